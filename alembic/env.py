@@ -23,7 +23,9 @@ from app.models import (
     reaction_tags,
     VisitHistory,
     Tag,
-    TagCategory
+    TagCategory,
+    EmbeddingJob,
+    EmbeddingModel
 )
 
 # this is the Alembic Config object
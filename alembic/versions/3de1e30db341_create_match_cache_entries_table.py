@@ -0,0 +1,36 @@
+"""create match cache entries table
+
+Revision ID: 3de1e30db341
+Revises: a9a8e8e502dd
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3de1e30db341'
+down_revision: Union[str, None] = 'a9a8e8e502dd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 작품 매칭 공유 캐시 (MATCH_CACHE_SHARED=true)
+    # UNLOGGED: WAL 미기록 → 빠름, 크래시 시 비워져도 되는 캐시 데이터
+    op.execute("""
+        CREATE UNLOGGED TABLE match_cache_entries (
+            phash BIGINT PRIMARY KEY,
+            embedding vector(384) NOT NULL,
+            expires_at TIMESTAMPTZ NOT NULL
+        )
+    """)
+    op.create_index('ix_match_cache_entries_expires_at', 'match_cache_entries', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_match_cache_entries_expires_at', table_name='match_cache_entries')
+    op.drop_table('match_cache_entries')
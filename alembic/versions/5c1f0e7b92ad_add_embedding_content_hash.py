@@ -0,0 +1,33 @@
+"""add embedding content hash
+
+Revision ID: 5c1f0e7b92ad
+Revises: da34204d5785
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1f0e7b92ad'
+down_revision: Union[str, None] = 'da34204d5785'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 임베딩을 만든 이미지의 SHA-256 (같은 이미지면 재생성 생략/재사용)
+    op.add_column('artworks', sa.Column('embedding_content_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_artworks_embedding_content_hash', 'artworks', ['embedding_content_hash'])
+
+    # 작업에 이미지 해시 전달 (임베딩 저장 시 함께 기록)
+    op.add_column('embedding_jobs', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('embedding_jobs', 'content_hash')
+    op.drop_index('ix_artworks_embedding_content_hash', table_name='artworks')
+    op.drop_column('artworks', 'embedding_content_hash')
@@ -0,0 +1,50 @@
+"""switch embedding index to hnsw
+
+Revision ID: a9a8e8e502dd
+Revises: 93eba08617ec
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9a8e8e502dd'
+down_revision: Union[str, None] = '93eba08617ec'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 1. 빈 테이블에서 학습된 ivfflat 인덱스 삭제 (centroid가 의미 없음)
+    op.execute('DROP INDEX IF EXISTS artworks_embedding_idx')
+
+    # 2. HNSW 인덱스 생성 (학습 단계 없음, 행 추가 시 점진적으로 갱신)
+    op.execute("""
+        CREATE INDEX artworks_embedding_idx
+        ON artworks
+        USING hnsw (embedding vector_cosine_ops)
+        WITH (m = 16, ef_construction = 64)
+    """)
+
+    # 3. 빌드 정보 기록 (app/utils/rebuild_vector_index.py가 사용)
+    row_count = op.get_bind().execute(
+        sa.text('SELECT COUNT(embedding) FROM artworks')
+    ).scalar()
+    op.execute(
+        f"COMMENT ON INDEX artworks_embedding_idx IS 'type=hnsw;rows={int(row_count or 0)}'"
+    )
+
+
+def downgrade() -> None:
+    # 롤백: ivfflat 인덱스로 되돌리기
+    op.execute('DROP INDEX IF EXISTS artworks_embedding_idx')
+    op.execute("""
+        CREATE INDEX artworks_embedding_idx
+        ON artworks
+        USING ivfflat (embedding vector_cosine_ops)
+        WITH (lists = 100)
+    """)
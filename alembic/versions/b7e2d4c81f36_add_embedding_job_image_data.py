@@ -0,0 +1,27 @@
+"""add embedding job image data
+
+Revision ID: b7e2d4c81f36
+Revises: 5c1f0e7b92ad
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4c81f36'
+down_revision: Union[str, None] = '5c1f0e7b92ad'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 업로드 시 리사이즈한 이미지 (워커가 S3에서 다시 받지 않음, 완료 시 비움)
+    op.add_column('embedding_jobs', sa.Column('image_data', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('embedding_jobs', 'image_data')
@@ -0,0 +1,83 @@
+"""create embedding jobs table
+
+Revision ID: da34204d5785
+Revises: 3de1e30db341
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'da34204d5785'
+down_revision: Union[str, None] = '3de1e30db341'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # embedding_jobs 테이블 생성
+    op.create_table(
+        'embedding_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('artwork_id', sa.Integer(), nullable=False),
+        sa.Column('thumbnail_url', sa.String(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('locked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['artwork_id'], ['artworks.id'], ondelete='CASCADE'),
+        sa.CheckConstraint(
+            "status IN ('pending', 'running', 'done', 'failed')",
+            name='ck_embedding_job_status'
+        )
+    )
+
+    # 인덱스 생성
+    op.create_index('ix_embedding_jobs_id', 'embedding_jobs', ['id'])
+
+    # 작업 가져오기: 실행 가능한 pending 작업만 (부분 인덱스)
+    op.create_index(
+        'ix_embedding_jobs_pending', 'embedding_jobs', ['run_after', 'id'],
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+    # 작품당 대기 작업은 하나 (중복 등록 시 ON CONFLICT로 합치기)
+    op.create_index(
+        'uq_embedding_jobs_pending_artwork', 'embedding_jobs', ['artwork_id'],
+        unique=True,
+        postgresql_where=sa.text("status = 'pending'")
+    )
+
+    # 작업 등록 시 워커 깨우기 (LISTEN embedding_jobs)
+    op.execute("""
+        CREATE FUNCTION notify_embedding_job() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('embedding_jobs', NEW.id::text);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER embedding_jobs_notify
+        AFTER INSERT OR UPDATE OF run_after ON embedding_jobs
+        FOR EACH ROW WHEN (NEW.status = 'pending')
+        EXECUTE FUNCTION notify_embedding_job()
+    """)
+
+
+def downgrade() -> None:
+    op.execute('DROP TRIGGER IF EXISTS embedding_jobs_notify ON embedding_jobs')
+    op.execute('DROP FUNCTION IF EXISTS notify_embedding_job()')
+    op.drop_index('uq_embedding_jobs_pending_artwork', table_name='embedding_jobs')
+    op.drop_index('ix_embedding_jobs_pending', table_name='embedding_jobs')
+    op.drop_index('ix_embedding_jobs_id', table_name='embedding_jobs')
+    op.drop_table('embedding_jobs')
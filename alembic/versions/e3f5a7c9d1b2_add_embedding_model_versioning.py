@@ -0,0 +1,80 @@
+"""add embedding model versioning
+
+Revision ID: e3f5a7c9d1b2
+Revises: b7e2d4c81f36
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3f5a7c9d1b2'
+down_revision: Union[str, None] = 'b7e2d4c81f36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # embedding_models 테이블 생성
+    op.create_table(
+        'embedding_models',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.String(length=64), nullable=False),
+        sa.Column('backend', sa.String(length=20), nullable=False),
+        sa.Column('dimension', sa.Integer(), nullable=False, server_default='384'),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='shadow'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.Column('activated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('version'),
+        sa.CheckConstraint(
+            "status IN ('active', 'shadow', 'retired')",
+            name='ck_embedding_model_status'
+        )
+    )
+    op.create_index('ix_embedding_models_id', 'embedding_models', ['id'])
+
+    # active / shadow는 각각 최대 하나
+    op.create_index(
+        'uq_embedding_models_status', 'embedding_models', ['status'],
+        unique=True,
+        postgresql_where=sa.text("status IN ('active', 'shadow')")
+    )
+
+    # 기존 임베딩을 만든 모델 (Lambda DINOv2-small)
+    op.execute("""
+        INSERT INTO embedding_models (version, backend, dimension, description, status, activated_at)
+        VALUES ('dinov2-small', 'lambda', 384,
+                'facebook/dinov2-small CLS 토큰 (짧은 변 256 bicubic → 224 center crop → ImageNet 정규화)',
+                'active', now())
+    """)
+
+    # 작품 임베딩 모델 버전 + 섀도 임베딩 컬럼
+    op.add_column('artworks', sa.Column('embedding_model', sa.String(length=64), nullable=True))
+    op.add_column('artworks', sa.Column('embedding_shadow', Vector(384), nullable=True))
+    op.add_column('artworks', sa.Column('embedding_shadow_content_hash', sa.String(length=64), nullable=True))
+    op.add_column('artworks', sa.Column('embedding_shadow_model', sa.String(length=64), nullable=True))
+    op.create_index('ix_artworks_embedding_shadow_content_hash', 'artworks', ['embedding_shadow_content_hash'])
+    op.execute("UPDATE artworks SET embedding_model = 'dinov2-small' WHERE embedding IS NOT NULL")
+
+    # 매칭 캐시: 모델마다 임베딩 공간이 다르므로 버전별로 구분
+    op.add_column('match_cache_entries', sa.Column('model_version', sa.String(length=64), nullable=False, server_default=''))
+
+
+def downgrade() -> None:
+    op.drop_column('match_cache_entries', 'model_version')
+    op.execute('DROP INDEX IF EXISTS artworks_embedding_shadow_idx')
+    op.drop_index('ix_artworks_embedding_shadow_content_hash', table_name='artworks')
+    op.drop_column('artworks', 'embedding_shadow_model')
+    op.drop_column('artworks', 'embedding_shadow_content_hash')
+    op.drop_column('artworks', 'embedding_shadow')
+    op.drop_column('artworks', 'embedding_model')
+    op.drop_index('uq_embedding_models_status', table_name='embedding_models')
+    op.drop_index('ix_embedding_models_id', table_name='embedding_models')
+    op.drop_table('embedding_models')
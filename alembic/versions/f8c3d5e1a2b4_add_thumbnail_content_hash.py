@@ -0,0 +1,39 @@
+"""add thumbnail content hash
+
+Revision ID: f8c3d5e1a2b4
+Revises: e3f5a7c9d1b2
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f8c3d5e1a2b4'
+down_revision: Union[str, None] = 'e3f5a7c9d1b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 현재 썸네일 이미지의 SHA-256 (같은 파일 재업로드 판별)
+    op.add_column('artworks', sa.Column('thumbnail_content_hash', sa.String(length=64), nullable=True))
+
+    # 끝나지 않았거나 실패한 임베딩 작업이 없는 작품만 임베딩 이미지 = 현재 썸네일
+    # (나머지는 NULL → 다음 업로드는 생략 없이 교체)
+    op.execute("""
+        UPDATE artworks a
+        SET thumbnail_content_hash = a.embedding_content_hash
+        WHERE a.embedding_content_hash IS NOT NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM embedding_jobs j
+                WHERE j.artwork_id = a.id AND j.status <> 'done'
+            )
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('artworks', 'thumbnail_content_hash')
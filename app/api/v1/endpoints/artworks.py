@@ -1,30 +1,69 @@
 # app/api/v1/endpoints/artworks.py
+import asyncio
 import base64
-import io
+from datetime import date
+import json
 import logging
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from PIL import Image
-from sqlalchemy import func, text
+from PIL import UnidentifiedImageError
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import bindparam, func, text
 from sqlalchemy.orm import Session, joinedload
 
 from app.api.deps import verify_api_key
+from app.config import settings
 from app.database import SessionLocal, get_db
 from app.models.artist import Artist
 from app.models.artwork import Artwork
 from app.models.exhibition import Exhibition
 from app.models.reaction import Reaction
+from app.models.visit_history import VisitHistory
 from app.schemas.artwork import (
+    ArtworkBatchMatchRequest,
+    ArtworkBatchMatchResponse,
     ArtworkCreate,
     ArtworkDetail,
+    ArtworkMatchAdmissionStats,
+    ArtworkMatchCacheStats,
+    ArtworkMatchLambdaStats,
     ArtworkMatchRequest,
     ArtworkMatchResponse,
     ArtworkResponse,
     ArtworkUpdate,
 )
-from app.utils.embedding_utils import generate_embedding_background
-from app.utils.lambda_client import lambda_client
+from app.utils.admission import AdmissionRejected, get_match_admission
+from app.utils.embedding import fuse_similarities, get_artwork_embedding_index
+from app.utils.embedding_jobs import enqueue_embedding_job
+from app.utils.embedding_models import get_embedding_model_registry
+from app.utils.embedding_resilience import (
+    Deadline,
+    EmbeddingBackendUnavailable,
+    current_deadline,
+    deadline_scope,
+)
+from app.utils.embedding_utils import (
+    generate_embedding_background,
+    reuse_embedding_by_hash,
+    update_embedding_index,
+)
+from app.utils.image_processing import (
+    ImageTooLargeError,
+    compute_content_hash,
+    get_image_preprocessor,
+)
+from app.utils.lambda_client import lambda_telemetry
+from app.utils.lambda_warmer import get_lambda_warmer
+from app.utils.match_cache import get_match_cache
+from app.utils.match_stream import ConsecutiveMatchTracker, LatestFrameSlot
+from app.utils.singleflight import AsyncSingleFlight, content_key
 from app.utils.s3_client import s3_client
+from app.utils.vector_index import (
+    apply_search_settings,
+    candidate_distance_sql,
+    rescore_candidates,
+)
 from fastapi import (
     APIRouter,
     BackgroundTasks,
@@ -33,9 +72,14 @@ from fastapi import (
     Form,
     HTTPException,
     Query,
+    Request,
     UploadFile,
+    WebSocket,
+    WebSocketDisconnect,
     status,
 )
+from fastapi.encoders import jsonable_encoder
+from starlette.websockets import WebSocketState
 
 logger = logging.getLogger(__name__)
 
@@ -203,6 +247,19 @@ def get_artwork(artwork_id: int, db: Session = Depends(get_db)):
     return result
 
 
+async def prepare_embedding_image(image_bytes: bytes) -> Optional[bytes]:
+    """
+    업로드한 썸네일을 임베딩 입력 크기로 리사이즈 (임베딩 단계에서 S3를 다시 읽지 않도록)
+
+    실패하면 None → 임베딩 단계에서 S3 get_object로 읽음
+    """
+    try:
+        return await get_image_preprocessor().preprocess(image_bytes, max_size=800)
+    except Exception as e:
+        logger.warning(f"⚠️ 임베딩용 이미지 리사이즈 실패 (S3에서 다시 읽음): {e}")
+        return None
+
+
 @router.post(
     "",
     response_model=ArtworkDetail,
@@ -253,10 +310,19 @@ async def create_artwork(
             detail=f"작가 ID {artist_id}를 찾을 수 없습니다",
         )
 
+    # 한 번만 읽어서 해시/업로드/임베딩에 같이 사용
+    thumbnail_bytes = await thumbnail.read()
+    content_hash = compute_content_hash(thumbnail_bytes)
+
     # S3에 썸네일 업로드
     try:
         logger.info(f"S3 업로드 시작: {thumbnail.filename}")
-        thumbnail_url = await s3_client.upload_file(file=thumbnail, folder="artworks")
+        thumbnail_url = await s3_client.upload_bytes(
+            thumbnail_bytes,
+            folder="artworks",
+            filename=thumbnail.filename,
+            content_type=thumbnail.content_type,
+        )
         logger.info(f"✅ S3 업로드 성공: {thumbnail_url}")
     except Exception as e:
         logger.error(f"❌ S3 업로드 실패: {e}")
@@ -272,20 +338,43 @@ async def create_artwork(
         description=description,
         year=year,
         thumbnail_url=thumbnail_url,
+        thumbnail_content_hash=content_hash,
     )
     db.add(new_artwork)
+    db.flush()
+
+    # 같은 이미지를 쓰는 작품이 있으면 임베딩 복사 (Lambda 호출 생략)
+    reused_embedding = reuse_embedding_by_hash(db, int(new_artwork.id), content_hash)
+    embedding_image = None
+    if reused_embedding is None:
+        embedding_image = await prepare_embedding_image(thumbnail_bytes)
+
+    if reused_embedding is not None:
+        logger.info(f"♻️  같은 이미지 작품의 임베딩 재사용: Artwork ID {new_artwork.id}")
+    elif settings.EMBEDDING_JOBS_ENABLED:
+        # 임베딩 작업 등록 (작품 저장과 같은 트랜잭션 → 유실 없음)
+        enqueue_embedding_job(
+            db, int(new_artwork.id), thumbnail_url, content_hash, embedding_image
+        )
+        logger.info(f"🔄 임베딩 작업 등록: Artwork ID {new_artwork.id}")
+
     db.commit()
     db.refresh(new_artwork)
 
-    # 백그라운드에서 임베딩 생성
-    logger.info(f"🔄 임베딩 생성 예약: Artwork ID {new_artwork.id}")
-    background_tasks.add_task(
-        generate_embedding_background,
-        artwork_id=int(new_artwork.id),
-        thumbnail_url=thumbnail_url,
-        title=title,
-        db=SessionLocal(),
-    )
+    if reused_embedding is not None:
+        update_embedding_index(int(new_artwork.id), reused_embedding, db)
+    elif not settings.EMBEDDING_JOBS_ENABLED:
+        # 백그라운드에서 임베딩 생성
+        logger.info(f"🔄 임베딩 생성 예약: Artwork ID {new_artwork.id}")
+        background_tasks.add_task(
+            generate_embedding_background,
+            artwork_id=int(new_artwork.id),
+            thumbnail_url=thumbnail_url,
+            title=title,
+            db=SessionLocal(),
+            content_hash=content_hash,
+            image_bytes=embedding_image,
+        )
 
     logger.info(
         f"✅ 작품 생성 완료: '{title}' (ID: {new_artwork.id}, 작가: {artist.name})"
@@ -333,7 +422,7 @@ async def update_artwork(
 
     Note:
         - 이미지 교체 시 기존 S3 이미지 삭제
-        - 이미지 교체 시 임베딩 재생성
+        - 이미지 교체 시 임베딩 재생성 (같은 파일이면 생략, 같은 이미지 작품이 있으면 임베딩 복사)
     """
     logger.info(f"작품 수정 시작: ID {artwork_id}")
 
@@ -371,6 +460,22 @@ async def update_artwork(
         updated_fields.append(f"연도={year}")
 
     # 썸네일 이미지 교체
+    reused_embedding = None
+    if thumbnail is not None:
+        thumbnail_bytes = await thumbnail.read()
+        content_hash = compute_content_hash(thumbnail_bytes)
+
+        # 지금 썸네일과 같은 파일이고 그 이미지의 임베딩도 있을 때만 생략
+        # (임베딩 해시만 보면 A → B(작업 대기 중) → A 재업로드 시 B가 남음)
+        if (
+            content_hash == artwork.thumbnail_content_hash
+            and content_hash == artwork.embedding_content_hash
+            and artwork.embedding is not None
+        ):
+            # 같은 파일 재업로드 → 업로드/임베딩 재생성 생략
+            logger.info("♻️  썸네일 변경 없음 (내용 해시 일치): 교체/임베딩 재생성 생략")
+            thumbnail = None
+
     if thumbnail is not None:
         logger.info(f"썸네일 교체 시작: {thumbnail.filename}")
 
@@ -385,22 +490,45 @@ async def update_artwork(
 
         # 새 이미지 업로드
         try:
-            new_thumbnail_url = await s3_client.upload_file(
-                file=thumbnail, folder="artworks"
+            new_thumbnail_url = await s3_client.upload_bytes(
+                thumbnail_bytes,
+                folder="artworks",
+                filename=thumbnail.filename,
+                content_type=thumbnail.content_type,
             )
             artwork.thumbnail_url = new_thumbnail_url  # type: ignore
+            artwork.thumbnail_content_hash = content_hash  # type: ignore
             logger.info(f"✅ 새 썸네일 업로드 성공: {new_thumbnail_url}")
             updated_fields.append("썸네일")
 
-            # 백그라운드에서 임베딩 재생성
-            logger.info(f"🔄 임베딩 재생성 예약: Artwork ID {artwork_id}")
-            background_tasks.add_task(
-                generate_embedding_background,
-                artwork_id=artwork_id,
-                thumbnail_url=new_thumbnail_url,
-                title=artwork.title,
-                db=SessionLocal(),
-            )
+            # 같은 이미지를 쓰는 다른 작품이 있으면 임베딩 복사
+            reused_embedding = reuse_embedding_by_hash(db, artwork_id, content_hash)
+            if reused_embedding is not None:
+                logger.info(
+                    f"♻️  같은 이미지 작품의 임베딩 재사용: Artwork ID {artwork_id}"
+                )
+            elif settings.EMBEDDING_JOBS_ENABLED:
+                # 임베딩 재생성 작업 등록 (아래 commit과 함께 반영)
+                enqueue_embedding_job(
+                    db,
+                    artwork_id,
+                    new_thumbnail_url,
+                    content_hash,
+                    await prepare_embedding_image(thumbnail_bytes),
+                )
+                logger.info(f"🔄 임베딩 재생성 작업 등록: Artwork ID {artwork_id}")
+            else:
+                # 백그라운드에서 임베딩 재생성
+                logger.info(f"🔄 임베딩 재생성 예약: Artwork ID {artwork_id}")
+                background_tasks.add_task(
+                    generate_embedding_background,
+                    artwork_id=artwork_id,
+                    thumbnail_url=new_thumbnail_url,
+                    title=artwork.title,
+                    db=SessionLocal(),
+                    content_hash=content_hash,
+                    image_bytes=await prepare_embedding_image(thumbnail_bytes),
+                )
         except Exception as e:
             logger.error(f"❌ S3 업로드 실패: {e}")
             raise HTTPException(
@@ -411,6 +539,11 @@ async def update_artwork(
     db.commit()
     db.refresh(artwork)
 
+    # 인메모리 매칭 인덱스 메타데이터 갱신 (제목, 작가 등)
+    if reused_embedding is not None:
+        update_embedding_index(artwork_id, reused_embedding, db)
+    get_artwork_embedding_index().refresh_metadata(artwork_id, db)
+
     logger.info(
         f"✅ 작품 수정 완료: ID {artwork_id} ({', '.join(updated_fields) if updated_fields else '변경 없음'})"
     )
@@ -466,65 +599,656 @@ async def delete_artwork(
     db.delete(artwork)
     db.commit()
 
+    # 인메모리 매칭 인덱스에서 제거
+    get_artwork_embedding_index().remove(artwork_id)
+
     logger.info(f"✅ 작품 삭제 완료: '{artwork_title}' (ID: {artwork_id})")
     return None
 
 
-def resize_base64_image_smart(base64_string: str, max_size: int = 1024) -> str:
+def resolve_match_scope(
+    db: Session,
+    exhibition_id: Optional[int] = None,
+    visit_id: Optional[int] = None,
+    ongoing_only: bool = False,
+) -> Optional[List[int]]:
+    """
+    매칭 검색 범위(전시 ID 목록) 결정
+
+    우선순위: exhibition_id > visit_id의 전시 > ongoing_only(진행 중 전시 전체)
+
+    Args:
+        db: DB 세션
+        exhibition_id: 전시 ID
+        visit_id: 방문 기록 ID
+        ongoing_only: 진행 중 전시만 검색 여부
+
+    Returns:
+        Optional[List[int]]: 검색 대상 전시 ID 목록 (None이면 전체 작품)
+
+    Raises:
+        404: 존재하지 않는 exhibition_id 또는 visit_id
+    """
+    if exhibition_id is not None:
+        exhibition = (
+            db.query(Exhibition.id).filter(Exhibition.id == exhibition_id).first()
+        )
+        if not exhibition:
+            logger.warning(f"전시 ID {exhibition_id} 찾을 수 없음")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"전시 ID {exhibition_id}를 찾을 수 없습니다",
+            )
+        return [exhibition_id]
+
+    if visit_id is not None:
+        visit = (
+            db.query(VisitHistory.exhibition_id)
+            .filter(VisitHistory.id == visit_id)
+            .first()
+        )
+        if not visit:
+            logger.warning(f"방문 기록 ID {visit_id} 찾을 수 없음")
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"방문 기록 ID {visit_id}를 찾을 수 없습니다",
+            )
+        return [visit.exhibition_id]
+
+    if ongoing_only:
+        embedding_index = get_artwork_embedding_index()
+        if settings.EMBEDDING_INDEX_ENABLED and embedding_index.is_ready:
+            return embedding_index.ongoing_exhibition_ids()
+
+        today = date.today()
+        rows = (
+            db.query(Exhibition.id)
+            .filter(Exhibition.start_date <= today, Exhibition.end_date >= today)
+            .all()
+        )
+        return [row.id for row in rows]
+
+    return None
+
+
+def search_artworks_pgvector(
+    db: Session,
+    user_embedding: List[float],
+    threshold: float,
+    top_k: int = 10,
+    exhibition_ids: Optional[List[int]] = None,
+    model_version: Optional[str] = None,
+) -> List[dict]:
+    """
+    pgvector 유사도 검색 (인메모리 인덱스 미사용 시 fallback)
+
+    Args:
+        db: DB 세션
+        user_embedding: 사용자 이미지 임베딩
+        threshold: 유사도 임계값
+        top_k: 최대 결과 개수
+        exhibition_ids: 검색 대상 전시 ID 목록 (None이면 전체 작품)
+        model_version: user_embedding을 만든 모델 버전 (같은 모델 임베딩만 비교)
+
+    Returns:
+        List[dict]: 매칭 결과 (ArtworkMatchResult 형식)
+    """
+    if exhibition_ids is not None and not exhibition_ids:
+        return []
+
+    # 전시 범위 지정 시 해당 전시 작품만 후보로 사용
+    scope_filter = (
+        """
+            AND a.id IN (
+                SELECT ea.artwork_id
+                FROM exhibition_artworks ea
+                WHERE ea.exhibition_id = ANY(:exhibition_ids)
+            )"""
+        if exhibition_ids is not None
+        else ""
+    )
+    # 모델 전환 직후 다른 벡터 공간의 행과 비교하지 않도록
+    if model_version is not None:
+        scope_filter += "\n            AND a.embedding_model = :model_version"
+
+    # pgvector 코사인 유사도 검색
+    # 1 - (embedding <=> user_embedding) = 코사인 유사도
+    # - 안쪽: ORDER BY (양자화) 거리 + LIMIT만 사용 → ANN 인덱스(hnsw/ivfflat) 스캔
+    # - 가운데: 후보를 float32 원본 벡터의 정확한 거리로 다시 정렬해 top_k개 (양자화 시)
+    # - 바깥: top_k개에만 임계값 적용 (WHERE에 두면 인덱스 스캔 후 post-filter)
+    candidates = rescore_candidates(top_k)
+    query = text(
+        f"""
+        SELECT id, title, artist_id, thumbnail_url, 1 - distance as similarity
+        FROM (
+            SELECT id, title, artist_id, thumbnail_url,
+                   embedding <=> :user_embedding as distance
+            FROM (
+                SELECT 
+                    a.id,
+                    a.title,
+                    a.artist_id,
+                    a.thumbnail_url,
+                    a.embedding
+                FROM artworks a
+                WHERE a.embedding IS NOT NULL{scope_filter}
+                ORDER BY {candidate_distance_sql("a.embedding", ":user_embedding")}
+                LIMIT :candidates
+            ) candidates
+            ORDER BY distance
+            LIMIT :top_k
+        ) rescored
+        WHERE 1 - distance >= :threshold
+        ORDER BY distance
+    """
+    ).bindparams(bindparam("user_embedding", type_=Vector(384)))
+
+    # 이 트랜잭션에만 ef_search / probes 적용 (후보 수 기준)
+    apply_search_settings(db, top_k=candidates, filtered=exhibition_ids is not None)
+
+    params = {
+        "user_embedding": np.asarray(user_embedding, dtype=np.float32),
+        "threshold": threshold,
+        "top_k": top_k,
+        "candidates": candidates,
+    }
+    if exhibition_ids is not None:
+        params["exhibition_ids"] = list(exhibition_ids)
+    if model_version is not None:
+        params["model_version"] = model_version
+
+    results = db.execute(query, params).fetchall()
+
+    # 결과에 상세 정보 추가
+    matched_artworks = []
+
+    for row in results:
+        # 작품 상세 정보 조회
+        artwork = (
+            db.query(Artwork)
+            .options(
+                joinedload(Artwork.artist),
+                joinedload(Artwork.exhibitions).joinedload(Exhibition.venue),
+            )
+            .filter(Artwork.id == row.id)
+            .first()
+        )
+
+        if artwork:
+            matched_artworks.append(
+                {
+                    "artwork_id": artwork.id,
+                    "title": artwork.title,
+                    "artist_id": artwork.artist_id,
+                    "artist_name": artwork.artist.name if artwork.artist else "",
+                    "thumbnail_url": artwork.thumbnail_url,
+                    "similarity": float(row.similarity),
+                    "exhibitions": [
+                        {
+                            "id": ex.id,
+                            "title": ex.title,
+                            "venue_name": ex.venue.name if ex.venue else "",
+                            "start_date": ex.start_date,
+                            "end_date": ex.end_date,
+                            "cover_image_url": ex.cover_image_url,
+                        }
+                        for ex in artwork.exhibitions
+                    ],
+                }
+            )
+
+    return matched_artworks
+
+
+# 동시에 들어온 같은 이미지의 임베딩 생성 합치기 (단체 관람객이 같은 작품을 동시에 촬영)
+match_embedding_flight = AsyncSingleFlight()
+
+
+async def prepare_match_image(
+    image_bytes: bytes, model_version: str
+) -> Tuple[Optional[str], Optional[np.ndarray], Optional[bytes]]:
+    """
+    매칭용 사용자 이미지 준비
+
+    1. dHash로 매칭 캐시 조회 (비슷한 사진이 최근에 있었으면 임베딩 재사용)
+    2. 조건부 리사이즈 (1MB 이하면 스킵)
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        model_version: 임베딩 모델 버전 (검색 대상 임베딩과 같은 모델)
+
+    Returns:
+        Tuple: (dHash, 캐시된 임베딩, 임베딩할 이미지) - 캐시 히트면 이미지는 None
+    """
+    size_mb = len(image_bytes) / 1024 / 1024
+
+    try:
+        # 1. 매칭 캐시 조회
+        image_hash = None
+        if settings.MATCH_CACHE_ENABLED:
+            # 전체 디코딩이 필요하므로 리사이즈와 같은 프로세스 풀에서 (GIL 경합 없음)
+            image_hash = await get_image_preprocessor().dhash(image_bytes)
+            cached_embedding = await asyncio.to_thread(
+                get_match_cache().get, image_hash, model_version
+            )
+            if cached_embedding is not None:
+                return image_hash, cached_embedding, None
+
+        # 2. 조건부 리사이즈 (1MB 이하면 스킵, 프로세스 풀에서 실행)
+        if size_mb > 1.0:
+            logger.info(f"   🔄 이미지 리사이즈 중... ({size_mb:.2f}MB)")
+            resized_image = await get_image_preprocessor().preprocess(
+                image_bytes, max_size=1024
+            )
+            new_size_mb = len(resized_image) / 1024 / 1024
+            logger.info(f"   ✅ 리사이즈 완료: {size_mb:.2f}MB → {new_size_mb:.2f}MB")
+        else:
+            logger.info("   ✅ 리사이즈 생략 (1MB 이하)")
+            resized_image = image_bytes
+    except ImageTooLargeError as e:
+        logger.warning(f"이미지 픽셀 수 초과: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+    except UnidentifiedImageError:
+        logger.warning("이미지 디코딩 실패")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="유효한 이미지가 아닙니다.",
+        )
+
+    return image_hash, None, resized_image
+
+
+async def embed_match_image(image_bytes: bytes, model_version: str) -> np.ndarray:
     """
-    조건부 이미지 리사이즈 (1MB 이하는 스킵)
+    매칭용 사용자 이미지 임베딩 생성
+
+    1. 매칭 캐시 조회 + 조건부 리사이즈 (prepare_match_image)
+    2. 임베딩 백엔드로 임베딩 생성 → 캐시 저장
 
     Args:
-        base64_string: base64 인코딩된 이미지
-        max_size: 최대 가로/세로 크기 (px)
+        image_bytes: 원본 이미지 바이트
+        model_version: 임베딩 모델 버전 (검색 대상 임베딩과 같은 모델)
 
     Returns:
-        str: 리사이즈된 base64 이미지 (또는 원본)
+        np.ndarray: 384차원 임베딩
     """
-    size_mb = len(base64_string) / 1024 / 1024
+    image_hash, cached_embedding, resized_image = await prepare_match_image(
+        image_bytes, model_version
+    )
+    if cached_embedding is not None:
+        return cached_embedding
+
+    # 사용자 이미지 임베딩 생성 (Lambda / HuggingFace / 로컬 ONNX)
+    embedding_backend = get_embedding_model_registry().backend_for(model_version)
+    logger.info(f"   🔄 임베딩 생성 중 ({embedding_backend.name}, {model_version})...")
+    user_embedding = await embedding_backend.aembed(resized_image)
+    logger.info(f"   ✅ 임베딩 생성 완료: {len(user_embedding)}차원")
+
+    if image_hash is not None:
+        await asyncio.to_thread(
+            get_match_cache().put, image_hash, user_embedding, model_version
+        )
 
-    # 1MB 이하면 원본 사용
-    if size_mb <= 1.0:
-        return base64_string
+    return user_embedding
+
+
+async def embed_match_images(
+    images: List[bytes], model_version: str
+) -> List[np.ndarray]:
+    """
+    여러 장 매칭용 임베딩 생성 (캐시 미스만 모아서 배치 1회 호출)
 
+    Args:
+        images: 원본 이미지 바이트 목록
+        model_version: 임베딩 모델 버전
+
+    Returns:
+        List[np.ndarray]: 요청 순서와 같은 384차원 임베딩 목록
+    """
+    prepared = await asyncio.gather(
+        *(prepare_match_image(image_bytes, model_version) for image_bytes in images)
+    )
+    embeddings: List[Optional[np.ndarray]] = [cached for _, cached, _ in prepared]
+    missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+
+    if missing:
+        embedding_backend = get_embedding_model_registry().backend_for(model_version)
+        logger.info(
+            f"   🔄 임베딩 배치 생성 중 ({embedding_backend.name}, {model_version}, "
+            f"{len(missing)}장, 캐시 {len(images) - len(missing)}장)..."
+        )
+        generated = await embedding_backend.aembed_batch(
+            [prepared[i][2] for i in missing]
+        )
+        logger.info(f"   ✅ 임베딩 배치 생성 완료: {len(generated)}장")
+
+        for i, embedding in zip(missing, generated):
+            embeddings[i] = embedding
+            image_hash = prepared[i][0]
+            if image_hash is not None:
+                await asyncio.to_thread(
+                    get_match_cache().put, image_hash, embedding, model_version
+                )
+    else:
+        logger.info(f"   ✅ 임베딩 전부 캐시 히트 ({len(images)}장)")
+
+    return embeddings
+
+
+async def await_match_embedding(
+    func: Callable[[], Awaitable[Any]], deadline: Optional[Deadline]
+) -> Any:
+    """
+    매칭 임베딩 대기 (요청 시간 예산 안에서)
+
+    예산은 contextvar로 임베딩 백엔드(hedging / 서킷 브레이커)와 스레드 호출까지 전달됩니다.
+    singleflight로 합류한 요청도 각자 자기 예산만큼만 기다립니다.
+
+    Raises:
+        HTTPException: 시간 예산 초과 (504) / 임베딩 백엔드 차단 (503)
+    """
     try:
-        # base64 → 이미지
-        image_data = base64.b64decode(base64_string)
-        image = Image.open(io.BytesIO(image_data))
+        with deadline_scope(deadline):
+            deadline = current_deadline()
+            if deadline is None:
+                return await func()
+            return await asyncio.wait_for(func(), timeout=deadline.remaining())
+    except TimeoutError as e:
+        logger.warning(f"⏱️ 임베딩 시간 예산 초과: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="이미지 인식이 지연되고 있습니다. 잠시 후 다시 시도해주세요.",
+        )
+    except EmbeddingBackendUnavailable as e:
+        logger.warning(f"🚫 {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="이미지 인식 서비스가 일시적으로 불안정합니다. 잠시 후 다시 시도해주세요.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
 
-        # RGB로 변환
-        if image.mode in ("RGBA", "LA", "P"):
-            image = image.convert("RGB")
 
-        # 리사이즈 (비율 유지)
-        image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+def search_artworks_pgvector_fused(
+    db: Session,
+    user_embeddings: List[np.ndarray],
+    threshold: float,
+    top_k: int = 10,
+    exhibition_ids: Optional[List[int]] = None,
+    model_version: Optional[str] = None,
+    fusion: str = "max",
+) -> List[dict]:
+    """
+    여러 장 pgvector 유사도 검색 (인메모리 인덱스 미사용 시 fallback)
 
-        # 이미지 → base64
-        buffer = io.BytesIO()
-        image.save(buffer, format="JPEG", quality=85, optimize=True)
-        resized_base64 = base64.b64encode(buffer.getvalue()).decode()
+    사진별 ANN 후보를 합친 뒤, 후보 전체의 사진별 정확한 유사도를 계산해 작품별로 합칩니다.
 
-        return resized_base64
+    Returns:
+        List[dict]: 매칭 결과 (ArtworkBatchMatchResult 형식, 합친 유사도 내림차순)
+    """
+    candidates: Dict[int, dict] = {}
+    for user_embedding in user_embeddings:
+        for result in search_artworks_pgvector(
+            db,
+            user_embedding,
+            threshold=0.0,
+            top_k=top_k,
+            exhibition_ids=exhibition_ids,
+            model_version=model_version,
+        ):
+            candidates.setdefault(result["artwork_id"], result)
+
+    if not candidates:
+        return []
+
+    artwork_ids = list(candidates)
+    rows = db.execute(
+        text("SELECT id, embedding FROM artworks WHERE id = ANY(:ids)").columns(
+            embedding=Vector(384)
+        ),
+        {"ids": artwork_ids},
+    ).fetchall()
+    vectors = {row.id: np.asarray(row.embedding, dtype=np.float32) for row in rows}
+    artwork_ids = [artwork_id for artwork_id in artwork_ids if artwork_id in vectors]
+    if not artwork_ids:
+        return []
+
+    matrix = np.vstack([vectors[artwork_id] for artwork_id in artwork_ids])
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True) + 1e-8
+    queries = np.vstack(user_embeddings).astype(np.float32)
+    queries /= np.linalg.norm(queries, axis=1, keepdims=True) + 1e-8
+
+    similarities = matrix @ queries.T
+    fused = fuse_similarities(similarities, fusion)
+
+    results = []
+    for i in np.argsort(-fused)[:top_k]:
+        if fused[i] < threshold:
+            break
+        results.append(
+            {
+                **candidates[artwork_ids[i]],
+                "similarity": float(fused[i]),
+                "image_similarities": similarities[i].tolist(),
+            }
+        )
+    return results
 
-    except Exception as e:
-        logger.error(f"이미지 리사이즈 실패: {e}, 원본 사용")
-        return base64_string
+
+async def find_artwork_matches(
+    image_bytes: bytes,
+    threshold: float,
+    db: Session,
+    exhibition_ids: Optional[List[int]] = None,
+    deadline: Optional[Deadline] = None,
+) -> List[dict]:
+    """
+    이미지 한 장 매칭 (REST 매칭 / 실시간 인식 스트림 공용)
+
+    1. 사용자 이미지 임베딩 (singleflight → 매칭 캐시 → 조건부 리사이즈 → 임베딩 백엔드)
+       검색 대상과 같은 모델 버전으로 생성 (인메모리 인덱스가 로드한 버전 / DB 활성 버전)
+    2. 인메모리 인덱스 유사도 검색 (미로드 시 DB pgvector 검색)
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        threshold: 유사도 임계값
+        db: DB 세션
+        exhibition_ids: 검색 대상 전시 ID 목록 (None이면 전체 작품)
+        deadline: 요청 시간 예산 (임베딩 생성이 넘기면 504)
+
+    Returns:
+        List[dict]: 임계값 이상 매칭 결과 (ArtworkMatchResult 형식, 유사도 내림차순)
+    """
+    # 0. 검색 대상 임베딩의 모델 버전
+    embedding_index = get_artwork_embedding_index()
+    use_index = settings.EMBEDDING_INDEX_ENABLED and embedding_index.is_ready
+    if use_index:
+        embedding_index.schedule_refresh()
+        model_version = embedding_index.model_version
+    else:
+        model_version = get_embedding_model_registry().active_version()
+
+    # 1. 사용자 이미지 임베딩 (같은 이미지가 동시에 들어오면 한 번만 생성)
+    user_embedding = await await_match_embedding(
+        lambda: match_embedding_flight.do(
+            (model_version, content_key(image_bytes)),
+            lambda: embed_match_image(image_bytes, model_version),
+        ),
+        deadline,
+    )
+
+    # 2. 유사도 검색 (인메모리 인덱스 우선, 미로드 시 pgvector)
+    if use_index:
+        logger.info(f"   🔍 인메모리 인덱스 검색 중 (threshold >= {threshold})...")
+        return embedding_index.search(
+            user_embedding,
+            top_k=10,
+            threshold=threshold,
+            exhibition_ids=exhibition_ids,
+        )
+
+    logger.info(f"   🔍 DB 유사도 검색 중 (threshold >= {threshold})...")
+    return search_artworks_pgvector(
+        db,
+        user_embedding,
+        threshold=threshold,
+        top_k=10,
+        exhibition_ids=exhibition_ids,
+        model_version=model_version,
+    )
+
+
+async def find_artwork_matches_batch(
+    images: List[bytes],
+    threshold: float,
+    db: Session,
+    exhibition_ids: Optional[List[int]] = None,
+    fusion: str = "max",
+    deadline: Optional[Deadline] = None,
+) -> List[dict]:
+    """
+    같은 작품을 찍은 여러 장 매칭
+
+    1. 임베딩 (캐시 미스만 배치 1회 호출)
+    2. 사진별 유사도를 작품별로 합쳐 한 번에 순위 (인메모리 인덱스 우선, 미로드 시 pgvector)
+
+    Returns:
+        List[dict]: 합친 유사도 임계값 이상 매칭 결과 (내림차순)
+    """
+    embedding_index = get_artwork_embedding_index()
+    use_index = settings.EMBEDDING_INDEX_ENABLED and embedding_index.is_ready
+    if use_index:
+        embedding_index.schedule_refresh()
+        model_version = embedding_index.model_version
+    else:
+        model_version = get_embedding_model_registry().active_version()
+
+    user_embeddings = await await_match_embedding(
+        lambda: embed_match_images(images, model_version), deadline
+    )
+
+    if use_index:
+        logger.info(
+            f"   🔍 인메모리 인덱스 검색 중 ({fusion}, threshold >= {threshold})..."
+        )
+        return embedding_index.search_fused(
+            user_embeddings,
+            top_k=10,
+            threshold=threshold,
+            exhibition_ids=exhibition_ids,
+            fusion=fusion,
+        )
+
+    logger.info(f"   🔍 DB 유사도 검색 중 ({fusion}, threshold >= {threshold})...")
+    return search_artworks_pgvector_fused(
+        db,
+        user_embeddings,
+        threshold=threshold,
+        top_k=10,
+        exhibition_ids=exhibition_ids,
+        model_version=model_version,
+        fusion=fusion,
+    )
+
+
+async def run_artwork_match(
+    image_bytes: bytes,
+    threshold: float,
+    db: Session,
+    exhibition_ids: Optional[List[int]] = None,
+    deadline: Optional[Deadline] = None,
+) -> dict:
+    """
+    작품 매칭 파이프라인 (JSON / 바이너리 업로드 공용)
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        threshold: 유사도 임계값
+        db: DB 세션
+        exhibition_ids: 검색 대상 전시 ID 목록 (None이면 전체 작품)
+        deadline: 요청 시간 예산
+
+    Returns:
+        dict: ArtworkMatchResponse 형식 결과
+    """
+    matched_artworks = await find_artwork_matches(
+        image_bytes, threshold, db, exhibition_ids=exhibition_ids, deadline=deadline
+    )
+
+    # 검색 결과 상세 로깅
+    logger.info(f"   📊 검색 결과: {len(matched_artworks)}개 작품 매칭")
+
+    if matched_artworks:
+        # 유사도 통계
+        similarities = [r["similarity"] for r in matched_artworks]
+        max_sim = max(similarities)
+        min_sim = min(similarities)
+        avg_sim = sum(similarities) / len(similarities)
+
+        logger.info(f"   📈 유사도 통계:")
+        logger.info(f"      - 최고: {max_sim:.4f}")
+        logger.info(f"      - 최저: {min_sim:.4f}")
+        logger.info(f"      - 평균: {avg_sim:.4f}")
+
+        # 상위 3개 결과 로깅
+        logger.info(f"   🎯 상위 매칭 작품:")
+        for idx, r in enumerate(matched_artworks[:3], 1):
+            logger.info(
+                f"      [{idx}] {r['title']} "
+                f"(유사도: {r['similarity']:.4f}, ID: {r['artwork_id']})"
+            )
+
+        # 전체 결과는 DEBUG 레벨에
+        if len(matched_artworks) > 3:
+            logger.debug(f"   📋 전체 매칭 결과:")
+            for idx, r in enumerate(matched_artworks, 1):
+                logger.debug(
+                    f"      [{idx}] {r['title']} - "
+                    f"유사도: {r['similarity']:.4f} "
+                    f"(ID: {r['artwork_id']})"
+                )
+    else:
+        logger.warning(
+            f"   ⚠️  매칭된 작품 없음 " f"(threshold {threshold} 이상인 작품 없음)"
+        )
+
+    # 최종 결과 로깅
+    logger.info("   " + "=" * 56)
+    logger.info(
+        f"   ✅ 매칭 완료: "
+        f"매칭 여부={len(matched_artworks) > 0}, "
+        f"총 {len(matched_artworks)}개, "
+        f"사용 Threshold={threshold}"
+    )
+    logger.info("=" * 60)
+
+    return {
+        "matched": len(matched_artworks) > 0,
+        "total_matches": len(matched_artworks),
+        "threshold": threshold,
+        "results": matched_artworks,
+    }
 
 
 @router.post(
     "/match",
     response_model=ArtworkMatchResponse,
     summary="작품 이미지 매칭",
-    description="업로드된 이미지와 유사한 작품을 전체 작품에서 찾습니다. (pgvector 유사도 검색)",
+    description="업로드된 이미지와 유사한 작품을 찾습니다. exhibition_id/visit_id/ongoing_only로 검색 범위 지정 가능. (인메모리 인덱스, 미로드 시 pgvector 유사도 검색)",
 )
 async def match_artwork(request: ArtworkMatchRequest, db: Session = Depends(get_db)):
     """
-    이미지 매칭 (pgvector 기반)
+    이미지 매칭 (base64 JSON 요청)
 
-    1. lambda로 사용자 이미지 임베딩 생성
-    2. DB에서 pgvector 유사도 검색
+    1. base64 디코딩
+    2. 매칭 파이프라인 실행 (리사이즈 → 임베딩 → 유사도 검색)
     3. 결과 반환
+
+    요청 시간 예산(MATCH_DEADLINE_SECONDS)을 넘기면 504, 임베딩 백엔드 차단 시 503
     """
+    deadline = Deadline.after(settings.MATCH_DEADLINE_SECONDS)
     try:
         # 매칭 시작 로깅
         logger.info("=" * 60)
@@ -542,142 +1266,138 @@ async def match_artwork(request: ArtworkMatchRequest, db: Session = Depends(get_
         size_mb = len(request.image_base64) / 1024 / 1024
         logger.info(f"   🖼️  원본 이미지 크기: {size_mb:.2f}MB")
 
-        if size_mb > 50:
+        if size_mb > settings.MATCH_MAX_UPLOAD_MB:
             logger.warning(f"이미지 크기 초과: {size_mb:.2f}MB")
             raise HTTPException(
                 status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
-                detail=f"이미지 크기가 너무 큽니다: {size_mb:.2f}MB (최대 50MB)",
+                detail=f"이미지 크기가 너무 큽니다: {size_mb:.2f}MB (최대 {settings.MATCH_MAX_UPLOAD_MB}MB)",
             )
 
-        # 2. 조건부 리사이즈 (1MB 이하면 스킵)
-        if size_mb > 1.0:
-            logger.info(f"   🔄 이미지 리사이즈 중... ({size_mb:.2f}MB)")
-            resized_image = resize_base64_image_smart(
-                request.image_base64, max_size=1024
-            )
-            new_size_mb = len(resized_image) / 1024 / 1024
-            logger.info(f"   ✅ 리사이즈 완료: {size_mb:.2f}MB → {new_size_mb:.2f}MB")
+        # 검색 범위 결정 (전시 / 방문 기록 / 진행 중 전시)
+        exhibition_ids = resolve_match_scope(
+            db,
+            exhibition_id=request.exhibition_id,
+            visit_id=request.visit_id,
+            ongoing_only=request.ongoing_only,
+        )
+        if exhibition_ids is None:
+            logger.info("   🗂️  검색 범위: 전체 작품")
         else:
-            logger.info("   ✅ 리사이즈 생략 (1MB 이하)")
-            resized_image = request.image_base64
-
-        # 3. Lambda로 사용자 이미지 임베딩 생성
-        logger.info("   🔄 Lambda 호출 중 (임베딩 생성)...")
-        user_embedding = lambda_client.generate_embedding(resized_image)
-        logger.info(f"   ✅ 임베딩 생성 완료: {len(user_embedding)}차원")
-
-        # 4. DB에서 pgvector 유사도 검색
-        logger.info(f"   🔍 DB 유사도 검색 중 (threshold >= {request.threshold})...")
-
-        # pgvector 코사인 유사도 검색
-        # 1 - (embedding <=> user_embedding) = 코사인 유사도
-        query = text(
-            """
-            SELECT 
-                a.id,
-                a.title,
-                a.artist_id,
-                a.thumbnail_url,
-                1 - (a.embedding <=> CAST(:user_embedding AS vector)) as similarity
-            FROM artworks a
-            WHERE a.embedding IS NOT NULL
-                AND 1 - (a.embedding <=> CAST(:user_embedding AS vector)) >= :threshold
-            ORDER BY a.embedding <=> CAST(:user_embedding AS vector)
-            LIMIT 10
-        """
+            logger.info(f"   🗂️  검색 범위: 전시 {exhibition_ids}")
+
+        # 2. base64 디코딩
+        try:
+            image_bytes = base64.b64decode(request.image_base64)
+        except ValueError:
+            logger.warning("base64 디코딩 실패")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="유효한 base64 이미지가 아닙니다.",
+            )
+
+        return await run_artwork_match(
+            image_bytes,
+            request.threshold,
+            db,
+            exhibition_ids=exhibition_ids,
+            deadline=deadline,
         )
 
-        results = db.execute(
-            query,
-            {
-                "user_embedding": str(user_embedding),
-                "threshold": request.threshold,
-            },
-        ).fetchall()
-
-        # 검색 결과 상세 로깅
-        logger.info(f"   📊 검색 결과: {len(results)}개 작품 매칭")
-
-        if results:
-            # 유사도 통계
-            similarities = [float(r.similarity) for r in results]
-            max_sim = max(similarities)
-            min_sim = min(similarities)
-            avg_sim = sum(similarities) / len(similarities)
-
-            logger.info(f"   📈 유사도 통계:")
-            logger.info(f"      - 최고: {max_sim:.4f}")
-            logger.info(f"      - 최저: {min_sim:.4f}")
-            logger.info(f"      - 평균: {avg_sim:.4f}")
-
-            # 상위 3개 결과 로깅
-            logger.info(f"   🎯 상위 매칭 작품:")
-            for idx, r in enumerate(results[:3], 1):
-                logger.info(
-                    f"      [{idx}] {r.title} "
-                    f"(유사도: {r.similarity:.4f}, ID: {r.id})"
-                )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("=" * 60)
+        logger.error(f"❌ 작품 매칭 실패: {str(e)}", exc_info=True)
+        logger.error("=" * 60)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"이미지 매칭 중 오류가 발생했습니다: {str(e)}",
+        )
 
-            # 전체 결과는 DEBUG 레벨에
-            if len(results) > 3:
-                logger.debug(f"   📋 전체 매칭 결과:")
-                for idx, r in enumerate(results, 1):
-                    logger.debug(
-                        f"      [{idx}] {r.title} - "
-                        f"유사도: {r.similarity:.4f} "
-                        f"(ID: {r.id})"
-                    )
-        else:
-            logger.warning(
-                f"   ⚠️  매칭된 작품 없음 "
-                f"(threshold {request.threshold} 이상인 작품 없음)"
+
+@router.post(
+    "/match/batch",
+    response_model=ArtworkBatchMatchResponse,
+    summary="작품 이미지 매칭 (여러 장)",
+    description=(
+        "같은 작품을 여러 장(반사/각도 보완) 찍은 사진으로 매칭합니다. "
+        "임베딩은 한 번의 배치 호출로 만들고, 작품별 유사도를 max/mean으로 합쳐 하나의 순위를 반환합니다."
+    ),
+)
+async def match_artwork_batch(
+    request: ArtworkBatchMatchRequest, db: Session = Depends(get_db)
+):
+    """
+    이미지 매칭 (여러 장, base64 JSON 요청)
+
+    1. base64 디코딩
+    2. 임베딩 배치 생성 (캐시 미스만 1회 호출)
+    3. 작품별 유사도 합치기 → 결과 반환
+    """
+    deadline = Deadline.after(settings.MATCH_DEADLINE_SECONDS)
+    try:
+        logger.info("=" * 60)
+        logger.info("🔍 작품 이미지 매칭 시작 (여러 장)")
+        logger.info(
+            f"   📊 요청 Threshold: {request.threshold}, 사진 {len(request.images_base64)}장, "
+            f"합치기: {request.fusion}"
+        )
+
+        # 1. 입력 검증
+        if len(request.images_base64) > settings.MATCH_BATCH_MAX_IMAGES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"사진이 너무 많습니다: {len(request.images_base64)}장 (최대 {settings.MATCH_BATCH_MAX_IMAGES}장)",
+            )
+        if not all(request.images_base64):
+            logger.warning("빈 이미지 포함")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="이미지가 제공되지 않았습니다.",
             )
 
-        # 5. 결과에 상세 정보 추가
-        matched_artworks = []
+        # 검색 범위 결정 (전시 / 방문 기록 / 진행 중 전시)
+        exhibition_ids = resolve_match_scope(
+            db,
+            exhibition_id=request.exhibition_id,
+            visit_id=request.visit_id,
+            ongoing_only=request.ongoing_only,
+        )
+        if exhibition_ids is None:
+            logger.info("   🗂️  검색 범위: 전체 작품")
+        else:
+            logger.info(f"   🗂️  검색 범위: 전시 {exhibition_ids}")
 
-        for row in results:
-            # 작품 상세 정보 조회
-            artwork = (
-                db.query(Artwork)
-                .options(
-                    joinedload(Artwork.artist),
-                    joinedload(Artwork.exhibitions).joinedload(Exhibition.venue),
-                )
-                .filter(Artwork.id == row.id)
-                .first()
+        # 2. base64 디코딩
+        try:
+            images = [
+                base64.b64decode(image_base64) for image_base64 in request.images_base64
+            ]
+        except ValueError:
+            logger.warning("base64 디코딩 실패")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="유효한 base64 이미지가 아닙니다.",
             )
 
-            if artwork:
-                matched_artworks.append(
-                    {
-                        "artwork_id": artwork.id,
-                        "title": artwork.title,
-                        "artist_id": artwork.artist_id,
-                        "artist_name": artwork.artist.name if artwork.artist else "",
-                        "thumbnail_url": artwork.thumbnail_url,
-                        "similarity": float(row.similarity),
-                        "exhibitions": [
-                            {
-                                "id": ex.id,
-                                "title": ex.title,
-                                "venue_name": ex.venue.name if ex.venue else "",
-                                "start_date": ex.start_date,
-                                "end_date": ex.end_date,
-                                "cover_image_url": ex.cover_image_url,
-                            }
-                            for ex in artwork.exhibitions
-                        ],
-                    }
-                )
+        matched_artworks = await find_artwork_matches_batch(
+            images,
+            request.threshold,
+            db,
+            exhibition_ids=exhibition_ids,
+            fusion=request.fusion,
+            deadline=deadline,
+        )
 
-        # 최종 결과 로깅
-        logger.info("   " + "=" * 56)
+        if matched_artworks:
+            top = matched_artworks[0]
+            logger.info(
+                f"   🎯 최고 매칭: {top['title']} (유사도: {top['similarity']:.4f}, "
+                f"사진별: {[round(s, 4) for s in top['image_similarities']]})"
+            )
         logger.info(
-            f"   ✅ 매칭 완료: "
-            f"매칭 여부={len(matched_artworks) > 0}, "
-            f"총 {len(matched_artworks)}개, "
-            f"사용 Threshold={request.threshold}"
+            f"   ✅ 매칭 완료: 매칭 여부={len(matched_artworks) > 0}, "
+            f"총 {len(matched_artworks)}개, 사용 Threshold={request.threshold}"
         )
         logger.info("=" * 60)
 
@@ -685,6 +1405,8 @@ async def match_artwork(request: ArtworkMatchRequest, db: Session = Depends(get_
             "matched": len(matched_artworks) > 0,
             "total_matches": len(matched_artworks),
             "threshold": request.threshold,
+            "fusion": request.fusion,
+            "image_count": len(images),
             "results": matched_artworks,
         }
 
@@ -698,3 +1420,396 @@ async def match_artwork(request: ArtworkMatchRequest, db: Session = Depends(get_
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"이미지 매칭 중 오류가 발생했습니다: {str(e)}",
         )
+
+
+async def read_match_upload(request: Request) -> bytes:
+    """
+    바이너리 매칭 요청에서 이미지 바이트 추출
+
+    - multipart/form-data: image 필드의 파일
+    - 그 외 (application/octet-stream, image/*): Request Body 스트리밍 수신
+
+    크기 제한은 BodySizeLimitMiddleware가 수신 단계에서 적용합니다.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if "multipart/form-data" in content_type:
+        form = await request.form()
+        upload = form.get("image")
+        if upload is None or isinstance(upload, str):
+            return b""
+        try:
+            return await upload.read()
+        finally:
+            await form.close()
+
+    chunks = bytearray()
+    async for chunk in request.stream():
+        chunks.extend(chunk)
+    return bytes(chunks)
+
+
+@router.post(
+    "/match/binary",
+    response_model=ArtworkMatchResponse,
+    summary="작품 이미지 매칭 (바이너리 업로드)",
+    description=(
+        "이미지를 base64 없이 원본 바이트로 업로드해 매칭합니다. "
+        "application/octet-stream(image/*) Body 또는 multipart/form-data의 image 필드를 지원합니다."
+    ),
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/octet-stream": {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"image": {"type": "string", "format": "binary"}},
+                        "required": ["image"],
+                    }
+                },
+            },
+        }
+    },
+)
+async def match_artwork_binary(
+    request: Request,
+    threshold: float = Query(0.7, ge=0.0, le=1.0, description="유사도 임계값"),
+    exhibition_id: Optional[int] = Query(None, description="전시 ID"),
+    visit_id: Optional[int] = Query(None, description="방문 기록 ID"),
+    ongoing_only: bool = Query(False, description="진행 중인 전시의 작품만 검색"),
+    db: Session = Depends(get_db),
+):
+    """
+    이미지 매칭 (바이너리 업로드)
+
+    1. 이미지 바이트 수신 (base64 인코딩/JSON 파싱 없음)
+    2. 매칭 파이프라인 실행 (리사이즈 → 임베딩 → 유사도 검색)
+    3. 결과 반환
+    """
+    try:
+        # 매칭 시작 로깅
+        logger.info("=" * 60)
+        logger.info("🔍 작품 이미지 매칭 시작 (바이너리)")
+        logger.info(f"   📊 요청 Threshold: {threshold}")
+
+        # 검색 범위 결정 (이미지 수신 전에 검증)
+        exhibition_ids = resolve_match_scope(
+            db,
+            exhibition_id=exhibition_id,
+            visit_id=visit_id,
+            ongoing_only=ongoing_only,
+        )
+        if exhibition_ids is None:
+            logger.info("   🗂️  검색 범위: 전체 작품")
+        else:
+            logger.info(f"   🗂️  검색 범위: 전시 {exhibition_ids}")
+
+        # 1. 이미지 수신
+        image_bytes = await read_match_upload(request)
+        if not image_bytes:
+            logger.warning("이미지가 제공되지 않음")
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="이미지가 제공되지 않았습니다.",
+            )
+
+        size_mb = len(image_bytes) / 1024 / 1024
+        logger.info(f"   🖼️  원본 이미지 크기: {size_mb:.2f}MB")
+
+        # 시간 예산은 수신 완료 후부터 (클라이언트 업로드 속도와 무관하게)
+        return await run_artwork_match(
+            image_bytes,
+            threshold,
+            db,
+            exhibition_ids=exhibition_ids,
+            deadline=Deadline.after(settings.MATCH_DEADLINE_SECONDS),
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("=" * 60)
+        logger.error(f"❌ 작품 매칭 실패: {str(e)}", exc_info=True)
+        logger.error("=" * 60)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"이미지 매칭 중 오류가 발생했습니다: {str(e)}",
+        )
+
+
+async def receive_match_frames(
+    websocket: WebSocket,
+    slot: LatestFrameSlot,
+    tracker: ConsecutiveMatchTracker,
+) -> None:
+    """
+    실시간 인식 스트림 수신 태스크
+
+    - 바이너리 메시지: 프레임 (최신 프레임만 보관, 밀린 프레임은 버림)
+    - 텍스트 메시지: {"type": "reset"} 연속 기록 초기화 / {"type": "stop"} 세션 종료
+    - MATCH_STREAM_IDLE_TIMEOUT_SECONDS 동안 메시지가 없으면 종료
+    """
+    max_bytes = settings.MATCH_STREAM_MAX_FRAME_KB * 1024
+
+    try:
+        while True:
+            message = await asyncio.wait_for(
+                websocket.receive(), timeout=settings.MATCH_STREAM_IDLE_TIMEOUT_SECONDS
+            )
+            if message["type"] == "websocket.disconnect":
+                break
+
+            data = message.get("bytes")
+            if data is not None:
+                if len(data) > max_bytes:
+                    await websocket.send_json(
+                        {
+                            "type": "error",
+                            "detail": f"프레임 크기가 너무 큽니다: {len(data) / 1024:.0f}KB "
+                            f"(최대 {settings.MATCH_STREAM_MAX_FRAME_KB}KB)",
+                        }
+                    )
+                    continue
+                slot.put(data)
+                continue
+
+            try:
+                control = json.loads(message.get("text") or "")
+            except ValueError:
+                control = {}
+            if control.get("type") == "reset":
+                tracker.reset()
+            elif control.get("type") == "stop":
+                break
+    except asyncio.TimeoutError:
+        logger.info("   ⏱️  실시간 인식: 유휴 시간 초과로 종료")
+    except (WebSocketDisconnect, RuntimeError):
+        # 클라이언트 연결 끊김 (수신/오류 전송 중)
+        pass
+    finally:
+        slot.close()
+
+
+@router.websocket("/match/stream")
+async def match_artwork_stream(
+    websocket: WebSocket,
+    threshold: float = Query(0.7, ge=0.0, le=1.0, description="유사도 임계값"),
+    exhibition_id: Optional[int] = Query(None, description="전시 ID"),
+    visit_id: Optional[int] = Query(None, description="방문 기록 ID"),
+    ongoing_only: bool = Query(False, description="진행 중인 전시의 작품만 검색"),
+    consecutive: int = Query(
+        settings.MATCH_STREAM_CONSECUTIVE_FRAMES,
+        ge=1,
+        le=30,
+        description="확정에 필요한 연속 프레임 수",
+    ),
+    early_exit: bool = Query(True, description="첫 확정 후 세션 종료"),
+):
+    """
+    실시간 작품 인식 (WebSocket)
+
+    클라이언트는 축소한 카메라 프레임(JPEG 등)을 바이너리 메시지로 계속 보내고,
+    서버는 최신 프레임만 매칭하면서 (처리 중 밀린 프레임은 버림) 결과를 푸시합니다.
+
+    서버 → 클라이언트 (JSON):
+    - {"type": "ready"}: 세션 시작 (검색 범위 확인 완료)
+    - {"type": "frame"}: 프레임별 1위 후보 / 연속 횟수 / 버린 프레임 수
+    - {"type": "match"}: 같은 작품이 consecutive 프레임 연속 임계값 이상 (ArtworkMatchResponse 필드 포함)
+    - {"type": "error"}: 프레임 오류 (세션 유지) / 검색 범위 오류 (세션 종료)
+      - 매칭 수용 제어(HTTP 매칭과 같은 UUID별 빈도 / 동시 실행 제한)에 걸린 프레임은
+        status_code(429 / 503)와 retry_after(초)를 함께 보내고, 그동안 들어온 프레임은 최신 1개만 남김
+    - {"type": "done"}: 세션 종료 통계
+    """
+    await websocket.accept()
+    logger.info("=" * 60)
+    logger.info("📡 실시간 작품 인식 시작")
+    logger.info(f"   📊 요청 Threshold: {threshold}, 연속 프레임: {consecutive}")
+
+    # 검색 범위 결정 (세션 동안 고정)
+    db = SessionLocal()
+    try:
+        exhibition_ids = resolve_match_scope(
+            db,
+            exhibition_id=exhibition_id,
+            visit_id=visit_id,
+            ongoing_only=ongoing_only,
+        )
+    except HTTPException as e:
+        await websocket.send_json({"type": "error", "detail": e.detail})
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+    finally:
+        db.close()
+
+    slot = LatestFrameSlot()
+    tracker = ConsecutiveMatchTracker(consecutive)
+    processed = 0
+    # WebSocket은 MatchAdmissionMiddleware(HTTP POST 전용)를 거치지 않으므로 프레임마다 직접 수용 제어
+    admission = get_match_admission()
+    visitor_uuid = websocket.headers.get("x-user-uuid") or None
+    await websocket.send_json(
+        {"type": "ready", "threshold": threshold, "consecutive": tracker.required}
+    )
+
+    receiver = asyncio.create_task(receive_match_frames(websocket, slot, tracker))
+    try:
+        while True:
+            frame = await slot.get()
+            if frame is None:
+                break
+            frame_id, image_bytes = frame
+
+            try:
+                acquired = await admission.admit(visitor_uuid)
+            except AdmissionRejected as e:
+                logger.warning(
+                    f"🚦 실시간 인식 프레임 {frame_id} 거절 ({e.status_code}): {e.detail}"
+                )
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "frame": frame_id,
+                        "status_code": e.status_code,
+                        "detail": e.detail,
+                        "retry_after": e.retry_after,
+                    }
+                )
+                # 대기 중 들어온 프레임은 최신 1개만 남음 (LatestFrameSlot)
+                await asyncio.sleep(e.retry_after)
+                continue
+
+            # 프레임마다 짧은 세션 (긴 WebSocket 동안 커넥션을 잡고 있지 않도록)
+            db = SessionLocal()
+            try:
+                matched_artworks = await find_artwork_matches(
+                    image_bytes,
+                    threshold,
+                    db,
+                    exhibition_ids=exhibition_ids,
+                    deadline=Deadline.after(settings.MATCH_DEADLINE_SECONDS),
+                )
+            except HTTPException as e:
+                await websocket.send_json(
+                    {"type": "error", "frame": frame_id, "detail": e.detail}
+                )
+                continue
+            except Exception as e:
+                logger.warning(f"⚠️ 실시간 인식 프레임 {frame_id} 매칭 실패: {e}")
+                await websocket.send_json(
+                    {
+                        "type": "error",
+                        "frame": frame_id,
+                        "detail": f"프레임 매칭 중 오류가 발생했습니다: {str(e)}",
+                    }
+                )
+                continue
+            finally:
+                db.close()
+                if acquired:
+                    admission.release()
+
+            processed += 1
+            confirmed = tracker.update(matched_artworks)
+            top = matched_artworks[0] if matched_artworks else None
+            await websocket.send_json(
+                {
+                    "type": "frame",
+                    "frame": frame_id,
+                    "artwork_id": top["artwork_id"] if top else None,
+                    "similarity": top["similarity"] if top else None,
+                    "streak": tracker.streak,
+                    "dropped": slot.dropped,
+                }
+            )
+
+            if confirmed:
+                logger.info(
+                    f"   ✅ 실시간 인식 확정: {top['title']} "
+                    f"(ID: {top['artwork_id']}, 유사도: {top['similarity']:.4f}, "
+                    f"{tracker.streak}프레임 연속)"
+                )
+                response = ArtworkMatchResponse(
+                    matched=True,
+                    total_matches=len(matched_artworks),
+                    threshold=threshold,
+                    results=matched_artworks,
+                )
+                await websocket.send_json(
+                    {
+                        "type": "match",
+                        "frame": frame_id,
+                        "streak": tracker.streak,
+                        **jsonable_encoder(response),
+                    }
+                )
+                if early_exit:
+                    break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+
+    logger.info(
+        f"   📡 실시간 인식 종료: 수신 {slot.received}프레임, "
+        f"처리 {processed}, 버림 {slot.dropped}"
+    )
+    logger.info("=" * 60)
+
+    if websocket.client_state == WebSocketState.CONNECTED:
+        try:
+            await websocket.send_json(
+                {
+                    "type": "done",
+                    "received": slot.received,
+                    "processed": processed,
+                    "dropped": slot.dropped,
+                    "confirmed_artwork_id": tracker.confirmed,
+                }
+            )
+            await websocket.close()
+        except (WebSocketDisconnect, RuntimeError):
+            pass
+
+
+@router.get(
+    "/match/cache/stats",
+    response_model=ArtworkMatchCacheStats,
+    summary="작품 매칭 캐시 통계",
+    description="매칭 캐시 히트율과 절약한 임베딩(Lambda) 호출 수를 조회합니다. (관리자 전용, API Key 필요)",
+)
+def get_match_cache_stats(_: bool = Depends(verify_api_key)):
+    """매칭 캐시 + singleflight 통계 (워커 프로세스별 로컬 카운터)"""
+    return {
+        **get_match_cache().stats(),
+        "singleflight": match_embedding_flight.stats(),
+    }
+
+
+@router.get(
+    "/match/lambda/stats",
+    response_model=ArtworkMatchLambdaStats,
+    summary="임베딩 Lambda 호출 통계",
+    description="Lambda 호출의 콜드/웜 지연 시간, 워밍 스케줄러 상태, hedge / 서킷 브레이커 상태를 조회합니다. (관리자 전용, API Key 필요)",
+)
+def get_match_lambda_stats(_: bool = Depends(verify_api_key)):
+    """콜드/웜 지연 시간 + 워밍 상태 + 복원력 상태 (워커 프로세스별 로컬 카운터)"""
+    return {
+        **lambda_telemetry.stats(),
+        "warmer": get_lambda_warmer().stats(),
+        "backends": get_embedding_model_registry().backend_stats(),
+    }
+
+
+@router.get(
+    "/match/admission/stats",
+    response_model=ArtworkMatchAdmissionStats,
+    summary="작품 매칭 수용 제어 통계",
+    description="매칭 동시 실행 / 대기열 상태와 429·503으로 거절한 요청 수를 조회합니다. (관리자 전용, API Key 필요)",
+)
+def get_match_admission_stats(_: bool = Depends(verify_api_key)):
+    """동시 실행 제한 + UUID별 토큰 버킷 (워커 프로세스별 로컬 카운터)"""
+    return get_match_admission().stats()
@@ -13,17 +13,22 @@ from app.models.venue import Venue
 from app.schemas.exhibition import (
     ExhibitionCreate,
     ExhibitionDetail,
+    ExhibitionMatchBundle,
     ExhibitionResponse,
     ExhibitionUpdate,
 )
+from app.utils.embedding import get_artwork_embedding_index
+from app.utils.match_bundle import etag_matches, get_match_bundle_cache
 from app.utils.s3_client import s3_client
 from fastapi import (
     APIRouter,
     Depends,
     File,
     Form,
+    Header,
     HTTPException,
     Query,
+    Response,
     UploadFile,
     status,
 )
@@ -203,6 +208,61 @@ def get_exhibition(exhibition_id: int, db: Session = Depends(get_db)):
     return result
 
 
+@router.get(
+    "/{exhibition_id}/match-bundle",
+    response_model=ExhibitionMatchBundle,
+    summary="전시 오프라인 매칭 번들",
+    description=(
+        "전시 작품의 L2 정규화 임베딩(float16, base64)과 최소 메타데이터를 내려줍니다. "
+        "기기에서 네트워크 없이 최근접 탐색으로 작품을 인식할 때 사용합니다. "
+        "ETag / If-None-Match를 지원하며, 변경이 없으면 304를 반환합니다."
+    ),
+    responses={304: {"description": "번들 변경 없음 (If-None-Match 일치)"}},
+)
+def get_exhibition_match_bundle(
+    exhibition_id: int,
+    if_none_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db),
+):
+    """
+    전시 오프라인 매칭 번들
+
+    작품 / 작가 / 전시 구성 / 활성 임베딩 모델이 바뀐 전시만 다시 빌드하고,
+    그 외에는 캐시된 번들을 그대로 반환합니다.
+
+    Args:
+        exhibition_id: 전시 ID
+        if_none_match: 이전에 받은 번들의 ETag
+
+    Returns:
+        ExhibitionMatchBundle: 매칭 번들 (변경 없으면 304)
+
+    Raises:
+        404: 전시를 찾을 수 없음
+    """
+    exhibition = db.query(Exhibition.id).filter(Exhibition.id == exhibition_id).first()
+    if not exhibition:
+        logger.warning(f"전시 ID {exhibition_id} 찾을 수 없음")
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"전시 ID {exhibition_id}를 찾을 수 없습니다",
+        )
+
+    bundle = get_match_bundle_cache().get(db, exhibition_id)
+    # 기기는 캐시해 두고 매번 ETag로 재검증
+    headers = {"ETag": bundle.etag, "Cache-Control": "no-cache"}
+
+    if etag_matches(if_none_match, bundle.etag):
+        logger.info(f"📦 전시 {exhibition_id} 매칭 번들 변경 없음 (304)")
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    logger.info(
+        f"📦 전시 {exhibition_id} 매칭 번들 전송: 작품 {bundle.count}개 "
+        f"({len(bundle.body) / 1024:.1f}KB)"
+    )
+    return Response(content=bundle.body, media_type="application/json", headers=headers)
+
+
 @router.post(
     "",
     response_model=ExhibitionDetail,
@@ -328,6 +388,9 @@ async def create_exhibition(
                 detail="artwork_ids는 유효한 JSON 배열 문자열이어야 합니다",
             )
 
+    # 작품 매칭 인덱스의 전시 정보 재로드 예약
+    get_artwork_embedding_index().invalidate()
+
     logger.info(
         f"✅ 전시 생성 완료: '{title}' (ID: {new_exhibition.id}, 장소: {venue.name})"
     )
@@ -484,6 +547,9 @@ async def update_exhibition(
     db.commit()
     db.refresh(exhibition)
 
+    # 작품 매칭 인덱스의 전시 정보 재로드 예약
+    get_artwork_embedding_index().invalidate()
+
     logger.info(
         f"✅ 전시 수정 완료: '{exhibition.title}' (ID: {exhibition_id}, {', '.join(updated_fields) if updated_fields else '변경 없음'})"
     )
@@ -539,5 +605,8 @@ async def delete_exhibition(
     db.delete(exhibition)
     db.commit()
 
+    # 작품 매칭 인덱스의 전시 정보 재로드 예약
+    get_artwork_embedding_index().invalidate()
+
     logger.info(f"✅ 전시 삭제 완료: '{exhibition_title}' (ID: {exhibition_id})")
     return None
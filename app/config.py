@@ -22,12 +22,138 @@ class Settings(BaseSettings):
     AWS_REGION: str = "ap-northeast-2"
     AWS_LAMBDA_REGION: str
     S3_BUCKET_NAME: str
+    S3_MAX_POOL_CONNECTIONS: int = 20
 
     # HuggingFace
     HUGGINGFACE_TOKEN: str
 
     # Lambda
     LAMBDA_FUNCTION_NAME: str = "lastdance-embedding-generator"
+    LAMBDA_BATCH_SIZE: int = 16
+
+    # Lambda 워밍 (EMBEDDING_BACKEND=lambda일 때 API 프로세스에서 주기적으로 warmup 호출)
+    LAMBDA_WARMER_ENABLED: bool = True
+    LAMBDA_WARMER_INTERVAL_SECONDS: int = 240
+    LAMBDA_WARMER_MIN_CONCURRENCY: int = 1
+    LAMBDA_WARMER_MAX_CONCURRENCY: int = 5
+    # 운영 시간 중 진행 중인 전시 1개당 추가 웜 컨테이너 수
+    LAMBDA_WARMER_PER_EXHIBITION: float = 0.5
+    LAMBDA_WARMER_OPEN_HOUR: int = 10
+    LAMBDA_WARMER_CLOSE_HOUR: int = 20
+    LAMBDA_WARMER_UTC_OFFSET_HOURS: int = 9
+    LAMBDA_WARMER_HOLD_MS: int = 200
+
+    # 임베딩 백엔드 (lambda / huggingface / onnx)
+    EMBEDDING_BACKEND: str = "lambda"
+
+    # 임베딩 모델 버전 (EMBEDDING_BACKEND + LAMBDA_FUNCTION_NAME/ONNX_MODEL_PATH가 만드는 벡터 공간 이름)
+    EMBEDDING_MODEL_VERSION: str = "dinov2-small"
+    # 섀도 모델 (비어있으면 비활성): artworks.embedding_shadow를 채운 뒤 switch_embedding_model.py로 전환
+    SHADOW_EMBEDDING_MODEL_VERSION: str = ""
+    SHADOW_EMBEDDING_BACKEND: str = "lambda"
+    SHADOW_LAMBDA_FUNCTION_NAME: str = ""
+    SHADOW_ONNX_MODEL_PATH: str = ""
+    # DB의 활성/섀도 모델 확인 주기 (초)
+    EMBEDDING_MODEL_REFRESH_SECONDS: int = 30
+
+    # 로컬 ONNX 임베딩 (EMBEDDING_BACKEND=onnx)
+    ONNX_MODEL_PATH: str = "models/dinov2-small.onnx"
+    ONNX_NUM_WORKERS: int = 2
+    ONNX_INTRA_OP_THREADS: int = 1
+
+    # 임베딩 호출 복원력 (embedding_resilience.py)
+    # 매칭 요청 1건의 시간 예산 (초과 시 504, 임베딩 호출/재시도/대기 모두 이 안에서)
+    MATCH_DEADLINE_SECONDS: float = 12.0
+    # hedging: 첫 호출이 최근 지연 p{PERCENTILE}을 넘기면 같은 호출을 한 번 더 보내 먼저 온 결과 사용
+    EMBEDDING_HEDGE_ENABLED: bool = True
+    EMBEDDING_HEDGE_PERCENTILE: float = 95.0
+    EMBEDDING_HEDGE_MIN_MS: float = 200.0
+    # 지연 표본이 부족할 때 (프로세스 시작 직후) hedge 지연
+    EMBEDDING_HEDGE_DEFAULT_MS: float = 1500.0
+    # 서킷 브레이커: 최근 WINDOW번 중 실패/지연(SLOW_MS 초과) 비율이 FAILURE_RATE 이상이면 OPEN_SECONDS 동안 차단
+    EMBEDDING_BREAKER_WINDOW: int = 20
+    EMBEDDING_BREAKER_MIN_CALLS: int = 5
+    EMBEDDING_BREAKER_FAILURE_RATE: float = 0.5
+    EMBEDDING_BREAKER_SLOW_MS: float = 8000.0
+    EMBEDDING_BREAKER_OPEN_SECONDS: float = 30.0
+    # 차단/실패 시 보조 백엔드 (lambda / onnx, 비어있으면 즉시 503)
+    # 같은 벡터 공간을 보장하는 lambda ↔ onnx만 허용 (huggingface는 주/보조 어느 쪽이든 사용 안 함)
+    EMBEDDING_FALLBACK_BACKEND: str = ""
+
+    # Lambda 호출 타임아웃 (boto3 기본값: 연결 60초 / 읽기 60초 / 재시도 포함 수 분)
+    LAMBDA_CONNECT_TIMEOUT_SECONDS: float = 2.0
+    LAMBDA_READ_TIMEOUT_SECONDS: float = 30.0
+    LAMBDA_MAX_ATTEMPTS: int = 2
+
+    # 작품 매칭 인메모리 인덱스 (비활성화 시 pgvector 검색)
+    EMBEDDING_INDEX_ENABLED: bool = True
+    EMBEDDING_INDEX_REFRESH_SECONDS: int = 30
+    # 차원 축소 후보 검색 (fit_embedding_projection.py로 만든 npz, 빈 값이면 전체 차원 검색)
+    # 후보가 MIN_ROWS개 이상일 때 축소 공간에서 CANDIDATES개를 고른 뒤 384차원으로 rescoring
+    EMBEDDING_PROJECTION_PATH: str = ""
+    EMBEDDING_PROJECTION_MIN_ROWS: int = 2000
+    EMBEDDING_PROJECTION_CANDIDATES: int = 128
+
+    # pgvector ANN 인덱스 (hnsw / ivfflat)
+    VECTOR_INDEX_TYPE: str = "hnsw"
+    HNSW_M: int = 16
+    HNSW_EF_CONSTRUCTION: int = 64
+    HNSW_EF_SEARCH: int = 40
+    IVFFLAT_PROBES: int = 10
+    # 인덱스 양자화 (none / halfvec / binary, pgvector 0.7+, 변경 후 rebuild_vector_index.py로 재빌드)
+    # 양자화 거리로 top_k x VECTOR_RESCORE_FACTOR개 후보를 뽑아 float32 원본으로 다시 정렬
+    VECTOR_INDEX_QUANTIZATION: str = "none"
+    VECTOR_RESCORE_FACTOR: int = 4
+
+    # 작품 매칭 캐시 (dHash → 임베딩, 반복 촬영 시 임베딩 생성 생략)
+    MATCH_CACHE_ENABLED: bool = True
+    MATCH_CACHE_MAX_ENTRIES: int = 1024
+    MATCH_CACHE_TTL_SECONDS: int = 600
+    MATCH_CACHE_MAX_DISTANCE: int = 3
+    MATCH_CACHE_SHARED: bool = False
+
+    # 임베딩 작업 큐 (False면 API 프로세스의 BackgroundTasks로 처리)
+    EMBEDDING_JOBS_ENABLED: bool = True
+    EMBEDDING_WORKER_CONCURRENCY: int = 4
+    EMBEDDING_WORKER_POLL_SECONDS: float = 5.0
+    EMBEDDING_JOB_MAX_ATTEMPTS: int = 5
+    EMBEDDING_JOB_BACKOFF_SECONDS: int = 10
+    EMBEDDING_JOB_BACKOFF_MAX_SECONDS: int = 600
+    EMBEDDING_JOB_LOCK_TIMEOUT_SECONDS: int = 600
+    # 업로드 시 리사이즈한 이미지를 작업에 함께 저장 (워커가 S3에서 다시 받지 않음, 초과 시 S3에서 읽음)
+    EMBEDDING_JOB_MAX_IMAGE_BYTES: int = 1_048_576
+    # 끝난 작업 보관 기간 (일, 워커가 주기적으로 삭제, 0이면 삭제 안 함)
+    EMBEDDING_JOB_DONE_RETENTION_DAYS: int = 7
+    EMBEDDING_JOB_FAILED_RETENTION_DAYS: int = 30
+
+    # 작품 매칭 업로드 최대 크기 (MB, ASGI 레벨에서 스트리밍 중 제한)
+    MATCH_MAX_UPLOAD_MB: int = 50
+    # 여러 장 매칭 (POST /artworks/match/batch) 최대 사진 수
+    MATCH_BATCH_MAX_IMAGES: int = 5
+
+    # 작품 매칭 수용 제어 (POST /artworks/match*, 워커 프로세스별)
+    # 동시 실행 MAX_CONCURRENT개 + 대기열 MAX_QUEUE개, 대기열이 차거나 QUEUE_TIMEOUT 초과 시 503 (0이면 비활성)
+    MATCH_MAX_CONCURRENT: int = 8
+    MATCH_MAX_QUEUE: int = 16
+    MATCH_QUEUE_TIMEOUT_SECONDS: float = 2.0
+    # 관람객 UUID(X-User-UUID)별 토큰 버킷: 초당 RATE개, 최대 BURST개, 초과 시 429 (0이면 비활성)
+    MATCH_RATE_PER_UUID: float = 0.0
+    MATCH_BURST_PER_UUID: int = 5
+    MATCH_RATE_MAX_UUIDS: int = 10000
+
+    # 실시간 작품 인식 (WebSocket /artworks/match/stream)
+    # 같은 작품이 K프레임 연속 1위일 때 확정, 프레임은 축소 이미지 기준 크기 제한
+    MATCH_STREAM_CONSECUTIVE_FRAMES: int = 3
+    MATCH_STREAM_MAX_FRAME_KB: int = 512
+    MATCH_STREAM_IDLE_TIMEOUT_SECONDS: float = 30.0
+
+    # 전시별 오프라인 매칭 번들 (GET /exhibitions/{id}/match-bundle) 캐시 전시 수
+    MATCH_BUNDLE_CACHE_SIZE: int = 32
+
+    # 이미지 전처리 프로세스 풀
+    IMAGE_PROCESS_WORKERS: int = 2
+    IMAGE_PROCESS_MAX_PENDING: int = 16
+    IMAGE_MAX_PIXELS: int = 50_000_000
 
     ENVIRONMENT: str = "local"
 
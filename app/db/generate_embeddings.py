@@ -3,15 +3,15 @@
 """
 
 import base64
-import io
 import logging
 
-from PIL import Image
 import requests
-from sqlalchemy import text
 
+from app.config import settings
 from app.database import SessionLocal
 from app.models.artwork import Artwork
+from app.utils.embedding_utils import save_artwork_embedding
+from app.utils.image_processing import preprocess_image_bytes
 from app.utils.lambda_client import lambda_client
 
 logging.basicConfig(level=logging.INFO)
@@ -37,7 +37,7 @@ def download_image_as_base64(url: str) -> str:
 
 def resize_base64_image(base64_string: str, max_size: int = 800) -> str:
     """
-    base64 이미지 리사이즈
+    base64 이미지 리사이즈 (공용 이미지 전처리 엔진 사용)
 
     Args:
         base64_string: base64 인코딩된 이미지
@@ -47,34 +47,21 @@ def resize_base64_image(base64_string: str, max_size: int = 800) -> str:
         str: 리사이즈된 base64 이미지
     """
     try:
-        # base64 → 이미지
         image_data = base64.b64decode(base64_string)
-        image = Image.open(io.BytesIO(image_data))
-
-        # RGB로 변환
-        if image.mode in ("RGBA", "LA", "P"):
-            image = image.convert("RGB")
-
-        # 현재 크기
-        width, height = image.size
-
-        # 리사이즈 필요한지 확인
-        if width > max_size or height > max_size:
-            # 비율 유지하며 리사이즈
-            image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        resized = preprocess_image_bytes(
+            image_data, max_size=max_size, max_pixels=settings.IMAGE_MAX_PIXELS
+        )
 
-            # 이미지 → base64
-            buffer = io.BytesIO()
-            image.save(buffer, format="JPEG", quality=85, optimize=True)
-            resized_base64 = base64.b64encode(buffer.getvalue()).decode()
+        if resized is image_data:
+            return base64_string
 
-            size_before = len(base64_string) / 1024 / 1024
-            size_after = len(resized_base64) / 1024 / 1024
-            logger.info(f"리사이즈: {size_before:.2f}MB → {size_after:.2f}MB")
+        resized_base64 = base64.b64encode(resized).decode()
 
-            return resized_base64
+        size_before = len(base64_string) / 1024 / 1024
+        size_after = len(resized_base64) / 1024 / 1024
+        logger.info(f"리사이즈: {size_before:.2f}MB → {size_after:.2f}MB")
 
-        return base64_string
+        return resized_base64
 
     except Exception as e:
         logger.error(f"이미지 리사이즈 실패: {e}, 원본 사용")
@@ -117,16 +104,11 @@ def generate_all_embeddings():
                 logger.info(f"임베딩 생성 완료: {len(embedding)}차원")
 
                 # 4. DB 저장 (raw SQL 사용)
-                db.execute(
-                    text(
-                        """
-                        UPDATE artworks 
-                        SET embedding = CAST(:embedding AS vector), 
-                            updated_at = now() 
-                        WHERE id = :id
-                    """
-                    ),
-                    {"embedding": str(embedding), "id": artwork.id},
+                save_artwork_embedding(
+                    db,
+                    artwork.id,
+                    embedding,
+                    model_version=settings.EMBEDDING_MODEL_VERSION,
                 )
                 db.commit()
 
@@ -2,7 +2,14 @@ import logging
 
 from app.api.v1 import api_router
 from app.config import settings
+from app.database import SessionLocal
+from app.middleware.admission import MatchAdmissionMiddleware
+from app.middleware.body_limit import BodySizeLimitMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.utils.admission import get_match_admission
+from app.utils.embedding import get_artwork_embedding_index
+from app.utils.image_processing import get_image_preprocessor
+from app.utils.lambda_warmer import get_lambda_warmer
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -36,9 +43,68 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 매칭 업로드 크기 제한 (엔드포인트가 Body를 버퍼링하기 전에 차단)
+# JSON 요청의 base64 문자열 외 필드를 위해 여유분 64KB 허용
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.MATCH_MAX_UPLOAD_MB * 1024 * 1024 + 64 * 1024,
+    path_prefixes=[f"{settings.API_V1_PREFIX}/artworks/match"],
+)
+
+# 매칭 요청 수용 제어 (Body 수신 전에 429 / 503으로 거절, 카탈로그 API 응답성 유지)
+app.add_middleware(
+    MatchAdmissionMiddleware,
+    admission=get_match_admission(),
+    path_prefixes=[f"{settings.API_V1_PREFIX}/artworks/match"],
+)
+
 app.add_middleware(LoggingMiddleware)
 
 
+@app.on_event("startup")
+def load_embedding_index():
+    """
+    작품 임베딩 인메모리 인덱스 로드 (실패 시 pgvector 검색으로 동작)
+    """
+    if not settings.EMBEDDING_INDEX_ENABLED:
+        return
+
+    db = SessionLocal()
+    try:
+        get_artwork_embedding_index().load(db)
+    except Exception as e:
+        logging.getLogger(__name__).warning(
+            f"⚠️ 임베딩 인덱스 로드 실패 (pgvector 검색 사용): {e}"
+        )
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def start_lambda_warmer():
+    """
+    Lambda 워밍 시작 (유휴 후 첫 매칭 요청의 콜드 스타트 방지)
+    """
+    if settings.LAMBDA_WARMER_ENABLED and settings.EMBEDDING_BACKEND == "lambda":
+        get_lambda_warmer().start()
+
+
+@app.on_event("shutdown")
+def stop_lambda_warmer():
+    """
+    Lambda 워밍 종료
+    """
+    get_lambda_warmer().stop()
+
+
+@app.on_event("shutdown")
+def shutdown_image_preprocessor():
+    """
+    이미지 전처리 프로세스 풀 종료
+    """
+    get_image_preprocessor().shutdown()
+
+
 # 헬스체크 엔드포인트
 @app.get("/health", tags=["Health"])
 async def health_check():
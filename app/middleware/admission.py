@@ -0,0 +1,69 @@
+import json
+import logging
+from typing import Iterable
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.admission import AdmissionRejected, MatchAdmission
+
+logger = logging.getLogger(__name__)
+
+
+class MatchAdmissionMiddleware:
+    """
+    지정 경로의 POST 요청 수용 제어 미들웨어 (작품 매칭)
+
+    - Body를 읽기 전에 판단하므로 거절된 요청은 업로드 / 디코딩 비용이 들지 않음
+    - 관람객 UUID(X-User-UUID 헤더)별 토큰 버킷 초과 시 429, 동시 실행 / 대기열 초과 시 503
+    - 거절 응답에 Retry-After 헤더 포함
+    """
+
+    def __init__(
+        self, app: ASGIApp, admission: MatchAdmission, path_prefixes: Iterable[str]
+    ):
+        self.app = app
+        self.admission = admission
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(self.path_prefixes)
+            or not self.admission.enabled
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        visitor_uuid = headers.get(b"x-user-uuid", b"").decode("latin-1") or None
+
+        try:
+            acquired = await self.admission.admit(visitor_uuid)
+        except AdmissionRejected as e:
+            await self._send_rejected(send, e)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if acquired:
+                self.admission.release()
+
+    async def _send_rejected(self, send: Send, rejected: AdmissionRejected) -> None:
+        """429 / 503 응답 전송"""
+        logger.warning(f"🚦 매칭 요청 거절 ({rejected.status_code}): {rejected.detail}")
+
+        body = json.dumps({"detail": rejected.detail}, ensure_ascii=False).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": rejected.status_code,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(rejected.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,99 @@
+import json
+import logging
+from typing import Iterable
+
+from fastapi import HTTPException
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class _BodyTooLarge(HTTPException):
+    """
+    스트리밍 중 Body 크기 초과
+
+    HTTPException이므로 엔드포인트의 Body 파싱 중 발생해도 413으로 응답됨
+    """
+
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            status_code=413,
+            detail=f"이미지 크기가 너무 큽니다 (최대 {max_bytes / 1024 / 1024:.0f}MB)",
+        )
+
+
+class BodySizeLimitMiddleware:
+    """
+    지정 경로의 Request Body 크기를 ASGI 레벨에서 제한하는 미들웨어
+
+    - Content-Length 헤더가 제한을 넘으면 Body를 읽기 전에 즉시 413 응답
+    - Content-Length가 없거나(chunked) 거짓이면 수신한 바이트를 세다가 초과 시 중단
+    """
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_prefixes: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_prefixes = tuple(path_prefixes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefixes):
+            await self.app(scope, receive, send)
+            return
+
+        # 1. Content-Length 선검사
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length is not None:
+            try:
+                if int(content_length) > self.max_bytes:
+                    await self._send_too_large(send, int(content_length))
+                    return
+            except ValueError:
+                pass
+
+        # 2. 스트리밍 수신 바이트 카운트
+        received = 0
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    raise _BodyTooLarge(self.max_bytes)
+            return message
+
+        async def tracked_send(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracked_send)
+        except _BodyTooLarge:
+            if response_started:
+                raise
+            await self._send_too_large(send, received)
+
+    async def _send_too_large(self, send: Send, size: int) -> None:
+        """413 응답 전송"""
+        max_mb = self.max_bytes / 1024 / 1024
+        logger.warning(f"Request Body 크기 초과: {size / 1024 / 1024:.2f}MB")
+
+        body = json.dumps(
+            {"detail": f"이미지 크기가 너무 큽니다 (최대 {max_mb:.0f}MB)"},
+            ensure_ascii=False,
+        ).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -2,10 +2,11 @@ from datetime import datetime
 import json
 import logging
 import time
-from typing import Callable
+from typing import Callable, List, Tuple
 from zoneinfo import ZoneInfo
 
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import Message
 
 from fastapi import Request, Response
 
@@ -30,6 +31,9 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         "x-user-uuid",
     }
 
+    # 이보다 큰 JSON Body는 읽지 않음 (base64 이미지 버퍼링/파싱 방지)
+    MAX_LOGGED_BODY_BYTES = 64 * 1024
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         # 한국 시간
         kst = ZoneInfo("Asia/Seoul")
@@ -43,19 +47,30 @@ class LoggingMiddleware(BaseHTTPMiddleware):
         if request.method in ["POST", "PUT", "PATCH"]:
             try:
                 content_type = request.headers.get("content-type", "")
+                content_length = int(request.headers.get("content-length") or 0)
                 if "multipart/form-data" in content_type:
                     logger.info("   Body: <multipart/form-data - file upload>")
                     body = None
+                elif "application/json" not in content_type:
+                    # 바이너리 업로드 (이미지 등)는 버퍼링하지 않고 그대로 스트리밍
+                    logger.info(
+                        f"   Body: <{content_type or 'unknown'} - {content_length} bytes>"
+                    )
+                    body = None
+                elif content_length > self.MAX_LOGGED_BODY_BYTES:
+                    # 큰 JSON (base64 이미지 등)은 파싱하지 않고 크기만 표시
+                    logger.info(f"   Body: <application/json - {content_length} bytes>")
+                    body = None
                 else:
-                    body_bytes = await request.body()
-                    if body_bytes:
+                    # Content-Length가 없는(chunked) 요청도 제한까지만 읽음
+                    # (큰 Body를 여기서 전부 버퍼링하면 BodySizeLimitMiddleware가 막기 전에 메모리에 올라감)
+                    body_bytes, complete = await self._read_body_prefix(request)
+                    if not complete:
+                        logger.info(
+                            f"   Body: <application/json - {self.MAX_LOGGED_BODY_BYTES} bytes 초과>"
+                        )
+                    elif body_bytes:
                         body = json.loads(body_bytes.decode())
-
-                    # Body를 다시 읽을 수 있도록 설정
-                    async def receive():
-                        return {"type": "http.request", "body": body_bytes}
-
-                    request._receive = receive
             except Exception as e:
                 logger.warning(f"Request Body 읽기 실패: {e}")
                 body = None
@@ -119,6 +134,44 @@ class LoggingMiddleware(BaseHTTPMiddleware):
             logger.debug("상세 에러:", exc_info=True)
             raise
 
+    async def _read_body_prefix(self, request: Request) -> Tuple[bytes, bool]:
+        """
+        Request Body를 MAX_LOGGED_BODY_BYTES까지만 수신
+
+        읽은 메시지는 엔드포인트가 처음부터 다시 받도록 되돌려 놓고,
+        나머지는 원래 스트림에서 그대로 이어서 받습니다.
+
+        Returns:
+            Tuple[bytes, bool]: (읽은 바이트, Body 전체를 읽었는지)
+        """
+        receive = request._receive
+        messages: List[Message] = []
+        chunks: List[bytes] = []
+        size = 0
+        complete = False
+
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            if not message.get("more_body", False):
+                complete = True
+                break
+            if size > self.MAX_LOGGED_BODY_BYTES:
+                break
+
+        async def replay() -> Message:
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        request._receive = replay
+        return b"".join(chunks), complete
+
     def _mask_sensitive_headers(self, headers: dict) -> dict:
         """민감한 헤더 마스킹"""
         masked = {}
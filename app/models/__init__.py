@@ -3,6 +3,8 @@ from app.models.artist_reaction_emoji import ArtistReactionEmoji
 from app.models.artist_reaction_message import ArtistReactionMessage
 from app.models.artwork import Artwork
 from app.models.device import Device
+from app.models.embedding_job import EmbeddingJob
+from app.models.embedding_model import EmbeddingModel
 from app.models.exhibition import Exhibition, exhibition_artworks
 from app.models.invitation import Invitation
 from app.models.notification import Notification
@@ -30,4 +32,6 @@ __all__ = [
     "ArtistReactionMessage",
     "Invitation",
     "Notification",
+    "EmbeddingJob",
+    "EmbeddingModel",
 ]
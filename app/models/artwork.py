@@ -19,7 +19,18 @@ class Artwork(Base):
     description = Column(String, nullable=True)
     year = Column(Integer, nullable=True)
     thumbnail_url = Column(String, nullable=True)
+    # 현재 썸네일 이미지의 SHA-256 (같은 파일 재업로드 판별)
+    thumbnail_content_hash = Column(String(64), nullable=True)
     embedding = Column(Vector(384), nullable=True)
+    # 임베딩을 만든 이미지의 SHA-256 (같은 이미지면 재생성 생략/다른 작품 임베딩 재사용)
+    embedding_content_hash = Column(String(64), nullable=True, index=True)
+    # 임베딩을 만든 모델 버전 (embedding_models.version)
+    embedding_model = Column(String(64), nullable=True)
+
+    # 섀도 임베딩 (전환 전 새 모델로 백그라운드에서 채움, 전환 후에는 이전 모델 → 되돌리기용)
+    embedding_shadow = Column(Vector(384), nullable=True)
+    embedding_shadow_content_hash = Column(String(64), nullable=True, index=True)
+    embedding_shadow_model = Column(String(64), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -0,0 +1,99 @@
+"""
+EmbeddingJob Model
+작품 임베딩 생성 작업 큐
+"""
+
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class EmbeddingJob(Base):
+    """
+    작품 임베딩 생성 작업
+
+    API는 INSERT 한 번으로 작업을 등록하고, 별도 워커 프로세스(app/workers/embedding_worker.py)가
+    SELECT ... FOR UPDATE SKIP LOCKED로 작업을 가져가 처리합니다.
+
+    Attributes:
+        id: 작업 ID
+        artwork_id: 작품 ID
+        thumbnail_url: 임베딩을 만들 썸네일 URL
+        content_hash: 썸네일 SHA-256 (임베딩 저장 시 함께 기록)
+        image_data: 업로드 시 리사이즈한 이미지 (없으면 S3에서 읽음, 완료 시 비움)
+        status: 작업 상태 ("pending", "running", "done", "failed")
+        attempts: 시도 횟수
+        max_attempts: 최대 시도 횟수
+        last_error: 마지막 오류 메시지
+        run_after: 이 시각 이후 실행 (재시도 backoff)
+        locked_at: 워커가 가져간 시각 (오래된 running 작업 회수용)
+        created_at: 생성일시
+        updated_at: 수정일시
+    """
+
+    __tablename__ = "embedding_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    artwork_id = Column(
+        Integer, ForeignKey("artworks.id", ondelete="CASCADE"), nullable=False
+    )
+    thumbnail_url = Column(String, nullable=False)
+    content_hash = Column(String(64), nullable=True)
+    image_data = Column(LargeBinary, nullable=True)
+
+    status = Column(String(20), nullable=False, server_default="pending")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    max_attempts = Column(Integer, nullable=False, server_default="5")
+    last_error = Column(Text, nullable=True)
+
+    run_after = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    locked_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('pending', 'running', 'done', 'failed')",
+            name="ck_embedding_job_status",
+        ),
+        # 작업 가져오기: 실행 가능한 pending 작업만 (부분 인덱스)
+        Index(
+            "ix_embedding_jobs_pending",
+            "run_after",
+            "id",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        # 작품당 대기 작업은 하나 (중복 등록 시 ON CONFLICT로 합치기)
+        Index(
+            "uq_embedding_jobs_pending_artwork",
+            "artwork_id",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<EmbeddingJob(id={self.id}, artwork_id={self.artwork_id}, status={self.status}, attempts={self.attempts})>"
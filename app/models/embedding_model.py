@@ -0,0 +1,69 @@
+"""
+EmbeddingModel Model
+작품 임베딩 모델 버전
+"""
+
+from sqlalchemy import (
+    CheckConstraint,
+    Column,
+    DateTime,
+    Index,
+    Integer,
+    String,
+    Text,
+    text,
+)
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class EmbeddingModel(Base):
+    """
+    작품 임베딩 모델 버전
+
+    artworks.embedding은 active 모델, artworks.embedding_shadow는 shadow 모델의 벡터 공간입니다.
+    전환(app/utils/switch_embedding_model.py) 시 두 컬럼과 상태를 한 트랜잭션에서 맞바꿉니다.
+
+    Attributes:
+        id: 모델 ID
+        version: 버전 이름 (EMBEDDING_MODEL_VERSION / SHADOW_EMBEDDING_MODEL_VERSION)
+        backend: 임베딩 백엔드 (lambda / huggingface / onnx)
+        dimension: 임베딩 차원
+        description: 모델/전처리 설명
+        status: 상태 ("active", "shadow", "retired")
+        created_at: 등록일시
+        activated_at: 마지막 활성화 일시
+    """
+
+    __tablename__ = "embedding_models"
+
+    id = Column(Integer, primary_key=True, index=True)
+    version = Column(String(64), nullable=False, unique=True)
+    backend = Column(String(20), nullable=False)
+    dimension = Column(Integer, nullable=False, server_default="384")
+    description = Column(Text, nullable=True)
+    status = Column(String(20), nullable=False, server_default="shadow")
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    activated_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Constraints
+    __table_args__ = (
+        CheckConstraint(
+            "status IN ('active', 'shadow', 'retired')",
+            name="ck_embedding_model_status",
+        ),
+        # active / shadow는 각각 최대 하나
+        Index(
+            "uq_embedding_models_status",
+            "status",
+            unique=True,
+            postgresql_where=text("status IN ('active', 'shadow')"),
+        ),
+    )
+
+    def __repr__(self):
+        return f"<EmbeddingModel(version={self.version}, backend={self.backend}, status={self.status})>"
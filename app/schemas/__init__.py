@@ -8,6 +8,9 @@ from app.schemas.artist import ArtistCreate, ArtistResponse, ArtistUpdate
 
 # 5️⃣ Artwork (ExhibitionSummary 사용)
 from app.schemas.artwork import (
+    ArtworkBatchMatchRequest,
+    ArtworkBatchMatchResponse,
+    ArtworkBatchMatchResult,
     ArtworkCreate,
     ArtworkDetail,
     ArtworkMatchRequest,
@@ -23,9 +26,11 @@ from app.schemas.exhibition import (
     ArtworkSummary,
     ExhibitionCreate,
     ExhibitionDetail,
+    ExhibitionMatchBundle,
     ExhibitionResponse,
     ExhibitionSummary,
     ExhibitionUpdate,
+    MatchBundleArtwork,
 )
 
 # 7️⃣ Reaction (ReactionSummary 포함)
@@ -101,6 +106,8 @@ __all__ = [
     "ExhibitionResponse",
     "ExhibitionDetail",
     "ExhibitionSummary",
+    "ExhibitionMatchBundle",
+    "MatchBundleArtwork",
     "ArtworkSummary",
     "ArtistSummary",
     # Artwork
@@ -109,6 +116,9 @@ __all__ = [
     "ArtworkResponse",
     "ArtworkDetail",
     "ArtworkMatchRequest",
+    "ArtworkBatchMatchRequest",
+    "ArtworkBatchMatchResponse",
+    "ArtworkBatchMatchResult",
     "ArtworkMatchResult",
     "ArtworkMatchResponse",
     # VisitHistory
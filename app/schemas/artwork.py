@@ -3,7 +3,7 @@ Artwork Schemas
 """
 
 from datetime import datetime
-from typing import TYPE_CHECKING, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -38,10 +38,37 @@ class ArtworkUpdate(BaseModel):
 
 
 class ArtworkMatchRequest(BaseModel):
-    """작품 매칭 요청 (전체 작품 대상)"""
+    """작품 매칭 요청 (기본: 전체 작품 대상, 전시 범위 지정 가능)"""
 
     image_base64: str = Field(..., description="Base64 인코딩된 이미지")
     threshold: float = Field(0.7, ge=0.0, le=1.0, description="유사도 임계값")
+    visit_id: Optional[int] = Field(
+        None, description="방문 기록 ID (해당 방문 전시의 작품만 검색)"
+    )
+    exhibition_id: Optional[int] = Field(
+        None, description="전시 ID (해당 전시의 작품만 검색, visit_id보다 우선)"
+    )
+    ongoing_only: bool = Field(False, description="진행 중인 전시의 작품만 검색")
+
+
+class ArtworkBatchMatchRequest(BaseModel):
+    """작품 매칭 요청 (같은 작품을 여러 장 촬영, 임베딩 1회 배치 호출)"""
+
+    images_base64: List[str] = Field(
+        ..., min_length=1, description="Base64 인코딩된 이미지 목록 (같은 작품)"
+    )
+    threshold: float = Field(0.7, ge=0.0, le=1.0, description="유사도 임계값")
+    fusion: Literal["max", "mean"] = Field(
+        "max",
+        description="작품별 사진 유사도 합치기 (max: 가장 잘 찍힌 사진 기준, mean: 전체 평균)",
+    )
+    visit_id: Optional[int] = Field(
+        None, description="방문 기록 ID (해당 방문 전시의 작품만 검색)"
+    )
+    exhibition_id: Optional[int] = Field(
+        None, description="전시 ID (해당 전시의 작품만 검색, visit_id보다 우선)"
+    )
+    ongoing_only: bool = Field(False, description="진행 중인 전시의 작품만 검색")
 
 
 # ============================================================================
@@ -108,3 +135,86 @@ class ArtworkMatchResponse(BaseModel):
     total_matches: int = Field(..., description="전체 매칭 개수")
     threshold: float = Field(..., description="사용된 임계값")
     results: List[ArtworkMatchResult] = Field(..., description="매칭 결과 목록")
+
+
+class ArtworkBatchMatchResult(ArtworkMatchResult):
+    """작품 매칭 결과 (여러 장)"""
+
+    image_similarities: List[float] = Field(
+        ..., description="사진별 유사도 (요청 순서)"
+    )
+
+
+class ArtworkBatchMatchResponse(BaseModel):
+    """작품 매칭 응답 (여러 장)"""
+
+    matched: bool = Field(..., description="매칭 성공 여부")
+    total_matches: int = Field(..., description="전체 매칭 개수")
+    threshold: float = Field(..., description="사용된 임계값")
+    fusion: str = Field(..., description="사용된 유사도 합치기 방식")
+    image_count: int = Field(..., description="요청 사진 수")
+    results: List[ArtworkBatchMatchResult] = Field(
+        ..., description="매칭 결과 목록 (합친 유사도 내림차순)"
+    )
+
+
+class ArtworkMatchCacheStats(BaseModel):
+    """작품 매칭 캐시 통계"""
+
+    hits: int = Field(..., description="전체 히트 수 (= 절약한 임베딩 호출 수)")
+    exact_hits: int = Field(..., description="dHash 완전 일치 히트")
+    near_hits: int = Field(..., description="해밍 거리 근접 히트")
+    shared_hits: int = Field(..., description="공유 캐시(DB) 히트")
+    misses: int = Field(..., description="미스 수")
+    lookups: int = Field(..., description="전체 조회 수")
+    hit_rate: float = Field(..., description="히트율 (0~1)")
+    embedding_calls_saved: int = Field(..., description="절약한 임베딩(Lambda) 호출 수")
+    evictions: int = Field(..., description="LRU 제거 수")
+    expirations: int = Field(..., description="TTL 만료 제거 수")
+    shared_errors: int = Field(..., description="공유 캐시 오류 수")
+    entries: int = Field(..., description="현재 로컬 항목 수")
+    max_entries: int = Field(..., description="로컬 최대 항목 수")
+    ttl_seconds: int = Field(..., description="항목 유효 시간 (초)")
+    max_distance: int = Field(..., description="근접 판정 최대 해밍 거리")
+    shared: bool = Field(..., description="공유 캐시 사용 여부")
+    embedding_model_version: Optional[str] = Field(
+        None, description="로컬 항목을 만든 임베딩 모델 버전"
+    )
+    singleflight: Dict[str, float] = Field(
+        ...,
+        description="동시 중복 요청 합치기 통계 (executions / coalesced / in_flight)",
+    )
+
+
+class ArtworkMatchAdmissionStats(BaseModel):
+    """작품 매칭 수용 제어 통계"""
+
+    concurrency: Optional[Dict[str, float]] = Field(
+        None,
+        description="동시 실행 제한 (active / waiting / admitted / queued / rejected_*, 비활성 시 null)",
+    )
+    rate_limit: Optional[Dict[str, float]] = Field(
+        None,
+        description="관람객 UUID별 토큰 버킷 (tracked_keys / allowed / limited, 비활성 시 null)",
+    )
+
+
+class ArtworkMatchLambdaStats(BaseModel):
+    """임베딩 Lambda 호출 통계 (콜드/웜)"""
+
+    invocations: int = Field(..., description="전체 호출 수")
+    cold_rate: float = Field(..., description="콜드 스타트 비율 (0~1)")
+    by_kind: Dict[str, Dict[str, int]] = Field(
+        ..., description="호출 종류(single / batch / warmup)별 cold / warm / unknown 수"
+    )
+    latency_ms: Dict[str, Dict[str, Any]] = Field(
+        ..., description="cold / warm / unknown별 호출 수와 지연 시간 p50 / p99 (ms)"
+    )
+    last_cold_start: Optional[Dict[str, Any]] = Field(
+        None, description="마지막 콜드 스타트 (시각, 지연 시간, init / 모델 로드 시간)"
+    )
+    warmer: Dict[str, Any] = Field(..., description="워밍 스케줄러 상태")
+    backends: Dict[str, Dict[str, Any]] = Field(
+        ...,
+        description="모델 버전별 매칭 임베딩 복원력 상태 (hedge / 보조 백엔드 / 서킷 브레이커)",
+    )
@@ -124,3 +124,34 @@ class ExhibitionDetail(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class MatchBundleArtwork(BaseModel):
+    """오프라인 매칭 번들 작품 메타데이터"""
+
+    artwork_id: int = Field(..., description="작품 ID")
+    title: str = Field(..., description="작품 제목")
+    artist_name: str = Field(..., description="작가 이름")
+    thumbnail_url: Optional[str] = Field(None, description="썸네일 URL")
+
+
+class ExhibitionMatchBundle(BaseModel):
+    """전시 오프라인 매칭 번들 (기기 내 최근접 탐색용)"""
+
+    exhibition_id: int = Field(..., description="전시 ID")
+    version: str = Field(..., description="번들 버전 (ETag와 동일)")
+    format: int = Field(..., description="번들 형식 버전")
+    embedding_model_version: str = Field(
+        ..., description="임베딩 모델 버전 (기기 내 모델과 같아야 비교 가능)"
+    )
+    dimension: int = Field(..., description="임베딩 차원")
+    dtype: str = Field(..., description="임베딩 값 형식 (float16, little-endian)")
+    count: int = Field(..., description="작품 수")
+    generated_at: datetime = Field(..., description="생성일시")
+    artworks: List[MatchBundleArtwork] = Field(
+        ..., description="작품 목록 (embeddings 행 순서와 동일)"
+    )
+    embeddings: str = Field(
+        ...,
+        description="L2 정규화 임베딩 (count x dimension float16 행 우선) base64",
+    )
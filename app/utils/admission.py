@@ -0,0 +1,234 @@
+"""
+작품 매칭 요청 수용 제어 (load shedding)
+
+매칭은 이미지 디코딩 / 리사이즈 / Lambda / 벡터 검색을 모두 거치는 가장 비싼 요청입니다.
+전시 오픈 때처럼 매칭이 몰려도 다른 API가 응답하고 Lambda 비용이 상한을 넘지 않도록
+워커 프로세스별로 동시에 처리하는 매칭 수를 제한합니다.
+
+- MatchConcurrencyLimiter: 동시 실행 max_concurrent개 + 대기열 max_queue개
+  (대기열이 차면 즉시 503, queue_timeout 안에 차례가 오지 않아도 503)
+- TokenBucketLimiter: 관람객 UUID(X-User-UUID)별 초당 rate개, 최대 burst개 (초과 시 429)
+"""
+
+import asyncio
+from collections import OrderedDict
+import logging
+import math
+import threading
+import time
+from typing import Optional
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejected(Exception):
+    """매칭 요청 거절 (status_code / detail / retry_after로 응답)"""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class MatchConcurrencyLimiter:
+    """
+    동시 실행 수 제한 + 유한 대기열 (이벤트 루프 하나에서 사용)
+
+    acquire()로 들어가고, 성공했으면 반드시 release()로 나갑니다.
+    """
+
+    def __init__(
+        self, max_concurrent: int, max_queue: int = 0, queue_timeout: float = 2.0
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.active = 0
+        self.waiting = 0
+        self.admitted = 0
+        self.queued = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+
+    async def acquire(self) -> None:
+        """
+        실행 슬롯 얻기 (빈 슬롯이 없으면 대기열에서 queue_timeout까지 대기)
+
+        Raises:
+            AdmissionRejected: 대기열이 가득 참 / 대기 시간 초과 (503)
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                self.rejected_queue_full += 1
+                raise AdmissionRejected(
+                    503,
+                    "요청이 많아 이미지 인식을 처리할 수 없습니다. 잠시 후 다시 시도해주세요.",
+                )
+
+            self.waiting += 1
+            self.queued += 1
+            try:
+                await asyncio.wait_for(
+                    self._semaphore.acquire(), timeout=self.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                self.rejected_timeout += 1
+                raise AdmissionRejected(
+                    503,
+                    "요청이 많아 이미지 인식이 지연되고 있습니다. 잠시 후 다시 시도해주세요.",
+                ) from None
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.active += 1
+        self.admitted += 1
+
+    def release(self) -> None:
+        """실행 슬롯 반납 (대기 중인 요청이 있으면 차례로 넘김)"""
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "queued": self.queued,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+        }
+
+
+class TokenBucketLimiter:
+    """
+    키(관람객 UUID)별 토큰 버킷
+
+    키마다 최대 burst개 토큰, 초당 rate개씩 채워지고 요청마다 1개 사용.
+    추적하는 키 수는 max_keys개까지 (가장 오래 안 쓴 키부터 제거, 제거된 키는 가득 찬 버킷으로 다시 시작)
+    """
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.limited = 0
+
+    def consume(self, key: str) -> None:
+        """
+        토큰 1개 사용
+
+        Raises:
+            AdmissionRejected: 토큰 없음 (429, Retry-After = 다음 토큰까지 초)
+        """
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+
+            if tokens < 1.0:
+                self._buckets[key] = (tokens, now)
+                self._buckets.move_to_end(key)
+                self.limited += 1
+                retry_after = max(1, math.ceil((1.0 - tokens) / self.rate))
+                raise AdmissionRejected(
+                    429,
+                    "이미지 인식 요청이 너무 잦습니다. 잠시 후 다시 시도해주세요.",
+                    retry_after=retry_after,
+                )
+
+            self._buckets[key] = (tokens - 1.0, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+            self.allowed += 1
+
+    def stats(self) -> dict:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "tracked_keys": len(self._buckets),
+            "allowed": self.allowed,
+            "limited": self.limited,
+        }
+
+
+class MatchAdmission:
+    """매칭 요청 수용 제어 (UUID 토큰 버킷 → 동시 실행 제한 순서)"""
+
+    def __init__(
+        self,
+        limiter: Optional[MatchConcurrencyLimiter] = None,
+        rate_limiter: Optional[TokenBucketLimiter] = None,
+    ):
+        self.limiter = limiter
+        self.rate_limiter = rate_limiter
+
+    @property
+    def enabled(self) -> bool:
+        return self.limiter is not None or self.rate_limiter is not None
+
+    async def admit(self, visitor_uuid: Optional[str]) -> bool:
+        """
+        요청 수용
+
+        Returns:
+            bool: 동시 실행 슬롯을 얻었는지 (True면 처리 후 release() 필요)
+
+        Raises:
+            AdmissionRejected: 429 (UUID별 요청 빈도 초과) / 503 (서버 과부하)
+        """
+        if self.rate_limiter is not None and visitor_uuid:
+            self.rate_limiter.consume(visitor_uuid)
+        if self.limiter is None:
+            return False
+        await self.limiter.acquire()
+        return True
+
+    def release(self) -> None:
+        self.limiter.release()
+
+    def stats(self) -> dict:
+        return {
+            "concurrency": self.limiter.stats() if self.limiter else None,
+            "rate_limit": self.rate_limiter.stats() if self.rate_limiter else None,
+        }
+
+
+# 싱글톤
+_match_admission = None
+
+
+def get_match_admission() -> MatchAdmission:
+    """매칭 요청 수용 제어 (MATCH_MAX_CONCURRENT / MATCH_RATE_PER_UUID가 0이면 해당 제한 비활성)"""
+    global _match_admission
+    if _match_admission is None:
+        limiter = None
+        if settings.MATCH_MAX_CONCURRENT > 0:
+            limiter = MatchConcurrencyLimiter(
+                max_concurrent=settings.MATCH_MAX_CONCURRENT,
+                max_queue=settings.MATCH_MAX_QUEUE,
+                queue_timeout=settings.MATCH_QUEUE_TIMEOUT_SECONDS,
+            )
+        rate_limiter = None
+        if settings.MATCH_RATE_PER_UUID > 0:
+            rate_limiter = TokenBucketLimiter(
+                rate=settings.MATCH_RATE_PER_UUID,
+                burst=settings.MATCH_BURST_PER_UUID,
+                max_keys=settings.MATCH_RATE_MAX_UUIDS,
+            )
+        _match_admission = MatchAdmission(limiter, rate_limiter)
+    return _match_admission
@@ -0,0 +1,187 @@
+"""
+차원 축소 후보 검색 벤치마크 (recall@1 / recall@5 / p50·p99 지연시간)
+
+인메모리 인덱스와 같은 방식으로 비교합니다.
+- 기준: 384차원 전체 행렬곱 top-k (현재 검색)
+- 축소: 투영 공간에서 후보 N개 → 후보만 384차원으로 rescoring → top-k
+recall@k는 기준 검색 top-k와 겹치는 비율입니다.
+
+데이터:
+- 기본: artworks.embedding (활성 모델), 쿼리는 작품 벡터 + 노이즈 (관람객이 찍은 작품 사진)
+- --synthetic N: 합성 군집 데이터 N개 (카탈로그가 작을 때 규모 확인용)
+
+사용법:
+    docker-compose run --rm api python app/utils/benchmark_embedding_projection.py
+    docker-compose run --rm api python app/utils/benchmark_embedding_projection.py --dims 32 64 128 --candidates 64 128 256
+    docker-compose run --rm api python app/utils/benchmark_embedding_projection.py --synthetic 100000 --methods pca random
+"""
+
+import sys
+
+sys.path.insert(0, "/app")
+
+import argparse
+import logging
+import time
+from typing import List
+
+import numpy as np
+
+from app.utils.benchmark_vector_index import make_dataset, normalize
+from app.utils.embedding_projection import (
+    METHODS,
+    EmbeddingProjection,
+    fit_pca,
+    fit_random,
+    load_embeddings,
+)
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+K = 5
+
+
+def load_catalog(args):
+    """(카탈로그 행렬, 쿼리 행렬)"""
+    if args.synthetic:
+        return make_dataset(
+            args.synthetic, args.queries, args.clusters, args.noise, args.seed
+        )
+
+    from app.database import SessionLocal
+    from app.utils.embedding_models import get_embedding_model_registry
+
+    db = SessionLocal()
+    try:
+        data = load_embeddings(db, get_embedding_model_registry().active_version())
+    finally:
+        db.close()
+    if data.shape[0] <= K:
+        raise RuntimeError(f"임베딩이 너무 적습니다: {data.shape[0]}개")
+
+    rng = np.random.default_rng(args.seed)
+    targets = rng.integers(0, data.shape[0], args.queries)
+    queries = normalize(
+        data[targets]
+        + args.noise
+        * rng.standard_normal((args.queries, data.shape[1]))
+        / np.sqrt(data.shape[1])
+    )
+    return data, queries.astype(np.float32)
+
+
+def top_k(similarities: np.ndarray, k: int) -> np.ndarray:
+    """유사도 내림차순 top-k 위치"""
+    k = min(k, similarities.shape[0])
+    top = np.argpartition(-similarities, k - 1)[:k]
+    return top[np.argsort(-similarities[top])]
+
+
+def search_full(matrix: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """현재 검색: 전체 차원 행렬곱"""
+    return top_k(matrix @ query, K)
+
+
+def search_reduced(
+    projection: EmbeddingProjection,
+    matrix: np.ndarray,
+    reduced: tuple,
+    query: np.ndarray,
+    candidates: int,
+) -> np.ndarray:
+    """축소 공간 후보 → 전체 차원 rescoring"""
+    pool = projection.candidates(reduced[0], reduced[1], query, candidates)
+    return pool[top_k(matrix[pool] @ query, K)]
+
+
+def measure(search, queries: np.ndarray, truth: List[np.ndarray]) -> dict:
+    """쿼리 실행 → recall@1, recall@5, p50/p99 (ms)"""
+    latencies = []
+    hits_1 = hits_5 = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        found = search(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits_1 += int(found[0] == expected[0])
+        hits_5 += len(set(found[:K].tolist()) & set(expected[:K].tolist()))
+
+    return {
+        "recall@1": hits_1 / len(truth),
+        "recall@5": hits_5 / (len(truth) * K),
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+    }
+
+
+def report(label: str, result: dict) -> None:
+    logger.info(
+        f"  {label:<28} recall@1={result['recall@1']:.4f}  "
+        f"recall@5={result['recall@5']:.4f}  "
+        f"p50={result['p50']:.3f}ms  p99={result['p99']:.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="차원 축소 후보 검색 벤치마크")
+    parser.add_argument("--synthetic", type=int, default=0, help="합성 데이터 행 수")
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--noise", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--methods", nargs="+", choices=METHODS, default=["pca"])
+    parser.add_argument("--dims", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[32, 64, 128, 256])
+    args = parser.parse_args()
+
+    data, queries = load_catalog(args)
+
+    logger.info("=" * 60)
+    logger.info("📊 차원 축소 후보 검색 벤치마크")
+    logger.info("=" * 60)
+    logger.info(f"  - 데이터: {data.shape[0]}개 x {data.shape[1]}차원")
+    logger.info(f"  - 쿼리: {len(queries)}개")
+
+    truth = [search_full(data, query) for query in queries]
+
+    logger.info(f"\n🧮 전체 차원 ({data.shape[1]})")
+    report("full", measure(lambda q: search_full(data, q), queries, truth))
+
+    for method in args.methods:
+        for dims in args.dims:
+            if method == "pca":
+                projection = fit_pca(data, dims)
+                extra = f", 설명 분산 {projection.explained_variance:.2%}"
+            else:
+                projection = fit_random(data.shape[1], dims, seed=args.seed)
+                extra = ""
+            reduced = projection.reduce_matrix(data)
+            memory_mb = reduced[0].nbytes / 1024 / 1024
+
+            logger.info(
+                f"\n📐 {method} {dims}차원 (축소 행렬 {memory_mb:.1f}MB{extra})"
+            )
+            for candidates in args.candidates:
+                report(
+                    f"candidates={candidates}",
+                    measure(
+                        lambda q: search_reduced(
+                            projection, data, reduced, q, candidates
+                        ),
+                        queries,
+                        truth,
+                    ),
+                )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n\n⚠️  사용자에 의해 중단되었습니다.")
+    except Exception as e:
+        logger.error(f"\n❌ 예상치 못한 오류: {e}", exc_info=True)
+        raise
@@ -0,0 +1,284 @@
+"""
+pgvector ANN 인덱스 벤치마크 (recall@k / p50·p99 지연시간)
+
+합성 384차원 데이터(군집 + 노이즈 쿼리)를 임시 테이블에 넣고
+hnsw(ef_search별) / ivfflat(probes별) 검색 결과를 numpy brute force 정답과 비교합니다.
+쿼리는 매칭 API와 같은 형태 (ORDER BY 거리 LIMIT k)입니다.
+
+양자화 인덱스(--quantization halfvec binary)는 매칭 API처럼 k x --rescore-factor개 후보를
+양자화 거리로 뽑은 뒤 float32 원본으로 다시 정렬하며, 인덱스 크기도 함께 출력합니다.
+(합성 데이터는 원점 중심 분포라 binary 양자화에 유리합니다. 실제 임베딩으로도 확인 권장)
+
+사용법:
+    docker-compose run --rm api python app/utils/benchmark_vector_index.py
+    docker-compose run --rm api python app/utils/benchmark_vector_index.py --rows 50000 --types hnsw
+    docker-compose run --rm api python app/utils/benchmark_vector_index.py --ef-search 20 40 80 --probes 5 10 20
+    docker-compose run --rm api python app/utils/benchmark_vector_index.py --types hnsw --quantization none halfvec binary --rescore-factor 4
+"""
+
+import sys
+
+sys.path.insert(0, "/app")
+
+import argparse
+import io
+import logging
+import time
+from typing import List
+
+import numpy as np
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import engine
+from app.utils.vector_index import (
+    QUANTIZATIONS,
+    candidate_distance_sql,
+    create_index_sql,
+    ivfflat_lists,
+)
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DIMENSION = 384
+TABLE = "bench_artwork_embeddings"
+
+
+def search_sql(quantization: str) -> str:
+    """
+    매칭 API(search_artworks_pgvector)와 같은 형태의 검색 쿼리
+
+    양자화하지 않으면 :candidates = :k (rescoring 없음)
+    """
+    return f"""
+        SELECT id FROM (
+            SELECT id, embedding FROM {TABLE}
+            ORDER BY {candidate_distance_sql("embedding", ":query", quantization)}
+            LIMIT :candidates
+        ) candidates
+        ORDER BY embedding <=> CAST(:query AS vector({DIMENSION}))
+        LIMIT :k
+    """
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2 정규화"""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def make_dataset(rows: int, queries: int, clusters: int, noise: float, seed: int):
+    """
+    합성 데이터 생성
+
+    - 데이터: 군집 중심 + 가우시안 노이즈 (비슷한 작품들이 모인 분포)
+    - 쿼리: 임의 작품 벡터 + 작은 노이즈 (관람객이 찍은 작품 사진)
+    """
+    rng = np.random.default_rng(seed)
+    centers = normalize(rng.standard_normal((clusters, DIMENSION)))
+    labels = rng.integers(0, clusters, rows)
+    data = normalize(
+        centers[labels]
+        + 2.0 * rng.standard_normal((rows, DIMENSION)) / np.sqrt(DIMENSION)
+    )
+
+    targets = rng.integers(0, rows, queries)
+    query_vectors = normalize(
+        data[targets]
+        + noise * rng.standard_normal((queries, DIMENSION)) / np.sqrt(DIMENSION)
+    )
+    return data.astype(np.float32), query_vectors.astype(np.float32)
+
+
+def brute_force(data: np.ndarray, query_vectors: np.ndarray, k: int) -> List[set]:
+    """정답 top-k (정확한 코사인 유사도)"""
+    scores = query_vectors @ data.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return [set((row + 1).tolist()) for row in top]
+
+
+def vector_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.7g}" for value in vector) + "]"
+
+
+def load_table(conn, data: np.ndarray) -> None:
+    """임시 테이블 생성 + COPY로 적재"""
+    conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+    conn.execute(
+        text(
+            f"CREATE TEMP TABLE {TABLE} (id integer PRIMARY KEY, embedding vector({DIMENSION}))"
+        )
+    )
+
+    buffer = io.StringIO()
+    for index, vector in enumerate(data, 1):
+        buffer.write(f"{index}\t{vector_literal(vector)}\n")
+    buffer.seek(0)
+
+    cursor = conn.connection.cursor()
+    cursor.copy_expert(f"COPY {TABLE} (id, embedding) FROM STDIN", buffer)
+    cursor.close()
+    conn.execute(text(f"ANALYZE {TABLE}"))
+
+
+def run_queries(
+    conn,
+    query_vectors: np.ndarray,
+    k: int,
+    truth: List[set],
+    quantization: str = "none",
+    candidates: int = 0,
+) -> dict:
+    """쿼리 실행 → recall@k, p50/p99 (ms)"""
+    latencies = []
+    hits = 0
+    sql = text(search_sql(quantization))
+    params = {"k": k, "candidates": max(candidates, k)}
+
+    for query_vector, expected in zip(query_vectors, truth):
+        params["query"] = vector_literal(query_vector)
+        start = time.perf_counter()
+        ids = conn.execute(sql, params).scalars().all()
+        latencies.append((time.perf_counter() - start) * 1000)
+        hits += len(expected.intersection(ids))
+
+    return {
+        "recall": hits / (len(truth) * k),
+        "p50": float(np.percentile(latencies, 50)),
+        "p99": float(np.percentile(latencies, 99)),
+    }
+
+
+def index_size_mb(conn, index_name: str) -> float:
+    """인덱스 디스크 크기 (MB)"""
+    size = conn.execute(
+        text("SELECT pg_relation_size(CAST(:name AS regclass))"), {"name": index_name}
+    ).scalar()
+    return size / 1024 / 1024
+
+
+def report(label: str, result: dict) -> None:
+    logger.info(
+        f"  {label:<24} recall@k={result['recall']:.4f}  "
+        f"p50={result['p50']:.2f}ms  p99={result['p99']:.2f}ms"
+    )
+
+
+def run_index(
+    conn, args, index_type: str, quantization: str, query_vectors, truth
+) -> None:
+    """인덱스 하나 빌드 → 검색 파라미터별 recall / 지연시간 → 삭제"""
+    index_name = f"{TABLE}_{index_type}_{quantization}_idx"
+    candidates = args.k if quantization == "none" else args.k * args.rescore_factor
+
+    logger.info(f"\n🔨 {index_type} ({quantization}) 인덱스 빌드 중...")
+    start = time.perf_counter()
+    conn.execute(
+        text(
+            create_index_sql(
+                index_type,
+                args.rows,
+                index_name=index_name,
+                table=TABLE,
+                quantization=quantization,
+            )
+        )
+    )
+    build_seconds = time.perf_counter() - start
+    extra = f", lists={ivfflat_lists(args.rows)}" if index_type == "ivfflat" else ""
+    logger.info(
+        f"✅ 빌드 완료: {build_seconds:.1f}초, "
+        f"{index_size_mb(conn, index_name):.1f}MB{extra}"
+    )
+
+    if index_type == "hnsw":
+        setting, values = "hnsw.ef_search", args.ef_search
+    else:
+        setting, values = "ivfflat.probes", args.probes
+
+    for value in values:
+        # hnsw는 ef_search개까지만 반환하므로 후보 수 이상으로 (매칭 API와 동일)
+        if index_type == "hnsw":
+            value = max(value, candidates)
+        conn.execute(
+            text("SELECT set_config(:name, :value, false)"),
+            {"name": setting, "value": str(value)},
+        )
+        report(
+            f"{setting}={value}",
+            run_queries(conn, query_vectors, args.k, truth, quantization, candidates),
+        )
+
+    conn.execute(text(f"DROP INDEX {index_name}"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="pgvector ANN 인덱스 벤치마크")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--clusters", type=int, default=64)
+    parser.add_argument("--noise", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--types", nargs="+", choices=["hnsw", "ivfflat"], default=["hnsw", "ivfflat"]
+    )
+    parser.add_argument(
+        "--ef-search", type=int, nargs="+", default=[10, 20, 40, 80, 160]
+    )
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 5, 10, 20, 40])
+    parser.add_argument(
+        "--quantization", nargs="+", choices=QUANTIZATIONS, default=["none"]
+    )
+    parser.add_argument(
+        "--rescore-factor", type=int, default=settings.VECTOR_RESCORE_FACTOR
+    )
+    args = parser.parse_args()
+
+    logger.info("=" * 60)
+    logger.info("📊 pgvector ANN 벤치마크")
+    logger.info("=" * 60)
+    logger.info(f"  - 데이터: {args.rows}개 x {DIMENSION}차원 ({args.clusters}개 군집)")
+    logger.info(f"  - 쿼리: {args.queries}개, k={args.k}")
+    logger.info(
+        f"  - 양자화: {', '.join(args.quantization)} (rescoring 후보 k x {args.rescore_factor})"
+    )
+
+    data, query_vectors = make_dataset(
+        args.rows, args.queries, args.clusters, args.noise, args.seed
+    )
+
+    # 정답 + 인메모리 brute force 지연시간
+    start = time.perf_counter()
+    truth = brute_force(data, query_vectors, args.k)
+    numpy_ms = (time.perf_counter() - start) * 1000 / args.queries
+    logger.info(f"\n🧮 numpy brute force: 쿼리당 {numpy_ms:.3f}ms")
+
+    with engine.connect() as conn:
+        logger.info("\n📥 임시 테이블 적재 중...")
+        load_table(conn, data)
+
+        # 인덱스 없는 정확 검색 (sequential scan)
+        logger.info("\n🐢 인덱스 없음 (exact)")
+        report("seq scan", run_queries(conn, query_vectors, args.k, truth))
+
+        for index_type in args.types:
+            for quantization in args.quantization:
+                run_index(conn, args, index_type, quantization, query_vectors, truth)
+
+        conn.execute(text(f"DROP TABLE IF EXISTS {TABLE}"))
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n\n⚠️  사용자에 의해 중단되었습니다.")
+    except Exception as e:
+        logger.error(f"\n❌ 예상치 못한 오류: {e}", exc_info=True)
+        raise
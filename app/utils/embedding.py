@@ -1,15 +1,25 @@
 # app/utils/embedding.py
 """HuggingFace API 임베딩 서비스 (DINOv2 + 재시도 로직)"""
+import asyncio
+from datetime import date
 import io
 import logging
+import threading
 import time
-from typing import Union
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 from PIL import Image
 import numpy as np
 import requests
+from sqlalchemy import text
 
 from app.config import settings
+from app.utils.embedding_projection import EmbeddingProjection, get_embedding_projection
+from app.utils.embedding_resilience import (
+    EmbeddingDeadlineExceeded,
+    bounded_timeout,
+    sleep_within_deadline,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +42,9 @@ class HuggingFaceEmbeddingService:
         """
         이미지에서 임베딩 벡터 추출 (재시도 로직 포함)
 
+        매칭 요청의 시간 예산(deadline_scope) 안에서 호출되면
+        요청 타임아웃과 재시도 대기를 남은 예산으로 제한합니다 (넘기면 EmbeddingDeadlineExceeded).
+
         Args:
             image: PIL Image, bytes, 또는 이미지 경로
             max_retries: 최대 재시도 횟수
@@ -68,7 +81,7 @@ class HuggingFaceEmbeddingService:
                     headers=self.headers,
                     data=image_bytes,
                     params={"wait_for_model": "true"},  # 모델 로딩 대기
-                    timeout=60,
+                    timeout=bounded_timeout(60, "HuggingFace"),
                 )
 
                 # 상태 코드 확인
@@ -77,7 +90,7 @@ class HuggingFaceEmbeddingService:
                     if "loading" in error_msg.lower():
                         wait_time = 20
                         logger.warning(f"모델 로딩 중, {wait_time}초 대기")
-                        time.sleep(wait_time)
+                        sleep_within_deadline(wait_time, "HuggingFace")
                         continue
 
                 response.raise_for_status()
@@ -120,13 +133,16 @@ class HuggingFaceEmbeddingService:
                 if attempt == max_retries - 1:
                     raise
 
-                time.sleep(5)
+                sleep_within_deadline(5, "HuggingFace")
+
+            except EmbeddingDeadlineExceeded:
+                raise
 
             except Exception as e:
                 logger.error(f"에러 발생: {e}")
                 if attempt == max_retries - 1:
                     raise
-                time.sleep(5)
+                sleep_within_deadline(5, "HuggingFace")
 
         raise RuntimeError(f"{max_retries}번 시도 후 실패")
 
@@ -182,8 +198,532 @@ class PrecomputedEmbeddingService:
         ]
 
 
+class ArtworkEmbeddingIndex:
+    """
+    작품 임베딩 인메모리 인덱스 (워커 프로세스별)
+
+    - 정규화된 float32 행렬 한 번의 행렬곱으로 top-k 검색
+    - 결과 메타데이터(제목, 작가, 썸네일, 전시)를 함께 보관 → 매칭 시 DB 조회 없음
+    - 전시별 부분 행렬을 미리 만들어 전시 범위 검색은 해당 전시 작품만 계산
+    - 차원 축소 투영(EMBEDDING_PROJECTION_PATH)이 있으면 큰 후보 집합은 축소 공간에서 후보를 고른 뒤
+      전체 차원으로 rescoring
+    - 다른 워커의 변경은 주기적인 fingerprint 확인으로 반영
+      (async 핸들러는 schedule_refresh: 재로드는 스레드에서, 끝날 때까지 이전 스냅샷으로 검색)
+    - 활성 모델 버전의 임베딩만 로드 (model_version: 매칭 쿼리 임베딩도 이 버전으로 생성)
+    """
+
+    def __init__(self, dimension: int = 384, refresh_interval: float = 30.0):
+        self.dimension = dimension
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._ids: List[int] = []
+        self._positions: Dict[int, int] = {}
+        self._matrix = np.empty((0, dimension), dtype=np.float32)
+        self._metadata: Dict[int, dict] = {}
+        self._exhibition_periods: Dict[int, Tuple[date, date]] = {}
+        self._exhibition_subsets: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        self._loaded = False
+        self._fingerprint: Optional[tuple] = None
+        self._last_checked = 0.0
+        self.model_version: Optional[str] = None
+        self.projection: Optional[EmbeddingProjection] = None
+        self._reduced: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._refreshing = False
+
+    @property
+    def is_ready(self) -> bool:
+        """인덱스 로드 여부"""
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _normalize(self, embedding) -> np.ndarray:
+        """L2 정규화된 float32 벡터로 변환"""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dimension:
+            raise ValueError(
+                f"잘못된 임베딩 차원: {vector.shape[0]} (예상: {self.dimension})"
+            )
+        return vector / (np.linalg.norm(vector) + 1e-8)
+
+    @staticmethod
+    def _build_metadata(artwork) -> dict:
+        """매칭 결과 형식의 메타데이터 생성 (similarity 제외)"""
+        return {
+            "artwork_id": artwork.id,
+            "title": artwork.title,
+            "artist_id": artwork.artist_id,
+            "artist_name": artwork.artist.name if artwork.artist else "",
+            "thumbnail_url": artwork.thumbnail_url,
+            "exhibitions": [
+                {
+                    "id": ex.id,
+                    "title": ex.title,
+                    "venue_name": ex.venue.name if ex.venue else "",
+                    "start_date": ex.start_date,
+                    "end_date": ex.end_date,
+                    "cover_image_url": ex.cover_image_url,
+                }
+                for ex in artwork.exhibitions
+            ],
+        }
+
+    @staticmethod
+    def _query_artworks(db, model_version: Optional[str] = None):
+        """임베딩 + 메타데이터 조회 쿼리 (model_version 지정 시 해당 모델 임베딩만)"""
+        from sqlalchemy.orm import joinedload
+
+        from app.models import Artwork, Exhibition
+
+        query = (
+            db.query(Artwork)
+            .options(
+                joinedload(Artwork.artist),
+                joinedload(Artwork.exhibitions).joinedload(Exhibition.venue),
+            )
+            .filter(Artwork.embedding.isnot(None))
+            .order_by(Artwork.id)
+        )
+        if model_version is not None:
+            query = query.filter(Artwork.embedding_model == model_version)
+        return query
+
+    @staticmethod
+    def _build_exhibition_subsets(ids: List[int], matrix: np.ndarray, metadata: dict):
+        """
+        전시별 후보 집합 생성
+
+        Returns:
+            tuple: (전시 ID → (시작일, 종료일), 전시 ID → (행 위치 배열, 부분 행렬))
+        """
+        periods: Dict[int, Tuple[date, date]] = {}
+        positions: Dict[int, List[int]] = {}
+        for position, artwork_id in enumerate(ids):
+            for ex in metadata[artwork_id]["exhibitions"]:
+                periods[ex["id"]] = (ex["start_date"], ex["end_date"])
+                positions.setdefault(ex["id"], []).append(position)
+
+        subsets = {}
+        for exhibition_id, rows in positions.items():
+            rows_array = np.asarray(rows, dtype=np.int64)
+            subsets[exhibition_id] = (rows_array, matrix[rows_array])
+        return periods, subsets
+
+    def _load_projection(
+        self, model_version: Optional[str]
+    ) -> Optional[EmbeddingProjection]:
+        """이 인덱스 모델 버전으로 학습된 차원 축소 투영 (없으면 None)"""
+        projection = get_embedding_projection()
+        if projection is None:
+            return None
+        if projection.dimension != self.dimension:
+            logger.warning(
+                f"⚠️ 차원 축소 투영 차원 불일치 ({projection.dimension}): 전체 차원 검색"
+            )
+            return None
+        if projection.model_version not in (None, model_version):
+            logger.warning(
+                f"⚠️ 차원 축소 투영 모델({projection.model_version})이 "
+                f"인덱스 모델({model_version})과 달라 사용하지 않습니다"
+            )
+            return None
+        return projection
+
+    def _reproject(self) -> None:
+        """in-place 변경 후 축소 행렬 재생성 (lock 안에서 호출)"""
+        if self.projection is not None:
+            self._reduced = self.projection.reduce_matrix(self._matrix)
+
+    def _rebuild_exhibition_subsets(self) -> None:
+        """in-place 변경 후 전시별 부분 행렬 재생성 (lock 안에서 호출)"""
+        self._exhibition_periods, self._exhibition_subsets = (
+            self._build_exhibition_subsets(self._ids, self._matrix, self._metadata)
+        )
+
+    @staticmethod
+    def _fetch_fingerprint(db) -> tuple:
+        """작품/전시 변경 감지용 fingerprint (가벼운 집계 쿼리)"""
+        row = db.execute(
+            text(
+                """
+                SELECT
+                    (SELECT COUNT(embedding) FROM artworks),
+                    (SELECT MAX(updated_at) FROM artworks),
+                    (SELECT MAX(updated_at) FROM artists),
+                    (SELECT COUNT(*) FROM exhibitions),
+                    (SELECT MAX(updated_at) FROM exhibitions),
+                    (SELECT COUNT(*) FROM exhibition_artworks),
+                    (SELECT MAX(created_at) FROM exhibition_artworks),
+                    (SELECT version FROM embedding_models WHERE status = 'active')
+            """
+            )
+        ).fetchone()
+        return tuple(row)
+
+    def load(self, db) -> None:
+        """DB에서 전체 인덱스 로드 (시작 시 / 변경 감지 시)"""
+        start_time = time.perf_counter()
+        fingerprint = self._fetch_fingerprint(db)
+        # fingerprint 마지막 값 = 활성 모델 버전 (등록된 모델이 없으면 전체 로드)
+        model_version = fingerprint[-1]
+        artworks = self._query_artworks(db, model_version).all()
+
+        ids: List[int] = []
+        metadata: Dict[int, dict] = {}
+        rows = []
+        for artwork in artworks:
+            try:
+                rows.append(self._normalize(artwork.embedding))
+            except ValueError as e:
+                logger.warning(f"작품 ID {artwork.id} 인덱스 제외: {e}")
+                continue
+            ids.append(int(artwork.id))
+            metadata[int(artwork.id)] = self._build_metadata(artwork)
+
+        matrix = (
+            np.vstack(rows).astype(np.float32, copy=False)
+            if rows
+            else np.empty((0, self.dimension), dtype=np.float32)
+        )
+
+        periods, subsets = self._build_exhibition_subsets(ids, matrix, metadata)
+
+        active_version = model_version or settings.EMBEDDING_MODEL_VERSION
+        projection = self._load_projection(active_version)
+        reduced = projection.reduce_matrix(matrix) if projection is not None else None
+
+        with self._lock:
+            self._ids = ids
+            self._positions = {artwork_id: i for i, artwork_id in enumerate(ids)}
+            self._matrix = matrix
+            self._metadata = metadata
+            self._exhibition_periods = periods
+            self._exhibition_subsets = subsets
+            self._fingerprint = fingerprint
+            self._last_checked = time.monotonic()
+            self._loaded = True
+            self.model_version = active_version
+            self.projection = projection
+            self._reduced = reduced
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            f"✅ 임베딩 인덱스 로드 완료: {len(ids)}개 작품, 모델 {self.model_version} "
+            f"({elapsed_ms:.1f}ms)"
+        )
+
+    def ensure_fresh(self, db) -> None:
+        """refresh_interval마다 fingerprint를 확인하고 변경 시 재로드"""
+        if time.monotonic() - self._last_checked < self.refresh_interval:
+            return
+
+        fingerprint = self._fetch_fingerprint(db)
+        if fingerprint != self._fingerprint:
+            logger.info("🔄 작품 데이터 변경 감지: 임베딩 인덱스 재로드")
+            self.load(db)
+        else:
+            self._last_checked = time.monotonic()
+
+    def schedule_refresh(self) -> None:
+        """
+        async 핸들러용 ensure_fresh (기다리지 않음)
+
+        전체 재로드(작품 전체 조회 + 행렬 재생성)가 이벤트 루프를 막지 않도록
+        확인 주기가 지났으면 스레드에서 새 DB 세션으로 확인/재로드합니다.
+        재로드가 끝나 스냅샷이 교체될 때까지 요청은 이전 스냅샷으로 검색합니다.
+        """
+        if time.monotonic() - self._last_checked < self.refresh_interval:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        asyncio.get_running_loop().run_in_executor(None, self._refresh_in_background)
+
+    def _refresh_in_background(self) -> None:
+        """schedule_refresh 스레드 작업 (실패 시 확인 주기 뒤 다시 시도)"""
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            self.ensure_fresh(db)
+        except Exception as e:
+            logger.warning(f"⚠️ 임베딩 인덱스 재로드 실패 (이전 스냅샷 유지): {e}")
+            self._last_checked = time.monotonic()
+        finally:
+            db.close()
+            with self._lock:
+                self._refreshing = False
+
+    def invalidate(self) -> None:
+        """다음 ensure_fresh 호출 시 재로드하도록 표시"""
+        with self._lock:
+            self._fingerprint = None
+            self._last_checked = 0.0
+
+    def upsert(self, artwork_id: int, embedding, db) -> None:
+        """
+        작품 임베딩 추가/교체 (in-place)
+
+        Args:
+            artwork_id: 작품 ID
+            embedding: 새 임베딩 벡터
+            db: 메타데이터 조회용 DB 세션
+        """
+        if not self._loaded:
+            return
+
+        artwork = self._query_artworks(db).filter_by(id=artwork_id).first()
+        if artwork is None:
+            self.remove(artwork_id)
+            return
+
+        # 다른 모델의 임베딩은 섞지 않음 (전환 직후 등 → 재로드로 반영)
+        if artwork.embedding_model not in (None, self.model_version):
+            self.invalidate()
+            return
+
+        vector = self._normalize(embedding)
+        metadata = self._build_metadata(artwork)
+        fingerprint = self._fetch_fingerprint(db)
+
+        # 검색은 lock 밖에서 스냅샷(행렬/ids/메타데이터)을 읽으므로 제자리 수정 없이 새 객체로 교체
+        with self._lock:
+            position = self._positions.get(artwork_id)
+            if position is None:
+                self._matrix = np.vstack([self._matrix, vector[None, :]])
+                self._positions = {**self._positions, artwork_id: len(self._ids)}
+                self._ids = self._ids + [artwork_id]
+            else:
+                matrix = self._matrix.copy()
+                matrix[position] = vector
+                self._matrix = matrix
+            self._metadata = {**self._metadata, artwork_id: metadata}
+            self._reproject()
+            self._rebuild_exhibition_subsets()
+            self._fingerprint = fingerprint
+
+        logger.info(f"✅ 임베딩 인덱스 갱신: Artwork ID {artwork_id}")
+
+    def refresh_metadata(self, artwork_id: int, db) -> None:
+        """작품 정보 수정 시 메타데이터만 갱신"""
+        if not self._loaded or artwork_id not in self._positions:
+            return
+
+        artwork = self._query_artworks(db).filter_by(id=artwork_id).first()
+        if artwork is None:
+            self.remove(artwork_id)
+            return
+
+        metadata = self._build_metadata(artwork)
+        with self._lock:
+            self._metadata = {**self._metadata, artwork_id: metadata}
+            self._rebuild_exhibition_subsets()
+
+    def remove(self, artwork_id: int) -> None:
+        """작품 삭제 시 인덱스에서 제거"""
+        with self._lock:
+            position = self._positions.get(artwork_id)
+            if position is None:
+                return
+
+            ids = self._ids[:position] + self._ids[position + 1 :]
+            self._matrix = np.delete(self._matrix, position, axis=0)
+            self._ids = ids
+            self._positions = {aid: i for i, aid in enumerate(ids)}
+            self._metadata = {
+                aid: value for aid, value in self._metadata.items() if aid != artwork_id
+            }
+            self._reproject()
+            self._rebuild_exhibition_subsets()
+
+        logger.info(f"🗑️  임베딩 인덱스에서 제거: Artwork ID {artwork_id}")
+
+    def ongoing_exhibition_ids(self, today: Optional[date] = None) -> List[int]:
+        """인덱스에 포함된 전시 중 진행 중인 전시 ID 목록"""
+        today = today or date.today()
+        with self._lock:
+            periods = self._exhibition_periods
+        return [
+            exhibition_id
+            for exhibition_id, (start_date, end_date) in periods.items()
+            if start_date <= today <= end_date
+        ]
+
+    @staticmethod
+    def _scope(
+        matrix: np.ndarray, subsets: dict, exhibition_ids: Optional[Iterable[int]]
+    ) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        검색 대상 후보 (전체 또는 전시별 부분 행렬)
+
+        Returns:
+            Tuple[Optional[np.ndarray], np.ndarray]: (전체 행렬 기준 행 위치 (전체면 None), 후보 행렬)
+        """
+        if exhibition_ids is None:
+            return None, matrix
+
+        scoped = [subsets[e] for e in set(exhibition_ids) if e in subsets]
+        if not scoped:
+            return None, matrix[:0]
+        if len(scoped) == 1:
+            return scoped[0]
+        positions = np.unique(np.concatenate([rows for rows, _ in scoped]))
+        return positions, matrix[positions]
+
+    def search(
+        self,
+        query_embedding,
+        top_k: int = 10,
+        threshold: float = 0.0,
+        exhibition_ids: Optional[Iterable[int]] = None,
+    ) -> List[dict]:
+        """
+        코사인 유사도 top-k 검색
+
+        Args:
+            query_embedding: 사용자 이미지 임베딩
+            top_k: 최대 결과 개수
+            threshold: 유사도 임계값
+            exhibition_ids: 검색 대상 전시 ID 목록 (None이면 전체 작품)
+
+        Returns:
+            List[dict]: 매칭 결과 (ArtworkMatchResult 형식, 유사도 내림차순)
+        """
+        query = self._normalize(query_embedding)
+
+        with self._lock:
+            matrix = self._matrix
+            ids = self._ids
+            metadata = self._metadata
+            subsets = self._exhibition_subsets
+            projection = self.projection
+            reduced = self._reduced
+
+        positions, matrix = self._scope(matrix, subsets, exhibition_ids)
+        if matrix.shape[0] == 0:
+            return []
+
+        # 후보가 많으면 축소 공간에서 먼저 고르고, 고른 후보만 전체 차원으로 계산
+        pool: Optional[np.ndarray] = None
+        pool_size = max(top_k, settings.EMBEDDING_PROJECTION_CANDIDATES)
+        if (
+            projection is not None
+            and matrix.shape[0] >= settings.EMBEDDING_PROJECTION_MIN_ROWS
+            and pool_size < matrix.shape[0]
+        ):
+            reduced_matrix, squared_norms = reduced
+            if positions is not None:
+                reduced_matrix = reduced_matrix[positions]
+                squared_norms = squared_norms[positions]
+            pool = projection.candidates(
+                reduced_matrix, squared_norms, query, pool_size
+            )
+            similarities = matrix[pool] @ query
+        else:
+            similarities = matrix @ query
+
+        count = similarities.shape[0]
+        k = min(top_k, count)
+        if k < count:
+            candidates = np.argpartition(-similarities, k - 1)[:k]
+        else:
+            candidates = np.arange(count)
+        candidates = candidates[np.argsort(-similarities[candidates])]
+
+        results = []
+        for candidate in candidates:
+            similarity = float(similarities[candidate])
+            if similarity < threshold:
+                break
+            if pool is not None:
+                candidate = pool[candidate]
+            position = positions[candidate] if positions is not None else candidate
+            results.append({**metadata[ids[position]], "similarity": similarity})
+
+        return results
+
+    def search_fused(
+        self,
+        query_embeddings: List,
+        top_k: int = 10,
+        threshold: float = 0.0,
+        exhibition_ids: Optional[Iterable[int]] = None,
+        fusion: str = "max",
+    ) -> List[dict]:
+        """
+        같은 작품을 찍은 여러 장의 유사도를 작품별로 합친 top-k 검색
+
+        Args:
+            query_embeddings: 사용자 이미지 임베딩 목록
+            top_k: 최대 결과 개수
+            threshold: 합친 유사도 임계값
+            exhibition_ids: 검색 대상 전시 ID 목록 (None이면 전체 작품)
+            fusion: max / mean
+
+        Returns:
+            List[dict]: 매칭 결과 (ArtworkBatchMatchResult 형식, 합친 유사도 내림차순)
+        """
+        queries = np.vstack([self._normalize(e) for e in query_embeddings])
+
+        with self._lock:
+            matrix = self._matrix
+            ids = self._ids
+            metadata = self._metadata
+            subsets = self._exhibition_subsets
+
+        positions, matrix = self._scope(matrix, subsets, exhibition_ids)
+        if matrix.shape[0] == 0:
+            return []
+
+        # (후보 수, 사진 수) 행렬곱 한 번
+        similarities = matrix @ queries.T
+        fused = fuse_similarities(similarities, fusion)
+
+        count = fused.shape[0]
+        k = min(top_k, count)
+        if k < count:
+            candidates = np.argpartition(-fused, k - 1)[:k]
+        else:
+            candidates = np.arange(count)
+        candidates = candidates[np.argsort(-fused[candidates])]
+
+        results = []
+        for candidate in candidates:
+            similarity = float(fused[candidate])
+            if similarity < threshold:
+                break
+            position = positions[candidate] if positions is not None else candidate
+            results.append(
+                {
+                    **metadata[ids[position]],
+                    "similarity": similarity,
+                    "image_similarities": similarities[candidate].tolist(),
+                }
+            )
+
+        return results
+
+
+def fuse_similarities(similarities: np.ndarray, fusion: str) -> np.ndarray:
+    """
+    (후보 수, 사진 수) 유사도 → 작품별 하나로 합치기
+
+    - max: 가장 잘 찍힌 사진 기준 (반사/각도 문제가 있는 사진의 영향 없음)
+    - mean: 전체 평균 (우연히 한 장만 비슷한 다른 작품에 강함)
+    """
+    if fusion == "max":
+        return similarities.max(axis=1)
+    if fusion == "mean":
+        return similarities.mean(axis=1)
+    raise ValueError(f"지원하지 않는 유사도 합치기 방식: {fusion}")
+
+
 # 싱글톤
 _embedding_service = None
+_artwork_embedding_index = None
 
 
 def get_embedding_service() -> HuggingFaceEmbeddingService:
@@ -192,3 +732,13 @@ def get_embedding_service() -> HuggingFaceEmbeddingService:
     if _embedding_service is None:
         _embedding_service = HuggingFaceEmbeddingService()
     return _embedding_service
+
+
+def get_artwork_embedding_index() -> ArtworkEmbeddingIndex:
+    """작품 임베딩 인메모리 인덱스"""
+    global _artwork_embedding_index
+    if _artwork_embedding_index is None:
+        _artwork_embedding_index = ArtworkEmbeddingIndex(
+            refresh_interval=settings.EMBEDDING_INDEX_REFRESH_SECONDS
+        )
+    return _artwork_embedding_index
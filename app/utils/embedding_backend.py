@@ -0,0 +1,309 @@
+"""
+임베딩 백엔드
+
+이미지 바이트 → 384차원 DINOv2 임베딩을 만드는 방법을 하나의 인터페이스로 통일합니다.
+- lambda: AWS Lambda (기본값)
+- huggingface: HuggingFace Inference API
+- onnx: 로컬 CPU ONNX Runtime (네트워크 홉/콜드 스타트 없음, 오프라인 테스트/벤치마크용)
+
+settings.EMBEDDING_BACKEND로 선택합니다.
+섀도 모델(SHADOW_EMBEDDING_*)이 활성화되면 DB의 활성 버전에 맞는 백엔드를 사용합니다 (embedding_models.py).
+"""
+
+from abc import ABC, abstractmethod
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import io
+import logging
+import threading
+from typing import List, Optional
+
+from PIL import Image
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_http_session = None
+
+
+def _get_http_session():
+    """외부 이미지 URL 다운로드용 HTTP 세션 (연결 재사용)"""
+    global _http_session
+    if _http_session is None:
+        import requests
+
+        _http_session = requests.Session()
+    return _http_session
+
+
+class EmbeddingBackend(ABC):
+    """임베딩 백엔드 인터페이스"""
+
+    name: str = "base"
+    dimension: int = 384
+
+    @abstractmethod
+    def embed(self, image_bytes: bytes) -> np.ndarray:
+        """
+        단일 이미지 임베딩 생성
+
+        Args:
+            image_bytes: 이미지 바이트 (JPEG/PNG 등)
+
+        Returns:
+            np.ndarray: float32 임베딩 벡터 (384차원)
+        """
+
+    def embed_batch(self, images: List[bytes]) -> List[np.ndarray]:
+        """여러 이미지 임베딩 생성 (기본: 한 장씩 순차 처리)"""
+        return [self.embed(image_bytes) for image_bytes in images]
+
+    async def aembed(self, image_bytes: bytes) -> np.ndarray:
+        """async 핸들러용 (블로킹 호출을 스레드에서 실행)"""
+        return await asyncio.to_thread(self.embed, image_bytes)
+
+    async def aembed_batch(self, images: List[bytes]) -> List[np.ndarray]:
+        """async 핸들러용 배치 임베딩"""
+        return await asyncio.to_thread(self.embed_batch, images)
+
+    def embed_url(self, image_url: str, max_size: int = 800) -> np.ndarray:
+        """
+        이미지 URL 임베딩 생성 (기본: 다운로드 → 리사이즈 → embed)
+
+        우리 버킷 이미지는 S3 get_object로, 외부 URL은 공유 HTTP 세션으로 받습니다.
+
+        Args:
+            image_url: 이미지 URL (S3 등)
+            max_size: 리사이즈 최대 크기 (px)
+
+        Returns:
+            np.ndarray: float32 임베딩 벡터 (384차원)
+        """
+        from app.utils.image_processing import get_image_preprocessor
+        from app.utils.s3_client import s3_client
+
+        content = s3_client.get_file_bytes(image_url)
+        if content is None:
+            response = _get_http_session().get(image_url, timeout=10)
+            response.raise_for_status()
+            content = response.content
+
+        image_bytes = get_image_preprocessor().preprocess_blocking(
+            content, max_size=max_size
+        )
+        logger.info(f"이미지 크기: {len(image_bytes) / 1024 / 1024:.2f}MB")
+        return self.embed(image_bytes)
+
+    async def aembed_url(self, image_url: str, max_size: int = 800) -> np.ndarray:
+        """async 핸들러용 URL 임베딩"""
+        return await asyncio.to_thread(self.embed_url, image_url, max_size)
+
+    def _validate(self, embedding) -> np.ndarray:
+        """float32 1차원 벡터로 변환 + 차원 검증"""
+        vector = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != self.dimension:
+            raise ValueError(
+                f"잘못된 임베딩 차원: {vector.shape[0]} (예상: {self.dimension})"
+            )
+        return vector
+
+
+class LambdaEmbeddingBackend(EmbeddingBackend):
+    """AWS Lambda (DINOv2-small) 임베딩"""
+
+    name = "lambda"
+
+    def __init__(self, function_name: Optional[str] = None):
+        self.function_name = function_name
+        self._client = None
+
+    @property
+    def client(self):
+        """Lambda 클라이언트 (기본 함수는 공용 lambda_client, 섀도 함수는 별도 클라이언트)"""
+        if self._client is None:
+            from app.utils.lambda_client import LambdaClient, lambda_client
+
+            if self.function_name and self.function_name != lambda_client.function_name:
+                self._client = LambdaClient(function_name=self.function_name)
+            else:
+                self._client = lambda_client
+        return self._client
+
+    def embed(self, image_bytes: bytes) -> np.ndarray:
+        return self._validate(self.client.generate_embedding_from_bytes(image_bytes))
+
+    def embed_batch(self, images: List[bytes]) -> List[np.ndarray]:
+        if not images:
+            return []
+        embeddings = self.client.generate_embeddings_batch_from_bytes(
+            images, batch_size=settings.LAMBDA_BATCH_SIZE
+        )
+        return [self._validate(embedding) for embedding in embeddings]
+
+    def embed_url(self, image_url: str, max_size: int = 800) -> np.ndarray:
+        """우리 버킷 이미지는 Lambda가 S3에서 직접 읽음 (API 서버 경유 X)"""
+        reference = self.client.s3_reference(image_url)
+        if reference is None:
+            return super().embed_url(image_url, max_size)
+
+        logger.info(
+            f"Lambda S3 모드: s3://{reference['s3_bucket']}/{reference['s3_key']}"
+        )
+        return self._validate(self.client.generate_embedding_from_s3(**reference))
+
+
+class HuggingFaceEmbeddingBackend(EmbeddingBackend):
+    """HuggingFace Inference API 임베딩"""
+
+    name = "huggingface"
+
+    def embed(self, image_bytes: bytes) -> np.ndarray:
+        from app.utils.embedding import get_embedding_service
+
+        return self._validate(get_embedding_service().get_embedding(image_bytes))
+
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """
+    로컬 CPU ONNX Runtime 임베딩 (DINOv2-small)
+
+    - 모델: app/utils/export_onnx_model.py로 내보낸 ONNX 파일
+    - 전처리: AutoImageProcessor와 동일 (짧은 변 256 bicubic → 224 center crop → ImageNet 정규화)
+    - 추론은 전용 스레드 풀에서 실행 (ONNX Runtime은 추론 중 GIL 해제)
+    """
+
+    name = "onnx"
+
+    RESIZE_SHORTEST_EDGE = 256
+    CROP_SIZE = 224
+    IMAGE_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+    IMAGE_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+    def __init__(
+        self, model_path: str, num_workers: int = 2, intra_op_threads: int = 1
+    ):
+        self.model_path = model_path
+        self.num_workers = num_workers
+        self.intra_op_threads = intra_op_threads
+        self._session = None
+        self._input_name: Optional[str] = None
+        self._session_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="onnx-embedding"
+        )
+
+    def _get_session(self):
+        """ONNX 세션 (첫 사용 시 로드)"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    try:
+                        import onnxruntime as ort
+                    except ImportError as e:
+                        raise RuntimeError(
+                            "onnx 백엔드를 사용하려면 onnxruntime 패키지가 필요합니다"
+                        ) from e
+
+                    options = ort.SessionOptions()
+                    options.intra_op_num_threads = self.intra_op_threads
+                    options.graph_optimization_level = (
+                        ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+                    )
+                    self._session = ort.InferenceSession(
+                        self.model_path,
+                        sess_options=options,
+                        providers=["CPUExecutionProvider"],
+                    )
+                    self._input_name = self._session.get_inputs()[0].name
+                    logger.info(f"ONNX 임베딩 모델 로드 완료: {self.model_path}")
+        return self._session
+
+    def _preprocess(self, image_bytes: bytes) -> np.ndarray:
+        """이미지 → (3, 224, 224) float32 텐서"""
+        # JPEG draft(축소 디코딩)는 쓰지 않음: AutoImageProcessor / Lambda와 같은 픽셀에서 시작해야
+        # 같은 모델 버전의 저장된 임베딩과 벡터가 어긋나지 않음
+        image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+
+        # 짧은 변 기준 리사이즈 (bicubic)
+        width, height = image.size
+        scale = self.RESIZE_SHORTEST_EDGE / min(width, height)
+        new_size = (max(1, round(width * scale)), max(1, round(height * scale)))
+        image = image.resize(new_size, Image.Resampling.BICUBIC)
+
+        # 중앙 크롭
+        left = (new_size[0] - self.CROP_SIZE) // 2
+        top = (new_size[1] - self.CROP_SIZE) // 2
+        image = image.crop((left, top, left + self.CROP_SIZE, top + self.CROP_SIZE))
+
+        # 정규화 (HWC → CHW)
+        pixels = np.asarray(image, dtype=np.float32) / 255.0
+        pixels = (pixels - self.IMAGE_MEAN) / self.IMAGE_STD
+        return pixels.transpose(2, 0, 1)
+
+    def _run(self, images: List[bytes]) -> List[np.ndarray]:
+        """배치 전처리 + 한 번의 forward pass"""
+        session = self._get_session()
+        batch = np.stack([self._preprocess(image_bytes) for image_bytes in images])
+        output = session.run(None, {self._input_name: batch})[0]
+
+        # last_hidden_state (N, tokens, 384) → CLS 토큰
+        if output.ndim == 3:
+            output = output[:, 0, :]
+        return [self._validate(row) for row in output]
+
+    def embed(self, image_bytes: bytes) -> np.ndarray:
+        return self._executor.submit(self._run, [image_bytes]).result()[0]
+
+    def embed_batch(self, images: List[bytes]) -> List[np.ndarray]:
+        if not images:
+            return []
+        return self._executor.submit(self._run, images).result()
+
+    async def aembed(self, image_bytes: bytes) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        results = await loop.run_in_executor(self._executor, self._run, [image_bytes])
+        return results[0]
+
+    async def aembed_batch(self, images: List[bytes]) -> List[np.ndarray]:
+        if not images:
+            return []
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self._run, images)
+
+
+def create_embedding_backend(
+    name: str,
+    lambda_function_name: Optional[str] = None,
+    onnx_model_path: Optional[str] = None,
+) -> EmbeddingBackend:
+    """
+    이름으로 임베딩 백엔드 생성
+
+    Args:
+        name: lambda / huggingface / onnx
+        lambda_function_name: Lambda 함수 이름 (기본값: LAMBDA_FUNCTION_NAME)
+        onnx_model_path: ONNX 모델 경로 (기본값: ONNX_MODEL_PATH)
+
+    Returns:
+        EmbeddingBackend: 임베딩 백엔드
+    """
+    if name == "lambda":
+        return LambdaEmbeddingBackend(function_name=lambda_function_name)
+    if name == "huggingface":
+        return HuggingFaceEmbeddingBackend()
+    if name == "onnx":
+        return OnnxEmbeddingBackend(
+            model_path=onnx_model_path or settings.ONNX_MODEL_PATH,
+            num_workers=settings.ONNX_NUM_WORKERS,
+            intra_op_threads=settings.ONNX_INTRA_OP_THREADS,
+        )
+    raise ValueError(f"지원하지 않는 임베딩 백엔드: {name}")
+
+
+def get_embedding_backend() -> EmbeddingBackend:
+    """현재 활성 임베딩 모델의 백엔드 (DB embedding_models 기준)"""
+    from app.utils.embedding_models import get_embedding_model_registry
+
+    return get_embedding_model_registry().active()[1]
@@ -0,0 +1,279 @@
+"""
+작품 임베딩 작업 큐 (embedding_jobs 테이블)
+
+- API: enqueue_embedding_job() → INSERT 한 번 (작품 저장과 같은 트랜잭션)
+- 워커: claim_embedding_jobs() → FOR UPDATE SKIP LOCKED로 여러 워커가 겹치지 않게 가져감
+- 실패 시 지수 backoff로 재시도, max_attempts 초과 시 failed
+- image_data: 업로드 때 리사이즈한 이미지 (워커가 S3에서 다시 받지 않음, 완료 시 비움)
+- done / failed 작업은 보관 기간이 지나면 워커가 삭제 (purge_finished_embedding_jobs)
+"""
+
+import logging
+import random
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# 작품당 pending 작업은 하나: 이미 대기 중이면 URL만 갱신하고 바로 실행 가능하게
+ENQUEUE_QUERY = text(
+    """
+    INSERT INTO embedding_jobs
+        (artwork_id, thumbnail_url, content_hash, image_data, max_attempts)
+    VALUES (:artwork_id, :thumbnail_url, :content_hash, :image_data, :max_attempts)
+    ON CONFLICT (artwork_id) WHERE status = 'pending'
+    DO UPDATE SET thumbnail_url = EXCLUDED.thumbnail_url,
+                  content_hash = EXCLUDED.content_hash,
+                  image_data = EXCLUDED.image_data,
+                  max_attempts = EXCLUDED.max_attempts,
+                  attempts = 0,
+                  last_error = NULL,
+                  run_after = now(),
+                  updated_at = now()
+"""
+)
+
+# 같은 작품의 running 작업이 있으면 건너뜀 (이전 썸네일 작업이 나중에 끝나 덮어쓰는 것 방지)
+CLAIM_QUERY = text(
+    """
+    UPDATE embedding_jobs j
+    SET status = 'running',
+        attempts = j.attempts + 1,
+        locked_at = now(),
+        updated_at = now()
+    FROM artworks a
+    WHERE a.id = j.artwork_id
+        AND j.id IN (
+            SELECT p.id
+            FROM embedding_jobs p
+            WHERE p.status = 'pending'
+                AND p.run_after <= now()
+                AND NOT EXISTS (
+                    SELECT 1 FROM embedding_jobs r
+                    WHERE r.artwork_id = p.artwork_id AND r.status = 'running'
+                )
+            ORDER BY p.run_after, p.id
+            LIMIT :limit
+            FOR UPDATE SKIP LOCKED
+        )
+    RETURNING j.id, j.artwork_id, j.thumbnail_url, j.content_hash, j.image_data,
+        j.attempts, j.max_attempts, a.title
+"""
+)
+
+
+def enqueue_embedding_job(
+    db: Session,
+    artwork_id: int,
+    thumbnail_url: str,
+    content_hash: Optional[str] = None,
+    image_data: Optional[bytes] = None,
+) -> None:
+    """
+    임베딩 작업 등록 (commit은 호출자가 담당 → 작품 저장과 원자적)
+
+    Args:
+        db: DB 세션
+        artwork_id: 작품 ID
+        thumbnail_url: 썸네일 URL
+        content_hash: 썸네일 SHA-256
+        image_data: 업로드 시 리사이즈한 이미지 (EMBEDDING_JOB_MAX_IMAGE_BYTES 초과 시 저장 안 함)
+    """
+    if (
+        image_data is not None
+        and len(image_data) > settings.EMBEDDING_JOB_MAX_IMAGE_BYTES
+    ):
+        image_data = None
+
+    db.execute(
+        ENQUEUE_QUERY,
+        {
+            "artwork_id": artwork_id,
+            "thumbnail_url": thumbnail_url,
+            "content_hash": content_hash,
+            "image_data": image_data,
+            "max_attempts": settings.EMBEDDING_JOB_MAX_ATTEMPTS,
+        },
+    )
+
+
+def claim_embedding_jobs(db: Session, limit: int) -> List:
+    """
+    실행할 작업 가져오기 (running으로 변경 후 commit)
+
+    Args:
+        db: DB 세션
+        limit: 최대 작업 수
+
+    Returns:
+        List: (id, artwork_id, thumbnail_url, content_hash, image_data, attempts,
+            max_attempts, title) 행 목록
+    """
+    jobs = db.execute(CLAIM_QUERY, {"limit": limit}).fetchall()
+    db.commit()
+    return jobs
+
+
+def complete_embedding_job(db: Session, job_id: int) -> None:
+    """작업 완료 처리"""
+    db.execute(
+        text(
+            """
+            UPDATE embedding_jobs
+            SET status = 'done', image_data = NULL, locked_at = NULL,
+                last_error = NULL, updated_at = now()
+            WHERE id = :id
+        """
+        ),
+        {"id": job_id},
+    )
+    db.commit()
+
+
+def backoff_seconds(attempts: int) -> float:
+    """재시도 대기 시간 (지수 backoff + jitter)"""
+    delay = settings.EMBEDDING_JOB_BACKOFF_SECONDS * (2 ** max(0, attempts - 1))
+    delay = min(delay, settings.EMBEDDING_JOB_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def fail_embedding_job(db: Session, job, error: str) -> bool:
+    """
+    작업 실패 처리 (재시도 가능하면 pending + backoff, 아니면 failed)
+
+    Args:
+        db: DB 세션
+        job: claim_embedding_jobs() 결과 행
+        error: 오류 메시지
+
+    Returns:
+        bool: 재시도 예약 여부
+    """
+    retry = job.attempts < job.max_attempts
+
+    if retry:
+        # 그 사이 같은 작품의 새 작업이 등록됐으면 (pending 유니크) 이 작업은 버림
+        db.execute(
+            text(
+                """
+                UPDATE embedding_jobs j
+                SET status = CASE
+                        WHEN EXISTS (
+                            SELECT 1 FROM embedding_jobs p
+                            WHERE p.artwork_id = j.artwork_id AND p.status = 'pending'
+                        ) THEN 'failed'
+                        ELSE 'pending'
+                    END,
+                    run_after = now() + make_interval(secs => :delay),
+                    locked_at = NULL,
+                    last_error = :error,
+                    updated_at = now()
+                WHERE j.id = :id
+            """
+            ),
+            {"id": job.id, "delay": backoff_seconds(job.attempts), "error": error},
+        )
+    else:
+        db.execute(
+            text(
+                """
+                UPDATE embedding_jobs
+                SET status = 'failed', image_data = NULL, locked_at = NULL,
+                    last_error = :error, updated_at = now()
+                WHERE id = :id
+            """
+            ),
+            {"id": job.id, "error": error},
+        )
+
+    db.commit()
+    return retry
+
+
+def reclaim_stale_embedding_jobs(db: Session, lock_timeout_seconds: int) -> int:
+    """
+    워커가 죽어서 running으로 남은 작업을 pending으로 되돌림
+
+    Args:
+        db: DB 세션
+        lock_timeout_seconds: 이 시간 이상 running이면 회수
+
+    Returns:
+        int: 회수한 작업 수
+    """
+    result = db.execute(
+        text(
+            """
+            UPDATE embedding_jobs j
+            SET status = CASE
+                    WHEN j.attempts >= j.max_attempts THEN 'failed'
+                    WHEN EXISTS (
+                        SELECT 1 FROM embedding_jobs p
+                        WHERE p.artwork_id = j.artwork_id AND p.status = 'pending'
+                    ) THEN 'failed'
+                    ELSE 'pending'
+                END,
+                locked_at = NULL,
+                last_error = '워커 응답 없음 (lock timeout)',
+                updated_at = now()
+            WHERE j.status = 'running'
+                AND j.locked_at < now() - make_interval(secs => :timeout)
+        """
+        ),
+        {"timeout": lock_timeout_seconds},
+    )
+    db.commit()
+    return result.rowcount
+
+
+# 보관 기간이 지난 작업 삭제 (batch_size개씩: 긴 DELETE로 큐 테이블을 오래 잠그지 않도록)
+PURGE_QUERY = text(
+    """
+    DELETE FROM embedding_jobs
+    WHERE id IN (
+        SELECT id
+        FROM embedding_jobs
+        WHERE status = :status
+            AND updated_at < now() - make_interval(days => :days)
+        LIMIT :batch_size
+    )
+"""
+)
+
+
+def purge_finished_embedding_jobs(
+    db: Session, done_days: int, failed_days: int, batch_size: int = 1000
+) -> int:
+    """
+    보관 기간이 지난 done / failed 작업 삭제
+
+    작품마다 썸네일이 바뀔 때마다 행이 쌓이므로 테이블(과 claim 스캔)이 계속 커지지 않도록 정리합니다.
+    failed는 원인 확인용으로 더 오래 보관합니다.
+
+    Args:
+        db: DB 세션
+        done_days: done 작업 보관 기간 (일, 0 이하면 삭제 안 함)
+        failed_days: failed 작업 보관 기간 (일, 0 이하면 삭제 안 함)
+        batch_size: DELETE 한 번에 지우는 최대 행 수
+
+    Returns:
+        int: 삭제한 작업 수
+    """
+    deleted = 0
+    for job_status, days in (("done", done_days), ("failed", failed_days)):
+        if days <= 0:
+            continue
+        while True:
+            result = db.execute(
+                PURGE_QUERY,
+                {"status": job_status, "days": days, "batch_size": batch_size},
+            )
+            db.commit()
+            deleted += result.rowcount
+            if result.rowcount < batch_size:
+                break
+    return deleted
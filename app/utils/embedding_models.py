@@ -0,0 +1,232 @@
+"""
+작품 임베딩 모델 버전 관리
+
+artworks.embedding(활성)과 artworks.embedding_shadow(섀도)는 서로 다른 모델의 벡터 공간입니다.
+- embedding_models 테이블: 버전별 상태 (active 1개 / shadow 최대 1개 / retired)
+- 프로세스는 설정된 두 버전 (EMBEDDING_MODEL_VERSION, SHADOW_EMBEDDING_MODEL_VERSION)의 백엔드를 만들 수 있고,
+  DB의 활성 버전을 주기적으로 확인해 그 버전의 백엔드로 매칭/작품 임베딩을 생성
+- 섀도 버전이 설정되어 있으면 작품 임베딩 생성 시 섀도 컬럼도 함께 채움
+- 전환: app/utils/switch_embedding_model.py (컬럼/인덱스 이름을 한 트랜잭션에서 교체)
+- 백엔드는 매칭 호출용 복원력 래퍼(시간 예산 / hedging / 서킷 브레이커)로 감쌈 (embedding_resilience.py)
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.utils.embedding_backend import EmbeddingBackend, create_embedding_backend
+from app.utils.embedding_resilience import create_resilient_backend
+
+logger = logging.getLogger(__name__)
+
+ACTIVE = "active"
+SHADOW = "shadow"
+RETIRED = "retired"
+
+# 같은 전처리(짧은 변 256 → 224 크롭) + CLS 벡터로 같은 벡터 공간을 만드는 백엔드
+# (huggingface는 전처리 / 출력 처리가 달라 보조 백엔드로 섞어 쓰면 매칭 결과가 조용히 틀어짐)
+FALLBACK_COMPATIBLE_BACKENDS = ("lambda", "onnx")
+
+
+class StaleEmbeddingModelError(RuntimeError):
+    """임베딩을 만든 모델이 저장 시점에 더 이상 활성/섀도가 아님 (전환 직후 등)"""
+
+
+def configured_models() -> Dict[str, dict]:
+    """설정에 정의된 모델 버전 → create_embedding_backend 인자"""
+    models = {
+        settings.EMBEDDING_MODEL_VERSION: {
+            "name": settings.EMBEDDING_BACKEND,
+            "lambda_function_name": settings.LAMBDA_FUNCTION_NAME,
+            "onnx_model_path": settings.ONNX_MODEL_PATH,
+        }
+    }
+    if settings.SHADOW_EMBEDDING_MODEL_VERSION:
+        models[settings.SHADOW_EMBEDDING_MODEL_VERSION] = {
+            "name": settings.SHADOW_EMBEDDING_BACKEND,
+            "lambda_function_name": settings.SHADOW_LAMBDA_FUNCTION_NAME or None,
+            "onnx_model_path": settings.SHADOW_ONNX_MODEL_PATH or None,
+        }
+    return models
+
+
+def fetch_model_versions(db) -> Tuple[Optional[str], Optional[str]]:
+    """
+    DB의 활성 / 섀도 버전
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (활성 버전, 섀도 버전)
+    """
+    rows = db.execute(
+        text(
+            """
+            SELECT version, status
+            FROM embedding_models
+            WHERE status IN ('active', 'shadow')
+        """
+        )
+    ).fetchall()
+    versions = {row.status: row.version for row in rows}
+    return versions.get(ACTIVE), versions.get(SHADOW)
+
+
+class EmbeddingModelRegistry:
+    """
+    활성 / 섀도 모델 버전과 버전별 임베딩 백엔드
+
+    - refresh_interval마다 DB 확인 (조회 실패 시 마지막 값 유지)
+    - DB에 활성 버전이 없으면 EMBEDDING_MODEL_VERSION 사용
+    """
+
+    def __init__(
+        self,
+        models: Dict[str, dict],
+        default_version: str,
+        refresh_interval: float = 30.0,
+    ):
+        self.models = models
+        self.default_version = default_version
+        self.refresh_interval = refresh_interval
+        self._active = default_version
+        self._shadow: Optional[str] = None
+        self._backends: Dict[str, EmbeddingBackend] = {}
+        self._lock = threading.Lock()
+        self._last_checked = 0.0
+
+    def refresh(self, force: bool = False) -> None:
+        """DB의 활성 / 섀도 버전 확인"""
+        if not force and time.monotonic() - self._last_checked < self.refresh_interval:
+            return
+
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            active, shadow = fetch_model_versions(db)
+        except Exception as e:
+            logger.warning(f"⚠️ 임베딩 모델 버전 조회 실패 (이전 값 유지): {e}")
+            self._last_checked = time.monotonic()
+            return
+        finally:
+            db.close()
+
+        active = active or self.default_version
+        with self._lock:
+            if active != self._active:
+                logger.info(f"🔀 활성 임베딩 모델 변경: {self._active} → {active}")
+            self._active = active
+            self._shadow = shadow
+            self._last_checked = time.monotonic()
+
+    def invalidate(self) -> None:
+        """다음 조회 시 DB 다시 확인"""
+        self._last_checked = 0.0
+
+    def active_version(self) -> str:
+        """활성 모델 버전"""
+        self.refresh()
+        return self._active
+
+    def shadow_version(self) -> Optional[str]:
+        """이 프로세스가 만들 수 있는 섀도 모델 버전 (없으면 None)"""
+        self.refresh()
+        shadow = self._shadow
+        if shadow is None or shadow == self._active or shadow not in self.models:
+            return None
+        return shadow
+
+    def backend_for(self, version: str) -> EmbeddingBackend:
+        """
+        모델 버전의 임베딩 백엔드
+
+        Raises:
+            RuntimeError: 이 프로세스에 해당 버전 설정이 없을 때 (다른 벡터 공간과 섞이지 않도록 실패)
+        """
+        if version not in self.models:
+            raise RuntimeError(
+                f"임베딩 모델 '{version}' 설정이 없습니다 "
+                f"(EMBEDDING_MODEL_VERSION / SHADOW_EMBEDDING_MODEL_VERSION 확인)"
+            )
+
+        with self._lock:
+            backend = self._backends.get(version)
+            if backend is None:
+                backend = create_resilient_backend(
+                    create_embedding_backend(**self.models[version]),
+                    fallback=self._create_fallback(version),
+                )
+                self._backends[version] = backend
+                logger.info(
+                    f"임베딩 백엔드: {backend.name} (모델 {version}, "
+                    f"보조: {backend.fallback.name if backend.fallback else '없음'})"
+                )
+            return backend
+
+    def _create_fallback(self, version: str) -> Optional[EmbeddingBackend]:
+        """
+        보조 백엔드 (EMBEDDING_FALLBACK_BACKEND, 기본 모델 버전만)
+
+        섀도 모델은 벡터 공간이 다를 수 있으므로 보조 백엔드를 두지 않습니다.
+        주 / 보조 백엔드가 모두 FALLBACK_COMPATIBLE_BACKENDS일 때만 사용합니다.
+        """
+        name = settings.EMBEDDING_FALLBACK_BACKEND
+        if not name or version != self.default_version:
+            return None
+        primary = self.models[version]["name"]
+        if name == primary:
+            return None
+        if (
+            name not in FALLBACK_COMPATIBLE_BACKENDS
+            or primary not in FALLBACK_COMPATIBLE_BACKENDS
+        ):
+            logger.warning(
+                f"⚠️ 보조 임베딩 백엔드 사용 안 함: {primary} → {name}는 같은 벡터 공간이 아닐 수 있습니다 "
+                f"(가능: {', '.join(FALLBACK_COMPATIBLE_BACKENDS)})"
+            )
+            return None
+        return create_embedding_backend(name)
+
+    def active(self) -> Tuple[str, EmbeddingBackend]:
+        """(활성 버전, 백엔드)"""
+        version = self.active_version()
+        return version, self.backend_for(version)
+
+    def shadow(self) -> Optional[Tuple[str, EmbeddingBackend]]:
+        """(섀도 버전, 백엔드) (섀도 모델이 없으면 None)"""
+        version = self.shadow_version()
+        if version is None:
+            return None
+        return version, self.backend_for(version)
+
+    def stats(self) -> dict:
+        return {
+            "active": self._active,
+            "shadow": self._shadow,
+            "configured": sorted(self.models),
+        }
+
+    def backend_stats(self) -> Dict[str, dict]:
+        """생성된 버전별 백엔드 복원력 통계 (hedge / 보조 백엔드 / 서킷 상태)"""
+        with self._lock:
+            backends = dict(self._backends)
+        return {version: backend.stats() for version, backend in backends.items()}
+
+
+# 싱글톤
+_embedding_model_registry = None
+
+
+def get_embedding_model_registry() -> EmbeddingModelRegistry:
+    """임베딩 모델 버전 레지스트리"""
+    global _embedding_model_registry
+    if _embedding_model_registry is None:
+        _embedding_model_registry = EmbeddingModelRegistry(
+            models=configured_models(),
+            default_version=settings.EMBEDDING_MODEL_VERSION,
+            refresh_interval=settings.EMBEDDING_MODEL_REFRESH_SECONDS,
+        )
+    return _embedding_model_registry
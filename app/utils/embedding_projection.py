@@ -0,0 +1,245 @@
+"""
+작품 임베딩 차원 축소 (후보 검색용)
+
+384차원 전체 행렬곱 대신 축소 공간(예: 64/128차원)에서 후보를 넉넉히 고른 뒤
+후보만 전체 384차원 벡터로 다시 계산(rescoring)합니다.
+
+- pca: artworks.embedding(L2 정규화)로 학습한 주성분
+- random: 무작위 직교 투영 (학습 데이터 불필요, 기준선)
+- 후보 점수: 축소 공간 거리 ||Px - Pq||² (평균은 상쇄) → 2·Px·Pq - ||Px||² 내림차순
+- 아티팩트: npz (mean, components + 메타데이터), 학습: app/utils/fit_embedding_projection.py
+"""
+
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+import os
+from typing import Optional, Tuple
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import text
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("pca", "random")
+
+
+class EmbeddingProjection:
+    """
+    학습된 투영 (x - mean) @ components
+
+    Attributes:
+        mean: (dimension,) 학습 데이터 평균 (random은 0)
+        components: (dimension, dims) 직교 투영 행렬
+        method: pca / random
+        model_version: 학습에 사용한 임베딩 모델 버전 (다른 모델 인덱스에는 사용 안 함)
+        fitted_rows: 학습 행 수
+        explained_variance: 축소 공간이 설명하는 분산 비율 (pca)
+    """
+
+    def __init__(
+        self,
+        mean: np.ndarray,
+        components: np.ndarray,
+        method: str,
+        model_version: Optional[str] = None,
+        fitted_rows: int = 0,
+        explained_variance: Optional[float] = None,
+        created_at: Optional[str] = None,
+    ):
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.components = np.ascontiguousarray(components, dtype=np.float32)
+        self.method = method
+        self.model_version = model_version
+        self.fitted_rows = fitted_rows
+        self.explained_variance = explained_variance
+        self.created_at = created_at or datetime.now(timezone.utc).isoformat()
+        self.version = hashlib.sha256(
+            self.mean.tobytes() + self.components.tobytes()
+        ).hexdigest()[:12]
+
+    @property
+    def dimension(self) -> int:
+        return self.components.shape[0]
+
+    @property
+    def dims(self) -> int:
+        return self.components.shape[1]
+
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        """(N, dimension) 또는 (dimension,) → 축소 공간"""
+        return (np.asarray(vectors, dtype=np.float32) - self.mean) @ self.components
+
+    def reduce_matrix(self, matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        인덱스 행렬 축소
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: (축소 행렬, 행별 제곱 노름)
+        """
+        reduced = np.ascontiguousarray(self.project(matrix))
+        return reduced, np.einsum("ij,ij->i", reduced, reduced)
+
+    def candidates(
+        self,
+        reduced: np.ndarray,
+        squared_norms: np.ndarray,
+        query: np.ndarray,
+        count: int,
+    ) -> np.ndarray:
+        """
+        축소 공간에서 가까운 후보 행 위치 (순서 없음)
+
+        Args:
+            reduced: 축소 행렬
+            squared_norms: 축소 행렬 행별 제곱 노름
+            query: 정규화된 쿼리 벡터 (전체 차원)
+            count: 후보 수
+        """
+        scores = 2.0 * (reduced @ self.project(query)) - squared_norms
+        if count >= scores.shape[0]:
+            return np.arange(scores.shape[0])
+        return np.argpartition(-scores, count - 1)[:count]
+
+    def save(self, path: str) -> None:
+        """npz로 저장 (메타데이터는 JSON 문자열)"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        meta = {
+            "method": self.method,
+            "model_version": self.model_version,
+            "fitted_rows": self.fitted_rows,
+            "explained_variance": self.explained_variance,
+            "created_at": self.created_at,
+            "version": self.version,
+        }
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                mean=self.mean,
+                components=self.components,
+                meta=np.array(json.dumps(meta)),
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "EmbeddingProjection":
+        """npz 아티팩트 로드"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            return cls(
+                mean=data["mean"],
+                components=data["components"],
+                method=meta["method"],
+                model_version=meta.get("model_version"),
+                fitted_rows=meta.get("fitted_rows", 0),
+                explained_variance=meta.get("explained_variance"),
+                created_at=meta.get("created_at"),
+            )
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "method": self.method,
+            "dims": self.dims,
+            "model_version": self.model_version,
+            "fitted_rows": self.fitted_rows,
+            "explained_variance": self.explained_variance,
+        }
+
+
+def load_embeddings(db, model_version: Optional[str] = None) -> np.ndarray:
+    """
+    artworks.embedding 전체 (L2 정규화, float32)
+
+    Args:
+        db: DB 세션
+        model_version: 해당 모델 임베딩만 (None이면 전체)
+    """
+    model_filter = " AND embedding_model = :model_version" if model_version else ""
+    query = text(
+        f"SELECT embedding FROM artworks WHERE embedding IS NOT NULL{model_filter} ORDER BY id"
+    ).columns(embedding=Vector(384))
+    params = {"model_version": model_version} if model_version else {}
+    rows = db.execute(query, params).scalars().all()
+    if not rows:
+        return np.empty((0, 384), dtype=np.float32)
+
+    matrix = np.vstack([np.asarray(row, dtype=np.float32) for row in rows])
+    return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-8)
+
+
+def fit_pca(
+    matrix: np.ndarray, dims: int, model_version: Optional[str] = None
+) -> EmbeddingProjection:
+    """
+    PCA 투영 학습
+
+    Args:
+        matrix: (N, dimension) L2 정규화된 임베딩
+        dims: 축소 차원
+        model_version: 임베딩 모델 버전
+    """
+    matrix = np.asarray(matrix, dtype=np.float64)
+    if matrix.shape[0] < dims:
+        raise ValueError(
+            f"학습 행 수({matrix.shape[0]})가 축소 차원({dims})보다 적습니다"
+        )
+
+    mean = matrix.mean(axis=0)
+    _, singular_values, vt = np.linalg.svd(matrix - mean, full_matrices=False)
+    variance = singular_values**2
+    explained = float(variance[:dims].sum() / variance.sum())
+    return EmbeddingProjection(
+        mean=mean,
+        components=vt[:dims].T,
+        method="pca",
+        model_version=model_version,
+        fitted_rows=matrix.shape[0],
+        explained_variance=explained,
+    )
+
+
+def fit_random(
+    dimension: int,
+    dims: int,
+    model_version: Optional[str] = None,
+    seed: int = 42,
+) -> EmbeddingProjection:
+    """무작위 직교 투영 (가우시안 행렬 QR 분해)"""
+    rng = np.random.default_rng(seed)
+    q, _ = np.linalg.qr(rng.standard_normal((dimension, dims)))
+    return EmbeddingProjection(
+        mean=np.zeros(dimension),
+        components=q,
+        method="random",
+        model_version=model_version,
+    )
+
+
+# 싱글톤 (EMBEDDING_PROJECTION_PATH 미설정 / 로드 실패 시 None)
+_embedding_projection = None
+_embedding_projection_loaded = False
+
+
+def get_embedding_projection() -> Optional[EmbeddingProjection]:
+    """설정된 차원 축소 투영"""
+    global _embedding_projection, _embedding_projection_loaded
+    if not _embedding_projection_loaded:
+        _embedding_projection_loaded = True
+        path = settings.EMBEDDING_PROJECTION_PATH
+        if path:
+            try:
+                _embedding_projection = EmbeddingProjection.load(path)
+                logger.info(
+                    f"차원 축소 투영 로드: {_embedding_projection.method} "
+                    f"{_embedding_projection.dims}차원 (v{_embedding_projection.version}, "
+                    f"모델 {_embedding_projection.model_version})"
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ 차원 축소 투영 로드 실패 (전체 차원 검색): {e}")
+    return _embedding_projection
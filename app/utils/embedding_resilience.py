@@ -0,0 +1,485 @@
+"""
+임베딩 호출 복원력 (시간 예산 / hedging / 서킷 브레이커)
+
+Lambda가 느려지거나 실패해도 매칭 응답 시간이 시간 예산 안에서 끝나도록 합니다.
+- Deadline: 매칭 요청의 시간 예산 (match_artwork에서 시작 → contextvar로 백엔드/스레드까지 전달)
+- hedging: 첫 호출이 최근 지연 p95를 넘기면 같은 호출을 한 번 더 보내 먼저 끝난 결과 사용
+- CircuitBreaker: 최근 호출의 실패/지연 비율이 높으면 일정 시간 호출하지 않고 바로 실패 (또는 보조 백엔드)
+
+ResilientEmbeddingBackend는 매칭 경로(aembed / aembed_batch)만 감쌉니다.
+작품 임베딩 생성(embed_url / embed_batch 등 백그라운드 작업)은 원래 백엔드를 그대로 호출합니다.
+"""
+
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import logging
+import threading
+import time
+from typing import Iterator, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.utils.embedding_backend import EmbeddingBackend
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingDeadlineExceeded(TimeoutError):
+    """매칭 요청의 시간 예산 안에 임베딩을 만들지 못함"""
+
+
+class EmbeddingBackendUnavailable(RuntimeError):
+    """서킷 브레이커가 열려 있고 보조 백엔드가 없음"""
+
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Deadline:
+    """요청 시간 예산 (monotonic 기준 만료 시각)"""
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """남은 시간 (초, 만료 시 0)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+_current_deadline: ContextVar[Optional[Deadline]] = ContextVar(
+    "embedding_deadline", default=None
+)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """
+    현재 컨텍스트의 시간 예산 설정
+
+    asyncio 태스크 / asyncio.to_thread는 컨텍스트를 복사하므로
+    이 안에서 시작한 임베딩 호출(HuggingFace 재시도 대기 등)도 같은 예산을 봅니다.
+    바깥 예산이 더 짧으면 바깥 예산을 유지합니다.
+    """
+    outer = _current_deadline.get()
+    if deadline is None or (
+        outer is not None and outer.expires_at <= deadline.expires_at
+    ):
+        deadline = outer
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """현재 컨텍스트의 시간 예산 (없으면 None)"""
+    return _current_deadline.get()
+
+
+def bounded_timeout(default: float, what: str = "임베딩") -> float:
+    """
+    블로킹 호출 타임아웃 (기본값과 남은 예산 중 짧은 쪽)
+
+    Raises:
+        EmbeddingDeadlineExceeded: 예산이 이미 만료됨
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return default
+    remaining = deadline.remaining()
+    if remaining <= 0:
+        raise EmbeddingDeadlineExceeded(f"{what} 시간 예산 초과")
+    return min(default, remaining)
+
+
+def sleep_within_deadline(seconds: float, what: str = "임베딩") -> None:
+    """
+    재시도 전 대기 (남은 예산으로는 대기 후 재시도할 수 없으면 바로 실패)
+
+    Raises:
+        EmbeddingDeadlineExceeded: 대기 시간이 남은 예산보다 김
+    """
+    deadline = current_deadline()
+    if deadline is not None and deadline.remaining() <= seconds:
+        raise EmbeddingDeadlineExceeded(
+            f"{what} 재시도 대기 {seconds:.0f}초가 남은 시간 예산을 넘습니다"
+        )
+    time.sleep(seconds)
+
+
+class CircuitBreaker:
+    """
+    서킷 브레이커 (closed → open → half_open)
+
+    - closed: 최근 window번 호출 중 실패(예외 / 시간 초과 / slow_ms 초과) 비율이
+      failure_rate 이상이면 (min_calls번 이상 기록 시) open
+    - open: open_seconds 동안 호출 차단
+    - half_open: 시험 호출 1개만 허용 → 성공하면 closed, 실패하면 다시 open
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        slow_ms: float = 8000.0,
+        open_seconds: float = 30.0,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_ms = slow_ms
+        self.open_seconds = open_seconds
+        self.state = self.CLOSED
+        self._outcomes = deque(maxlen=window)
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """호출 허용 여부 (open 시간이 지나면 시험 호출 1개 허용)"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.open_seconds:
+                    self.rejected += 1
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_in_flight = False
+
+            if self.state == self.HALF_OPEN:
+                if self._probe_in_flight:
+                    self.rejected += 1
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record(self, ok: bool, latency_ms: Optional[float] = None) -> None:
+        """
+        호출 결과 기록
+
+        Args:
+            ok: 성공 여부
+            latency_ms: 지연 시간 (slow_ms 초과면 성공이어도 실패로 집계)
+        """
+        failed = not ok or (latency_ms is not None and latency_ms > self.slow_ms)
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+                if failed:
+                    self._trip()
+                else:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"✅ 임베딩 서킷 닫힘 ({self.name}): 시험 호출 성공")
+                return
+
+            self._outcomes.append(failed)
+            if self.state == self.CLOSED and len(self._outcomes) >= self.min_calls:
+                rate = sum(self._outcomes) / len(self._outcomes)
+                if rate >= self.failure_rate:
+                    self._trip()
+
+    def abandon(self) -> None:
+        """
+        결과 없이 끝난 시험 호출 (요청 취소 / 시간 예산으로 wait_for가 취소)
+
+        half_open 시험 호출이 기록 없이 사라지면 이후 호출이 모두 차단되므로
+        시험 호출 자리를 비워 다음 호출이 다시 시험하게 합니다.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probe_in_flight = False
+
+    def _trip(self) -> None:
+        self.state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+        logger.warning(
+            f"🚫 임베딩 서킷 열림 ({self.name}): {self.open_seconds:.0f}초 동안 호출 차단"
+        )
+
+    def retry_after(self) -> int:
+        """다시 시도할 수 있을 때까지 남은 시간 (초, Retry-After 헤더용)"""
+        if self.state != self.OPEN:
+            return 0
+        remaining = self.open_seconds - (time.monotonic() - self._opened_at)
+        return max(1, int(np.ceil(remaining)))
+
+    def stats(self) -> dict:
+        with self._lock:
+            outcomes = list(self._outcomes)
+        return {
+            "state": self.state,
+            "recent_calls": len(outcomes),
+            "recent_failure_rate": (
+                round(sum(outcomes) / len(outcomes), 4) if outcomes else 0.0
+            ),
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
+
+
+class ResilientEmbeddingBackend(EmbeddingBackend):
+    """
+    매칭용 임베딩 호출 감싸기 (시간 예산 + hedging + 서킷 브레이커 + 보조 백엔드)
+
+    aembed:
+    1. 서킷이 열려 있으면 보조 백엔드 (없으면 EmbeddingBackendUnavailable)
+    2. 주 백엔드 호출, hedge_delay()까지 끝나지 않으면 같은 호출을 한 번 더 보내 먼저 성공한 결과 사용
+    3. 주 백엔드 실패 시 남은 예산 안에서 보조 백엔드
+    시간 예산을 넘기면 EmbeddingDeadlineExceeded (남은 호출은 기다리지 않음)
+    """
+
+    def __init__(
+        self,
+        primary: EmbeddingBackend,
+        fallback: Optional[EmbeddingBackend] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        hedge_enabled: bool = True,
+        hedge_percentile: float = 95.0,
+        hedge_min_ms: float = 200.0,
+        hedge_default_ms: float = 1500.0,
+        latency_window: int = 200,
+        min_samples: int = 20,
+    ):
+        self.primary = primary
+        self.fallback = fallback
+        self.name = primary.name
+        self.dimension = primary.dimension
+        self.breaker = breaker or CircuitBreaker(primary.name)
+        self.hedge_enabled = hedge_enabled
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_ms = hedge_min_ms
+        self.hedge_default_ms = hedge_default_ms
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=latency_window)
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.fallbacks = 0
+        self.deadline_exceeded = 0
+        self.failures = 0
+
+    # 백그라운드 작품 임베딩 생성은 원래 백엔드 그대로
+    def embed(self, image_bytes: bytes) -> np.ndarray:
+        return self.primary.embed(image_bytes)
+
+    def embed_batch(self, images: List[bytes]) -> List[np.ndarray]:
+        return self.primary.embed_batch(images)
+
+    def embed_url(self, image_url: str, max_size: int = 800) -> np.ndarray:
+        return self.primary.embed_url(image_url, max_size)
+
+    async def aembed_url(self, image_url: str, max_size: int = 800) -> np.ndarray:
+        return await self.primary.aembed_url(image_url, max_size)
+
+    def hedge_delay(self) -> float:
+        """hedge 호출까지 대기 시간 (초, 최근 성공 지연의 p{hedge_percentile})"""
+        latencies = list(self._latencies)
+        if len(latencies) < self.min_samples:
+            delay_ms = self.hedge_default_ms
+        else:
+            delay_ms = float(np.percentile(latencies, self.hedge_percentile))
+        return max(self.hedge_min_ms, delay_ms) / 1000
+
+    async def aembed(self, image_bytes: bytes) -> np.ndarray:
+        self.calls += 1
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired:
+            self.deadline_exceeded += 1
+            raise EmbeddingDeadlineExceeded("임베딩 시간 예산 초과")
+
+        if not self.breaker.allow():
+            return await self._fallback(lambda: self.fallback.aembed(image_bytes))
+        probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+
+        try:
+            return await self._hedged(image_bytes, deadline)
+        except asyncio.CancelledError:
+            if probe:
+                self.breaker.abandon()
+            raise
+        except EmbeddingDeadlineExceeded:
+            raise
+        except Exception as e:
+            if self.fallback is None:
+                raise
+            logger.warning(f"⚠️ 임베딩 실패 ({self.name}), 보조 백엔드 사용: {e}")
+            return await self._fallback(lambda: self.fallback.aembed(image_bytes))
+
+    async def aembed_batch(self, images: List[bytes]) -> List[np.ndarray]:
+        """배치는 hedge 없이 (호출 비용이 큼) 시간 예산 + 서킷 브레이커만"""
+        if not images:
+            return []
+        self.calls += 1
+        deadline = current_deadline()
+        if not self.breaker.allow():
+            return await self._fallback(lambda: self.fallback.aembed_batch(images))
+        probe = self.breaker.state == CircuitBreaker.HALF_OPEN
+
+        started = time.perf_counter()
+        try:
+            embeddings = await self._within(self.primary.aembed_batch(images), deadline)
+        except asyncio.CancelledError:
+            # 바깥 wait_for / 요청 취소: 결과를 모르므로 기록하지 않고 시험 호출 자리만 비움
+            if probe:
+                self.breaker.abandon()
+            raise
+        except EmbeddingDeadlineExceeded:
+            self.breaker.record(False)
+            raise
+        except Exception as e:
+            self.breaker.record(False)
+            self.failures += 1
+            if self.fallback is None:
+                raise
+            logger.warning(f"⚠️ 임베딩 배치 실패 ({self.name}), 보조 백엔드 사용: {e}")
+            return await self._fallback(lambda: self.fallback.aembed_batch(images))
+
+        self.breaker.record(True, (time.perf_counter() - started) * 1000)
+        return embeddings
+
+    async def _within(self, awaitable, deadline: Optional[Deadline]):
+        """시간 예산 안에서 대기"""
+        if deadline is None:
+            return await awaitable
+        try:
+            return await asyncio.wait_for(awaitable, timeout=deadline.remaining())
+        except asyncio.TimeoutError:
+            self.deadline_exceeded += 1
+            raise EmbeddingDeadlineExceeded("임베딩 시간 예산 초과") from None
+
+    async def _fallback(self, call):
+        """보조 백엔드 호출 (없으면 서킷 차단 오류)"""
+        if self.fallback is None:
+            raise EmbeddingBackendUnavailable(
+                f"임베딩 백엔드({self.name})가 일시적으로 차단되었습니다",
+                retry_after=self.breaker.retry_after(),
+            )
+        self.fallbacks += 1
+        return await self._within(call(), current_deadline())
+
+    async def _hedged(
+        self, image_bytes: bytes, deadline: Optional[Deadline]
+    ) -> np.ndarray:
+        """주 백엔드 호출 + hedge (먼저 성공한 결과)"""
+        started = time.perf_counter()
+        first = asyncio.ensure_future(self.primary.aembed(image_bytes))
+        pending = {first}
+        hedge_at = self.hedge_delay() if self.hedge_enabled else None
+        error: Optional[BaseException] = None
+
+        try:
+            while pending:
+                timeout = None if deadline is None else deadline.remaining()
+                if hedge_at is not None:
+                    until_hedge = max(0.0, hedge_at - (time.perf_counter() - started))
+                    timeout = (
+                        until_hedge if timeout is None else min(timeout, until_hedge)
+                    )
+
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for task in done:
+                    if task.exception() is None:
+                        latency_ms = (time.perf_counter() - started) * 1000
+                        self._latencies.append(latency_ms)
+                        self.breaker.record(True, latency_ms)
+                        if task is not first:
+                            self.hedge_wins += 1
+                        return task.result()
+                    error = task.exception()
+
+                if done:
+                    continue
+
+                if deadline is not None and deadline.expired:
+                    self.deadline_exceeded += 1
+                    self.breaker.record(False)
+                    raise EmbeddingDeadlineExceeded(
+                        f"임베딩 시간 예산 초과 ({self.name}, "
+                        f"{(time.perf_counter() - started) * 1000:.0f}ms)"
+                    )
+
+                if hedge_at is not None:
+                    # 첫 호출이 p95보다 느림 → 같은 호출을 한 번 더 (먼저 끝난 쪽 사용)
+                    hedge_at = None
+                    self.hedges += 1
+                    logger.info(
+                        f"   ⏱️ 임베딩 hedge 호출 ({self.name}, "
+                        f"{(time.perf_counter() - started) * 1000:.0f}ms 경과)"
+                    )
+                    pending.add(asyncio.ensure_future(self.primary.aembed(image_bytes)))
+        finally:
+            # 남은 호출은 기다리지 않음 (스레드는 boto3 읽기 타임아웃 안에서 끝남)
+            for task in pending:
+                task.cancel()
+
+        self.failures += 1
+        self.breaker.record(False)
+        raise error
+
+    def stats(self) -> dict:
+        latencies = list(self._latencies)
+        return {
+            "backend": self.name,
+            "fallback": self.fallback.name if self.fallback else None,
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_delay_ms": round(self.hedge_delay() * 1000, 1),
+            "latency_p50_ms": (
+                round(float(np.percentile(latencies, 50)), 1) if latencies else None
+            ),
+            "fallbacks": self.fallbacks,
+            "failures": self.failures,
+            "deadline_exceeded": self.deadline_exceeded,
+            "breaker": self.breaker.stats(),
+        }
+
+
+def create_resilient_backend(
+    primary: EmbeddingBackend, fallback: Optional[EmbeddingBackend] = None
+) -> ResilientEmbeddingBackend:
+    """설정값으로 매칭용 복원력 백엔드 생성"""
+    return ResilientEmbeddingBackend(
+        primary,
+        fallback=fallback,
+        breaker=CircuitBreaker(
+            primary.name,
+            window=settings.EMBEDDING_BREAKER_WINDOW,
+            min_calls=settings.EMBEDDING_BREAKER_MIN_CALLS,
+            failure_rate=settings.EMBEDDING_BREAKER_FAILURE_RATE,
+            slow_ms=settings.EMBEDDING_BREAKER_SLOW_MS,
+            open_seconds=settings.EMBEDDING_BREAKER_OPEN_SECONDS,
+        ),
+        hedge_enabled=settings.EMBEDDING_HEDGE_ENABLED,
+        hedge_percentile=settings.EMBEDDING_HEDGE_PERCENTILE,
+        hedge_min_ms=settings.EMBEDDING_HEDGE_MIN_MS,
+        hedge_default_ms=settings.EMBEDDING_HEDGE_DEFAULT_MS,
+    )
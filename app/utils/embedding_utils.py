@@ -2,19 +2,47 @@
 작품 임베딩 생성 유틸리티
 
 작품 생성 시 자동으로 임베딩을 생성합니다.
-- BackgroundTasks를 사용하여 비동기 처리
-- S3 이미지 다운로드 → base64 변환 → Lambda 호출 → DB 저장
+- 기본: embedding_jobs 큐에 등록 → 워커 프로세스가 처리 (app/workers/embedding_worker.py)
+- EMBEDDING_JOBS_ENABLED=False: BackgroundTasks를 사용하여 API 프로세스에서 처리
+- 임베딩 백엔드(URL) → DB 저장 → 인메모리 인덱스 갱신
+  - 업로드 직후: 업로드 때 리사이즈해 둔 바이트를 그대로 사용 (다시 받지 않음)
+  - lambda: 우리 버킷 이미지는 Lambda가 S3에서 직접 읽음
+  - 그 외: S3 get_object → 리사이즈(프로세스 풀) → 임베딩
+- 임베딩은 만든 모델 버전과 함께 저장 (전환 직후 이전 모델 결과는 거부 → 재시도)
+- 섀도 모델이 있으면 artworks.embedding_shadow도 채움 (embedding_models.py)
 """
 
-import base64
 import logging
+from typing import Optional, Sequence, Tuple
 
+import numpy as np
+from pgvector.sqlalchemy import Vector
 import requests
-from sqlalchemy import text
+from sqlalchemy import (
+    Integer,
+    String,
+    bindparam,
+    cast,
+    column,
+    func,
+    literal,
+    select,
+    text,
+    update,
+    values,
+)
 from sqlalchemy.orm import Session
 
-from app.db.generate_embeddings import resize_base64_image
-from app.utils.lambda_client import lambda_client
+from app.models.artwork import Artwork
+from app.models.embedding_model import EmbeddingModel
+from app.utils.embedding import get_artwork_embedding_index
+from app.utils.embedding_models import (
+    ACTIVE,
+    SHADOW,
+    StaleEmbeddingModelError,
+    get_embedding_model_registry,
+)
+from app.utils.singleflight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -24,53 +52,378 @@ logger = logging.getLogger(__name__)
 # - reactions: https://lastdance-artworks.s3.ap-northeast-2.amazonaws.com/reactions/test/exhibition_1/visitor_1_1234567890_abc123.jpg
 
 
+# 임베딩 저장 쿼리: 파라미터를 pgvector 타입으로 바인딩 (float32 배열 그대로 전달, str()/CAST 불필요)
+# 임베딩을 만든 모델이 지금도 활성일 때만 저장 (등록된 모델이 없으면 그대로 저장)
+SAVE_EMBEDDING_QUERY = text(
+    """
+    UPDATE artworks
+    SET embedding = :embedding,
+        embedding_model = :model_version,
+        embedding_content_hash = COALESCE(:content_hash, embedding_content_hash),
+        updated_at = now()
+    WHERE id = :id
+        AND :model_version = COALESCE(
+            (SELECT version FROM embedding_models WHERE status = 'active'),
+            :model_version
+        )
+"""
+).bindparams(bindparam("embedding", type_=Vector(384)))
+
+# 섀도 임베딩 저장: 섀도로 등록된 모델일 때만 (updated_at은 그대로 → 인메모리 인덱스 재로드 안 함)
+SAVE_SHADOW_EMBEDDING_QUERY = text(
+    """
+    UPDATE artworks
+    SET embedding_shadow = :embedding,
+        embedding_shadow_model = :model_version,
+        embedding_shadow_content_hash = COALESCE(:content_hash, embedding_content_hash)
+    WHERE id = :id
+        AND EXISTS (
+            SELECT 1 FROM embedding_models
+            WHERE version = :model_version AND status = 'shadow'
+        )
+"""
+).bindparams(bindparam("embedding", type_=Vector(384)))
+
+# 같은 이미지(SHA-256)로 같은 모델 임베딩이 이미 있는 다른 작품에서 복사
+REUSE_EMBEDDING_QUERY = text(
+    """
+    UPDATE artworks a
+    SET embedding = src.embedding,
+        embedding_model = src.embedding_model,
+        embedding_content_hash = src.embedding_content_hash,
+        updated_at = now()
+    FROM (
+        SELECT embedding, embedding_model, embedding_content_hash
+        FROM artworks
+        WHERE embedding_content_hash = :content_hash
+            AND embedding IS NOT NULL
+            AND embedding_model = :model_version
+            AND id <> :id
+        LIMIT 1
+    ) src
+    WHERE a.id = :id
+    RETURNING a.embedding
+"""
+).columns(embedding=Vector(384))
+
+
+def save_artwork_embedding(
+    db: Session,
+    artwork_id: int,
+    embedding,
+    content_hash: Optional[str] = None,
+    model_version: Optional[str] = None,
+) -> None:
+    """
+    작품 임베딩 저장 (commit은 호출자가 담당)
+
+    Args:
+        db: DB 세션
+        artwork_id: 작품 ID
+        embedding: 384차원 임베딩 (np.ndarray 또는 리스트)
+        content_hash: 임베딩을 만든 이미지의 SHA-256 (None이면 기존 값 유지)
+        model_version: 임베딩을 만든 모델 버전 (None이면 현재 활성 버전)
+
+    Raises:
+        StaleEmbeddingModelError: 그 사이 활성 모델이 바뀌었거나 작품이 삭제됨
+    """
+    registry = get_embedding_model_registry()
+    model_version = model_version or registry.active_version()
+
+    result = db.execute(
+        SAVE_EMBEDDING_QUERY,
+        {
+            "embedding": embedding,
+            "content_hash": content_hash,
+            "model_version": model_version,
+            "id": artwork_id,
+        },
+    )
+    if result.rowcount == 0:
+        registry.invalidate()
+        raise StaleEmbeddingModelError(
+            f"Artwork ID {artwork_id} 임베딩 저장 안 됨 "
+            f"(모델 '{model_version}'이 더 이상 활성이 아니거나 작품이 삭제됨)"
+        )
+
+
+def save_shadow_embedding(
+    db: Session,
+    artwork_id: int,
+    embedding,
+    model_version: str,
+    content_hash: Optional[str] = None,
+) -> bool:
+    """
+    섀도 임베딩 저장 (commit은 호출자가 담당)
+
+    Args:
+        db: DB 세션
+        artwork_id: 작품 ID
+        embedding: 섀도 모델 임베딩
+        model_version: 섀도 모델 버전
+        content_hash: 임베딩을 만든 이미지의 SHA-256 (None이면 활성 임베딩의 값)
+
+    Returns:
+        bool: 저장 여부 (섀도 모델이 바뀌었거나 작품이 삭제되면 False)
+    """
+    result = db.execute(
+        SAVE_SHADOW_EMBEDDING_QUERY,
+        {
+            "embedding": embedding,
+            "content_hash": content_hash,
+            "model_version": model_version,
+            "id": artwork_id,
+        },
+    )
+    return result.rowcount > 0
+
+
+def reuse_embedding_by_hash(
+    db: Session, artwork_id: int, content_hash: Optional[str]
+) -> Optional[np.ndarray]:
+    """
+    같은 이미지를 쓰는 다른 작품의 임베딩 복사 (commit은 호출자가 담당)
+
+    Args:
+        db: DB 세션
+        artwork_id: 임베딩을 채울 작품 ID
+        content_hash: 썸네일 SHA-256
+
+    Returns:
+        Optional[np.ndarray]: 복사한 임베딩 (같은 이미지 작품이 없으면 None)
+    """
+    if not content_hash:
+        return None
+
+    row = db.execute(
+        REUSE_EMBEDDING_QUERY,
+        {
+            "content_hash": content_hash,
+            "id": artwork_id,
+            "model_version": get_embedding_model_registry().active_version(),
+        },
+    ).first()
+    if row is None:
+        return None
+    return np.asarray(row.embedding, dtype=np.float32)
+
+
+def save_artwork_embeddings(
+    db: Session,
+    items: Sequence[Tuple[int, object]],
+    model_version: str,
+    shadow: bool = False,
+) -> int:
+    """
+    여러 작품 임베딩을 UPDATE 한 번으로 저장 (commit은 호출자가 담당)
+
+    UPDATE artworks SET ... FROM (VALUES (id, embedding), ...) → 행마다 왕복하지 않음
+    model_version이 지금도 활성(shadow=True면 섀도) 모델일 때만 저장합니다.
+
+    Args:
+        db: DB 세션
+        items: (작품 ID, 384차원 임베딩) 목록
+        model_version: 임베딩을 만든 모델 버전
+        shadow: True면 embedding_shadow 컬럼에 저장
+
+    Returns:
+        int: 갱신된 행 수 (모델이 바뀌었으면 0)
+    """
+    if not items:
+        return 0
+
+    rows = values(
+        column("id", Integer), column("embedding", Vector(384)), name="new_embeddings"
+    ).data([(int(artwork_id), embedding) for artwork_id, embedding in items])
+
+    current_version = (
+        select(EmbeddingModel.version)
+        .where(EmbeddingModel.status == (SHADOW if shadow else ACTIVE))
+        .scalar_subquery()
+    )
+    if shadow:
+        columns = {
+            "embedding_shadow": cast(rows.c.embedding, Vector(384)),
+            "embedding_shadow_model": model_version,
+            "embedding_shadow_content_hash": Artwork.embedding_content_hash,
+        }
+    else:
+        columns = {
+            "embedding": cast(rows.c.embedding, Vector(384)),
+            "embedding_model": model_version,
+            "updated_at": func.now(),
+        }
+        # 등록된 모델이 없으면 그대로 저장
+        current_version = func.coalesce(current_version, model_version)
+
+    result = db.execute(
+        update(Artwork)
+        .where(Artwork.id == rows.c.id)
+        .where(current_version == literal(model_version, String))
+        .values(**columns)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def update_embedding_index(artwork_id: int, embedding, db: Session) -> None:
+    """
+    인메모리 매칭 인덱스에 새 임베딩 반영 (실패해도 임베딩 저장에는 영향 없음)
+
+    Args:
+        artwork_id: 작품 ID
+        embedding: 저장된 임베딩 벡터
+        db: DB 세션
+    """
+    try:
+        get_artwork_embedding_index().upsert(artwork_id, embedding, db)
+    except Exception as e:
+        logger.warning(f"⚠️ 임베딩 인덱스 갱신 실패 (주기적 재로드로 반영): {e}")
+
+
+# 같은 작품 임베딩 생성이 동시에 예약되면 한 번만 실행 (관리자 중복 제출 등)
+embedding_flight = SingleFlight()
+
+
+def _generate_and_save_embedding(
+    artwork_id: int,
+    thumbnail_url: str,
+    title: str,
+    db: Session,
+    update_index: bool = True,
+    content_hash: Optional[str] = None,
+    image_bytes: Optional[bytes] = None,
+) -> None:
+    """
+    임베딩 생성 → DB 저장 → 인메모리 인덱스 갱신 → 섀도 임베딩
+
+    update_index=False: 워커 프로세스처럼 인메모리 인덱스가 없는 곳에서 호출
+    (API 인덱스는 updated_at fingerprint 확인으로 반영)
+    content_hash: 같은 이미지 임베딩이 이미 있으면 Lambda 호출 없이 복사
+    image_bytes: 업로드 시 리사이즈해 둔 이미지 (있으면 썸네일을 다시 받지 않음)
+    """
+    logger.info(f"임베딩 생성 시작: Artwork ID {artwork_id} - '{title}'")
+
+    # 0. 같은 이미지 임베딩 재사용 (예약 이후 다른 작품에서 먼저 생성된 경우)
+    embedding = reuse_embedding_by_hash(db, artwork_id, content_hash)
+    if embedding is not None:
+        db.commit()
+        logger.info(
+            f"♻️  Artwork '{title}' (ID: {artwork_id}) 같은 이미지 임베딩 재사용"
+        )
+        if update_index:
+            update_embedding_index(artwork_id, embedding, db)
+        generate_shadow_embedding(
+            artwork_id, thumbnail_url, db, content_hash, image_bytes
+        )
+        return
+
+    # 1. 임베딩 생성 (활성 모델)
+    #    - 업로드 바이트 있음: 그대로 사용
+    #    - 없음: Lambda S3 모드 / S3 get_object 후 HuggingFace·로컬 ONNX
+    model_version, backend = get_embedding_model_registry().active()
+    if image_bytes:
+        logger.info(
+            f"임베딩 생성 중 ({backend.name}, {model_version}): 업로드 이미지 재사용"
+        )
+        embedding = backend.embed(image_bytes)
+    else:
+        logger.info(
+            f"임베딩 생성 중 ({backend.name}, {model_version}): {thumbnail_url}"
+        )
+        embedding = backend.embed_url(thumbnail_url, max_size=800)
+    logger.info(f"임베딩 생성 완료: {len(embedding)}차원")
+
+    # 2. DB 저장 (raw SQL 사용, 그 사이 모델이 전환됐으면 StaleEmbeddingModelError)
+    save_artwork_embedding(db, artwork_id, embedding, content_hash, model_version)
+    db.commit()
+
+    logger.info(f"✅ Artwork '{title}' (ID: {artwork_id}) 임베딩 저장 완료")
+
+    # 3. 인메모리 매칭 인덱스 갱신
+    if update_index:
+        update_embedding_index(artwork_id, embedding, db)
+
+    # 4. 섀도 임베딩 (섀도 모델이 있을 때만)
+    generate_shadow_embedding(artwork_id, thumbnail_url, db, content_hash, image_bytes)
+
+
+def generate_shadow_embedding(
+    artwork_id: int,
+    thumbnail_url: str,
+    db: Session,
+    content_hash: Optional[str] = None,
+    image_bytes: Optional[bytes] = None,
+) -> bool:
+    """
+    섀도 모델 임베딩 생성 → artworks.embedding_shadow 저장
+
+    실패해도 활성 임베딩에는 영향 없음 (전환 전 generate_missing_embeddings.py --shadow로 채움)
+
+    Returns:
+        bool: 저장 여부 (섀도 모델이 없으면 False)
+    """
+    shadow = get_embedding_model_registry().shadow()
+    if shadow is None:
+        return False
+
+    model_version, backend = shadow
+    try:
+        if image_bytes:
+            embedding = backend.embed(image_bytes)
+        else:
+            embedding = backend.embed_url(thumbnail_url, max_size=800)
+        saved = save_shadow_embedding(
+            db, artwork_id, embedding, model_version, content_hash
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(
+            f"⚠️ Artwork ID {artwork_id} 섀도 임베딩 생성 실패 ({model_version}): {e}"
+        )
+        return False
+
+    if saved:
+        logger.info(f"🌓 Artwork ID {artwork_id} 섀도 임베딩 저장 ({model_version})")
+    return saved
+
+
 def generate_embedding_background(
-    artwork_id: int, thumbnail_url: str, title: str, db: Session
+    artwork_id: int,
+    thumbnail_url: str,
+    title: str,
+    db: Session,
+    content_hash: Optional[str] = None,
+    image_bytes: Optional[bytes] = None,
 ) -> None:
     """
     백그라운드에서 작품 임베딩 생성
 
+    같은 작품 + 같은 이미지(content_hash) 작업이 이미 진행 중이면 새로 생성하지 않고 완료를 기다립니다.
+    (썸네일 S3 키는 업로드마다 uuid가 붙어 달라지므로 키에 쓰지 않음)
+
     Args:
         artwork_id: 작품 ID
         thumbnail_url: 썸네일 S3 URL
         title: 작품 제목
         db: DB 세션 (BackgroundTasks에서는 새 세션 필요)
+        content_hash: 썸네일 SHA-256 (임베딩과 함께 저장)
+        image_bytes: 업로드 시 리사이즈해 둔 이미지 (없으면 S3에서 읽음)
     """
     try:
-        logger.info(f"임베딩 생성 시작: Artwork ID {artwork_id} - '{title}'")
-
-        # 1. 썸네일 다운로드
-        logger.info(f"이미지 다운로드: {thumbnail_url}")
-        response = requests.get(thumbnail_url, timeout=10)
-        response.raise_for_status()
-
-        # 2. base64 변환 & 리사이즈
-        image_base64 = base64.b64encode(response.content).decode()
-        image_base64 = resize_base64_image(image_base64, max_size=800)
-
-        size_mb = len(image_base64) / 1024 / 1024
-        logger.info(f"이미지 크기: {size_mb:.2f}MB")
-
-        # 3. Lambda로 임베딩 생성
-        logger.info("Lambda 호출: 임베딩 생성 중...")
-        embedding = lambda_client.generate_embedding(image_base64)
-        logger.info(f"임베딩 생성 완료: {len(embedding)}차원")
-
-        # 4. DB 저장 (raw SQL 사용)
-        db.execute(
-            text(
-                """
-                UPDATE artworks
-                SET embedding = CAST(:embedding AS vector),
-                    updated_at = now()
-                WHERE id = :id
-            """
+        embedding_flight.do(
+            (artwork_id, content_hash),
+            lambda: _generate_and_save_embedding(
+                artwork_id,
+                thumbnail_url,
+                title,
+                db,
+                content_hash=content_hash,
+                image_bytes=image_bytes,
             ),
-            {"embedding": str(embedding), "id": artwork_id},
         )
-        db.commit()
-
-        logger.info(f"✅ Artwork '{title}' (ID: {artwork_id}) 임베딩 저장 완료")
 
     except requests.RequestException as e:
         logger.error(f"⚠️ Artwork '{title}' 이미지 다운로드 실패: {e}")
@@ -100,32 +453,18 @@ async def generate_embedding_sync(
     try:
         logger.info(f"임베딩 생성 시작: Artwork ID {artwork_id} - '{title}'")
 
-        # 1. 썸네일 다운로드
-        response = requests.get(thumbnail_url, timeout=10)
-        response.raise_for_status()
-
-        # 2. base64 변환 & 리사이즈
-        image_base64 = base64.b64encode(response.content).decode()
-        image_base64 = resize_base64_image(image_base64, max_size=800)
-
-        # 3. Lambda로 임베딩 생성
-        embedding = lambda_client.generate_embedding(image_base64)
-
-        # 4. DB 저장
-        db.execute(
-            text(
-                """
-                UPDATE artworks
-                SET embedding = CAST(:embedding AS vector),
-                    updated_at = now()
-                WHERE id = :id
-            """
-            ),
-            {"embedding": str(embedding), "id": artwork_id},
-        )
+        # 1. 임베딩 생성 (Lambda S3 모드 / 다운로드 후 HuggingFace·로컬 ONNX)
+        model_version, backend = get_embedding_model_registry().active()
+        embedding = await backend.aembed_url(thumbnail_url, max_size=800)
+
+        # 2. DB 저장
+        save_artwork_embedding(db, artwork_id, embedding, model_version=model_version)
         db.commit()
 
         logger.info(f"✅ Artwork '{title}' 임베딩 저장 완료")
+
+        # 3. 인메모리 매칭 인덱스 갱신
+        update_embedding_index(artwork_id, embedding, db)
         return True
 
     except Exception as e:
@@ -0,0 +1,84 @@
+"""
+DINOv2-small ONNX 내보내기 스크립트 (로컬 onnx 임베딩 백엔드용)
+
+facebook/dinov2-small을 배치 크기가 가변인 ONNX 그래프로 내보냅니다.
+출력은 CLS 토큰 임베딩 (N, 384)입니다.
+
+사용법:
+    docker-compose run --rm api python app/utils/export_onnx_model.py
+    docker-compose run --rm api python app/utils/export_onnx_model.py --output models/dinov2-small.onnx
+"""
+
+import sys
+
+sys.path.insert(0, "/app")
+
+import argparse
+import logging
+import os
+
+import torch
+from transformers import AutoModel
+
+from app.config import settings
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+class ClsEmbeddingModel(torch.nn.Module):
+    """last_hidden_state에서 CLS 토큰만 반환하는 래퍼"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values):
+        return self.model(pixel_values=pixel_values).last_hidden_state[:, 0, :]
+
+
+def export(model_name: str, output_path: str, opset: int = 17) -> None:
+    """
+    ONNX 모델 내보내기
+
+    Args:
+        model_name: HuggingFace 모델 이름
+        output_path: 저장 경로
+        opset: ONNX opset 버전
+    """
+    logger.info(f"🦖 모델 로딩 중: {model_name}")
+    model = ClsEmbeddingModel(AutoModel.from_pretrained(model_name)).eval()
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+
+    logger.info(f"🔄 ONNX 내보내기: {output_path}")
+    dummy = torch.randn(1, 3, 224, 224)
+    torch.onnx.export(
+        model,
+        (dummy,),
+        output_path,
+        input_names=["pixel_values"],
+        output_names=["embedding"],
+        dynamic_axes={"pixel_values": {0: "batch"}, "embedding": {0: "batch"}},
+        opset_version=opset,
+    )
+
+    size_mb = os.path.getsize(output_path) / 1024 / 1024
+    logger.info(f"✅ 내보내기 완료: {output_path} ({size_mb:.1f}MB)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DINOv2 ONNX 내보내기")
+    parser.add_argument("--model", default="facebook/dinov2-small")
+    parser.add_argument("--output", default=settings.ONNX_MODEL_PATH)
+    parser.add_argument("--opset", type=int, default=17)
+    args = parser.parse_args()
+
+    export(args.model, args.output, args.opset)
+
+
+if __name__ == "__main__":
+    main()
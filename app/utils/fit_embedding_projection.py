@@ -0,0 +1,90 @@
+"""
+작품 임베딩 차원 축소 투영 학습 스크립트
+
+artworks.embedding(활성 모델)으로 PCA (또는 무작위 직교 투영)를 학습해 npz 아티팩트로 저장합니다.
+저장 후 EMBEDDING_PROJECTION_PATH에 경로를 설정하면 API 인메모리 인덱스가 후보 검색에 사용합니다.
+아티팩트에는 학습한 모델 버전이 기록되어, 모델 전환 후에는 다시 학습할 때까지 사용되지 않습니다.
+
+사용법:
+    docker-compose run --rm api python app/utils/fit_embedding_projection.py
+    docker-compose run --rm api python app/utils/fit_embedding_projection.py --dims 128
+    docker-compose run --rm api python app/utils/fit_embedding_projection.py --method random --output models/projection-random64.npz
+"""
+
+import sys
+
+sys.path.insert(0, "/app")
+
+import argparse
+import logging
+
+from app.database import SessionLocal
+from app.utils.embedding_models import get_embedding_model_registry
+from app.utils.embedding_projection import (
+    METHODS,
+    fit_pca,
+    fit_random,
+    load_embeddings,
+)
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작품 임베딩 차원 축소 투영 학습")
+    parser.add_argument("--dims", type=int, default=64)
+    parser.add_argument("--method", choices=METHODS, default="pca")
+    parser.add_argument("--seed", type=int, default=42, help="random 투영 시드")
+    parser.add_argument("--output", default=None, help="저장 경로 (.npz)")
+    args = parser.parse_args()
+
+    model_version = get_embedding_model_registry().active_version()
+
+    logger.info("=" * 60)
+    logger.info("📐 작품 임베딩 차원 축소 투영 학습")
+    logger.info("=" * 60)
+    logger.info(f"  - 모델: {model_version}")
+    logger.info(f"  - 방식: {args.method}, 384 → {args.dims}차원")
+
+    db = SessionLocal()
+    try:
+        matrix = load_embeddings(db, model_version)
+    finally:
+        db.close()
+    logger.info(f"  - 임베딩: {matrix.shape[0]}개")
+
+    if args.method == "pca":
+        projection = fit_pca(matrix, args.dims, model_version=model_version)
+        logger.info(f"  - 설명 분산: {projection.explained_variance:.2%}")
+    else:
+        projection = fit_random(
+            matrix.shape[1], args.dims, model_version=model_version, seed=args.seed
+        )
+        projection.fitted_rows = matrix.shape[0]
+
+    output = (
+        args.output
+        or f"models/embedding-projection-{model_version}-{args.method}{args.dims}-{projection.version}.npz"
+    )
+    projection.save(output)
+
+    logger.info(f"\n✅ 저장 완료: {output} (v{projection.version})")
+    logger.info(f"   EMBEDDING_PROJECTION_PATH={output} 설정 후 API를 재시작하세요.")
+    logger.info(
+        "   recall 확인: python app/utils/benchmark_embedding_projection.py "
+        f"--dims {args.dims}"
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n\n⚠️  사용자에 의해 중단되었습니다.")
+    except Exception as e:
+        logger.error(f"\n❌ 예상치 못한 오류: {e}", exc_info=True)
+        raise
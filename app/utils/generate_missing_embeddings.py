@@ -1,28 +1,49 @@
 """
 작품 임베딩 일괄 생성 스크립트 (Lambda 사용)
 
-Lambda 함수를 호출하여 임베딩을 생성합니다.
+단계별 파이프라인으로 처리합니다 (단계마다 큐 크기 제한 → 메모리 일정):
+
+    [조회] keyset 페이지네이션 (id > 마지막 id)
+      → [준비] N개 스레드: 우리 버킷은 S3 참조만, 외부 URL은 다운로드 + 리사이즈 (디코딩 1회)
+      → [임베딩] 배치로 묶어 Lambda 동시 호출 (1회 호출 = 1회 forward pass)
+      → [저장] 여러 행을 UPDATE 한 번으로 저장
+
+- 기본: 활성 모델 임베딩이 없는 작품만 처리 → 중단 후 다시 실행하면 남은 작품부터 이어서 처리
+- --shadow: 섀도 모델로 artworks.embedding_shadow 채우기 (매칭은 계속 활성 모델 사용)
+  → 다 채운 뒤 app/utils/switch_embedding_model.py switch로 전환
+- --all: 모든 작품 재생성, 완료 위치를 체크포인트 파일에 기록해 이어서 처리
 
 사용법:
     docker-compose run --rm api python app/utils/generate_missing_embeddings.py
+    docker-compose run --rm api python app/utils/generate_missing_embeddings.py --dry-run
+    docker-compose run --rm api python app/utils/generate_missing_embeddings.py --shadow
+    docker-compose run --rm api python app/utils/generate_missing_embeddings.py --all --checkpoint /app/embedding_backfill.ckpt
 """
 
 import sys
 
 sys.path.insert(0, "/app")
 
+import argparse
 import base64
-from io import BytesIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import logging
+import os
+import queue
+import threading
+import time
+from typing import List, Optional
 
-from PIL import Image
 import requests
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
-from app.db.generate_embeddings import resize_base64_image
-from app.utils.lambda_client import lambda_client
+from app.utils.embedding_backend import LambdaEmbeddingBackend
+from app.utils.embedding_models import get_embedding_model_registry
+from app.utils.embedding_utils import save_artwork_embeddings
+from app.utils.image_processing import preprocess_image_bytes
 
 # 로깅 설정
 logging.basicConfig(
@@ -36,115 +57,473 @@ DATABASE_URL = settings.DATABASE_URL
 engine = create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-
-def get_artworks_without_embedding():
-    """임베딩이 없는 작품 조회"""
+# 단계 종료 신호
+_DONE = object()
+
+
+def target_condition(include_all: bool, shadow: bool) -> str:
+    """처리 대상 조건 (다른 모델 버전으로 만든 임베딩도 대상)"""
+    if include_all:
+        return ""
+    if shadow:
+        return "AND embedding_shadow_model IS DISTINCT FROM :model_version"
+    return "AND (embedding IS NULL OR embedding_model IS DISTINCT FROM :model_version)"
+
+
+def build_page_query(include_all: bool, shadow: bool = False):
+    """keyset 페이지 조회 쿼리 (OFFSET 없이 id 기준으로 다음 페이지)"""
+    condition = target_condition(include_all, shadow)
+    return text(
+        f"""
+        SELECT id, title, thumbnail_url
+        FROM artworks
+        WHERE id > :after_id {condition}
+        ORDER BY id
+        LIMIT :limit
+    """
+    )
+
+
+def count_targets(
+    include_all: bool, after_id: int, model_version: str, shadow: bool = False
+) -> int:
+    """처리 대상 작품 수"""
+    condition = target_condition(include_all, shadow)
     db = SessionLocal()
     try:
-        query = text(
-            """
-            SELECT id, title, thumbnail_url, artist_id
-            FROM artworks
-            WHERE embedding IS NULL
-            ORDER BY id
-        """
-        )
-
-        result = db.execute(query)
-        artworks = result.fetchall()
-
-        logger.info(f"📊 임베딩 생성 대상: {len(artworks)}개 작품")
-        return artworks
-
+        return db.execute(
+            text(f"SELECT COUNT(*) FROM artworks WHERE id > :after_id {condition}"),
+            {"after_id": after_id, "model_version": model_version},
+        ).scalar()
     finally:
         db.close()
 
 
-def generate_embedding_for_artwork(artwork_id: int, title: str, thumbnail_url: str):
-    """작품의 임베딩 생성 (Lambda 사용)"""
-    db = SessionLocal()
+def read_checkpoint(path: Optional[str]) -> int:
+    """체크포인트 파일의 마지막 완료 id (없으면 0)"""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path) as f:
+        content = f.read().strip()
+    return int(content) if content else 0
 
-    try:
-        logger.info(f"{'='*60}")
-        logger.info(f"작품 ID: {artwork_id}")
-        logger.info(f"제목: {title}")
-        logger.info(f"이미지 URL: {thumbnail_url}")
-
-        # 1. 이미지 다운로드
-        logger.info("🔄 이미지 다운로드 중...")
-        response = requests.get(thumbnail_url, timeout=30)
-        response.raise_for_status()
-
-        image = Image.open(BytesIO(response.content)).convert("RGB")
-        logger.info(f"✅ 이미지 다운로드 완료: {image.size}")
-
-        # 2. Base64 변환 및 리사이즈
-        logger.info("🔄 이미지 변환 중...")
-        image_base64 = base64.b64encode(response.content).decode()
-        image_base64 = resize_base64_image(image_base64, max_size=800)
-
-        size_mb = len(image_base64) / 1024 / 1024
-        logger.info(f"✅ 이미지 크기: {size_mb:.2f}MB")
-
-        # 3. Lambda로 임베딩 생성
-        logger.info("🔄 Lambda 호출 중 (임베딩 생성)...")
-        embedding = lambda_client.generate_embedding(image_base64)
 
-        logger.info(f"✅ 임베딩 생성 완료: {len(embedding)}차원")
-
-        # 4. DB 저장
-        logger.info("💾 DB 저장 중...")
-
-        db.execute(
-            text(
-                """
-                UPDATE artworks
-                SET embedding = CAST(:embedding AS vector),
-                    updated_at = NOW()
-                WHERE id = :id
-            """
-            ),
-            {"embedding": str(embedding), "id": artwork_id},
+def write_checkpoint(path: Optional[str], artwork_id: int) -> None:
+    """체크포인트 기록 (임시 파일 → rename으로 원자적 교체)"""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(str(artwork_id))
+    os.replace(tmp_path, path)
+
+
+class Watermark:
+    """
+    이 id 이하는 모두 처리 완료(성공/실패)된 위치
+
+    단계가 동시에 돌아서 완료 순서가 id 순서와 다르므로, 앞쪽이 모두 끝난 지점까지만 전진합니다.
+    """
+
+    def __init__(self, start_id: int):
+        self.value = start_id
+        self._issued = deque()
+        self._finished = set()
+        self._lock = threading.Lock()
+
+    def issue(self, artwork_id: int) -> None:
+        with self._lock:
+            self._issued.append(artwork_id)
+
+    def finish(self, artwork_ids: List[int]) -> int:
+        with self._lock:
+            self._finished.update(artwork_ids)
+            while self._issued and self._issued[0] in self._finished:
+                self.value = self._issued.popleft()
+                self._finished.discard(self.value)
+            return self.value
+
+
+class Progress:
+    """진행률 / 처리율 집계"""
+
+    def __init__(self, total: int, interval: float):
+        self.total = total
+        self.interval = interval
+        self.saved = 0
+        self.failed = 0
+        self.s3_refs = 0
+        self.downloads = 0
+        self.lambda_calls = 0
+        self.failed_ids: List[int] = []
+        self.started = time.monotonic()
+        self._last_report = self.started
+        self._lock = threading.Lock()
+
+    def add(self, name: str, count: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def fail(self, artwork_id: int, reason: str) -> None:
+        logger.error(f"❌ [{artwork_id}] {reason}")
+        with self._lock:
+            self.failed += 1
+            self.failed_ids.append(artwork_id)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    @property
+    def rate(self) -> float:
+        return self.saved / self.elapsed if self.elapsed > 0 else 0.0
+
+    def report(self, force: bool = False) -> None:
+        now = time.monotonic()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+
+        processed = self.saved + self.failed
+        percent = processed / self.total * 100 if self.total else 100.0
+        remaining = max(0, self.total - processed)
+        eta = f"{remaining / self.rate:.0f}초" if self.rate > 0 else "-"
+        logger.info(
+            f"📈 진행: {processed}/{self.total} ({percent:.1f}%) | "
+            f"저장 {self.saved}, 실패 {self.failed} | "
+            f"{self.rate:.1f}개/초 | 남은 시간 ~{eta}"
         )
-        db.commit()
 
-        logger.info(f"✅ '{title}' (ID: {artwork_id}) 임베딩 저장 완료!")
-        return True
 
-    except requests.RequestException as e:
-        logger.error(f"❌ 이미지 다운로드 실패: {e}")
-        db.rollback()
-        return False
+class BackfillPipeline:
+    """조회 → 준비 → 임베딩 → 저장 파이프라인"""
+
+    def __init__(self, args, start_id: int, total: int, model_version: str, client):
+        self.args = args
+        self.page_query = build_page_query(args.all, args.shadow)
+        self.model_version = model_version
+        self.client = client
+        self.start_id = start_id
+        self.watermark = Watermark(start_id)
+        self.progress = Progress(total, args.progress_interval)
+
+        # 단계 사이 큐 (크기 제한 → 앞 단계가 너무 앞서가지 않음)
+        self.fetch_queue: queue.Queue = queue.Queue(maxsize=args.page_size * 2)
+        self.embed_queue: queue.Queue = queue.Queue(maxsize=args.batch_size * 4)
+        self.write_queue: queue.Queue = queue.Queue(maxsize=args.lambda_concurrency * 2)
+
+        self._http = threading.local()
+        self._stop = threading.Event()
+
+    # 1. 조회
+    def produce(self) -> None:
+        after_id = self.start_id
+        fetched = 0
+        try:
+            while not self._stop.is_set():
+                db = SessionLocal()
+                try:
+                    rows = db.execute(
+                        self.page_query,
+                        {
+                            "after_id": after_id,
+                            "limit": self.args.page_size,
+                            "model_version": self.model_version,
+                        },
+                    ).fetchall()
+                finally:
+                    db.close()
+
+                if not rows:
+                    break
+
+                for row in rows:
+                    if self.args.limit and fetched >= self.args.limit:
+                        return
+                    self.watermark.issue(row.id)
+                    self.fetch_queue.put(row)
+                    fetched += 1
+
+                after_id = rows[-1].id
+        finally:
+            for _ in range(self.args.download_concurrency):
+                self.fetch_queue.put(_DONE)
+
+    # 2. 준비
+    def _session(self) -> requests.Session:
+        """스레드별 HTTP 세션 (연결 재사용)"""
+        if not hasattr(self._http, "session"):
+            self._http.session = requests.Session()
+        return self._http.session
+
+    def prepare_item(self, row):
+        """Lambda 배치 요청 항목 (S3 참조 또는 리사이즈된 base64)"""
+        if not row.thumbnail_url:
+            raise ValueError("썸네일 URL 없음")
+
+        reference = self.client.s3_reference(row.thumbnail_url)
+        if reference is not None:
+            self.progress.add("s3_refs")
+            return reference
+
+        response = self._session().get(row.thumbnail_url, timeout=30)
+        response.raise_for_status()
 
-    except Exception as e:
-        logger.error(f"❌ 임베딩 생성 실패: {e}", exc_info=True)
-        db.rollback()
-        return False
+        resized = preprocess_image_bytes(
+            response.content, max_size=800, max_pixels=settings.IMAGE_MAX_PIXELS
+        )
+        self.progress.add("downloads")
+        return base64.b64encode(resized).decode()
+
+    def prepare(self) -> None:
+        try:
+            while True:
+                row = self.fetch_queue.get()
+                if row is _DONE:
+                    break
+                if self._stop.is_set():
+                    continue
+
+                try:
+                    item = self.prepare_item(row)
+                except requests.RequestException as e:
+                    self._finish_failed(row.id, f"이미지 다운로드 실패: {e}")
+                    continue
+                except Exception as e:
+                    self._finish_failed(row.id, f"이미지 변환 실패: {e}")
+                    continue
+
+                self.embed_queue.put((row.id, row.title, item))
+        finally:
+            self.embed_queue.put(_DONE)
+
+    # 3. 임베딩
+    def embed_batch(self, batch) -> None:
+        items = [item for _, _, item in batch]
+        try:
+            embeddings = self.client.generate_embeddings_batch(
+                items, batch_size=self.args.batch_size
+            )
+            self.progress.add("lambda_calls")
+        except Exception as e:
+            # 배치 중 한 장 때문에 전체가 실패할 수 있으므로 한 장씩 재시도
+            logger.warning(f"⚠️ Lambda 배치 실패 ({len(batch)}개), 개별 재시도: {e}")
+            embeddings = []
+            for artwork_id, _, item in batch:
+                try:
+                    embeddings.extend(self.client.generate_embeddings_batch([item]))
+                    self.progress.add("lambda_calls")
+                except Exception as item_error:
+                    embeddings.append(None)
+                    self._finish_failed(artwork_id, f"임베딩 생성 실패: {item_error}")
+
+        results = [
+            (artwork_id, embedding)
+            for (artwork_id, _, _), embedding in zip(batch, embeddings)
+            if embedding is not None
+        ]
+        if results:
+            self.write_queue.put(results)
+
+    def embed(self) -> None:
+        remaining_producers = self.args.download_concurrency
+        batch = []
+
+        with ThreadPoolExecutor(
+            max_workers=self.args.lambda_concurrency, thread_name_prefix="lambda"
+        ) as executor:
+            # 제출 개수 제한 (동시 호출 수만큼만 대기열에 둠)
+            slots = threading.BoundedSemaphore(self.args.lambda_concurrency * 2)
+
+            def submit(current_batch):
+                slots.acquire()
+                future = executor.submit(self.embed_batch, current_batch)
+                future.add_done_callback(lambda _: slots.release())
+
+            while remaining_producers:
+                try:
+                    entry = self.embed_queue.get(timeout=self.args.flush_seconds)
+                except queue.Empty:
+                    # 입력이 뜸할 때 덜 찬 배치도 흘려보냄
+                    if batch:
+                        submit(batch)
+                        batch = []
+                    continue
+
+                if entry is _DONE:
+                    remaining_producers -= 1
+                    continue
+
+                batch.append(entry)
+                if len(batch) >= self.args.batch_size:
+                    submit(batch)
+                    batch = []
+
+            if batch:
+                submit(batch)
+
+        self.write_queue.put(_DONE)
+
+    # 4. 저장
+    def write(self) -> None:
+        pending = []
+        finished = False
+
+        while not finished:
+            try:
+                entry = self.write_queue.get(timeout=self.args.flush_seconds)
+            except queue.Empty:
+                entry = None
+
+            if entry is _DONE:
+                finished = True
+            elif entry is not None:
+                pending.extend(entry)
+
+            if pending and (
+                finished or entry is None or len(pending) >= self.args.write_batch_size
+            ):
+                self._save(pending)
+                pending = []
+
+            self.progress.report()
+
+    def _save(self, results) -> None:
+        artwork_ids = [artwork_id for artwork_id, _ in results]
+
+        db = SessionLocal()
+        try:
+            saved = save_artwork_embeddings(
+                db, results, self.model_version, shadow=self.args.shadow
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            for artwork_id in artwork_ids:
+                self._finish_failed(artwork_id, f"DB 저장 실패: {e}")
+            return
+        finally:
+            db.close()
+
+        if saved == 0:
+            # 실행 중 모델이 전환됨 → 이후 결과도 저장되지 않으므로 중단
+            logger.error(
+                f"❌ 모델 '{self.model_version}'이 더 이상 대상 모델이 아닙니다"
+            )
+            self._stop.set()
+            for artwork_id in artwork_ids:
+                self._finish_failed(artwork_id, "모델 전환됨")
+            return
+
+        self._finish_saved(artwork_ids)
+
+    def _finish_saved(self, artwork_ids: List[int]) -> None:
+        self.progress.add("saved", len(artwork_ids))
+        write_checkpoint(self.args.checkpoint, self.watermark.finish(artwork_ids))
+
+    def _finish_failed(self, artwork_id: int, reason: str) -> None:
+        self.progress.fail(artwork_id, reason)
+        write_checkpoint(self.args.checkpoint, self.watermark.finish([artwork_id]))
+
+    def run(self) -> None:
+        threads = [threading.Thread(target=self.produce, name="produce")]
+        threads += [
+            threading.Thread(target=self.prepare, name=f"prepare-{i}")
+            for i in range(self.args.download_concurrency)
+        ]
+        threads += [
+            threading.Thread(target=self.embed, name="embed"),
+            threading.Thread(target=self.write, name="write"),
+        ]
+
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=0.5)
+        except KeyboardInterrupt:
+            # 새 작업은 멈추고, 이미 준비된 항목은 저장까지 마무리
+            logger.info("\n⚠️  중단 요청: 진행 중인 배치를 저장한 뒤 종료합니다...")
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        self.progress.report(force=True)
+
+
+def list_targets(args, start_id: int, model_version: str, client) -> None:
+    """--dry-run: 대상만 확인 (다운로드/Lambda 호출/DB 저장 없음)"""
+    page_query = build_page_query(args.all, args.shadow)
+    after_id = start_id
+    s3_refs = external = missing_url = listed = 0
 
+    db = SessionLocal()
+    try:
+        while True:
+            rows = db.execute(
+                page_query,
+                {
+                    "after_id": after_id,
+                    "limit": args.page_size,
+                    "model_version": model_version,
+                },
+            ).fetchall()
+            if not rows:
+                break
+
+            for row in rows:
+                if args.limit and listed >= args.limit:
+                    break
+                listed += 1
+                if not row.thumbnail_url:
+                    missing_url += 1
+                elif client.s3_reference(row.thumbnail_url) is not None:
+                    s3_refs += 1
+                else:
+                    external += 1
+
+            if args.limit and listed >= args.limit:
+                break
+            after_id = rows[-1].id
     finally:
         db.close()
 
+    logger.info(f"\n🔍 dry-run: 대상 {listed}개")
+    logger.info(f"  - S3 직접 읽기: {s3_refs}개")
+    logger.info(f"  - 외부 URL 다운로드: {external}개")
+    logger.info(f"  - 썸네일 없음 (실패 예정): {missing_url}개")
+    logger.info(
+        f"  - 예상 Lambda 호출: {-(-(s3_refs + external) // args.batch_size)}회 "
+        f"(배치 {args.batch_size}개)"
+    )
+
 
-def verify_embeddings():
-    """임베딩 생성 결과 확인"""
+def verify_embeddings(model_version: str, shadow: bool = False):
+    """임베딩 생성 결과 확인 (대상 모델 버전 기준)"""
+    model_column = "embedding_shadow_model" if shadow else "embedding_model"
     db = SessionLocal()
 
     try:
         logger.info("\n" + "=" * 60)
-        logger.info("🔍 임베딩 생성 결과 확인")
+        logger.info(f"🔍 임베딩 생성 결과 확인 (모델 {model_version})")
         logger.info("=" * 60)
 
         query = text(
-            """
-            SELECT 
+            f"""
+            SELECT
                 COUNT(*) as total,
-                COUNT(embedding) as with_embedding,
-                COUNT(*) - COUNT(embedding) as without_embedding
+                COUNT(*) FILTER (WHERE {model_column} = :model_version) as with_embedding,
+                COUNT(*) FILTER (
+                    WHERE {model_column} IS DISTINCT FROM :model_version
+                ) as without_embedding
             FROM artworks
         """
         )
 
-        result = db.execute(query).fetchone()
+        result = db.execute(query, {"model_version": model_version}).fetchone()
         total, with_emb, without_emb = result
 
         logger.info(f"\n📊 작품 임베딩 통계:")
@@ -159,17 +538,18 @@ def verify_embeddings():
 
             # 임베딩 없는 작품 리스트
             query2 = text(
-                """
+                f"""
                 SELECT id, title
                 FROM artworks
-                WHERE embedding IS NULL
+                WHERE {model_column} IS DISTINCT FROM :model_version
                 ORDER BY id
+                LIMIT 50
             """
             )
 
-            artworks = db.execute(query2).fetchall()
+            artworks = db.execute(query2, {"model_version": model_version}).fetchall()
 
-            logger.info("\n임베딩 없는 작품:")
+            logger.info("\n임베딩 없는 작품 (최대 50개):")
             for artwork_id, title in artworks:
                 logger.info(f"  - ID {artwork_id}: {title}")
 
@@ -177,51 +557,163 @@ def verify_embeddings():
         db.close()
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="작품 임베딩 일괄 생성 (Lambda)")
+    parser.add_argument(
+        "--all", action="store_true", help="임베딩이 있는 작품도 재생성"
+    )
+    parser.add_argument(
+        "--shadow",
+        action="store_true",
+        help="섀도 모델로 embedding_shadow 채우기 (전환 준비)",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="대상만 확인 (다운로드/Lambda/DB 저장 없음)",
+    )
+    parser.add_argument(
+        "--checkpoint", default=None, help="마지막 완료 id를 기록할 파일 (이어서 처리)"
+    )
+    parser.add_argument(
+        "--start-after",
+        type=int,
+        default=None,
+        help="이 id 다음부터 처리 (체크포인트보다 우선)",
+    )
+    parser.add_argument(
+        "--limit", type=int, default=0, help="최대 처리 작품 수 (0: 전체)"
+    )
+    parser.add_argument("--page-size", type=int, default=500, help="조회 페이지 크기")
+    parser.add_argument(
+        "--download-concurrency", type=int, default=16, help="동시 다운로드 수"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.LAMBDA_BATCH_SIZE,
+        help="Lambda 1회 호출당 이미지 수",
+    )
+    parser.add_argument(
+        "--lambda-concurrency", type=int, default=4, help="동시 Lambda 호출 수"
+    )
+    parser.add_argument(
+        "--write-batch-size", type=int, default=200, help="UPDATE 1회당 행 수"
+    )
+    parser.add_argument(
+        "--flush-seconds",
+        type=float,
+        default=1.0,
+        help="덜 찬 배치를 흘려보낼 대기 시간",
+    )
+    parser.add_argument(
+        "--progress-interval", type=float, default=10.0, help="진행률 출력 주기 (초)"
+    )
+    return parser.parse_args()
+
+
+def resolve_target(shadow: bool):
+    """
+    대상 모델 버전 + Lambda 클라이언트
+
+    Returns:
+        tuple: (모델 버전, LambdaClient) (설정이 맞지 않으면 None)
+    """
+    registry = get_embedding_model_registry()
+    registry.refresh(force=True)
+
+    model_version = registry.shadow_version() if shadow else registry.active_version()
+    if model_version is None:
+        logger.error(
+            "❌ 섀도 모델이 없습니다: switch_embedding_model.py shadow로 등록하고 "
+            "SHADOW_EMBEDDING_MODEL_VERSION을 설정하세요"
+        )
+        return None
+
+    # 배치 작업은 매칭용 복원력 래퍼(시간 예산 / hedging) 없이 원래 백엔드 사용
+    backend = registry.backend_for(model_version).primary
+    if not isinstance(backend, LambdaEmbeddingBackend):
+        logger.error(
+            f"❌ Lambda 백엔드만 지원합니다 (모델 {model_version}: {backend.name})"
+        )
+        return None
+    return model_version, backend.client
+
+
 def main():
     """메인 실행"""
+    args = parse_args()
+
+    target = resolve_target(args.shadow)
+    if target is None:
+        return
+    model_version, client = target
+
     logger.info("=" * 60)
     logger.info("🚀 작품 임베딩 일괄 생성 스크립트 (Lambda)")
     logger.info("=" * 60)
 
+    start_id = (
+        args.start_after
+        if args.start_after is not None
+        else read_checkpoint(args.checkpoint)
+    )
+
     # 설정 정보 출력
     logger.info(f"\n📋 설정 정보:")
     logger.info(f"  - DATABASE: {settings.POSTGRES_DB}")
     logger.info(f"  - Lambda Region: {settings.AWS_LAMBDA_REGION}")
+    logger.info(f"  - Lambda 함수: {client.function_name}")
     logger.info(f"  - S3 Bucket: {settings.S3_BUCKET_NAME}")
+    logger.info(
+        f"  - 모델: {model_version} ({'섀도 → embedding_shadow' if args.shadow else '활성 → embedding'})"
+    )
+    logger.info(f"  - 대상: {'전체 작품 (재생성)' if args.all else '임베딩 없는 작품'}")
+    logger.info(f"  - 시작 위치: id > {start_id}")
+    logger.info(
+        f"  - 다운로드 {args.download_concurrency}개 동시 | "
+        f"Lambda 배치 {args.batch_size}개 x {args.lambda_concurrency}개 동시 | "
+        f"UPDATE 1회당 {args.write_batch_size}행"
+    )
+
+    if args.dry_run:
+        list_targets(args, start_id, model_version, client)
+        return
 
-    # 임베딩 없는 작품 조회
-    artworks = get_artworks_without_embedding()
+    total = count_targets(args.all, start_id, model_version, args.shadow)
+    if args.limit:
+        total = min(total, args.limit)
 
-    if not artworks:
+    if not total:
         logger.info("\n✅ 모든 작품에 임베딩이 이미 생성되어 있습니다!")
         return
 
-    logger.info(f"\n📝 총 {len(artworks)}개 작품의 임베딩을 생성합니다.")
-    logger.info("⏱️  각 작품당 약 5-10초 소요 예상...\n")
-
-    # 각 작품별 임베딩 생성
-    success_count = 0
-    fail_count = 0
+    logger.info(f"\n📝 총 {total}개 작품의 임베딩을 생성합니다.\n")
 
-    for idx, (artwork_id, title, thumbnail_url, artist_id) in enumerate(artworks, 1):
-        logger.info(f"\n[{idx}/{len(artworks)}] 처리 중...")
-
-        if generate_embedding_for_artwork(artwork_id, title, thumbnail_url):
-            success_count += 1
-        else:
-            fail_count += 1
+    pipeline = BackfillPipeline(args, start_id, total, model_version, client)
+    pipeline.run()
+    progress = pipeline.progress
 
     # 결과 출력
     logger.info("\n" + "=" * 60)
     logger.info("✅ 임베딩 생성 완료!")
     logger.info("=" * 60)
     logger.info(f"\n📊 결과:")
-    logger.info(f"  - 성공: {success_count}개")
-    logger.info(f"  - 실패: {fail_count}개")
-    logger.info(f"  - 전체: {len(artworks)}개")
+    logger.info(f"  - 성공: {progress.saved}개")
+    logger.info(f"  - 실패: {progress.failed}개")
+    logger.info(f"  - 전체: {total}개")
+    logger.info(
+        f"  - S3 직접 읽기: {progress.s3_refs}개, 외부 다운로드: {progress.downloads}개"
+    )
+    logger.info(f"  - Lambda 호출: {progress.lambda_calls}회")
+    logger.info(f"  - 소요 시간: {progress.elapsed:.1f}초 ({progress.rate:.1f}개/초)")
+    logger.info(f"  - 완료 위치: id {pipeline.watermark.value}")
+
+    if progress.failed_ids:
+        logger.info(f"  - 실패한 작품 ID: {sorted(progress.failed_ids)[:50]}")
 
     # 최종 확인
-    verify_embeddings()
+    verify_embeddings(model_version, args.shadow)
 
 
 if __name__ == "__main__":
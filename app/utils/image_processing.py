@@ -0,0 +1,274 @@
+"""
+이미지 전처리 엔진
+
+- Pillow 디코드/리사이즈/JPEG 인코딩을 ProcessPoolExecutor에서 실행
+  → 이벤트 루프를 막지 않고 여러 코어로 분산
+- JPEG는 draft 모드로 목표 크기에 가깝게 바로 디코딩 (DCT 스케일링)
+- EXIF 회전 정보 반영, 픽셀 수 상한으로 decompression bomb 차단
+"""
+
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import hashlib
+import io
+import logging
+import multiprocessing
+import threading
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# EXIF Orientation 태그
+EXIF_ORIENTATION_TAG = 0x0112
+
+
+class ImageTooLargeError(ValueError):
+    """픽셀 수 상한 초과"""
+
+
+def preprocess_image_bytes(
+    image_bytes: bytes,
+    max_size: int = 1024,
+    quality: int = 85,
+    max_pixels: int = 50_000_000,
+) -> bytes:
+    """
+    이미지 리사이즈 + JPEG 재인코딩 (워커 프로세스에서 실행되는 순수 함수)
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        max_size: 최대 가로/세로 크기 (px)
+        quality: JPEG 품질
+        max_pixels: 허용 최대 픽셀 수 (가로 x 세로)
+
+    Returns:
+        bytes: 전처리된 JPEG 이미지 (변환이 필요 없으면 원본)
+
+    Raises:
+        ImageTooLargeError: 픽셀 수 상한 초과
+        PIL.UnidentifiedImageError: 이미지가 아닌 데이터
+    """
+    # 헤더만 읽음 (픽셀 디코딩 전)
+    image = Image.open(io.BytesIO(image_bytes))
+    width, height = image.size
+
+    if width * height > max_pixels:
+        raise ImageTooLargeError(
+            f"이미지 픽셀 수 초과: {width}x{height} (최대 {max_pixels:,}px)"
+        )
+
+    orientation = image.getexif().get(EXIF_ORIENTATION_TAG, 1)
+
+    # 이미 작은 JPEG + 회전 불필요 → 재인코딩 없이 원본 사용
+    if (
+        image.format == "JPEG"
+        and max(width, height) <= max_size
+        and orientation == 1
+        and image.mode == "RGB"
+    ):
+        return image_bytes
+
+    # JPEG draft 모드: 1/2, 1/4, 1/8 스케일로 바로 디코딩
+    if image.format == "JPEG":
+        image.draft("RGB", (max_size, max_size))
+
+    # EXIF 회전 반영
+    image = ImageOps.exif_transpose(image)
+
+    # RGB로 변환
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+
+    # 리사이즈 (비율 유지)
+    image.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+
+    # 이미지 → JPEG
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality, optimize=True)
+    return buffer.getvalue()
+
+
+def compute_dhash(
+    image_bytes: bytes, hash_size: int = 8, max_pixels: int = 50_000_000
+) -> int:
+    """
+    difference hash (dHash): 축소한 흑백 이미지에서 인접 픽셀 밝기 비교
+
+    재촬영/재압축/약간의 각도 차이에는 해밍 거리가 작게 유지됩니다.
+
+    Args:
+        image_bytes: 이미지 바이트
+        hash_size: 해시 한 변 크기 (hash_size^2 비트)
+        max_pixels: 허용 최대 픽셀 수
+
+    Returns:
+        int: hash_size^2 비트 해시 (8이면 64비트)
+
+    Raises:
+        ImageTooLargeError: 픽셀 수 상한 초과
+        PIL.UnidentifiedImageError: 이미지가 아닌 데이터
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    width, height = image.size
+
+    if width * height > max_pixels:
+        raise ImageTooLargeError(
+            f"이미지 픽셀 수 초과: {width}x{height} (최대 {max_pixels:,}px)"
+        )
+
+    # JPEG는 1/8 스케일로 바로 디코딩
+    if image.format == "JPEG":
+        image.draft("L", (hash_size * 8, hash_size * 8))
+
+    image = ImageOps.exif_transpose(image).convert("L")
+    image = image.resize((hash_size + 1, hash_size), Image.Resampling.BOX)
+
+    pixels = image.tobytes()
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+
+def compute_content_hash(image_bytes: bytes) -> str:
+    """
+    이미지 내용 해시 (SHA-256 hex)
+
+    완전히 같은 파일인지 판단 (임베딩 재사용/재생성 생략용).
+    비슷한 이미지 판단은 compute_dhash 사용.
+    """
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+class ImagePreprocessor:
+    """
+    프로세스 풀 기반 이미지 전처리기
+
+    - max_workers: 워커 프로세스 수
+    - max_pending: 동시에 풀에 제출되는 작업 수 상한 (초과 요청은 대기)
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 16):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._pending = threading.BoundedSemaphore(max_pending)
+        self._async_pending: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """워커 프로세스 풀 (첫 사용 시 생성)"""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                    logger.info(
+                        f"이미지 전처리 프로세스 풀 시작: {self.max_workers}개 워커"
+                    )
+        return self._executor
+
+    def _task(self, image_bytes: bytes, max_size: int, quality: int):
+        return partial(
+            preprocess_image_bytes,
+            image_bytes,
+            max_size=max_size,
+            quality=quality,
+            max_pixels=settings.IMAGE_MAX_PIXELS,
+        )
+
+    async def preprocess(
+        self, image_bytes: bytes, max_size: int = 1024, quality: int = 85
+    ) -> bytes:
+        """
+        이미지 전처리 (async 핸들러용, 이벤트 루프를 막지 않음)
+
+        Args:
+            image_bytes: 원본 이미지 바이트
+            max_size: 최대 가로/세로 크기 (px)
+            quality: JPEG 품질
+
+        Returns:
+            bytes: 전처리된 JPEG 이미지
+        """
+        return await self._run(self._task(image_bytes, max_size, quality))
+
+    async def dhash(self, image_bytes: bytes, hash_size: int = 8) -> int:
+        """
+        매칭 캐시용 dHash (async 핸들러용, 전체 디코딩을 프로세스 풀에서 실행)
+
+        Args:
+            image_bytes: 원본 이미지 바이트
+            hash_size: 해시 한 변 크기
+
+        Returns:
+            int: hash_size^2 비트 해시
+        """
+        return await self._run(
+            partial(
+                compute_dhash,
+                image_bytes,
+                hash_size=hash_size,
+                max_pixels=settings.IMAGE_MAX_PIXELS,
+            )
+        )
+
+    async def _run(self, task):
+        """프로세스 풀에서 실행 (동시 제출 수 max_pending 제한)"""
+        if self._async_pending is None:
+            self._async_pending = asyncio.Semaphore(self.max_pending)
+
+        async with self._async_pending:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), task)
+
+    def preprocess_blocking(
+        self, image_bytes: bytes, max_size: int = 1024, quality: int = 85
+    ) -> bytes:
+        """
+        이미지 전처리 (동기 코드용: BackgroundTasks 스레드, 워커 등)
+
+        Args:
+            image_bytes: 원본 이미지 바이트
+            max_size: 최대 가로/세로 크기 (px)
+            quality: JPEG 품질
+
+        Returns:
+            bytes: 전처리된 JPEG 이미지
+        """
+        with self._pending:
+            future = self._get_executor().submit(
+                self._task(image_bytes, max_size, quality)
+            )
+            return future.result()
+
+    def shutdown(self) -> None:
+        """워커 프로세스 풀 종료"""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+# 싱글톤
+_image_preprocessor = None
+
+
+def get_image_preprocessor() -> ImagePreprocessor:
+    """이미지 전처리기"""
+    global _image_preprocessor
+    if _image_preprocessor is None:
+        _image_preprocessor = ImagePreprocessor(
+            max_workers=settings.IMAGE_PROCESS_WORKERS,
+            max_pending=settings.IMAGE_PROCESS_MAX_PENDING,
+        )
+    return _image_preprocessor
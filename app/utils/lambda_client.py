@@ -2,68 +2,362 @@
 AWS Lambda 클라이언트
 """
 
+import base64
+from collections import deque
 import json
-from typing import List
+import logging
+import threading
+import time
+from typing import List, Optional, Union
 
 import boto3
+from botocore.config import Config
+import numpy as np
 
 from app.config import settings
+from app.utils.s3_client import s3_client
+
+logger = logging.getLogger(__name__)
+
+# Lambda 동기 호출 페이로드 제한 (6MB) 대비 여유
+MAX_PAYLOAD_BYTES = 5 * 1024 * 1024
+
+EMBEDDING_DIMENSION = 384
+
+
+def decode_float32(blob_base64: str) -> np.ndarray:
+    """base64 float32 (little-endian) blob → float32 배열"""
+    return np.frombuffer(base64.b64decode(blob_base64), dtype="<f4")
+
+
+def _percentile(values: List[float], percent: float) -> Optional[float]:
+    if not values:
+        return None
+    return round(float(np.percentile(values, percent)), 1)
+
+
+class LambdaTelemetry:
+    """
+    Lambda 호출 지연 시간 (콜드/웜 구분)
+
+    Lambda 응답의 cold_start 플래그로 구분합니다 (구버전 Lambda는 unknown).
+    """
+
+    def __init__(self, window: int = 500):
+        self._latencies = {
+            "cold": deque(maxlen=window),
+            "warm": deque(maxlen=window),
+            "unknown": deque(maxlen=window),
+        }
+        self._counts = {"cold": 0, "warm": 0, "unknown": 0}
+        self._by_kind = {}
+        self._last_cold = None
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, latency_ms: float, body: dict) -> None:
+        """
+        호출 1회 기록
+
+        Args:
+            kind: 호출 종류 (single / batch / warmup)
+            latency_ms: 클라이언트 측 전체 지연 시간
+            body: Lambda 응답 body
+        """
+        cold_start = body.get("cold_start")
+        state = "unknown" if cold_start is None else "cold" if cold_start else "warm"
+
+        with self._lock:
+            self._latencies[state].append(latency_ms)
+            self._counts[state] += 1
+            kind_counts = self._by_kind.setdefault(
+                kind, {"cold": 0, "warm": 0, "unknown": 0}
+            )
+            kind_counts[state] += 1
+            if state == "cold":
+                self._last_cold = {
+                    "at": time.time(),
+                    "kind": kind,
+                    "latency_ms": round(latency_ms, 1),
+                    "init_ms": body.get("init_ms"),
+                    "model_load_ms": body.get("model_load_ms"),
+                    "container_id": body.get("container_id"),
+                }
+
+        if state == "cold":
+            logger.info(
+                f"🥶 Lambda 콜드 스타트 ({kind}): {latency_ms:.0f}ms "
+                f"(init {body.get('init_ms')}ms, 모델 로드 {body.get('model_load_ms')}ms)"
+            )
+
+    def stats(self) -> dict:
+        """콜드/웜별 호출 수와 지연 시간 p50/p99 (최근 window개 기준)"""
+        with self._lock:
+            latencies = {
+                state: list(values) for state, values in self._latencies.items()
+            }
+            counts = dict(self._counts)
+            by_kind = {kind: dict(values) for kind, values in self._by_kind.items()}
+            last_cold = dict(self._last_cold) if self._last_cold else None
+
+        known = counts["cold"] + counts["warm"]
+        return {
+            "invocations": sum(counts.values()),
+            "cold_rate": round(counts["cold"] / known, 4) if known else 0.0,
+            "by_kind": by_kind,
+            "latency_ms": {
+                state: {
+                    "count": counts[state],
+                    "p50": _percentile(values, 50),
+                    "p99": _percentile(values, 99),
+                }
+                for state, values in latencies.items()
+            },
+            "last_cold_start": last_cold,
+        }
+
+
+lambda_telemetry = LambdaTelemetry()
 
 
 class LambdaClient:
-    def __init__(self):
+    def __init__(self, function_name: Optional[str] = None):
         self.client = boto3.client(
             "lambda",
             region_name=settings.AWS_LAMBDA_REGION,
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            # 기본값(읽기 60초 + 재시도)이면 Lambda 장애 시 스레드가 수 분 동안 묶임
+            config=Config(
+                connect_timeout=settings.LAMBDA_CONNECT_TIMEOUT_SECONDS,
+                read_timeout=settings.LAMBDA_READ_TIMEOUT_SECONDS,
+                retries={
+                    "total_max_attempts": settings.LAMBDA_MAX_ATTEMPTS,
+                    "mode": "standard",
+                },
+            ),
         )
-        self.function_name = settings.LAMBDA_FUNCTION_NAME
+        # 섀도 모델은 별도 Lambda 함수 (SHADOW_LAMBDA_FUNCTION_NAME)
+        self.function_name = function_name or settings.LAMBDA_FUNCTION_NAME
 
-    def generate_embedding(self, image_base64: str) -> List[float]:
+    def _invoke(self, body: dict) -> dict:
         """
-        Lambda 함수 호출하여 단일 이미지 임베딩 생성
+        Lambda 함수 호출 후 응답 body 반환
 
         Args:
-            image_base64 (str): Base64 인코딩된 이미지
+            body (dict): 요청 body
 
         Returns:
-            List[float]: 384차원 임베딩 벡터
+            dict: 응답 body
 
         Raises:
             Exception: Lambda 실행 실패 시
         """
-
+        # 임베딩은 base64 float32 blob으로 받음 (구버전 Lambda는 무시하고 JSON 리스트 반환)
         payload = {
-            "body": json.dumps({"image_base64": image_base64}),
+            "body": json.dumps({**body, "encoding": "float32"}),
             "httpMethod": "POST",
         }
 
+        result = self._invoke_raw(payload, "batch" if "images" in body else "single")
+
+        response_body = result.get("body", "{}")
+        if isinstance(response_body, str):
+            response_body = json.loads(response_body)
+
+        if result.get("statusCode") == 200:
+            return response_body
+        raise Exception(f"Lambda 오류: {response_body.get('error', result)}")
+
+    def _invoke_raw(self, payload: dict, kind: str) -> dict:
+        """Lambda 동기 호출 + 지연 시간 기록 (콜드/웜)"""
+        started = time.perf_counter()
         response = self.client.invoke(
             FunctionName=self.function_name,
             InvocationType="RequestResponse",
             Payload=json.dumps(payload),
         )
-
         result = json.loads(response["Payload"].read())
+        latency_ms = (time.perf_counter() - started) * 1000
 
-        if result.get("statusCode") == 200:
-            body = json.loads(result.get("body", "{}"))
-            embedding = body.get("embedding")
-            dimension = body.get("dimension")
+        try:
+            body = result.get("body", "{}")
+            lambda_telemetry.record(
+                kind, latency_ms, json.loads(body) if isinstance(body, str) else body
+            )
+        except (TypeError, ValueError):
+            pass
+
+        return result
+
+    def warmup(self, hold_ms: int = 0) -> dict:
+        """
+        워밍업 호출 (모델 로드 유지)
+
+        Args:
+            hold_ms (int): Lambda가 응답 전 대기할 시간 (동시 워밍업이 각각 다른 컨테이너를 깨우도록)
+
+        Returns:
+            dict: 응답 body (cold_start, container_id 등)
+        """
+        result = self._invoke_raw({"warmup": True, "hold_ms": hold_ms}, "warmup")
+        body = result.get("body", "{}")
+        body = json.loads(body) if isinstance(body, str) else body
+
+        if result.get("statusCode") != 200:
+            raise Exception(f"Lambda 워밍업 실패: {body.get('error', result)}")
+        return body
+
+    def generate_embedding(self, image_base64: str) -> np.ndarray:
+        """
+        Lambda 함수 호출하여 단일 이미지 임베딩 생성
+
+        Args:
+            image_base64 (str): Base64 인코딩된 이미지
+
+        Returns:
+            np.ndarray: 384차원 float32 임베딩 벡터
+
+        Raises:
+            Exception: Lambda 실행 실패 시
+        """
+        return self._parse_embedding(self._invoke({"image_base64": image_base64}))
+
+    def _parse_embedding(self, body: dict) -> np.ndarray:
+        """단일 임베딩 응답 검증 (float32 blob / JSON 리스트)"""
+        if "embedding_b64" in body:
+            embedding = decode_float32(body["embedding_b64"])
+        elif body.get("embedding"):
+            embedding = np.asarray(body["embedding"], dtype=np.float32)
+        else:
+            raise Exception("Lambda가 임베딩을 반환하지 않았습니다")
+
+        dimension = body.get("dimension")
+        if dimension != EMBEDDING_DIMENSION or embedding.shape[0] != dimension:
+            raise Exception(
+                f"잘못된 임베딩 차원: {embedding.shape[0]} (예상: {EMBEDDING_DIMENSION})"
+            )
+
+        return embedding
+
+    def generate_embedding_from_bytes(self, image_bytes: bytes) -> np.ndarray:
+        """
+        이미지 바이트로 임베딩 생성 (Lambda 호출 직전에 한 번만 base64 인코딩)
+
+        Args:
+            image_bytes (bytes): 이미지 바이트
+
+        Returns:
+            np.ndarray: 384차원 float32 임베딩 벡터
+        """
+        return self.generate_embedding(base64.b64encode(image_bytes).decode())
+
+    def s3_reference(self, image_url: str) -> Optional[dict]:
+        """
+        우리 버킷 이미지면 Lambda S3 모드 요청 항목 반환
+
+        Args:
+            image_url (str): 이미지 URL
+
+        Returns:
+            Optional[dict]: {"s3_bucket", "s3_key"} (외부 URL이면 None)
+        """
+        s3_key = s3_client.get_key_from_url(image_url)
+        if s3_key is None:
+            return None
+        return {"s3_bucket": s3_client.bucket_name, "s3_key": s3_key}
+
+    def generate_embedding_from_s3(self, s3_bucket: str, s3_key: str) -> np.ndarray:
+        """
+        Lambda가 S3 객체를 직접 읽어 임베딩 생성 (API 서버는 이미지를 다루지 않음)
+
+        Args:
+            s3_bucket (str): S3 버킷
+            s3_key (str): S3 객체 키
+
+        Returns:
+            np.ndarray: 384차원 float32 임베딩 벡터
+        """
+        return self._parse_embedding(
+            self._invoke({"s3_bucket": s3_bucket, "s3_key": s3_key})
+        )
+
+    def generate_embeddings_batch(
+        self, images_base64: List[Union[str, dict]], batch_size: int = 16
+    ) -> List[np.ndarray]:
+        """
+        여러 이미지 임베딩을 배치로 생성 (Lambda 1회 호출 = 1회 forward pass)
+
+        페이로드 제한(6MB)과 batch_size를 넘지 않도록 나눠서 호출합니다.
+
+        Args:
+            images_base64 (List[Union[str, dict]]): Base64 인코딩된 이미지
+                또는 {"s3_bucket", "s3_key"} 목록
+            batch_size (int): Lambda 1회 호출당 최대 이미지 수
+
+        Returns:
+            List[np.ndarray]: 요청 순서와 같은 384차원 float32 임베딩 목록
+
+        Raises:
+            Exception: Lambda 실행 실패 시
+        """
+        embeddings: List[np.ndarray] = []
 
-            if not embedding:
-                raise Exception("Lambda가 임베딩을 반환하지 않았습니다")
+        chunk: List[Union[str, dict]] = []
+        chunk_bytes = 0
+        for image_base64 in images_base64:
+            item_bytes = len(json.dumps(image_base64))
+            if chunk and (
+                len(chunk) >= batch_size or chunk_bytes + item_bytes > MAX_PAYLOAD_BYTES
+            ):
+                embeddings.extend(self._invoke_batch(chunk))
+                chunk, chunk_bytes = [], 0
+            chunk.append(image_base64)
+            chunk_bytes += item_bytes
 
-            if dimension != 384:
-                raise Exception(f"잘못된 임베딩 차원: {dimension} (예상: 384)")
+        if chunk:
+            embeddings.extend(self._invoke_batch(chunk))
 
-            return embedding
+        return embeddings
+
+    def _invoke_batch(self, images_base64: List[Union[str, dict]]) -> List[np.ndarray]:
+        """배치 1회 호출"""
+        body = self._invoke({"images": images_base64})
+        dimension = body.get("dimension")
+
+        if dimension != EMBEDDING_DIMENSION:
+            raise Exception(
+                f"잘못된 임베딩 차원: {dimension} (예상: {EMBEDDING_DIMENSION})"
+            )
+
+        if "embeddings_b64" in body:
+            embeddings = decode_float32(body["embeddings_b64"]).reshape(-1, dimension)
         else:
-            error_body = result.get("body", "{}")
-            if isinstance(error_body, str):
-                error_body = json.loads(error_body)
-            raise Exception(f"Lambda 오류: {error_body.get('error', result)}")
+            embeddings = np.asarray(body.get("embeddings") or [], dtype=np.float32)
+
+        if embeddings.ndim != 2 or embeddings.shape[0] != len(images_base64):
+            raise Exception(
+                f"Lambda 배치 응답 개수 불일치: {len(embeddings)} (예상: {len(images_base64)})"
+            )
+
+        return list(embeddings)
+
+    def generate_embeddings_batch_from_bytes(
+        self, images: List[bytes], batch_size: int = 16
+    ) -> List[np.ndarray]:
+        """
+        이미지 바이트 목록으로 배치 임베딩 생성
+
+        Args:
+            images (List[bytes]): 이미지 바이트 목록
+            batch_size (int): Lambda 1회 호출당 최대 이미지 수
+
+        Returns:
+            List[np.ndarray]: 384차원 float32 임베딩 목록
+        """
+        return self.generate_embeddings_batch(
+            [base64.b64encode(image_bytes).decode() for image_bytes in images],
+            batch_size=batch_size,
+        )
 
 
 lambda_client = LambdaClient()
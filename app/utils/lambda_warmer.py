@@ -0,0 +1,224 @@
+"""
+Lambda 워밍 스케줄러
+
+유휴 후 첫 매칭 요청이 Lambda 콜드 스타트(모델 다운로드 + 로드)를 겪지 않도록
+API 프로세스에서 주기적으로 {"warmup": true}를 보냅니다.
+
+- 시작 시 1회 + LAMBDA_WARMER_INTERVAL_SECONDS마다
+- 동시 워밍 수: 운영 시간 중에는 진행 중인 전시 수에 비례 (전시 오픈 시간대 트래픽 대비)
+  → 동시에 N개를 호출하고 잠시 점유(hold_ms)해서 서로 다른 컨테이너 N개를 깨움
+- 호출별 콜드/웜 지연 시간은 lambda_telemetry에 기록
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+import logging
+import math
+import threading
+from typing import Optional
+
+from sqlalchemy import func
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LambdaWarmer:
+    """
+    주기적 Lambda 워밍
+
+    - min_concurrency: 항상 유지할 웜 컨테이너 수
+    - max_concurrency: 최대 동시 워밍 수
+    - per_exhibition: 운영 시간 중 진행 중인 전시 1개당 추가 컨테이너 수
+    - open_hour / close_hour: 운영 시간 (현지 시각, close_hour 미포함)
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 240,
+        min_concurrency: int = 1,
+        max_concurrency: int = 5,
+        per_exhibition: float = 0.5,
+        open_hour: int = 10,
+        close_hour: int = 20,
+        utc_offset_hours: int = 9,
+        hold_ms: int = 200,
+    ):
+        self.interval_seconds = interval_seconds
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max(min_concurrency, max_concurrency)
+        self.per_exhibition = per_exhibition
+        self.open_hour = open_hour
+        self.close_hour = close_hour
+        self.timezone = timezone(timedelta(hours=utc_offset_hours))
+        self.hold_ms = hold_ms
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._runs = 0
+        self._failures = 0
+        self._last_run: Optional[dict] = None
+
+    def now(self) -> datetime:
+        return datetime.now(self.timezone)
+
+    def is_open(self, now: datetime) -> bool:
+        """전시 운영 시간 여부"""
+        return self.open_hour <= now.hour < self.close_hour
+
+    def target_concurrency(self, ongoing_exhibitions: int, now: datetime) -> int:
+        """
+        유지할 웜 컨테이너 수
+
+        Args:
+            ongoing_exhibitions: 오늘 진행 중인 전시 수
+            now: 현지 시각
+
+        Returns:
+            int: min_concurrency ~ max_concurrency
+        """
+        target = self.min_concurrency
+        if self.is_open(now) and ongoing_exhibitions > 0:
+            target += math.ceil(ongoing_exhibitions * self.per_exhibition)
+        return min(target, self.max_concurrency)
+
+    @staticmethod
+    def count_ongoing_exhibitions(today: date) -> int:
+        """오늘 진행 중인 전시 수 (start_date <= 오늘 <= end_date)"""
+        from app.database import SessionLocal
+        from app.models.exhibition import Exhibition
+
+        db = SessionLocal()
+        try:
+            return (
+                db.query(func.count(Exhibition.id))
+                .filter(Exhibition.start_date <= today, Exhibition.end_date >= today)
+                .scalar()
+                or 0
+            )
+        finally:
+            db.close()
+
+    def warm_once(self) -> dict:
+        """
+        워밍 1회 (동시 N개 호출)
+
+        Returns:
+            dict: 요청 수, 성공 수, 콜드 스타트 수, 깨운 컨테이너 수
+        """
+        from app.utils.lambda_client import lambda_client
+
+        now = self.now()
+        try:
+            ongoing = self.count_ongoing_exhibitions(now.date())
+        except Exception as e:
+            logger.warning(f"⚠️ 진행 중인 전시 조회 실패 (최소 워밍 수 사용): {e}")
+            ongoing = 0
+
+        concurrency = self.target_concurrency(ongoing, now)
+        hold_ms = self.hold_ms if concurrency > 1 else 0
+
+        def ping(_):
+            try:
+                return lambda_client.warmup(hold_ms=hold_ms)
+            except Exception as e:
+                logger.warning(f"⚠️ Lambda 워밍업 실패: {e}")
+                return None
+
+        with ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="lambda-warmer"
+        ) as executor:
+            results = list(executor.map(ping, range(concurrency)))
+
+        succeeded = [body for body in results if body is not None]
+        summary = {
+            "at": now.isoformat(),
+            "ongoing_exhibitions": ongoing,
+            "open": self.is_open(now),
+            "requested": concurrency,
+            "succeeded": len(succeeded),
+            "cold_starts": sum(1 for body in succeeded if body.get("cold_start")),
+            "containers": len(
+                {
+                    body.get("container_id")
+                    for body in succeeded
+                    if body.get("container_id")
+                }
+            ),
+        }
+
+        with self._lock:
+            self._runs += 1
+            self._failures += concurrency - len(succeeded)
+            self._last_run = summary
+
+        logger.info(
+            f"🔥 Lambda 워밍: {summary['succeeded']}/{concurrency}개 "
+            f"(컨테이너 {summary['containers']}개, 콜드 {summary['cold_starts']}개, "
+            f"진행 중인 전시 {ongoing}개)"
+        )
+        return summary
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.warm_once()
+            except Exception as e:
+                logger.warning(f"⚠️ Lambda 워밍 오류: {e}")
+            self._stop.wait(self.interval_seconds)
+
+    def start(self) -> None:
+        """워밍 스레드 시작 (즉시 1회 실행)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="lambda-warmer", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Lambda 워밍 시작: {self.interval_seconds}초 간격, "
+            f"{self.min_concurrency}~{self.max_concurrency}개"
+        )
+
+    def stop(self) -> None:
+        """워밍 스레드 종료"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "running": self._thread is not None and self._thread.is_alive(),
+                "interval_seconds": self.interval_seconds,
+                "min_concurrency": self.min_concurrency,
+                "max_concurrency": self.max_concurrency,
+                "runs": self._runs,
+                "failures": self._failures,
+                "last_run": dict(self._last_run) if self._last_run else None,
+            }
+
+
+# 싱글톤
+_lambda_warmer = None
+
+
+def get_lambda_warmer() -> LambdaWarmer:
+    """Lambda 워밍 스케줄러"""
+    global _lambda_warmer
+    if _lambda_warmer is None:
+        _lambda_warmer = LambdaWarmer(
+            interval_seconds=settings.LAMBDA_WARMER_INTERVAL_SECONDS,
+            min_concurrency=settings.LAMBDA_WARMER_MIN_CONCURRENCY,
+            max_concurrency=settings.LAMBDA_WARMER_MAX_CONCURRENCY,
+            per_exhibition=settings.LAMBDA_WARMER_PER_EXHIBITION,
+            open_hour=settings.LAMBDA_WARMER_OPEN_HOUR,
+            close_hour=settings.LAMBDA_WARMER_CLOSE_HOUR,
+            utc_offset_hours=settings.LAMBDA_WARMER_UTC_OFFSET_HOURS,
+            hold_ms=settings.LAMBDA_WARMER_HOLD_MS,
+        )
+    return _lambda_warmer
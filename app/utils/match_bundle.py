@@ -0,0 +1,230 @@
+"""
+전시별 오프라인 매칭 번들
+
+iOS 앱이 전시장에서 네트워크 없이 작품을 인식할 수 있도록
+전시 작품의 임베딩(L2 정규화, float16)과 최소 메타데이터를 한 번에 내려줍니다.
+
+- 전시별 fingerprint(작품/작가/전시 구성/활성 모델 변경 감지용 집계)로 버전 결정 → ETag
+- 직렬화한 번들을 전시별로 캐시 (LRU), fingerprint가 바뀐 전시만 다시 빌드
+- 임베딩: little-endian float16, (count, dimension) 행 우선, artworks 순서와 동일 → base64
+"""
+
+import base64
+from collections import OrderedDict
+from datetime import datetime, timezone
+import hashlib
+import json
+import logging
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import text
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = 1
+DIMENSION = 384
+
+FINGERPRINT_QUERY = text(
+    """
+    SELECT
+        COUNT(a.id),
+        COUNT(a.embedding),
+        COALESCE(SUM(a.id), 0),
+        MAX(a.updated_at),
+        MAX(ar.updated_at),
+        MAX(ea.created_at),
+        (SELECT version FROM embedding_models WHERE status = 'active')
+    FROM exhibition_artworks ea
+    JOIN artworks a ON a.id = ea.artwork_id
+    JOIN artists ar ON ar.id = a.artist_id
+    WHERE ea.exhibition_id = :exhibition_id
+"""
+)
+
+
+class MatchBundle:
+    """직렬화된 전시 매칭 번들"""
+
+    __slots__ = ("exhibition_id", "version", "count", "body")
+
+    def __init__(self, exhibition_id: int, version: str, count: int, body: bytes):
+        self.exhibition_id = exhibition_id
+        self.version = version
+        self.count = count
+        self.body = body
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.version}"'
+
+
+def fetch_bundle_fingerprint(db, exhibition_id: int) -> tuple:
+    """전시 작품 / 작가 / 구성 / 활성 모델 변경 감지용 fingerprint"""
+    row = db.execute(FINGERPRINT_QUERY, {"exhibition_id": exhibition_id}).fetchone()
+    return tuple(row)
+
+
+def bundle_version(fingerprint: tuple) -> str:
+    """fingerprint → 번들 버전 (ETag)"""
+    raw = repr((BUNDLE_FORMAT,) + fingerprint).encode()
+    return hashlib.sha256(raw).hexdigest()[:32]
+
+
+def build_match_bundle(
+    db, exhibition_id: int, model_version: Optional[str], version: str
+) -> MatchBundle:
+    """
+    전시 매칭 번들 생성
+
+    Args:
+        db: DB 세션
+        exhibition_id: 전시 ID
+        model_version: 활성 임베딩 모델 버전 (None이면 모델 구분 없이)
+        version: 번들 버전
+
+    Returns:
+        MatchBundle: JSON 직렬화된 번들
+    """
+    model_filter = (
+        "\n            AND a.embedding_model = :model_version" if model_version else ""
+    )
+    query = text(
+        f"""
+            SELECT a.id, a.title, ar.name AS artist_name, a.thumbnail_url, a.embedding
+            FROM exhibition_artworks ea
+            JOIN artworks a ON a.id = ea.artwork_id
+            JOIN artists ar ON ar.id = a.artist_id
+            WHERE ea.exhibition_id = :exhibition_id
+                AND a.embedding IS NOT NULL{model_filter}
+            ORDER BY a.id
+        """
+    ).columns(embedding=Vector(DIMENSION))
+    params = {"exhibition_id": exhibition_id}
+    if model_version:
+        params["model_version"] = model_version
+    rows = db.execute(query, params).fetchall()
+
+    artworks = []
+    vectors = []
+    for row in rows:
+        vector = np.asarray(row.embedding, dtype=np.float32).reshape(-1)
+        if vector.shape[0] != DIMENSION:
+            logger.warning(f"작품 ID {row.id} 번들 제외: 임베딩 차원 {vector.shape[0]}")
+            continue
+        vectors.append(vector / (np.linalg.norm(vector) + 1e-8))
+        artworks.append(
+            {
+                "artwork_id": row.id,
+                "title": row.title,
+                "artist_name": row.artist_name,
+                "thumbnail_url": row.thumbnail_url,
+            }
+        )
+
+    matrix = (
+        np.vstack(vectors) if vectors else np.empty((0, DIMENSION), dtype=np.float32)
+    )
+    embeddings = matrix.astype("<f2").tobytes()
+
+    payload = {
+        "exhibition_id": exhibition_id,
+        "version": version,
+        "format": BUNDLE_FORMAT,
+        "embedding_model_version": model_version or settings.EMBEDDING_MODEL_VERSION,
+        "dimension": DIMENSION,
+        "dtype": "float16",
+        "count": len(artworks),
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "artworks": artworks,
+        "embeddings": base64.b64encode(embeddings).decode("ascii"),
+    }
+    body = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
+    return MatchBundle(exhibition_id, version, len(artworks), body)
+
+
+class MatchBundleCache:
+    """
+    전시별 매칭 번들 캐시 (LRU)
+
+    요청마다 전시 fingerprint(집계 쿼리 1번)만 확인하고,
+    바뀐 전시만 다시 빌드합니다.
+    """
+
+    def __init__(self, max_entries: int = 32):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, MatchBundle]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, db, exhibition_id: int) -> MatchBundle:
+        """최신 번들 (변경이 없으면 캐시된 번들)"""
+        fingerprint = fetch_bundle_fingerprint(db, exhibition_id)
+        version = bundle_version(fingerprint)
+
+        with self._lock:
+            cached = self._entries.get(exhibition_id)
+            if cached is not None and cached.version == version:
+                self._entries.move_to_end(exhibition_id)
+                self.hits += 1
+                return cached
+
+        start_time = time.perf_counter()
+        # fingerprint 마지막 값 = 활성 모델 버전
+        bundle = build_match_bundle(db, exhibition_id, fingerprint[-1], version)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        logger.info(
+            f"📦 전시 {exhibition_id} 매칭 번들 빌드: 작품 {bundle.count}개, "
+            f"{len(bundle.body) / 1024:.1f}KB ({elapsed_ms:.1f}ms)"
+        )
+
+        with self._lock:
+            self._entries[exhibition_id] = bundle
+            self._entries.move_to_end(exhibition_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.builds += 1
+        return bundle
+
+    def invalidate(self, exhibition_id: Optional[int] = None) -> None:
+        """캐시 비우기 (exhibition_id 지정 시 해당 전시만)"""
+        with self._lock:
+            if exhibition_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(exhibition_id, None)
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더가 현재 ETag와 일치하는지 (약한 비교, 목록 / * 지원)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+# 싱글톤
+_match_bundle_cache = None
+
+
+def get_match_bundle_cache() -> MatchBundleCache:
+    """전시 매칭 번들 캐시"""
+    global _match_bundle_cache
+    if _match_bundle_cache is None:
+        _match_bundle_cache = MatchBundleCache(
+            max_entries=settings.MATCH_BUNDLE_CACHE_SIZE
+        )
+    return _match_bundle_cache
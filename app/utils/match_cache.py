@@ -0,0 +1,333 @@
+"""
+작품 매칭 캐시 (perceptual hash → 임베딩)
+
+같은 작품을 비슷한 위치에서 찍은 사진 / 같은 관람객의 재시도는 dHash 해밍 거리가 작습니다.
+거리 max_distance 이하의 이전 입력이 있으면 임베딩 생성(Lambda 호출)을 건너뜁니다.
+
+- 결과가 아닌 임베딩을 캐시 → 전시 범위/임계값/작품 변경과 무관하게 재사용 가능
+- 임베딩 모델 버전별로 구분 (활성 모델이 바뀌면 로컬 캐시를 비움)
+- 로컬: LRU + TTL (OrderedDict)
+- 공유(선택): UNLOGGED 테이블 match_cache_entries (여러 워커/서버 간 공유)
+"""
+
+from collections import OrderedDict
+import logging
+import random
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import bindparam, text
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+HASH_BITS = 64
+
+
+def _to_signed(image_hash: int) -> int:
+    """64비트 해시 → Postgres bigint 범위"""
+    return (
+        image_hash - (1 << HASH_BITS)
+        if image_hash >= 1 << (HASH_BITS - 1)
+        else image_hash
+    )
+
+
+class SharedMatchCacheStore:
+    """
+    Postgres UNLOGGED 테이블 기반 공유 캐시
+
+    UNLOGGED: WAL을 쓰지 않아 빠르고, 크래시 시 비워져도 되는 캐시 용도에 적합
+    """
+
+    # 만료 행 정리 빈도 (put 호출 대비 확률)
+    CLEANUP_PROBABILITY = 0.01
+
+    _GET_QUERY = text(
+        """
+        SELECT embedding, bit_count((phash # :phash)::bit(64)) AS distance
+        FROM match_cache_entries
+        WHERE expires_at > now()
+            AND model_version = :model_version
+            AND bit_count((phash # :phash)::bit(64)) <= :max_distance
+        ORDER BY distance
+        LIMIT 1
+    """
+    ).columns(embedding=Vector(384))
+
+    _PUT_QUERY = text(
+        """
+        INSERT INTO match_cache_entries (phash, embedding, model_version, expires_at)
+        VALUES (:phash, :embedding, :model_version, now() + make_interval(secs => :ttl))
+        ON CONFLICT (phash) DO UPDATE
+        SET embedding = EXCLUDED.embedding,
+            model_version = EXCLUDED.model_version,
+            expires_at = EXCLUDED.expires_at
+    """
+    ).bindparams(bindparam("embedding", type_=Vector(384)))
+
+    def get(
+        self, image_hash: int, max_distance: int, model_version: str
+    ) -> Optional[Tuple[np.ndarray, int]]:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            row = db.execute(
+                self._GET_QUERY,
+                {
+                    "phash": _to_signed(image_hash),
+                    "max_distance": max_distance,
+                    "model_version": model_version,
+                },
+            ).first()
+            if row is None:
+                return None
+            return np.asarray(row.embedding, dtype=np.float32), int(row.distance)
+        finally:
+            db.close()
+
+    def put(
+        self,
+        image_hash: int,
+        embedding: np.ndarray,
+        ttl_seconds: int,
+        model_version: str,
+    ) -> None:
+        from app.database import SessionLocal
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                self._PUT_QUERY,
+                {
+                    "phash": _to_signed(image_hash),
+                    "embedding": embedding,
+                    "model_version": model_version,
+                    "ttl": ttl_seconds,
+                },
+            )
+            if random.random() < self.CLEANUP_PROBABILITY:
+                db.execute(
+                    text("DELETE FROM match_cache_entries WHERE expires_at <= now()")
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+class MatchCache:
+    """
+    perceptual hash 기반 임베딩 캐시 (LRU + TTL)
+
+    - max_entries: 로컬 최대 항목 수 (초과 시 가장 오래 안 쓴 항목 제거)
+    - ttl_seconds: 항목 유효 시간
+    - max_distance: 같은 입력으로 볼 최대 해밍 거리 (0이면 완전 일치만)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: int = 600,
+        max_distance: int = 3,
+        shared_store: Optional[SharedMatchCacheStore] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self.shared_store = shared_store
+
+        # image_hash → (embedding, expires_at)
+        self._entries: "OrderedDict[int, Tuple[np.ndarray, float]]" = OrderedDict()
+        # 로컬 항목을 만든 임베딩 모델 버전
+        self._model_version: Optional[str] = None
+        self._lock = threading.Lock()
+        self._counters = {
+            "exact_hits": 0,
+            "near_hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+            "shared_errors": 0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _get_local(self, image_hash: int) -> Optional[Tuple[np.ndarray, int]]:
+        """로컬 조회 (완전 일치 → 해밍 거리 근접 순)"""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(image_hash)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(image_hash)
+                    return entry[0], 0
+                del self._entries[image_hash]
+                self._counters["expirations"] += 1
+
+            if self.max_distance <= 0:
+                return None
+
+            best_hash, best_distance = None, self.max_distance + 1
+            expired = []
+            for cached_hash, (_, expires_at) in self._entries.items():
+                if expires_at <= now:
+                    expired.append(cached_hash)
+                    continue
+                distance = (cached_hash ^ image_hash).bit_count()
+                if distance < best_distance:
+                    best_hash, best_distance = cached_hash, distance
+
+            for cached_hash in expired:
+                del self._entries[cached_hash]
+            self._counters["expirations"] += len(expired)
+
+            if best_hash is None:
+                return None
+
+            self._entries.move_to_end(best_hash)
+            return self._entries[best_hash][0], best_distance
+
+    def _use_model(self, model_version: str) -> None:
+        """모델 버전이 바뀌면 로컬 항목 비우기 (다른 벡터 공간의 임베딩 재사용 방지)"""
+        with self._lock:
+            if model_version != self._model_version:
+                if self._entries:
+                    logger.info(
+                        f"🔀 매칭 캐시 비움: 모델 {self._model_version} → {model_version}"
+                    )
+                self._entries.clear()
+                self._model_version = model_version
+
+    def _put_local(self, image_hash: int, embedding: np.ndarray) -> None:
+        with self._lock:
+            self._entries[image_hash] = (
+                embedding,
+                time.monotonic() + self.ttl_seconds,
+            )
+            self._entries.move_to_end(image_hash)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def get(self, image_hash: int, model_version: str) -> Optional[np.ndarray]:
+        """
+        캐시된 임베딩 조회
+
+        Args:
+            image_hash: 입력 이미지 dHash
+            model_version: 임베딩 모델 버전
+
+        Returns:
+            Optional[np.ndarray]: 캐시된 임베딩 (없으면 None)
+        """
+        self._use_model(model_version)
+        local = self._get_local(image_hash)
+        if local is not None:
+            embedding, distance = local
+            self._count("exact_hits" if distance == 0 else "near_hits")
+            logger.info(f"   ♻️  매칭 캐시 히트 (해밍 거리 {distance})")
+            return embedding
+
+        if self.shared_store is not None:
+            try:
+                shared = self.shared_store.get(
+                    image_hash, self.max_distance, model_version
+                )
+            except Exception as e:
+                self._count("shared_errors")
+                logger.warning(f"⚠️ 공유 매칭 캐시 조회 실패: {e}")
+                shared = None
+
+            if shared is not None:
+                embedding, distance = shared
+                self._count("shared_hits")
+                self._put_local(image_hash, embedding)
+                logger.info(f"   ♻️  공유 매칭 캐시 히트 (해밍 거리 {distance})")
+                return embedding
+
+        self._count("misses")
+        return None
+
+    def put(self, image_hash: int, embedding: np.ndarray, model_version: str) -> None:
+        """
+        임베딩 저장
+
+        Args:
+            image_hash: 입력 이미지 dHash
+            embedding: 생성된 임베딩
+            model_version: 임베딩 모델 버전
+        """
+        embedding = np.asarray(embedding, dtype=np.float32)
+        self._use_model(model_version)
+        self._put_local(image_hash, embedding)
+
+        if self.shared_store is not None:
+            try:
+                self.shared_store.put(
+                    image_hash, embedding, self.ttl_seconds, model_version
+                )
+            except Exception as e:
+                self._count("shared_errors")
+                logger.warning(f"⚠️ 공유 매칭 캐시 저장 실패: {e}")
+
+    def clear(self) -> None:
+        """로컬 캐시 비우기"""
+        with self._lock:
+            self._entries.clear()
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> dict:
+        """히트율 / 절약한 임베딩(Lambda) 호출 수"""
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+
+        hits = counters["exact_hits"] + counters["near_hits"] + counters["shared_hits"]
+        lookups = hits + counters["misses"]
+
+        return {
+            **counters,
+            "hits": hits,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "embedding_calls_saved": hits,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "max_distance": self.max_distance,
+            "shared": self.shared_store is not None,
+            "embedding_model_version": self._model_version,
+        }
+
+
+# 싱글톤
+_match_cache = None
+
+
+def get_match_cache() -> MatchCache:
+    """작품 매칭 캐시"""
+    global _match_cache
+    if _match_cache is None:
+        _match_cache = MatchCache(
+            max_entries=settings.MATCH_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.MATCH_CACHE_TTL_SECONDS,
+            max_distance=settings.MATCH_CACHE_MAX_DISTANCE,
+            shared_store=(
+                SharedMatchCacheStore() if settings.MATCH_CACHE_SHARED else None
+            ),
+        )
+    return _match_cache
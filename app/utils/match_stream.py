@@ -0,0 +1,108 @@
+"""
+실시간 작품 인식 (WebSocket 매칭 세션) 유틸리티
+
+- LatestFrameSlot: 최신 프레임 1개만 보관 (처리 중에 밀린 프레임은 버림 → 지연이 쌓이지 않음)
+- ConsecutiveMatchTracker: 같은 작품이 임계값 이상으로 K프레임 연속 1위일 때만 확정
+"""
+
+import asyncio
+from typing import List, Optional, Tuple
+
+
+class LatestFrameSlot:
+    """
+    최신 프레임 1개짜리 우편함
+
+    수신 태스크가 put, 매칭 태스크가 get 합니다.
+    매칭이 끝나기 전에 새 프레임이 오면 이전 프레임은 처리하지 않고 버립니다 (backpressure).
+    """
+
+    def __init__(self):
+        self._frame: Optional[Tuple[int, bytes]] = None
+        self._event = asyncio.Event()
+        self._closed = False
+        self.received = 0
+        self.dropped = 0
+
+    def put(self, data: bytes) -> int:
+        """
+        프레임 넣기
+
+        Returns:
+            int: 프레임 번호 (1부터)
+        """
+        self.received += 1
+        if self._frame is not None:
+            self.dropped += 1
+        self._frame = (self.received, data)
+        self._event.set()
+        return self.received
+
+    def close(self) -> None:
+        """수신 종료 (남은 프레임 처리 후 get이 None 반환)"""
+        self._closed = True
+        self._event.set()
+
+    async def get(self) -> Optional[Tuple[int, bytes]]:
+        """
+        다음 프레임 대기
+
+        Returns:
+            Optional[Tuple[int, bytes]]: (프레임 번호, 이미지 바이트) (수신 종료 시 None)
+        """
+        while self._frame is None:
+            if self._closed:
+                return None
+            self._event.clear()
+            await self._event.wait()
+
+        frame, self._frame = self._frame, None
+        return frame
+
+
+class ConsecutiveMatchTracker:
+    """
+    연속 프레임 매칭 확정
+
+    프레임마다 임계값 이상 결과의 1위 작품을 보고,
+    같은 작품이 required 프레임 연속이면 확정 (같은 작품은 한 번만 확정)
+    """
+
+    def __init__(self, required: int):
+        self.required = max(1, required)
+        self.candidate: Optional[int] = None
+        self.streak = 0
+        self.confirmed: Optional[int] = None
+
+    def update(self, results: List[dict]) -> bool:
+        """
+        프레임 결과 반영
+
+        Args:
+            results: 임계값 이상 매칭 결과 (유사도 내림차순)
+
+        Returns:
+            bool: 이 프레임에서 새로 확정되었는지
+        """
+        top = results[0]["artwork_id"] if results else None
+        if top is None:
+            self.candidate = None
+            self.streak = 0
+            return False
+
+        if top == self.candidate:
+            self.streak += 1
+        else:
+            self.candidate = top
+            self.streak = 1
+
+        if self.streak >= self.required and top != self.confirmed:
+            self.confirmed = top
+            return True
+        return False
+
+    def reset(self) -> None:
+        """연속 기록 / 확정 작품 초기화 (클라이언트가 다른 작품으로 이동)"""
+        self.candidate = None
+        self.streak = 0
+        self.confirmed = None
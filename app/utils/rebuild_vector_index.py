@@ -0,0 +1,225 @@
+"""
+작품 임베딩 ANN 인덱스 재빌드/재학습 스크립트
+
+인덱스 생성 당시 행 수(COMMENT ON INDEX)와 현재 행 수를 비교해서 필요할 때만 재빌드합니다.
+- 인덱스 없음 / 타입 변경 (settings.VECTOR_INDEX_TYPE) → 새로 빌드
+- 양자화 방식 변경 (settings.VECTOR_INDEX_QUANTIZATION: none / halfvec / binary) → 새로 빌드
+- ivfflat: 행 수가 --growth 배 이상 늘거나 줄어서 권장 lists 값이 바뀌면 재학습
+- hnsw: 학습 단계가 없어 자동 재빌드 안 함 (--force로 대량 삭제 후 정리 가능)
+
+CREATE INDEX CONCURRENTLY로 새 인덱스를 만든 뒤 이름을 바꿔치기하므로 매칭 검색이 멈추지 않습니다.
+
+사용법:
+    docker-compose run --rm api python app/utils/rebuild_vector_index.py
+    docker-compose run --rm api python app/utils/rebuild_vector_index.py --dry-run
+    docker-compose run --rm api python app/utils/rebuild_vector_index.py --type ivfflat --force
+    docker-compose run --rm api python app/utils/rebuild_vector_index.py --quantization halfvec
+"""
+
+import sys
+
+sys.path.insert(0, "/app")
+
+import argparse
+import logging
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.utils.vector_index import (
+    INDEX_NAME,
+    INDEX_TYPES,
+    QUANTIZATIONS,
+    create_index_sql,
+    get_index_state,
+    index_comment_sql,
+    ivfflat_lists,
+)
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 이 행 수 미만에서는 ivfflat centroid 학습이 부정확
+MIN_IVFFLAT_ROWS = 10_000
+
+
+def count_embeddings() -> int:
+    """임베딩이 있는 작품 수"""
+    db = SessionLocal()
+    try:
+        return db.execute(text("SELECT COUNT(embedding) FROM artworks")).scalar() or 0
+    finally:
+        db.close()
+
+
+def load_index_state() -> Optional[dict]:
+    """현재 인덱스 상태"""
+    db = SessionLocal()
+    try:
+        return get_index_state(db)
+    finally:
+        db.close()
+
+
+def needs_rebuild(
+    state: Optional[dict],
+    index_type: str,
+    rows: int,
+    growth: float,
+    quantization: str = "none",
+) -> Tuple[bool, str]:
+    """
+    재빌드 필요 여부
+
+    Returns:
+        Tuple[bool, str]: (재빌드 여부, 사유)
+    """
+    if state is None:
+        return True, "인덱스 없음"
+
+    if state["type"] != index_type:
+        return True, f"인덱스 타입 변경: {state['type']} → {index_type}"
+
+    if state["quantization"] != quantization:
+        return True, f"양자화 방식 변경: {state['quantization']} → {quantization}"
+
+    if index_type == "hnsw":
+        return False, "hnsw는 점진적으로 갱신됨"
+
+    built_rows = state["built_rows"]
+    if built_rows is None:
+        return True, "빌드 당시 행 수 기록 없음"
+
+    if ivfflat_lists(rows) == ivfflat_lists(built_rows):
+        return False, f"lists 변화 없음 ({ivfflat_lists(rows)})"
+
+    if rows >= built_rows * growth or rows * growth <= built_rows:
+        return True, f"행 수 변화: {built_rows} → {rows}"
+
+    return False, f"행 수 변화가 임계값 미만: {built_rows} → {rows} (x{growth})"
+
+
+def rebuild_index(
+    index_type: str, rows: int, maintenance_work_mem: str, quantization: str = "none"
+) -> None:
+    """
+    새 인덱스를 CONCURRENTLY로 만든 뒤 기존 인덱스와 교체
+
+    Args:
+        index_type: hnsw / ivfflat
+        rows: 현재 임베딩 행 수
+        maintenance_work_mem: 빌드용 메모리 (예: 512MB)
+        quantization: none / halfvec / binary
+    """
+    new_index_name = f"{INDEX_NAME}_new"
+
+    # CREATE INDEX CONCURRENTLY는 트랜잭션 밖에서만 가능
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(
+            text("SELECT set_config('maintenance_work_mem', :value, false)"),
+            {"value": maintenance_work_mem},
+        )
+
+        # 이전 실행이 중단되어 남은 INVALID 인덱스 정리
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {new_index_name}"))
+
+        logger.info(f"🔨 {index_type} ({quantization}) 인덱스 빌드 중 ({rows}개 행)...")
+        conn.execute(
+            text(
+                create_index_sql(
+                    index_type,
+                    rows,
+                    index_name=new_index_name,
+                    concurrently=True,
+                    quantization=quantization,
+                )
+            )
+        )
+
+    # 교체 (짧은 트랜잭션)
+    with engine.begin() as conn:
+        conn.execute(text(f"DROP INDEX IF EXISTS {INDEX_NAME}"))
+        conn.execute(text(f"ALTER INDEX {new_index_name} RENAME TO {INDEX_NAME}"))
+        conn.execute(text(index_comment_sql(index_type, rows)))
+
+    logger.info(f"✅ 인덱스 교체 완료: {INDEX_NAME} ({index_type}, {quantization})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작품 임베딩 ANN 인덱스 재빌드")
+    parser.add_argument(
+        "--type", choices=INDEX_TYPES, default=settings.VECTOR_INDEX_TYPE
+    )
+    parser.add_argument(
+        "--quantization",
+        choices=QUANTIZATIONS,
+        default=settings.VECTOR_INDEX_QUANTIZATION,
+    )
+    parser.add_argument(
+        "--growth",
+        type=float,
+        default=2.0,
+        help="ivfflat 재학습 기준 행 수 변화 배율",
+    )
+    parser.add_argument("--force", action="store_true", help="조건과 관계없이 재빌드")
+    parser.add_argument("--dry-run", action="store_true", help="판단만 하고 빌드 안 함")
+    parser.add_argument("--maintenance-work-mem", default="512MB")
+    args = parser.parse_args()
+
+    rows = count_embeddings()
+    state = load_index_state()
+
+    logger.info("=" * 60)
+    logger.info("🧭 작품 임베딩 ANN 인덱스 점검")
+    logger.info("=" * 60)
+    logger.info(f"  - 임베딩 행 수: {rows}")
+    if state:
+        logger.info(
+            f"  - 현재 인덱스: {state['type']}, 양자화 {state['quantization']} "
+            f"(빌드 당시 {state['built_rows']}행)"
+        )
+    else:
+        logger.info("  - 현재 인덱스: 없음")
+    logger.info(f"  - 목표 타입: {args.type}, 양자화 {args.quantization}")
+    if args.quantization != settings.VECTOR_INDEX_QUANTIZATION:
+        logger.warning(
+            f"⚠️  VECTOR_INDEX_QUANTIZATION({settings.VECTOR_INDEX_QUANTIZATION})과 다릅니다. "
+            "검색 쿼리가 인덱스를 쓰도록 설정도 함께 바꿔주세요."
+        )
+
+    if args.type == "ivfflat" and rows < MIN_IVFFLAT_ROWS:
+        logger.warning(
+            f"⚠️  행 수({rows})가 적어 ivfflat 학습이 부정확합니다. hnsw를 권장합니다."
+        )
+
+    rebuild, reason = needs_rebuild(
+        state, args.type, rows, args.growth, args.quantization
+    )
+    if args.force:
+        rebuild, reason = True, "--force"
+
+    if not rebuild:
+        logger.info(f"\n✅ 재빌드 불필요: {reason}")
+        return
+
+    logger.info(f"\n🔄 재빌드 필요: {reason}")
+    if args.dry_run:
+        logger.info("(dry-run) 빌드하지 않습니다.")
+        return
+
+    rebuild_index(args.type, rows, args.maintenance_work_mem, args.quantization)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n\n⚠️  사용자에 의해 중단되었습니다.")
+    except Exception as e:
+        logger.error(f"\n❌ 예상치 못한 오류: {e}", exc_info=True)
+        raise
@@ -1,9 +1,11 @@
 import logging
 import time
 from typing import Optional
+from urllib.parse import unquote, urlparse
 import uuid
 
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 from app.config import settings
@@ -21,6 +23,8 @@ class S3Client:
             aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
             aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
             region_name=settings.AWS_REGION,
+            # 업로드/임베딩 워커 스레드가 연결을 재사용하도록 풀 크기 지정
+            config=Config(max_pool_connections=settings.S3_MAX_POOL_CONNECTIONS),
         )
         self.bucket_name = settings.S3_BUCKET_NAME
 
@@ -43,10 +47,42 @@ class S3Client:
         Returns:
             str: S3 파일 URL
         """
-        try:
-            # 파일 읽기
-            contents = await file.read()
+        # 파일 읽기
+        contents = await file.read()
+
+        return await self.upload_bytes(
+            contents,
+            folder=folder,
+            filename=file.filename,
+            content_type=file.content_type,
+            exhibition_id=exhibition_id,
+            visitor_id=visitor_id,
+        )
+
+    async def upload_bytes(
+        self,
+        contents: bytes,
+        folder: str,
+        filename: Optional[str] = None,
+        content_type: Optional[str] = None,
+        exhibition_id: Optional[int] = None,
+        visitor_id: Optional[int] = None,
+    ) -> str:
+        """
+        이미 읽은 파일 바이트를 S3에 업로드 (호출자가 바이트를 다시 쓸 때 사용)
+
+        Args:
+            contents: 파일 바이트
+            folder: 폴더 (reactions, artworks 등)
+            filename: 원본 파일명 (확장자 추출용)
+            content_type: Content-Type
+            exhibition_id: 전시 ID
+            visitor_id: 관람객 ID
 
+        Returns:
+            str: S3 파일 URL
+        """
+        try:
             # 환경 (production or test or local)
             env = (
                 settings.ENVIRONMENT
@@ -56,7 +92,7 @@ class S3Client:
 
             # 파일명 생성
             timestamp = int(time.time())
-            file_extension = file.filename.split(".")[-1] if file.filename else "jpg"
+            file_extension = filename.split(".")[-1] if filename else "jpg"
             unique_id = str(uuid.uuid4())[:8]
 
             # reactions 폴더 구조
@@ -72,7 +108,7 @@ class S3Client:
                 Bucket=settings.S3_BUCKET_NAME,
                 Key=s3_key,
                 Body=contents,
-                ContentType=file.content_type or "image/jpeg",
+                ContentType=content_type or "image/jpeg",
             )
 
             # URL 생성
@@ -98,9 +134,9 @@ class S3Client:
         try:
             # URL에서 파일 키 추출
             # 예: https://bucket.s3.region.amazonaws.com/folder/file.jpg -> folder/file.jpg
-            file_key = file_url.split(
-                f"{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/"
-            )[1]
+            file_key = self.get_key_from_url(file_url)
+            if file_key is None:
+                raise IndexError(f"버킷 URL이 아닙니다: {file_url}")
 
             # S3에서 삭제
             self.s3_client.delete_object(Bucket=self.bucket_name, Key=file_key)
@@ -112,6 +148,64 @@ class S3Client:
             logger.error(f"Failed to delete file from S3: {e}")
             return False
 
+    def get_file_bytes(self, file_url: str) -> Optional[bytes]:
+        """
+        우리 버킷 파일 내용 읽기 (get_object, 공개 HTTP 대신 풀링된 클라이언트 사용)
+
+        Args:
+            file_url: S3 파일 URL
+
+        Returns:
+            파일 바이트 (우리 버킷 URL이 아니면 None)
+
+        Raises:
+            ClientError: 객체 없음/권한 오류 등
+        """
+        file_key = self.get_key_from_url(file_url)
+        if file_key is None:
+            return None
+
+        response = self.s3_client.get_object(Bucket=self.bucket_name, Key=file_key)
+        return response["Body"].read()
+
+    def get_key_from_url(self, file_url: str) -> Optional[str]:
+        """
+        우리 버킷의 S3 URL이면 객체 키 반환
+
+        지원 형식:
+        - https://bucket.s3.region.amazonaws.com/key
+        - https://bucket.s3.amazonaws.com/key
+        - https://s3.region.amazonaws.com/bucket/key
+
+        Args:
+            file_url: S3 파일 URL
+
+        Returns:
+            S3 객체 키 (다른 버킷/외부 URL이면 None)
+        """
+        if not file_url or not self.bucket_name:
+            return None
+
+        parsed = urlparse(str(file_url))
+        host = (parsed.hostname or "").lower()
+        path = unquote(parsed.path.lstrip("/"))
+        bucket = self.bucket_name.lower()
+
+        if host in (
+            f"{bucket}.s3.{settings.AWS_REGION}.amazonaws.com",
+            f"{bucket}.s3.amazonaws.com",
+        ):
+            key = path
+        elif host.startswith("s3.") and host.endswith(".amazonaws.com"):
+            prefix = f"{self.bucket_name}/"
+            if not path.startswith(prefix):
+                return None
+            key = path[len(prefix) :]
+        else:
+            return None
+
+        return key or None
+
     def generate_presigned_url(
         self, file_key: str, expiration: int = 3600
     ) -> Optional[str]:
@@ -0,0 +1,127 @@
+"""
+Singleflight: 동시에 들어온 같은 작업을 한 번만 실행
+
+- 같은 키의 작업이 진행 중이면 새로 실행하지 않고 진행 중인 결과를 함께 기다림
+- 완료되면 키를 지움 (결과 캐시가 아님 → 캐시는 match_cache)
+- AsyncSingleFlight: async 핸들러용 (작품 매칭, 키 = 이미지 내용 해시)
+- SingleFlight: 스레드용 (BackgroundTasks 임베딩 생성, 키 = artwork_id + 이미지 해시)
+"""
+
+import asyncio
+from concurrent.futures import Future
+import hashlib
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+def content_key(data: bytes) -> str:
+    """바이트 내용 해시 키"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class _Counters:
+    """실행/합류 횟수"""
+
+    def __init__(self):
+        self.executions = 0
+        self.coalesced = 0
+
+    def stats(self, in_flight: int) -> dict:
+        total = self.executions + self.coalesced
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesce_rate": round(self.coalesced / total, 4) if total else 0.0,
+            "in_flight": in_flight,
+        }
+
+
+class AsyncSingleFlight:
+    """async 작업 합치기 (이벤트 루프 하나에서 사용)"""
+
+    def __init__(self):
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+        self._counters = _Counters()
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        key로 진행 중인 작업이 있으면 그 결과를, 없으면 func()를 실행한 결과를 반환
+
+        요청 하나가 취소(클라이언트 연결 끊김)되어도 공유 작업은 계속 실행됩니다.
+
+        Args:
+            key: 작업 키
+            func: 코루틴을 반환하는 함수
+
+        Returns:
+            func() 결과 (예외도 대기 중인 모든 호출에 전파)
+        """
+        task = self._tasks.get(key)
+        if task is None:
+            self._counters.executions += 1
+            task = asyncio.ensure_future(func())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._done(key, done))
+        else:
+            self._counters.coalesced += 1
+
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        # 대기자가 모두 취소된 경우 "exception was never retrieved" 경고 방지
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        return self._counters.stats(len(self._tasks))
+
+
+class SingleFlight:
+    """스레드 작업 합치기"""
+
+    def __init__(self):
+        self._futures: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._counters = _Counters()
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        key로 진행 중인 작업이 있으면 끝날 때까지 기다려 그 결과를, 없으면 func() 결과를 반환
+
+        Args:
+            key: 작업 키
+            func: 실행할 함수
+
+        Returns:
+            func() 결과 (예외도 대기 중인 모든 호출에 전파)
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._futures[key] = future
+                self._counters.executions += 1
+            else:
+                self._counters.coalesced += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = func()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._futures.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return self._counters.stats(len(self._futures))
@@ -0,0 +1,452 @@
+"""
+작품 임베딩 모델 전환 스크립트 (무중단)
+
+새 모델(더 큰 모델, 양자화 모델, 다른 전처리)을 매칭을 멈추지 않고 도입합니다.
+
+    1. shadow: 새 모델을 섀도로 등록 + SHADOW_EMBEDDING_* 설정 후 재시작
+       → 새로 등록/수정되는 작품은 섀도 임베딩도 함께 생성
+    2. generate_missing_embeddings.py --shadow: 기존 작품의 embedding_shadow 채우기
+    3. switch: 섀도 인덱스를 CONCURRENTLY로 만든 뒤 한 트랜잭션에서
+       embedding ↔ embedding_shadow 컬럼/인덱스 이름과 모델 상태를 맞바꿈
+       → 각 프로세스는 EMBEDDING_MODEL_REFRESH_SECONDS 안에 새 모델로 매칭
+    4. 되돌리기: 이전 모델이 섀도로 남아 있으므로 switch --to <이전 버전>
+    5. clear-shadow: 이전 모델 임베딩/인덱스 정리
+
+컬럼 타입이 vector(384)이므로 같은 차원(384)의 모델끼리만 전환할 수 있습니다.
+(shadow 등록 시 --dimension이 embedding_shadow 컬럼 차원과 다르면 등록을 거부)
+
+사용법:
+    docker-compose run --rm api python app/utils/switch_embedding_model.py status
+    docker-compose run --rm api python app/utils/switch_embedding_model.py shadow --version dinov2-small-int8 --backend lambda --dimension 384
+    docker-compose run --rm api python app/utils/switch_embedding_model.py switch --to dinov2-small-int8
+    docker-compose run --rm api python app/utils/switch_embedding_model.py clear-shadow
+"""
+
+import sys
+
+sys.path.insert(0, "/app")
+
+import argparse
+import logging
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.utils.embedding_models import fetch_model_versions
+from app.utils.vector_index import (
+    INDEX_NAME,
+    INDEX_TYPES,
+    SHADOW_INDEX_NAME,
+    create_index_sql,
+    index_comment_sql,
+)
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+# 전환 시 이름을 맞바꾸는 (활성, 섀도) 컬럼 / 인덱스
+SWAPPED_COLUMNS = [
+    ("embedding", "embedding_shadow"),
+    ("embedding_model", "embedding_shadow_model"),
+    ("embedding_content_hash", "embedding_shadow_content_hash"),
+]
+SWAPPED_INDEXES = [
+    (INDEX_NAME, SHADOW_INDEX_NAME),
+    ("ix_artworks_embedding_content_hash", "ix_artworks_embedding_shadow_content_hash"),
+]
+
+MISSING_SHADOW_QUERY = text(
+    """
+    SELECT COUNT(*)
+    FROM artworks
+    WHERE embedding IS NOT NULL
+        AND embedding_shadow_model IS DISTINCT FROM :version
+"""
+)
+
+
+def count_missing_shadow(conn, version: str) -> int:
+    """활성 임베딩은 있는데 섀도 임베딩(version)이 없는 작품 수"""
+    return conn.execute(MISSING_SHADOW_QUERY, {"version": version}).scalar() or 0
+
+
+def index_validity(conn, index_name: str) -> Optional[bool]:
+    """인덱스 유효 여부 (없으면 None, CONCURRENTLY 빌드 중단 시 False)"""
+    return conn.execute(
+        text(
+            """
+            SELECT ix.indisvalid
+            FROM pg_class i
+            JOIN pg_index ix ON ix.indexrelid = i.oid
+            WHERE i.relname = :index_name
+        """
+        ),
+        {"index_name": index_name},
+    ).scalar()
+
+
+def show_status() -> None:
+    """모델 / 컬럼별 임베딩 현황"""
+    db = SessionLocal()
+    try:
+        models = db.execute(
+            text(
+                """
+                SELECT version, backend, dimension, status, activated_at, description
+                FROM embedding_models
+                ORDER BY status, created_at
+            """
+            )
+        ).fetchall()
+        active_counts = db.execute(
+            text(
+                """
+                SELECT embedding_model AS version, COUNT(*) AS count
+                FROM artworks WHERE embedding IS NOT NULL
+                GROUP BY embedding_model
+            """
+            )
+        ).fetchall()
+        shadow_counts = db.execute(
+            text(
+                """
+                SELECT embedding_shadow_model AS version, COUNT(*) AS count
+                FROM artworks WHERE embedding_shadow IS NOT NULL
+                GROUP BY embedding_shadow_model
+            """
+            )
+        ).fetchall()
+        _, shadow = fetch_model_versions(db)
+        missing = count_missing_shadow(db, shadow) if shadow else None
+        shadow_index = index_validity(db, SHADOW_INDEX_NAME)
+    finally:
+        db.close()
+
+    logger.info("=" * 60)
+    logger.info("🧭 작품 임베딩 모델 현황")
+    logger.info("=" * 60)
+    for model in models:
+        logger.info(
+            f"  - [{model.status}] {model.version} ({model.backend}, {model.dimension}차원)"
+            f"{' - ' + model.description if model.description else ''}"
+        )
+
+    logger.info("\n📊 embedding (활성 컬럼):")
+    for row in active_counts:
+        logger.info(f"  - {row.version}: {row.count}개")
+    logger.info("📊 embedding_shadow (섀도 컬럼):")
+    for row in shadow_counts:
+        logger.info(f"  - {row.version}: {row.count}개")
+
+    if shadow:
+        logger.info(f"\n🌓 섀도 모델 {shadow}: 남은 작품 {missing}개")
+        logger.info(
+            f"  - 섀도 인덱스: "
+            f"{'없음' if shadow_index is None else '정상' if shadow_index else 'INVALID'}"
+        )
+        if shadow != settings.SHADOW_EMBEDDING_MODEL_VERSION:
+            logger.warning(
+                f"⚠️  이 프로세스의 SHADOW_EMBEDDING_MODEL_VERSION"
+                f"('{settings.SHADOW_EMBEDDING_MODEL_VERSION}')이 섀도 모델과 다릅니다"
+            )
+
+
+def column_dimension(conn, column: str) -> Optional[int]:
+    """artworks vector 컬럼 차원 (pgvector는 atttypmod에 차원 저장, 컬럼이 없으면 None)"""
+    return conn.execute(
+        text(
+            """
+            SELECT atttypmod
+            FROM pg_attribute
+            WHERE attrelid = 'artworks'::regclass
+                AND attname = :column
+                AND NOT attisdropped
+        """
+        ),
+        {"column": column},
+    ).scalar()
+
+
+def register_shadow(
+    version: str, backend: str, description: Optional[str], dimension: int = 384
+) -> None:
+    """
+    새 모델을 섀도로 등록 (기존 섀도 모델은 retired)
+
+    섀도 컬럼은 활성 컬럼과 이름을 맞바꾸므로 차원이 같아야 합니다 (현재 vector(384) 고정).
+    다른 차원의 모델은 컬럼 타입을 바꾸는 마이그레이션이 먼저 필요해 등록을 거부합니다.
+    """
+    with engine.begin() as conn:
+        active, _ = fetch_model_versions(conn)
+        if version == active:
+            raise ValueError(f"'{version}'은 이미 활성 모델입니다")
+
+        shadow_dimension = column_dimension(conn, "embedding_shadow")
+        if dimension != shadow_dimension:
+            raise ValueError(
+                f"'{version}' 임베딩 차원({dimension})이 embedding_shadow 컬럼 차원"
+                f"({shadow_dimension})과 다릅니다: 같은 차원의 모델만 섀도로 등록할 수 있습니다"
+            )
+
+        conn.execute(
+            text(
+                """
+                UPDATE embedding_models SET status = 'retired'
+                WHERE status = 'shadow' AND version <> :version
+            """
+            ),
+            {"version": version},
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO embedding_models (version, backend, dimension, description, status)
+                VALUES (:version, :backend, :dimension, :description, 'shadow')
+                ON CONFLICT (version) DO UPDATE
+                SET backend = EXCLUDED.backend,
+                    dimension = EXCLUDED.dimension,
+                    description = COALESCE(EXCLUDED.description, embedding_models.description),
+                    status = 'shadow'
+            """
+            ),
+            {
+                "version": version,
+                "backend": backend,
+                "dimension": dimension,
+                "description": description,
+            },
+        )
+
+    logger.info(f"✅ 섀도 모델 등록: {version} ({backend}, {dimension}차원)")
+    logger.info(
+        "  다음: SHADOW_EMBEDDING_MODEL_VERSION 등을 설정해 API/워커 재시작 → "
+        "generate_missing_embeddings.py --shadow"
+    )
+
+
+def build_shadow_index(index_type: str, maintenance_work_mem: str) -> None:
+    """섀도 컬럼 ANN 인덱스를 CONCURRENTLY로 생성 (이미 유효한 인덱스가 있으면 생략)"""
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        validity = index_validity(conn, SHADOW_INDEX_NAME)
+        if validity:
+            logger.info(f"✅ 섀도 인덱스 있음: {SHADOW_INDEX_NAME}")
+            return
+
+        # 이전 실행이 중단되어 남은 INVALID 인덱스 정리
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {SHADOW_INDEX_NAME}"))
+
+        rows = (
+            conn.execute(text("SELECT COUNT(embedding_shadow) FROM artworks")).scalar()
+            or 0
+        )
+        conn.execute(
+            text("SELECT set_config('maintenance_work_mem', :value, false)"),
+            {"value": maintenance_work_mem},
+        )
+
+        logger.info(f"🔨 섀도 {index_type} 인덱스 빌드 중 ({rows}개 행)...")
+        conn.execute(
+            text(
+                create_index_sql(
+                    index_type,
+                    rows,
+                    index_name=SHADOW_INDEX_NAME,
+                    concurrently=True,
+                    column="embedding_shadow",
+                )
+            )
+        )
+        conn.execute(
+            text(index_comment_sql(index_type, rows, index_name=SHADOW_INDEX_NAME))
+        )
+
+
+def _swap_names(conn, statement: str, pairs) -> None:
+    """(a, b) 이름 맞바꾸기: a → tmp, b → a, tmp → b"""
+    for first, second in pairs:
+        temporary = f"{first}_swap"
+        conn.execute(text(statement.format(old=first, new=temporary)))
+        conn.execute(text(statement.format(old=second, new=first)))
+        conn.execute(text(statement.format(old=temporary, new=second)))
+
+
+def switch_model(
+    version: str,
+    allow_missing: bool,
+    index_type: str,
+    maintenance_work_mem: str,
+    lock_timeout: str,
+) -> None:
+    """
+    섀도 모델을 활성으로 전환 (이전 활성 모델은 섀도로)
+
+    Args:
+        version: 전환할 섀도 모델 버전
+        allow_missing: 섀도 임베딩이 없는 작품이 있어도 전환
+        index_type: 섀도 인덱스 타입 (hnsw / ivfflat)
+        maintenance_work_mem: 인덱스 빌드용 메모리
+        lock_timeout: 테이블 잠금 대기 상한 (매칭 쿼리를 오래 막지 않도록)
+    """
+    db = SessionLocal()
+    try:
+        active, shadow = fetch_model_versions(db)
+        missing = count_missing_shadow(db, version)
+    finally:
+        db.close()
+
+    if shadow != version:
+        raise ValueError(f"'{version}'은 섀도 모델이 아닙니다 (현재 섀도: {shadow})")
+
+    if missing and not allow_missing:
+        raise ValueError(
+            f"섀도 임베딩이 없는 작품 {missing}개: "
+            f"generate_missing_embeddings.py --shadow를 먼저 실행하세요 (--allow-missing으로 무시)"
+        )
+
+    # 1. 섀도 인덱스 (트랜잭션 밖, 매칭 쿼리를 막지 않음)
+    build_shadow_index(index_type, maintenance_work_mem)
+
+    # 2. 교체 (짧은 트랜잭션)
+    logger.info(f"🔀 모델 전환 중: {active} → {version}")
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT set_config('lock_timeout', :value, true)"),
+            {"value": lock_timeout},
+        )
+        conn.execute(text("LOCK TABLE artworks IN ACCESS EXCLUSIVE MODE"))
+
+        # 잠금 이후 다시 확인 (그 사이 새 작품이 추가됐을 수 있음)
+        missing = count_missing_shadow(conn, version)
+        if missing and not allow_missing:
+            raise ValueError(f"섀도 임베딩이 없는 작품 {missing}개 (전환 취소)")
+
+        _swap_names(
+            conn, "ALTER TABLE artworks RENAME COLUMN {old} TO {new}", SWAPPED_COLUMNS
+        )
+        _swap_names(
+            conn, "ALTER INDEX IF EXISTS {old} RENAME TO {new}", SWAPPED_INDEXES
+        )
+
+        # active / shadow 부분 유니크 인덱스 → 한 번에 맞바꾸지 않고 단계별로
+        conn.execute(
+            text(
+                "UPDATE embedding_models SET status = 'retired' WHERE status = 'active'"
+            )
+        )
+        conn.execute(
+            text(
+                """
+                UPDATE embedding_models SET status = 'active', activated_at = now()
+                WHERE version = :version
+            """
+            ),
+            {"version": version},
+        )
+        if active:
+            conn.execute(
+                text(
+                    "UPDATE embedding_models SET status = 'shadow' WHERE version = :version"
+                ),
+                {"version": active},
+            )
+
+        # 이전 모델로 만든 공유 매칭 캐시 정리
+        conn.execute(text("DELETE FROM match_cache_entries"))
+
+    logger.info(
+        f"✅ 전환 완료: 활성 {version}, 섀도 {active} (되돌리기: switch --to {active})"
+    )
+    if missing:
+        logger.warning(
+            f"⚠️  임베딩이 없는 작품 {missing}개: generate_missing_embeddings.py로 채우세요"
+        )
+
+
+def clear_shadow() -> None:
+    """섀도 모델 해제 + 섀도 임베딩/인덱스 정리"""
+    with engine.begin() as conn:
+        _, shadow = fetch_model_versions(conn)
+        conn.execute(
+            text(
+                "UPDATE embedding_models SET status = 'retired' WHERE status = 'shadow'"
+            )
+        )
+        result = conn.execute(
+            text(
+                """
+                UPDATE artworks
+                SET embedding_shadow = NULL,
+                    embedding_shadow_model = NULL,
+                    embedding_shadow_content_hash = NULL
+                WHERE embedding_shadow IS NOT NULL OR embedding_shadow_model IS NOT NULL
+            """
+            )
+        )
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {SHADOW_INDEX_NAME}"))
+
+    logger.info(f"✅ 섀도 모델 해제: {shadow} (작품 {result.rowcount}개 정리)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="작품 임베딩 모델 전환")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("status", help="모델 / 임베딩 현황")
+
+    shadow_parser = subparsers.add_parser("shadow", help="새 모델을 섀도로 등록")
+    shadow_parser.add_argument("--version", required=True)
+    shadow_parser.add_argument(
+        "--backend", choices=("lambda", "huggingface", "onnx"), default="lambda"
+    )
+    shadow_parser.add_argument(
+        "--dimension",
+        type=int,
+        default=384,
+        help="모델 임베딩 차원 (embedding_shadow 컬럼 차원과 같아야 함)",
+    )
+    shadow_parser.add_argument("--description", default=None)
+
+    switch_parser = subparsers.add_parser("switch", help="섀도 모델을 활성으로 전환")
+    switch_parser.add_argument("--to", dest="version", required=True)
+    switch_parser.add_argument("--allow-missing", action="store_true")
+    switch_parser.add_argument(
+        "--type", choices=INDEX_TYPES, default=settings.VECTOR_INDEX_TYPE
+    )
+    switch_parser.add_argument("--maintenance-work-mem", default="512MB")
+    switch_parser.add_argument("--lock-timeout", default="5s")
+
+    subparsers.add_parser("clear-shadow", help="섀도 모델 해제 + 섀도 임베딩 정리")
+
+    args = parser.parse_args()
+
+    if args.command == "status":
+        show_status()
+    elif args.command == "shadow":
+        register_shadow(args.version, args.backend, args.description, args.dimension)
+    elif args.command == "switch":
+        switch_model(
+            args.version,
+            args.allow_missing,
+            args.type,
+            args.maintenance_work_mem,
+            args.lock_timeout,
+        )
+    elif args.command == "clear-shadow":
+        clear_shadow()
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        logger.info("\n\n⚠️  사용자에 의해 중단되었습니다.")
+    except Exception as e:
+        logger.error(f"\n❌ 예상치 못한 오류: {e}", exc_info=True)
+        raise
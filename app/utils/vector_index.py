@@ -0,0 +1,229 @@
+"""
+pgvector ANN 인덱스 유틸리티
+
+- artworks.embedding 코사인 인덱스 (hnsw / ivfflat) 생성 SQL
+- 양자화 인덱스 (VECTOR_INDEX_QUANTIZATION): float32 원본 컬럼은 그대로 두고 표현식 인덱스만 양자화
+  - halfvec: CAST(embedding AS halfvec(384)) 코사인 (인덱스 크기 약 1/2)
+  - binary: CAST(binary_quantize(embedding) AS bit(384)) 해밍 거리 (인덱스 크기 약 1/32)
+  → 양자화 거리로 후보를 넉넉히 뽑은 뒤 원본 float32 벡터로 다시 정렬 (rescoring)
+- 쿼리별 검색 파라미터 (hnsw.ef_search / ivfflat.probes)
+- 인덱스 상태 조회 (빌드 당시 행 수는 COMMENT ON INDEX에 기록)
+"""
+
+import logging
+import math
+import re
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_NAME = "artworks_embedding_idx"
+# 섀도 임베딩 인덱스 (모델 전환 직전에 만들어 두고 전환 시 이름 교체)
+SHADOW_INDEX_NAME = "artworks_embedding_shadow_idx"
+INDEX_TYPES = ("hnsw", "ivfflat")
+QUANTIZATIONS = ("none", "halfvec", "binary")
+DIMENSION = 384
+
+# COMMENT ON INDEX 형식: "type=hnsw;rows=1234"
+_COMMENT_PATTERN = re.compile(r"type=(\w+);rows=(\d+)")
+
+
+def ivfflat_lists(rows: int) -> int:
+    """
+    ivfflat lists 권장값 (pgvector 가이드)
+
+    - 100만 행 이하: rows / 1000
+    - 100만 행 초과: sqrt(rows)
+    """
+    if rows > 1_000_000:
+        return int(math.sqrt(rows))
+    return max(1, rows // 1000)
+
+
+def quantized_expression(column: str, quantization: str) -> str:
+    """
+    인덱스 / 후보 검색에 쓰는 (양자화된) 벡터 표현식
+
+    인덱스 정의와 ORDER BY 표현식이 정확히 같아야 플래너가 인덱스를 사용합니다.
+    (text() 바인드 파라미터 뒤에 ::를 붙일 수 없어 CAST 사용)
+    """
+    if quantization == "none":
+        return column
+    if quantization == "halfvec":
+        return f"CAST({column} AS halfvec({DIMENSION}))"
+    if quantization == "binary":
+        return f"CAST(binary_quantize({column}) AS bit({DIMENSION}))"
+    raise ValueError(f"지원하지 않는 양자화 방식: {quantization}")
+
+
+def candidate_distance_sql(
+    column: str, query: str, quantization: Optional[str] = None
+) -> str:
+    """
+    ANN 후보 검색용 거리 표현식 (ORDER BY에 사용)
+
+    Args:
+        column: 벡터 컬럼 (예: a.embedding)
+        query: 쿼리 벡터 바인드 파라미터 (예: :user_embedding)
+        quantization: none / halfvec / binary (None이면 설정값)
+
+    Returns:
+        str: none/halfvec은 코사인 거리(<=>), binary는 해밍 거리(<~>)
+
+    쿼리는 항상 CAST(... AS vector(384))로 감쌉니다.
+    타입 없는 바인드 파라미터는 binary_quantize(vector / halfvec / bit 오버로드)에서
+    어느 함수인지 정할 수 없어 오류가 납니다 (API와 벤치마크가 같은 SQL을 쓰도록 여기서 처리)
+    """
+    quantization = quantization or settings.VECTOR_INDEX_QUANTIZATION
+    operator = "<~>" if quantization == "binary" else "<=>"
+    query_vector = f"CAST({query} AS vector({DIMENSION}))"
+    return (
+        f"{quantized_expression(column, quantization)} {operator} "
+        f"{quantized_expression(query_vector, quantization)}"
+    )
+
+
+def rescore_candidates(top_k: int, quantization: Optional[str] = None) -> int:
+    """
+    양자화 거리로 뽑을 후보 수 (원본 벡터로 다시 정렬할 개수)
+
+    양자화하지 않으면 top_k 그대로 (rescoring 없음)
+    """
+    quantization = quantization or settings.VECTOR_INDEX_QUANTIZATION
+    if quantization == "none":
+        return top_k
+    return top_k * max(1, settings.VECTOR_RESCORE_FACTOR)
+
+
+def create_index_sql(
+    index_type: str,
+    rows: int = 0,
+    index_name: str = INDEX_NAME,
+    concurrently: bool = False,
+    table: str = "artworks",
+    column: str = "embedding",
+    quantization: Optional[str] = None,
+) -> str:
+    """
+    ANN 인덱스 생성 SQL
+
+    Args:
+        index_type: hnsw / ivfflat
+        rows: 현재 임베딩 행 수 (ivfflat lists 계산용)
+        index_name: 인덱스 이름
+        concurrently: CREATE INDEX CONCURRENTLY 사용 여부 (트랜잭션 밖에서만 가능)
+        table: 대상 테이블 (벤치마크용)
+        column: 대상 컬럼 (섀도 임베딩: embedding_shadow)
+        quantization: none / halfvec / binary (None이면 설정값)
+
+    Returns:
+        str: CREATE INDEX 문
+    """
+    quantization = quantization or settings.VECTOR_INDEX_QUANTIZATION
+    opclass = {
+        "none": "vector_cosine_ops",
+        "halfvec": "halfvec_cosine_ops",
+        "binary": "bit_hamming_ops",
+    }.get(quantization)
+    if opclass is None:
+        raise ValueError(f"지원하지 않는 양자화 방식: {quantization}")
+
+    if index_type == "hnsw":
+        options = (
+            f"m = {settings.HNSW_M}, ef_construction = {settings.HNSW_EF_CONSTRUCTION}"
+        )
+    elif index_type == "ivfflat":
+        options = f"lists = {ivfflat_lists(rows)}"
+    else:
+        raise ValueError(f"지원하지 않는 인덱스 타입: {index_type}")
+
+    return f"""
+        CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}{index_name}
+        ON {table}
+        USING {index_type} (({quantized_expression(column, quantization)}) {opclass})
+        WITH ({options})
+    """
+
+
+def apply_search_settings(db: Session, top_k: int = 10, filtered: bool = False) -> None:
+    """
+    현재 트랜잭션에만 ANN 검색 파라미터 적용 (SET LOCAL과 동일)
+
+    - hnsw.ef_search: 후보 리스트 크기 (top_k 이상이어야 top_k개 반환 가능)
+    - ivfflat.probes: 탐색할 리스트 수
+    - filtered: 전시 범위 필터가 붙으면 post-filter로 결과가 줄어드므로 후보를 넉넉히
+
+    Args:
+        db: DB 세션
+        top_k: 요청 결과 수
+        filtered: WHERE 필터 동반 여부
+    """
+    ef_search = max(settings.HNSW_EF_SEARCH, top_k)
+    probes = settings.IVFFLAT_PROBES
+    if filtered:
+        ef_search *= 4
+        probes *= 4
+
+    db.execute(
+        text(
+            """
+            SELECT set_config('hnsw.ef_search', :ef_search, true),
+                   set_config('ivfflat.probes', :probes, true)
+        """
+        ),
+        {"ef_search": str(min(ef_search, 1000)), "probes": str(probes)},
+    )
+
+
+def get_index_state(db: Session) -> Optional[dict]:
+    """
+    현재 임베딩 인덱스 상태
+
+    Returns:
+        Optional[dict]: {"type", "quantization", "built_rows", "definition"} (인덱스 없으면 None)
+    """
+    row = db.execute(
+        text(
+            """
+            SELECT am.amname AS index_type,
+                   obj_description(i.oid, 'pg_class') AS comment,
+                   pg_get_indexdef(i.oid) AS definition
+            FROM pg_class i
+            JOIN pg_am am ON am.oid = i.relam
+            WHERE i.relname = :index_name AND i.relkind = 'i'
+        """
+        ),
+        {"index_name": INDEX_NAME},
+    ).first()
+
+    if row is None:
+        return None
+
+    built_rows = None
+    match = _COMMENT_PATTERN.search(row.comment or "")
+    if match:
+        built_rows = int(match.group(2))
+
+    # 양자화 방식은 인덱스 정의(표현식)에서 판별
+    quantization = "none"
+    if "binary_quantize" in row.definition:
+        quantization = "binary"
+    elif "halfvec" in row.definition:
+        quantization = "halfvec"
+
+    return {
+        "type": row.index_type,
+        "quantization": quantization,
+        "built_rows": built_rows,
+        "definition": row.definition,
+    }
+
+
+def index_comment_sql(index_type: str, rows: int, index_name: str = INDEX_NAME) -> str:
+    """빌드 정보 기록용 COMMENT ON INDEX 문"""
+    return f"COMMENT ON INDEX {index_name} IS 'type={index_type};rows={int(rows)}'"
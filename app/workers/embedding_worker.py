@@ -0,0 +1,222 @@
+"""
+작품 임베딩 워커
+
+embedding_jobs 큐의 작업을 가져와 임베딩을 생성합니다.
+- 작업 등록 시 NOTIFY로 바로 깨어나고, 놓친 알림/재시도는 주기적 폴링으로 처리
+- EMBEDDING_WORKER_CONCURRENCY개까지 동시에 처리 (스레드 풀)
+- 여러 워커를 띄워도 FOR UPDATE SKIP LOCKED로 같은 작업을 중복 처리하지 않음
+- SIGTERM/SIGINT: 새 작업을 받지 않고 진행 중인 작업을 마친 뒤 종료
+- 주기적으로 응답 없는 작업 회수 + 보관 기간이 지난 done / failed 작업 삭제
+
+사용법:
+    docker-compose up embedding-worker
+    python -m app.workers.embedding_worker
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import logging
+import select
+import signal
+import threading
+import time
+from typing import Set
+
+import requests
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.utils.embedding_jobs import (
+    claim_embedding_jobs,
+    complete_embedding_job,
+    fail_embedding_job,
+    purge_finished_embedding_jobs,
+    reclaim_stale_embedding_jobs,
+)
+from app.utils.embedding_utils import _generate_and_save_embedding
+
+# 로깅 설정
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "embedding_jobs"
+
+# 오래된 running 작업 회수 + 끝난 작업 정리 주기 (초)
+RECLAIM_INTERVAL_SECONDS = 60
+
+
+def process_job(job) -> None:
+    """작업 하나 처리 (스레드마다 별도 세션)"""
+    db = SessionLocal()
+    try:
+        _generate_and_save_embedding(
+            job.artwork_id,
+            job.thumbnail_url,
+            job.title,
+            db,
+            update_index=False,
+            content_hash=job.content_hash,
+            image_bytes=bytes(job.image_data) if job.image_data else None,
+        )
+        complete_embedding_job(db, job.id)
+
+    except Exception as e:
+        db.rollback()
+        if isinstance(e, requests.RequestException):
+            error = f"이미지 다운로드 실패: {e}"
+        else:
+            error = f"임베딩 생성 실패: {e}"
+
+        retry = fail_embedding_job(db, job, error)
+        if retry:
+            logger.warning(
+                f"⚠️ 작업 {job.id} (Artwork ID {job.artwork_id}) {error} "
+                f"→ 재시도 예약 ({job.attempts}/{job.max_attempts})"
+            )
+        else:
+            logger.error(
+                f"❌ 작업 {job.id} (Artwork ID {job.artwork_id}) {error} "
+                f"→ 최대 시도 횟수 초과"
+            )
+    finally:
+        db.close()
+
+
+class EmbeddingWorker:
+    """embedding_jobs 큐 소비자"""
+
+    def __init__(self, concurrency: int, poll_seconds: float):
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="embedding-worker"
+        )
+        self._in_flight: Set[Future] = set()
+        self._stop = threading.Event()
+        self._listen_conn = None
+        self._last_reclaim = 0.0
+
+    def stop(self, *_) -> None:
+        """종료 요청 (시그널 핸들러)"""
+        if not self._stop.is_set():
+            logger.info("🛑 종료 요청: 진행 중인 작업을 마친 뒤 종료합니다")
+        self._stop.set()
+
+    def _listen(self) -> None:
+        """LISTEN 연결 (autocommit 필요)"""
+        conn = engine.raw_connection()
+        conn.driver_connection.autocommit = True
+        with conn.driver_connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+        self._listen_conn = conn
+
+    def _wait_for_notify(self, timeout: float) -> None:
+        """NOTIFY 또는 timeout까지 대기"""
+        if self._listen_conn is None:
+            self._stop.wait(timeout)
+            return
+
+        pg_conn = self._listen_conn.driver_connection
+        if select.select([pg_conn], [], [], timeout)[0]:
+            pg_conn.poll()
+            pg_conn.notifies.clear()
+
+    def _reclaim_if_due(self) -> None:
+        now = time.monotonic()
+        if now - self._last_reclaim < RECLAIM_INTERVAL_SECONDS:
+            return
+        self._last_reclaim = now
+
+        db = SessionLocal()
+        try:
+            reclaimed = reclaim_stale_embedding_jobs(
+                db, settings.EMBEDDING_JOB_LOCK_TIMEOUT_SECONDS
+            )
+            if reclaimed:
+                logger.warning(f"♻️  응답 없는 작업 {reclaimed}개 회수")
+
+            purged = purge_finished_embedding_jobs(
+                db,
+                done_days=settings.EMBEDDING_JOB_DONE_RETENTION_DAYS,
+                failed_days=settings.EMBEDDING_JOB_FAILED_RETENTION_DAYS,
+            )
+            if purged:
+                logger.info(f"🧹 보관 기간이 지난 작업 {purged}개 삭제")
+        finally:
+            db.close()
+
+    def _claim(self, limit: int) -> int:
+        """작업 가져와서 스레드 풀에 제출"""
+        db = SessionLocal()
+        try:
+            jobs = claim_embedding_jobs(db, limit)
+        finally:
+            db.close()
+
+        for job in jobs:
+            logger.info(
+                f"🔄 작업 {job.id} 시작: Artwork ID {job.artwork_id} "
+                f"(시도 {job.attempts}/{job.max_attempts})"
+            )
+            self._in_flight.add(self._executor.submit(process_job, job))
+        return len(jobs)
+
+    def run(self) -> None:
+        logger.info(
+            f"🚀 임베딩 워커 시작 (동시 처리 {self.concurrency}개, 폴링 {self.poll_seconds}초)"
+        )
+
+        while not self._stop.is_set():
+            try:
+                if self._listen_conn is None:
+                    self._listen()
+
+                self._reclaim_if_due()
+
+                self._in_flight = {f for f in self._in_flight if not f.done()}
+                capacity = self.concurrency - len(self._in_flight)
+
+                if capacity <= 0:
+                    # 풀이 가득 참 → 작업 하나가 끝날 때까지 대기
+                    wait(
+                        self._in_flight,
+                        timeout=self.poll_seconds,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    continue
+
+                # 가져온 만큼 꽉 찼으면 대기 없이 바로 다음 작업 확인
+                if self._claim(capacity) < capacity:
+                    self._wait_for_notify(self.poll_seconds)
+
+            except Exception as e:
+                logger.error(f"❌ 워커 루프 오류 (재연결 후 계속): {e}")
+                self._close_listen()
+                self._stop.wait(self.poll_seconds)
+
+        self._executor.shutdown(wait=True)
+        self._close_listen()
+        logger.info("✅ 임베딩 워커 종료")
+
+    def _close_listen(self) -> None:
+        if self._listen_conn is not None:
+            try:
+                self._listen_conn.close()
+            except Exception:
+                pass
+            self._listen_conn = None
+
+
+def main():
+    worker = EmbeddingWorker(
+        concurrency=settings.EMBEDDING_WORKER_CONCURRENCY,
+        poll_seconds=settings.EMBEDDING_WORKER_POLL_SECONDS,
+    )
+    signal.signal(signal.SIGTERM, worker.stop)
+    signal.signal(signal.SIGINT, worker.stop)
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
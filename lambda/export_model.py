@@ -0,0 +1,115 @@
+"""
+Lambda 이미지 빌드 단계: DINOv2-small 가중치 내장 + TorchScript 내보내기
+
+콜드 컨테이너가 HuggingFace Hub에서 가중치를 받지 않도록 Docker 빌드 시 실행합니다.
+- {output_dir}/hf: save_pretrained 스냅샷 (transformers 모드용)
+- {output_dir}/dinov2_small_cls.pt: CLS 토큰 (N, 384)을 반환하는 traced + frozen TorchScript
+
+내보낸 뒤 검증:
+- traced 그래프 vs 원본 모델 출력 (배치 크기 1, 3)
+- lambda_handler.preprocess_images vs AutoImageProcessor 전처리
+
+사용법 (lambda/Dockerfile):
+    python export_model.py --output-dir /opt/model
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from PIL import Image
+import lambda_handler
+import numpy as np
+import torch
+from transformers import AutoImageProcessor, AutoModel
+
+
+class ClsEmbeddingModel(torch.nn.Module):
+    """last_hidden_state에서 CLS 토큰만 반환하는 래퍼"""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, pixel_values):
+        return self.model(pixel_values=pixel_values).last_hidden_state[:, 0, :]
+
+
+def vendor_weights(model_name: str, hf_dir: str):
+    """Hub에서 받은 가중치/전처리 설정을 이미지 안에 저장"""
+    # 다운로드 캐시는 임시 디렉토리에 (이미지 레이어에 남기지 않음)
+    with tempfile.TemporaryDirectory() as cache_dir:
+        processor = AutoImageProcessor.from_pretrained(model_name, cache_dir=cache_dir)
+        model = AutoModel.from_pretrained(model_name, cache_dir=cache_dir)
+        processor.save_pretrained(hf_dir)
+        model.save_pretrained(hf_dir)
+
+    print(f"📦 가중치 저장: {hf_dir}")
+    return processor, model.eval()
+
+
+def export_torchscript(model, output_path: str):
+    """CLS 임베딩 그래프 trace + freeze (배치 크기 가변, 입력 224x224 고정)"""
+    crop = lambda_handler.CROP_SIZE
+    wrapper = ClsEmbeddingModel(model).eval()
+
+    with torch.inference_mode():
+        traced = torch.jit.trace(wrapper, torch.randn(2, 3, crop, crop))
+    traced = torch.jit.freeze(traced.eval())
+    traced.save(output_path)
+
+    size_mb = os.path.getsize(output_path) / 1024 / 1024
+    print(f"✅ TorchScript 저장: {output_path} ({size_mb:.1f}MB)")
+    return torch.jit.load(output_path)
+
+
+def verify(processor, model, traced, tolerance: float = 1e-3):
+    """내보낸 그래프/전처리가 transformers 경로와 같은 결과를 내는지 확인"""
+    crop = lambda_handler.CROP_SIZE
+    wrapper = ClsEmbeddingModel(model).eval()
+
+    with torch.inference_mode():
+        for batch_size in (1, 3):
+            pixel_values = torch.randn(batch_size, 3, crop, crop)
+            diff = (traced(pixel_values) - wrapper(pixel_values)).abs().max().item()
+            print(f"🔍 traced vs eager (batch {batch_size}): max diff {diff:.2e}")
+            if diff > tolerance:
+                raise RuntimeError(f"traced 출력 불일치: {diff:.2e}")
+
+    # 가로/세로 이미지 모두 확인 (짧은 변 기준 리사이즈 + 중앙 크롭)
+    rng = np.random.default_rng(0)
+    images = [
+        Image.fromarray(rng.integers(0, 256, (480, 640, 3), dtype=np.uint8)),
+        Image.fromarray(rng.integers(0, 256, (900, 333, 3), dtype=np.uint8)),
+    ]
+    expected = processor(images=images, return_tensors="pt")["pixel_values"]
+    actual = lambda_handler.preprocess_images(images)
+    diff = (actual - expected).abs().max().item()
+    print(f"🔍 preprocess_images vs AutoImageProcessor: max diff {diff:.2e}")
+    if diff > tolerance:
+        raise RuntimeError(f"전처리 결과 불일치: {diff:.2e}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="DINOv2 가중치 내장 + TorchScript 내보내기"
+    )
+    parser.add_argument("--model", default=lambda_handler.MODEL_NAME)
+    parser.add_argument("--output-dir", default=lambda_handler.MODEL_DIR)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    processor, model = vendor_weights(args.model, os.path.join(args.output_dir, "hf"))
+    traced = export_torchscript(
+        model, os.path.join(args.output_dir, lambda_handler.TRACED_MODEL_FILENAME)
+    )
+    verify(processor, model, traced)
+
+    print(f"🎉 완료 ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
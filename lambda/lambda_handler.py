@@ -1,10 +1,26 @@
 """
-AWS Lambda 함수: 단일 이미지 임베딩 생성
+AWS Lambda 함수: 이미지 임베딩 생성 (단일 / 배치)
 DINOv2-small 모델 사용
+
+모델은 이미지 빌드 시 export_model.py로 MODEL_DIR에 내장합니다 (콜드 스타트에 Hub 다운로드 없음).
+- torchscript 모드 (기본): traced CLS 그래프 + numpy 전처리 (AutoImageProcessor 미사용)
+- transformers 모드: 내장 가중치(없으면 Hub)로 AutoModel + AutoImageProcessor
+INFERENCE_MODE 환경 변수로 선택 (auto: traced 파일이 있으면 torchscript)
+
+이미지는 base64 페이로드 또는 S3 객체 키(s3_bucket, s3_key)로 받습니다.
+S3 모드는 Lambda 실행 역할에 s3:GetObject 권한이 필요합니다.
+
+모든 응답 body에 콜드 스타트 정보(cold_start, container_id, 소요 시간)를 포함합니다.
 """
+import time
+
+# 컨테이너 초기화 시작 시각 (import 시간 포함 콜드 스타트 측정용)
+INIT_STARTED = time.perf_counter()
+
 import json
+import uuid
+import boto3
 import torch
-from transformers import AutoImageProcessor, AutoModel
 from PIL import Image
 import numpy as np
 import io
@@ -15,39 +31,292 @@ import os
 os.environ['TRANSFORMERS_CACHE'] = '/tmp/huggingface'
 os.environ['HF_HOME'] = '/tmp/huggingface'
 
+# 내장 모델 (export_model.py 출력)
+MODEL_NAME = 'facebook/dinov2-small'
+MODEL_DIR = os.environ.get('MODEL_DIR', '/opt/model')
+TRACED_MODEL_FILENAME = 'dinov2_small_cls.pt'
+TRACED_MODEL_PATH = os.path.join(MODEL_DIR, TRACED_MODEL_FILENAME)
+VENDORED_MODEL_DIR = os.path.join(MODEL_DIR, 'hf')
+
+# auto / torchscript / transformers
+INFERENCE_MODE = os.environ.get('INFERENCE_MODE', 'auto')
+
+# 전처리 (AutoImageProcessor와 동일: 짧은 변 256 bicubic → 224 center crop → ImageNet 정규화)
+RESIZE_SHORTEST_EDGE = 256
+CROP_SIZE = 224
+IMAGE_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+IMAGE_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+# (x / 255 - mean) / std = x * NORM_SCALE + NORM_OFFSET (미리 계산해 곱셈/덧셈 한 번으로)
+NORM_SCALE = (1.0 / (255.0 * IMAGE_STD)).astype(np.float32)
+NORM_OFFSET = (-IMAGE_MEAN / IMAGE_STD).astype(np.float32)
+
+# torch 스레드 = Lambda vCPU 수 (메모리 설정에 비례, 기본값은 호스트 코어 수라 과다 할당됨)
+TORCH_NUM_THREADS = int(
+    os.environ.get('TORCH_NUM_THREADS') or len(os.sched_getaffinity(0))
+)
+torch.set_num_threads(TORCH_NUM_THREADS)
+torch.set_num_interop_threads(1)
+
+# 배치 요청 최대 이미지 수 (6MB 페이로드 / 실행 시간 제한 대응)
+MAX_BATCH_SIZE = int(os.environ.get('MAX_BATCH_SIZE', '16'))
+
+# S3 모드: 읽기 허용 버킷 (쉼표 구분, 비어있으면 제한 없음)
+ALLOWED_S3_BUCKETS = {
+    bucket.strip()
+    for bucket in os.environ.get('ALLOWED_S3_BUCKETS', '').split(',')
+    if bucket.strip()
+}
+
+# S3 원본 디코딩 크기 상한 (JPEG draft 모드, 전처리기가 어차피 224로 줄임)
+S3_DECODE_MAX_SIZE = int(os.environ.get('S3_DECODE_MAX_SIZE', '800'))
+
+# 워밍업 요청 대기 상한 (동시 워밍업이 서로 다른 컨테이너에 가도록 잠시 점유)
+MAX_WARMUP_HOLD_MS = 1000
+
+S3_CLIENT = None
+
 # DINOv2 모델 (글로벌 변수 - 콜드 스타트 최적화)
 MODEL = None
 PROCESSOR = None
 DEVICE = None
 
+# 콜드 스타트 정보 (컨테이너당 한 번)
+COLD_START = True
+CONTAINER_ID = uuid.uuid4().hex[:8]
+INIT_MS = None
+MODEL_LOAD_MS = None
+
+
+def resolve_inference_mode() -> str:
+    """실제 사용할 추론 모드 (auto → traced 파일 유무로 결정)"""
+    if INFERENCE_MODE == 'auto':
+        return 'torchscript' if os.path.exists(TRACED_MODEL_PATH) else 'transformers'
+    if INFERENCE_MODE not in ('torchscript', 'transformers'):
+        raise ValueError(f'알 수 없는 INFERENCE_MODE: {INFERENCE_MODE}')
+    return INFERENCE_MODE
+
 
 def load_model():
     """DINOv2 모델 로드 (첫 실행 시 한 번만)"""
-    global MODEL, PROCESSOR, DEVICE
+    global MODEL, PROCESSOR, DEVICE, MODEL_LOAD_MS, INFERENCE_MODE
     
     if MODEL is None:
-        print("🦖 DINOv2 모델 로딩 중...")
+        INFERENCE_MODE = resolve_inference_mode()
+        print(f"🦖 DINOv2 모델 로딩 중... ({INFERENCE_MODE}, 스레드 {TORCH_NUM_THREADS}개)")
+        started = time.perf_counter()
         
         DEVICE = torch.device("cpu")
-        model_name = "facebook/dinov2-small"
         
-        PROCESSOR = AutoImageProcessor.from_pretrained(model_name)
-        MODEL = AutoModel.from_pretrained(model_name).to(DEVICE)
-        MODEL.eval()
+        if INFERENCE_MODE == 'torchscript':
+            model = torch.jit.load(TRACED_MODEL_PATH, map_location=DEVICE)
+            model.eval()
+            # 첫 호출 때 일어나는 그래프 최적화를 요청 전에 끝내둠
+            with torch.inference_mode():
+                model(torch.zeros(1, 3, CROP_SIZE, CROP_SIZE))
+        else:
+            # transformers import가 무거우므로 이 모드에서만 로드
+            from transformers import AutoImageProcessor, AutoModel
+            
+            model_source = VENDORED_MODEL_DIR if os.path.isdir(VENDORED_MODEL_DIR) else MODEL_NAME
+            PROCESSOR = AutoImageProcessor.from_pretrained(model_source)
+            model = AutoModel.from_pretrained(model_source).to(DEVICE)
+            model.eval()
         
-        print("✅ 모델 로딩 완료!")
+        MODEL = model
+        MODEL_LOAD_MS = (time.perf_counter() - started) * 1000
+        print(f"✅ 모델 로딩 완료! ({MODEL_LOAD_MS:.0f}ms)")
+
+
+def resize_and_crop(image: Image.Image) -> np.ndarray:
+    """짧은 변 256 bicubic 리사이즈 → 224 중앙 크롭 (HWC uint8)"""
+    width, height = image.size
+    if width <= height:
+        new_size = (RESIZE_SHORTEST_EDGE, int(RESIZE_SHORTEST_EDGE * height / width))
+    else:
+        new_size = (int(RESIZE_SHORTEST_EDGE * width / height), RESIZE_SHORTEST_EDGE)
+    image = image.resize(new_size, Image.Resampling.BICUBIC)
+    
+    left = (new_size[0] - CROP_SIZE) // 2
+    top = (new_size[1] - CROP_SIZE) // 2
+    image = image.crop((left, top, left + CROP_SIZE, top + CROP_SIZE))
+    return np.asarray(image, dtype=np.uint8)
+
+
+def preprocess_images(images: list) -> torch.Tensor:
+    """RGB 이미지 목록 → (N, 3, 224, 224) float32 텐서 (AutoImageProcessor 대체)"""
+    pixels = np.stack([resize_and_crop(image) for image in images]).astype(np.float32)
+    pixels *= NORM_SCALE
+    pixels += NORM_OFFSET
+    return torch.from_numpy(np.ascontiguousarray(pixels.transpose(0, 3, 1, 2)))
 
 
 def get_embedding(image: Image.Image) -> np.ndarray:
     """이미지에서 임베딩 추출 (384차원)"""
-    inputs = PROCESSOR(images=image, return_tensors="pt")
+    return get_embeddings([image])[0]
+
+
+def get_embeddings(images: list) -> np.ndarray:
+    """여러 이미지를 한 번의 forward pass로 임베딩 추출 (N x 384)"""
+    if PROCESSOR is None:
+        # torchscript: traced 그래프가 CLS 토큰을 바로 반환
+        with torch.inference_mode():
+            return MODEL(preprocess_images(images).to(DEVICE)).cpu().numpy()
+    
+    inputs = PROCESSOR(images=images, return_tensors="pt")
     inputs = {k: v.to(DEVICE) for k, v in inputs.items()}
     
     with torch.no_grad():
         outputs = MODEL(**inputs)
-        embedding = outputs.last_hidden_state[:, 0, :].cpu().numpy()
+        embeddings = outputs.last_hidden_state[:, 0, :].cpu().numpy()
+    
+    return embeddings
+
+
+def encode_float32(embeddings: np.ndarray) -> str:
+    """임베딩 → base64 float32 (little-endian) blob"""
+    return base64.b64encode(embeddings.astype('<f4').tobytes()).decode()
+
+
+def decode_image(image_base64: str) -> Image.Image:
+    """Base64 → RGB 이미지"""
+    image_bytes = base64.b64decode(image_base64)
+    return Image.open(io.BytesIO(image_bytes)).convert("RGB")
+
+
+def get_s3_client():
+    """S3 클라이언트 (글로벌 변수 - 컨테이너 재사용 시 커넥션 재사용)"""
+    global S3_CLIENT
+    
+    if S3_CLIENT is None:
+        S3_CLIENT = boto3.client('s3')
+    
+    return S3_CLIENT
+
+
+def load_s3_image(s3_bucket: str, s3_key: str) -> Image.Image:
+    """S3 객체 → RGB 이미지 (API 서버를 거치지 않고 직접 읽음)"""
+    if not s3_bucket or not s3_key:
+        raise ValueError('s3_bucket과 s3_key가 모두 필요합니다')
+    
+    if ALLOWED_S3_BUCKETS and s3_bucket not in ALLOWED_S3_BUCKETS:
+        raise ValueError(f'허용되지 않은 버킷: {s3_bucket}')
     
-    return embedding.squeeze()
+    response = get_s3_client().get_object(Bucket=s3_bucket, Key=s3_key)
+    image = Image.open(io.BytesIO(response['Body'].read()))
+    image.draft('RGB', (S3_DECODE_MAX_SIZE, S3_DECODE_MAX_SIZE))
+    return image.convert('RGB')
+
+
+def load_image(item) -> Image.Image:
+    """배치 항목 → RGB 이미지 (base64 문자열 또는 {"s3_bucket", "s3_key"})"""
+    if isinstance(item, dict):
+        return load_s3_image(item.get('s3_bucket'), item.get('s3_key'))
+    return decode_image(item)
+
+
+def handle_batch(images_base64: list, headers: dict, encoding: str = 'json') -> dict:
+    """배치 요청 처리: 모든 이미지를 쌓아서 한 번에 추론"""
+    if not isinstance(images_base64, list) or not images_base64:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({'error': 'images는 비어있지 않은 배열이어야 합니다'})
+        }
+    
+    if len(images_base64) > MAX_BATCH_SIZE:
+        return {
+            'statusCode': 400,
+            'headers': headers,
+            'body': json.dumps({
+                'error': f'배치 크기 초과: {len(images_base64)} (최대 {MAX_BATCH_SIZE})'
+            })
+        }
+    
+    print(f"🖼️  배치 이미지 디코딩 중... ({len(images_base64)}개)")
+    
+    images = []
+    for index, image_base64 in enumerate(images_base64):
+        try:
+            images.append(load_image(image_base64))
+        except Exception as e:
+            return {
+                'statusCode': 400,
+                'headers': headers,
+                'body': json.dumps({
+                    'error': f'이미지 로드 실패 (index {index}): {str(e)}',
+                    'index': index
+                })
+            }
+    
+    print(f"🧠 배치 임베딩 생성 중... ({len(images)}개)")
+    embeddings = get_embeddings(images)
+    print(f"✅ 배치 임베딩 생성 완료: shape {embeddings.shape}")
+    
+    if encoding == 'float32':
+        # N x 384 행렬을 하나의 float32 blob으로 (행 순서 = 요청 순서)
+        response_body = {'embeddings_b64': encode_float32(embeddings), 'encoding': 'float32'}
+    else:
+        response_body = {'embeddings': embeddings.tolist()}
+    
+    response_body['dimension'] = int(embeddings.shape[1])
+    response_body['count'] = int(embeddings.shape[0])
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps(response_body)
+    }
+
+
+def embedding_response(image: Image.Image, headers: dict, encoding: str = 'json') -> dict:
+    """단일 이미지 임베딩 생성 + 응답"""
+    print(f"🧠 이미지 임베딩 생성 중...")
+    embedding = get_embedding(image)
+    print(f"✅ 임베딩 생성 완료: shape {embedding.shape}")
+
+    if encoding == 'float32':
+        # base64 float32 blob (JSON float 리스트 대비 약 1/3 크기, 파싱 불필요)
+        return {
+            'statusCode': 200,
+            'headers': headers,
+            'body': json.dumps({
+                'embedding_b64': encode_float32(embedding),
+                'encoding': 'float32',
+                'dimension': int(embedding.shape[0])
+            })
+        }
+
+    # NumPy array → Python list 변환
+    embedding_list = embedding.tolist()
+    
+    return {
+        'statusCode': 200,
+        'headers': headers,
+        'body': json.dumps({
+            'embedding': embedding_list,
+            'dimension': len(embedding_list)
+        }, ensure_ascii=False)
+    }
+
+
+def add_telemetry(response: dict, cold_start: bool, started: float) -> dict:
+    """응답 body에 콜드 스타트 정보 추가"""
+    try:
+        body = json.loads(response.get('body') or '{}')
+    except (TypeError, ValueError):
+        return response
+    
+    body['cold_start'] = cold_start
+    body['container_id'] = CONTAINER_ID
+    body['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+    body['inference_mode'] = INFERENCE_MODE
+    if cold_start:
+        body['init_ms'] = round(INIT_MS, 1)
+        if MODEL_LOAD_MS is not None:
+            body['model_load_ms'] = round(MODEL_LOAD_MS, 1)
+    
+    response['body'] = json.dumps(body, ensure_ascii=False)
+    return response
 
 
 def handler(event, context):
@@ -59,9 +328,26 @@ def handler(event, context):
         "image_base64": "iVBORw0KGgoAAAANS..."
     }
     
-    또는 Warming up:
+    또는 S3 객체 (Lambda가 직접 읽음):
     {
-        "warmup": true
+        "s3_bucket": "lastdance-artworks",
+        "s3_key": "artworks/{uuid}.jpg"
+    }
+    
+    또는 배치 (한 번의 forward pass, base64와 S3 객체 혼용 가능):
+    {
+        "images": ["iVBORw0KGgo...", {"s3_bucket": "...", "s3_key": "..."}]
+    }
+    
+    또는 Warming up (hold_ms: 동시 워밍업이 각각 다른 컨테이너를 깨우도록 잠시 점유):
+    {
+        "warmup": true,
+        "hold_ms": 200
+    }
+    
+    공통 옵션:
+    {
+        "encoding": "float32"  // 응답을 base64 float32 blob으로 (기본값: "json")
     }
     
     Response:
@@ -69,8 +355,44 @@ def handler(event, context):
         "embedding" : [0.123, 0.456, ...], // 384차원 벡터
         "dimension" : 384
     }
+    
+    float32 Response:
+    {
+        "embedding_b64" : "zczMPc3MTD4...", // little-endian float32 x 384
+        "encoding" : "float32",
+        "dimension" : 384
+    }
+    
+    배치 Response:
+    {
+        "embeddings" : [[0.123, ...], [0.456, ...]], // 요청 순서와 동일
+        "dimension" : 384,
+        "count" : 2
+    }
+    
+    공통 Response 필드 (콜드 스타트 측정):
+    {
+        "cold_start" : true,       // 이 컨테이너의 첫 요청 여부
+        "container_id" : "a1b2c3d4",
+        "duration_ms" : 812.3,     // 핸들러 실행 시간
+        "init_ms" : 2310.5,        // (콜드) 모듈 import ~ 첫 요청
+        "model_load_ms" : 5120.8,  // (콜드) 모델 로드 시간
+        "inference_mode" : "torchscript"
+    }
     """
+    global COLD_START, INIT_MS
     
+    started = time.perf_counter()
+    cold_start = COLD_START
+    if cold_start:
+        COLD_START = False
+        INIT_MS = (started - INIT_STARTED) * 1000
+    
+    return add_telemetry(handle_request(event), cold_start, started)
+
+
+def handle_request(event) -> dict:
+    """요청 종류별 처리 (handler 참고)"""
     # CORS 헤더
     headers = {
         'Access-Control-Allow-Origin': '*',
@@ -84,6 +406,10 @@ def handler(event, context):
         if event.get('warmup'):
             print("🔥 Warming up... 모델 로드 유지")
             load_model()
+            
+            hold_ms = min(int(event.get('hold_ms') or 0), MAX_WARMUP_HOLD_MS)
+            if hold_ms > 0:
+                time.sleep(hold_ms / 1000)
             return {
                 'statusCode': 200,
                 'headers': headers,
@@ -111,6 +437,29 @@ def handler(event, context):
             body_str = base64.b64decode(body_str).decode('utf-8')
         
         body = json.loads(body_str)
+        
+        # 응답 인코딩: json (기본, float 리스트) / float32 (base64 blob)
+        encoding = body.get('encoding', 'json')
+        
+        # 배치 요청
+        if 'images' in body:
+            return handle_batch(body.get('images'), headers, encoding)
+        
+        # S3 객체 요청
+        if 's3_key' in body:
+            print(f"🪣 S3 이미지 로드 중: s3://{body.get('s3_bucket')}/{body.get('s3_key')}")
+            try:
+                uploaded_image = load_s3_image(body.get('s3_bucket'), body.get('s3_key'))
+                print(f"✅ S3 이미지 로드: {uploaded_image.size}")
+            except Exception as e:
+                return {
+                    'statusCode': 400,
+                    'headers': headers,
+                    'body': json.dumps({'error': f'S3 이미지 로드 실패: {str(e)}'})
+                }
+            
+            return embedding_response(uploaded_image, headers, encoding)
+        
         image_base64 = body.get('image_base64')
         
         # Validation
@@ -122,6 +471,13 @@ def handler(event, context):
                     'error': 'image_base64 필드가 필요합니다',
                     'example': {
                         'image_base64': 'base64_encoded_image_string',
+                    },
+                    's3_example': {
+                        's3_bucket': 'bucket_name',
+                        's3_key': 'artworks/image.jpg',
+                    },
+                    'batch_example': {
+                        'images': ['base64_encoded_image_string', '...'],
                     }
                 })
             }
@@ -130,8 +486,7 @@ def handler(event, context):
         
         # Base64 디코딩
         try:
-            image_bytes = base64.b64decode(image_base64)
-            uploaded_image = Image.open(io.BytesIO(image_bytes)).convert("RGB")
+            uploaded_image = decode_image(image_base64)
             print(f"✅ 업로드 이미지 로드: {uploaded_image.size}")
         except Exception as e:
             return {
@@ -140,22 +495,7 @@ def handler(event, context):
                 'body': json.dumps({'error': f'이미지 디코딩 실패: {str(e)}'})
             }
         
-        # 업로드된 이미지의 임베딩 생성
-        print(f"🧠 이미지 임베딩 생성 중...")
-        embedding = get_embedding(uploaded_image)
-        print(f"✅ 임베딩 생성 완료: shape {embedding.shape}")
-
-        # NumPy array → Python list 변환
-        embedding_list = embedding.tolist()
-        
-        return {
-            'statusCode': 200,
-            'headers': headers,
-            'body': json.dumps({
-                'embedding': embedding_list,
-                'dimension': len(embedding_list)
-            }, ensure_ascii=False)
-        }
+        return embedding_response(uploaded_image, headers, encoding)
         
     except Exception as e:
         print(f"❌ 에러 발생: {e}")
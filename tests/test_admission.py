@@ -0,0 +1,216 @@
+"""매칭 요청 수용 제어 (토큰 버킷 / 동시 실행 제한 / 미들웨어 / 실시간 인식) 테스트"""
+
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.api.v1.endpoints import artworks
+from app.middleware.admission import MatchAdmissionMiddleware
+from app.utils import admission as admission_module
+from app.utils.admission import (
+    AdmissionRejected,
+    MatchAdmission,
+    MatchConcurrencyLimiter,
+    TokenBucketLimiter,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(admission_module, "time", clock)
+    return clock
+
+
+def test_token_bucket_burst_then_refill(clock):
+    limiter = TokenBucketLimiter(rate=0.5, burst=2)
+
+    limiter.consume("visitor")
+    limiter.consume("visitor")
+    with pytest.raises(AdmissionRejected) as rejected:
+        limiter.consume("visitor")
+    assert rejected.value.status_code == 429
+    assert rejected.value.retry_after == 2
+
+    limiter.consume("other")  # UUID별로 따로
+    clock.now += 2
+    limiter.consume("visitor")
+    assert limiter.stats()["allowed"] == 4
+    assert limiter.stats()["limited"] == 1
+
+
+def test_token_bucket_tracks_bounded_keys(clock):
+    limiter = TokenBucketLimiter(rate=1.0, burst=1, max_keys=2)
+
+    for key in ("a", "b", "c"):
+        limiter.consume(key)
+
+    assert limiter.stats()["tracked_keys"] == 2
+    limiter.consume("a")  # 제거된 키는 가득 찬 버킷으로 다시 시작
+
+
+def test_concurrency_limiter_queue_full_and_timeout():
+    async def run():
+        limiter = MatchConcurrencyLimiter(
+            max_concurrent=1, max_queue=1, queue_timeout=0.05
+        )
+        await limiter.acquire()
+
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected) as full:
+            await limiter.acquire()
+        with pytest.raises(AdmissionRejected) as timed_out:
+            await waiter
+        return limiter, full.value, timed_out.value
+
+    limiter, full, timed_out = asyncio.run(run())
+
+    assert full.status_code == timed_out.status_code == 503
+    stats = limiter.stats()
+    assert (stats["rejected_queue_full"], stats["rejected_timeout"]) == (1, 1)
+    assert (stats["active"], stats["waiting"]) == (1, 0)
+
+
+def test_concurrency_limiter_hands_slot_to_queued_request():
+    async def run():
+        limiter = MatchConcurrencyLimiter(
+            max_concurrent=1, max_queue=1, queue_timeout=1
+        )
+        await limiter.acquire()
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+        limiter.release()
+        await asyncio.wait_for(waiter, timeout=1)
+        return limiter.stats()
+
+    stats = asyncio.run(run())
+
+    assert (stats["active"], stats["admitted"], stats["queued"]) == (1, 2, 1)
+
+
+def test_admission_without_limiter_only_rate_limits(clock):
+    admission = MatchAdmission(rate_limiter=TokenBucketLimiter(rate=1.0, burst=1))
+
+    assert asyncio.run(admission.admit("visitor")) is False
+    assert asyncio.run(admission.admit(None)) is False  # UUID 없으면 빈도 제한 없음
+    with pytest.raises(AdmissionRejected):
+        asyncio.run(admission.admit("visitor"))
+
+
+async def slow_match(request):
+    await asyncio.sleep(0.1)
+    return JSONResponse({"matched": True})
+
+
+def make_app(admission: MatchAdmission) -> Starlette:
+    app = Starlette(
+        routes=[Route("/artworks/match", slow_match, methods=["GET", "POST"])]
+    )
+    app.add_middleware(
+        MatchAdmissionMiddleware, admission=admission, path_prefixes=["/artworks/match"]
+    )
+    return app
+
+
+def request_all(app, requests):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await asyncio.gather(
+                *(
+                    c.request(method, "/artworks/match", headers=h)
+                    for method, h in requests
+                )
+            )
+
+    return asyncio.run(run())
+
+
+def test_middleware_sheds_overload_with_retry_after():
+    admission = MatchAdmission(MatchConcurrencyLimiter(1, max_queue=0))
+
+    responses = request_all(make_app(admission), [("POST", {})] * 3 + [("GET", {})])
+
+    assert sorted(r.status_code for r in responses[:3]) == [200, 503, 503]
+    assert responses[3].status_code == 200  # GET은 제한 없음
+    rejected = next(r for r in responses if r.status_code == 503)
+    assert rejected.headers["retry-after"] == "1"
+    assert "detail" in rejected.json()
+    assert admission.limiter.active == 0
+
+
+def test_middleware_rate_limits_per_uuid():
+    admission = MatchAdmission(rate_limiter=TokenBucketLimiter(rate=0.1, burst=1))
+    headers = {"x-user-uuid": "visitor"}
+
+    responses = request_all(make_app(admission), [("POST", headers)] * 2)
+
+    assert sorted(r.status_code for r in responses) == [200, 429]
+    limited = next(r for r in responses if r.status_code == 429)
+    assert limited.headers["retry-after"] == "10"
+
+
+class FakeSession:
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def stream_client(monkeypatch):
+    admission = MatchAdmission(
+        MatchConcurrencyLimiter(1, max_queue=0),
+        TokenBucketLimiter(rate=1.0, burst=1),
+    )
+
+    async def find_artwork_matches(*args, **kwargs):
+        return []
+
+    monkeypatch.setattr(artworks, "SessionLocal", FakeSession)
+    monkeypatch.setattr(artworks, "resolve_match_scope", lambda db, **kwargs: None)
+    monkeypatch.setattr(artworks, "find_artwork_matches", find_artwork_matches)
+    monkeypatch.setattr(artworks, "get_match_admission", lambda: admission)
+
+    app = FastAPI()
+    app.include_router(artworks.router)
+    return TestClient(app), admission
+
+
+def test_stream_frames_go_through_admission(stream_client):
+    client, admission = stream_client
+
+    with client.websocket_connect(
+        "/artworks/match/stream", headers={"x-user-uuid": "visitor"}
+    ) as websocket:
+        assert websocket.receive_json()["type"] == "ready"
+
+        websocket.send_bytes(b"frame-1")
+        assert websocket.receive_json()["type"] == "frame"
+
+        websocket.send_bytes(b"frame-2")
+        rejected = websocket.receive_json()
+        assert rejected["type"] == "error"
+        assert (rejected["status_code"], rejected["retry_after"]) == (429, 1)
+
+        websocket.send_text('{"type": "stop"}')
+        done = websocket.receive_json()
+
+    assert done["type"] == "done" and done["processed"] == 1
+    stats = admission.stats()
+    assert stats["concurrency"]["admitted"] == 1
+    assert stats["concurrency"]["active"] == 0
+    assert stats["rate_limit"]["limited"] == 1
@@ -0,0 +1,114 @@
+"""BodySizeLimitMiddleware / LoggingMiddleware Body 수신 테스트 (ASGI 앱 직접 호출)"""
+
+import asyncio
+import json
+
+import httpx
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.middleware.body_limit import BodySizeLimitMiddleware
+from app.middleware.logging import LoggingMiddleware
+
+MAX_BYTES = 1024
+
+
+async def echo_size(request: Request):
+    body = await request.body()
+    return JSONResponse({"size": len(body)})
+
+
+def make_app(with_logging: bool = False) -> Starlette:
+    app = Starlette(routes=[Route("/match", echo_size, methods=["POST"])])
+    app.add_middleware(
+        BodySizeLimitMiddleware, max_bytes=MAX_BYTES, path_prefixes=["/match"]
+    )
+    if with_logging:
+        app.add_middleware(LoggingMiddleware)
+    return app
+
+
+def post(app, **kwargs) -> httpx.Response:
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await c.post("/match", **kwargs)
+
+    return asyncio.run(run())
+
+
+def chunks(total: int, size: int = 256):
+    """Content-Length 없는 (chunked) Body"""
+
+    async def generate():
+        sent = 0
+        while sent < total:
+            chunk = b"a" * min(size, total - sent)
+            sent += len(chunk)
+            yield chunk
+
+    return generate()
+
+
+def test_small_body_passes():
+    response = post(make_app(), content=b"a" * 100)
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 100}
+
+
+def test_content_length_over_limit_rejected_before_reading():
+    response = post(make_app(), content=b"a" * (MAX_BYTES + 1))
+
+    assert response.status_code == 413
+
+
+def test_chunked_body_over_limit_rejected_while_streaming():
+    response = post(make_app(), content=chunks(MAX_BYTES * 4))
+
+    assert response.status_code == 413
+
+
+def test_logging_replays_small_json_body():
+    payload = json.dumps({"threshold": 0.7}).encode()
+    response = post(
+        make_app(with_logging=True),
+        content=payload,
+        headers={"content-type": "application/json"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"size": len(payload)}
+
+
+def test_logging_does_not_buffer_large_chunked_json(monkeypatch):
+    # 로깅 한도를 넘는 chunked JSON은 한도까지만 읽고 나머지는 스트리밍으로 전달
+    monkeypatch.setattr(LoggingMiddleware, "MAX_LOGGED_BODY_BYTES", 512)
+    received = []
+    original = LoggingMiddleware._read_body_prefix
+
+    async def spy(self, request):
+        body_bytes, complete = await original(self, request)
+        received.append((len(body_bytes), complete))
+        return body_bytes, complete
+
+    monkeypatch.setattr(LoggingMiddleware, "_read_body_prefix", spy)
+
+    app = make_app(with_logging=True)
+    too_large = post(
+        app,
+        content=chunks(MAX_BYTES * 4),
+        headers={"content-type": "application/json"},
+    )
+    allowed = post(
+        app,
+        content=chunks(900),
+        headers={"content-type": "application/json"},
+    )
+
+    assert too_large.status_code == 413
+    assert allowed.status_code == 200
+    assert allowed.json() == {"size": 900}
+    assert all(size <= 512 + 256 and not complete for size, complete in received)
@@ -0,0 +1,29 @@
+"""임베딩 백엔드 테스트 (모델 / 네트워크 없이 전처리만)"""
+
+import io
+
+from PIL import Image
+import numpy as np
+
+from app.utils.embedding_backend import OnnxEmbeddingBackend
+
+
+def encode(image: Image.Image, format: str) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=format, quality=95)
+    return buffer.getvalue()
+
+
+def test_onnx_preprocess_matches_full_decode():
+    # 큰 JPEG도 전체 해상도로 디코딩한 픽셀에서 리사이즈해야 함 (draft 축소 디코딩 X)
+    jpeg = encode(
+        Image.radial_gradient("L").resize((2048, 1536)).convert("RGB"), "JPEG"
+    )
+    decoded = Image.open(io.BytesIO(jpeg)).convert("RGB")
+    backend = OnnxEmbeddingBackend(model_path="unused.onnx")
+
+    from_jpeg = backend._preprocess(jpeg)
+    from_png = backend._preprocess(encode(decoded, "PNG"))
+
+    assert from_jpeg.shape == (3, 224, 224)
+    np.testing.assert_array_equal(from_jpeg, from_png)
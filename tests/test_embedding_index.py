@@ -0,0 +1,228 @@
+"""ArtworkEmbeddingIndex 인메모리 검색 테스트 (DB 없이 쿼리 결과를 대신 주입)"""
+
+import asyncio
+from datetime import date
+import threading
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app import database
+from app.config import settings
+from app.utils.embedding import ArtworkEmbeddingIndex, fuse_similarities
+from app.utils.embedding_projection import fit_random
+
+DIMENSION = 384
+
+
+class FakeSession:
+    closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeQuery:
+    """_query_artworks 결과 대용 (all / filter_by(id=).first())"""
+
+    def __init__(self, artworks):
+        self.artworks = artworks
+
+    def all(self):
+        return list(self.artworks)
+
+    def filter_by(self, id):
+        return FakeQuery([a for a in self.artworks if a.id == id])
+
+    def first(self):
+        return self.artworks[0] if self.artworks else None
+
+
+def make_artwork(artwork_id, embedding, exhibition_ids=()):
+    exhibitions = [
+        SimpleNamespace(
+            id=exhibition_id,
+            title=f"전시 {exhibition_id}",
+            venue=None,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 12, 31),
+            cover_image_url=None,
+        )
+        for exhibition_id in exhibition_ids
+    ]
+    return SimpleNamespace(
+        id=artwork_id,
+        title=f"작품 {artwork_id}",
+        artist_id=1,
+        artist=SimpleNamespace(name="작가"),
+        thumbnail_url=f"https://example.com/{artwork_id}.jpg",
+        exhibitions=exhibitions,
+        embedding=embedding,
+        embedding_model=None,
+    )
+
+
+def unit(seed):
+    vector = np.random.default_rng(seed).standard_normal(DIMENSION)
+    return (vector / np.linalg.norm(vector)).astype(np.float32)
+
+
+@pytest.fixture
+def artworks():
+    return [
+        make_artwork(1, unit(1), exhibition_ids=[10]),
+        make_artwork(2, unit(2), exhibition_ids=[10, 20]),
+        make_artwork(3, unit(3), exhibition_ids=[20]),
+        make_artwork(4, unit(4)),
+    ]
+
+
+@pytest.fixture
+def index(artworks):
+    index = ArtworkEmbeddingIndex(dimension=DIMENSION)
+    index._fetch_fingerprint = lambda db: (len(artworks), None)
+    index._query_artworks = lambda db, model_version=None: FakeQuery(artworks)
+    index.load(db=None)
+    return index
+
+
+def test_search_returns_exact_match_first(index):
+    results = index.search(unit(3), top_k=2)
+
+    assert [r["artwork_id"] for r in results][0] == 3
+    assert results[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+    assert len(results) == 2
+
+
+def test_search_applies_threshold(index):
+    results = index.search(unit(2), top_k=10, threshold=0.5)
+
+    assert [r["artwork_id"] for r in results] == [2]
+
+
+def scoped_ids(index, query, exhibition_ids):
+    """전시 범위 후보 전체 (임계값 없이)"""
+    results = index.search(query, threshold=-1.0, exhibition_ids=exhibition_ids)
+    return {r["artwork_id"] for r in results}
+
+
+def test_search_scoped_to_exhibitions(index):
+    assert scoped_ids(index, unit(4), [10]) == {1, 2}
+    assert scoped_ids(index, unit(4), [10, 20]) == {1, 2, 3}
+    assert scoped_ids(index, unit(4), [999]) == set()
+
+
+def test_search_rejects_wrong_dimension(index):
+    with pytest.raises(ValueError):
+        index.search(np.ones(10, dtype=np.float32))
+
+
+def test_remove_does_not_mutate_search_snapshot(index):
+    # 검색 중인 스레드가 잡고 있는 스냅샷은 remove 후에도 그대로여야 함
+    ids, metadata = index._ids, index._metadata
+
+    index.remove(3)
+
+    assert 3 in ids and 3 in metadata
+    assert 3 not in index._metadata
+    assert [r["artwork_id"] for r in index.search(unit(3), top_k=10)].count(3) == 0
+
+
+def test_upsert_does_not_mutate_search_snapshot(index, artworks):
+    ids, metadata = index._ids, index._metadata
+    artworks.append(make_artwork(5, unit(5), exhibition_ids=[20]))
+
+    index.upsert(5, unit(5), db=None)
+
+    assert 5 not in ids and 5 not in metadata
+    assert index.search(unit(5), top_k=1)[0]["artwork_id"] == 5
+    assert scoped_ids(index, unit(5), [20]) == {2, 3, 5}
+
+
+def test_fuse_similarities():
+    similarities = np.array([[0.9, 0.1], [0.6, 0.5]])
+
+    np.testing.assert_allclose(fuse_similarities(similarities, "max"), [0.9, 0.6])
+    np.testing.assert_allclose(fuse_similarities(similarities, "mean"), [0.5, 0.55])
+    with pytest.raises(ValueError):
+        fuse_similarities(similarities, "median")
+
+
+def test_search_fused_max_and_mean(index):
+    # 한 장은 1번 작품과 같고, 두 장은 2번 / 3번 작품 사이
+    between = unit(2) + unit(3)
+    photos = [unit(1), between, between]
+
+    by_max = index.search_fused(photos, top_k=1, threshold=-1.0, fusion="max")
+    by_mean = index.search_fused(photos, top_k=1, threshold=-1.0, fusion="mean")
+
+    assert by_max[0]["artwork_id"] == 1
+    assert by_max[0]["similarity"] == pytest.approx(1.0, abs=1e-5)
+    assert len(by_max[0]["image_similarities"]) == 3
+    assert by_mean[0]["artwork_id"] in (2, 3)
+
+
+def test_search_fused_scope_and_threshold(index):
+    results = index.search_fused(
+        [unit(1), unit(1)], top_k=10, threshold=-1.0, exhibition_ids=[20]
+    )
+
+    assert {r["artwork_id"] for r in results} == {2, 3}
+    confident = index.search_fused([unit(3)], threshold=0.5)
+    assert [r["artwork_id"] for r in confident] == [3]
+
+
+def test_search_with_projection_pool(index, monkeypatch):
+    # 축소 공간 후보 pool → 전체 차원 재계산 결과가 전체 검색과 같아야 함
+    monkeypatch.setattr(settings, "EMBEDDING_PROJECTION_MIN_ROWS", 1)
+    monkeypatch.setattr(settings, "EMBEDDING_PROJECTION_CANDIDATES", 2)
+    query = unit(3) + 0.5 * unit(2)
+    expected = index.search(query, top_k=2, threshold=-1.0)
+
+    index.projection = fit_random(DIMENSION, 128)
+    index._reduced = index.projection.reduce_matrix(index._matrix)
+    results = index.search(query, top_k=2, threshold=-1.0)
+
+    assert [r["artwork_id"] for r in results] == [r["artwork_id"] for r in expected]
+    assert [r["similarity"] for r in results] == pytest.approx(
+        [r["similarity"] for r in expected], abs=1e-5
+    )
+
+
+def test_schedule_refresh_reloads_off_the_event_loop(index, artworks, monkeypatch):
+    # 재로드 중에도 요청은 기다리지 않고 이전 스냅샷으로 검색
+    sessions = []
+
+    def session_local():
+        sessions.append(FakeSession())
+        return sessions[-1]
+
+    monkeypatch.setattr(database, "SessionLocal", session_local)
+    loading = threading.Event()
+    release = threading.Event()
+    query_artworks = index._query_artworks
+
+    def slow_query(db, model_version=None):
+        loading.set()
+        release.wait(timeout=5)
+        return query_artworks(db, model_version)
+
+    artworks.append(make_artwork(5, unit(5)))
+    index._fetch_fingerprint = lambda db: (len(artworks), None)
+    index._query_artworks = slow_query
+    index._last_checked = 0.0
+
+    async def run():
+        index.schedule_refresh()
+        index.schedule_refresh()  # 진행 중이면 다시 예약하지 않음
+        await asyncio.get_running_loop().run_in_executor(None, loading.wait, 5)
+        during = index.search(unit(5), top_k=1)[0]["artwork_id"]
+        release.set()
+        while index._refreshing:
+            await asyncio.sleep(0.01)
+        return during
+
+    assert asyncio.run(run()) != 5
+    assert index.search(unit(5), top_k=1)[0]["artwork_id"] == 5
+    assert len(sessions) == 1 and sessions[0].closed
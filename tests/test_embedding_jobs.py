@@ -0,0 +1,71 @@
+"""임베딩 작업 큐 정리 (보관 기간이 지난 done / failed 작업 삭제) 테스트 (DB는 가짜 세션)"""
+
+from types import SimpleNamespace
+
+from app.config import settings
+from app.utils.embedding_jobs import PURGE_QUERY, purge_finished_embedding_jobs
+from app.workers import embedding_worker
+
+
+class FakeSession:
+    """PURGE_QUERY마다 남은 행을 batch_size개씩 지우는 세션"""
+
+    def __init__(self, rows):
+        self.rows = dict(rows)
+        self.deletes = []
+        self.commits = 0
+        self.closed = False
+
+    def execute(self, query, params=None):
+        if query is not PURGE_QUERY:
+            return SimpleNamespace(rowcount=0)
+        self.deletes.append(params)
+        deleted = min(self.rows.get(params["status"], 0), params["batch_size"])
+        self.rows[params["status"]] = self.rows.get(params["status"], 0) - deleted
+        return SimpleNamespace(rowcount=deleted)
+
+    def commit(self):
+        self.commits += 1
+
+    def close(self):
+        self.closed = True
+
+
+def test_purge_deletes_in_batches_until_done():
+    db = FakeSession({"done": 25, "failed": 3})
+
+    deleted = purge_finished_embedding_jobs(
+        db, done_days=7, failed_days=30, batch_size=10
+    )
+
+    assert deleted == 28
+    assert db.rows == {"done": 0, "failed": 0}
+    assert [(p["status"], p["days"]) for p in db.deletes] == [
+        ("done", 7),
+        ("done", 7),
+        ("done", 7),
+        ("failed", 30),
+    ]
+    assert db.commits == len(db.deletes)
+
+
+def test_purge_skips_disabled_retention():
+    db = FakeSession({"done": 5, "failed": 5})
+
+    assert purge_finished_embedding_jobs(db, done_days=0, failed_days=30) == 5
+    assert db.rows["done"] == 5
+
+
+def test_worker_purges_on_reclaim_step(monkeypatch):
+    db = FakeSession({"done": 4, "failed": 1})
+    monkeypatch.setattr(embedding_worker, "SessionLocal", lambda: db)
+    monkeypatch.setattr(settings, "EMBEDDING_JOB_DONE_RETENTION_DAYS", 7)
+    monkeypatch.setattr(settings, "EMBEDDING_JOB_FAILED_RETENTION_DAYS", 30)
+    worker = embedding_worker.EmbeddingWorker(concurrency=1, poll_seconds=0.1)
+
+    worker._reclaim_if_due()
+    worker._reclaim_if_due()  # 주기 안에서는 다시 실행하지 않음
+
+    assert db.rows == {"done": 0, "failed": 0}
+    assert len(db.deletes) == 2
+    assert db.closed
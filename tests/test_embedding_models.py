@@ -0,0 +1,41 @@
+"""임베딩 모델 레지스트리 보조 백엔드 선택 테스트"""
+
+import pytest
+
+from app.config import settings
+from app.utils import embedding_models
+from app.utils.embedding_models import EmbeddingModelRegistry
+
+
+def registry(primary: str) -> EmbeddingModelRegistry:
+    return EmbeddingModelRegistry(
+        {"v1": {"name": primary}, "v2": {"name": primary}}, "v1"
+    )
+
+
+@pytest.fixture(autouse=True)
+def fake_backends(monkeypatch):
+    monkeypatch.setattr(embedding_models, "create_embedding_backend", lambda name: name)
+
+
+@pytest.mark.parametrize(
+    "primary, fallback, expected",
+    [
+        ("lambda", "onnx", "onnx"),
+        ("onnx", "lambda", "lambda"),
+        ("lambda", "lambda", None),
+        ("lambda", "huggingface", None),  # 전처리 / 출력이 달라 벡터 공간이 다름
+        ("huggingface", "onnx", None),
+        ("lambda", "", None),
+    ],
+)
+def test_fallback_only_for_same_vector_space(monkeypatch, primary, fallback, expected):
+    monkeypatch.setattr(settings, "EMBEDDING_FALLBACK_BACKEND", fallback)
+
+    assert registry(primary)._create_fallback("v1") == expected
+
+
+def test_no_fallback_for_shadow_version(monkeypatch):
+    monkeypatch.setattr(settings, "EMBEDDING_FALLBACK_BACKEND", "onnx")
+
+    assert registry("lambda")._create_fallback("v2") is None
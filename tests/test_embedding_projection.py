@@ -0,0 +1,87 @@
+"""작품 임베딩 차원 축소 (PCA / 무작위 투영) 후보 검색 테스트"""
+
+import numpy as np
+import pytest
+
+from app.utils.embedding_projection import EmbeddingProjection, fit_pca, fit_random
+
+DIMENSION = 384
+
+
+def normalize(vectors):
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+@pytest.fixture(scope="module")
+def dataset():
+    """저차원(32) 구조 + 작은 노이즈 임베딩과 기존 작품 근처 쿼리"""
+    rng = np.random.default_rng(0)
+    basis = rng.standard_normal((32, DIMENSION))
+    matrix = normalize(
+        rng.standard_normal((2000, 32)) @ basis
+        + 0.5 * rng.standard_normal((2000, DIMENSION))
+    ).astype(np.float32)
+    picked = rng.choice(len(matrix), 50, replace=False)
+    queries = normalize(
+        matrix[picked] + 0.05 * rng.standard_normal((50, DIMENSION))
+    ).astype(np.float32)
+    return matrix, queries
+
+
+def recall(projection, matrix, queries, top_k=10, count=100):
+    reduced, squared_norms = projection.reduce_matrix(matrix)
+    hits = 0
+    for query in queries:
+        exact = np.argsort(-(matrix @ query))[:top_k]
+        candidates = projection.candidates(reduced, squared_norms, query, count)
+        hits += len(set(exact) & set(candidates))
+    return hits / (top_k * len(queries))
+
+
+def test_pca_candidates_recall(dataset):
+    matrix, queries = dataset
+    projection = fit_pca(matrix, dims=64, model_version="v1")
+
+    assert projection.dims == 64 and projection.dimension == DIMENSION
+    assert 0.0 < projection.explained_variance <= 1.0
+    assert recall(projection, matrix, queries) >= 0.95
+
+
+def test_random_projection_is_orthonormal(dataset):
+    matrix, queries = dataset
+    projection = fit_random(DIMENSION, 128, seed=1)
+
+    np.testing.assert_allclose(
+        projection.components.T @ projection.components, np.eye(128), atol=1e-5
+    )
+    assert recall(projection, matrix, queries, count=200) >= 0.8
+
+
+def test_candidates_returns_all_rows_when_count_exceeds_size(dataset):
+    matrix, queries = dataset
+    projection = fit_random(DIMENSION, 16)
+    reduced, squared_norms = projection.reduce_matrix(matrix[:5])
+
+    candidates = projection.candidates(reduced, squared_norms, queries[0], 10)
+
+    assert sorted(candidates) == [0, 1, 2, 3, 4]
+
+
+def test_fit_pca_requires_enough_rows():
+    with pytest.raises(ValueError):
+        fit_pca(np.ones((10, DIMENSION), dtype=np.float32), dims=64)
+
+
+def test_save_load_roundtrip(dataset, tmp_path):
+    matrix, _ = dataset
+    projection = fit_pca(matrix[:200], dims=32, model_version="v1")
+    path = str(tmp_path / "projections" / "pca.npz")
+
+    projection.save(path)
+    loaded = EmbeddingProjection.load(path)
+
+    assert loaded.version == projection.version
+    assert loaded.stats() == projection.stats()
+    np.testing.assert_array_equal(
+        loaded.project(matrix[:3]), projection.project(matrix[:3])
+    )
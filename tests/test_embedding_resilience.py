@@ -0,0 +1,244 @@
+"""임베딩 호출 복원력 (서킷 브레이커 / 시간 예산 / hedging / 보조 백엔드) 테스트"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from app.utils import embedding_resilience
+from app.utils.embedding_backend import EmbeddingBackend
+from app.utils.embedding_resilience import (
+    CircuitBreaker,
+    Deadline,
+    EmbeddingBackendUnavailable,
+    EmbeddingDeadlineExceeded,
+    ResilientEmbeddingBackend,
+    bounded_timeout,
+    current_deadline,
+    deadline_scope,
+    sleep_within_deadline,
+)
+
+
+class FakeClock:
+    """embedding_resilience.time 대용 (monotonic만 수동으로 진행)"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def perf_counter(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(embedding_resilience, "time", clock)
+    return clock
+
+
+def test_breaker_opens_on_failure_rate(clock):
+    breaker = CircuitBreaker("lambda", window=10, min_calls=4, failure_rate=0.5)
+
+    for ok in (True, False, True):
+        breaker.record(ok)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is False
+    assert breaker.stats()["rejected"] == 1
+
+
+def test_breaker_counts_slow_calls_as_failures(clock):
+    breaker = CircuitBreaker("lambda", min_calls=2, failure_rate=1.0, slow_ms=100)
+
+    breaker.record(True, latency_ms=150)
+    breaker.record(True, latency_ms=500)
+
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_breaker_half_open_probe_closes_or_reopens(clock):
+    breaker = CircuitBreaker("lambda", min_calls=1, open_seconds=30)
+    breaker.record(False)
+    assert breaker.retry_after() == 30
+
+    clock.now += 31
+    assert breaker.allow() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is False  # 시험 호출은 1개만
+
+    breaker.record(False)
+    assert breaker.state == CircuitBreaker.OPEN and breaker.opened == 2
+
+    clock.now += 31
+    assert breaker.allow() is True
+    breaker.record(True)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.retry_after() == 0
+
+
+def test_deadline_scope_keeps_shorter_outer_deadline(clock):
+    outer = Deadline.after(1)
+
+    with deadline_scope(outer):
+        with deadline_scope(Deadline.after(10)) as inner:
+            assert inner is outer
+        with deadline_scope(None):
+            assert current_deadline() is outer
+    assert current_deadline() is None
+
+
+def test_bounded_timeout_and_sleep(clock):
+    assert bounded_timeout(30) == 30
+
+    with deadline_scope(Deadline.after(5)):
+        assert bounded_timeout(30) == 5
+        with pytest.raises(EmbeddingDeadlineExceeded):
+            sleep_within_deadline(5)
+        sleep_within_deadline(2)
+        assert bounded_timeout(30) == 3
+
+        clock.now += 3
+        with pytest.raises(EmbeddingDeadlineExceeded):
+            bounded_timeout(30)
+
+
+class FakeBackend(EmbeddingBackend):
+    """호출마다 delays의 시간만큼 걸리는 백엔드 (None이면 실패)"""
+
+    def __init__(self, name, delays, value=1.0):
+        self.name = name
+        self.delays = list(delays)
+        self.value = value
+        self.calls = 0
+
+    def embed(self, image_bytes):
+        raise NotImplementedError
+
+    async def aembed(self, image_bytes):
+        delay = self.delays[min(self.calls, len(self.delays) - 1)]
+        self.calls += 1
+        if delay is None:
+            raise RuntimeError(f"{self.name} 실패")
+        await asyncio.sleep(delay)
+        return np.full(384, self.value, dtype=np.float32)
+
+    async def aembed_batch(self, images):
+        return [await self.aembed(image) for image in images]
+
+
+def make_backend(primary, fallback=None, **kwargs):
+    options = dict(hedge_min_ms=10, hedge_default_ms=50)
+    options.update(kwargs)
+    return ResilientEmbeddingBackend(
+        primary,
+        fallback=fallback,
+        breaker=CircuitBreaker(primary.name, min_calls=1, open_seconds=60),
+        **options,
+    )
+
+
+def test_hedge_wins_when_first_call_is_slow():
+    primary = FakeBackend("lambda", [1.0, 0.01])
+    backend = make_backend(primary)
+
+    started = time.perf_counter()
+    embedding = asyncio.run(backend.aembed(b"image"))
+
+    assert embedding.shape == (384,)
+    assert time.perf_counter() - started < 0.5
+    assert (backend.hedges, backend.hedge_wins, primary.calls) == (1, 1, 2)
+
+
+def test_no_hedge_when_disabled():
+    primary = FakeBackend("lambda", [0.1, 0.01])
+    backend = make_backend(primary, hedge_enabled=False)
+
+    asyncio.run(backend.aembed(b"image"))
+
+    assert (backend.hedges, primary.calls) == (0, 1)
+
+
+def test_deadline_exceeded_does_not_wait_for_slow_backend():
+    backend = make_backend(FakeBackend("lambda", [1.0]), hedge_enabled=False)
+
+    async def run():
+        with deadline_scope(Deadline.after(0.05)):
+            return await backend.aembed(b"image")
+
+    started = time.perf_counter()
+    with pytest.raises(EmbeddingDeadlineExceeded):
+        asyncio.run(run())
+
+    assert time.perf_counter() - started < 0.5
+    assert backend.deadline_exceeded == 1
+
+
+def test_failure_uses_fallback_then_breaker_skips_primary():
+    primary = FakeBackend("lambda", [None])
+    fallback = FakeBackend("onnx", [0.0], value=2.0)
+    backend = make_backend(primary, fallback, hedge_enabled=False)
+
+    first = asyncio.run(backend.aembed(b"image"))
+    second = asyncio.run(backend.aembed(b"image"))
+
+    assert first[0] == second[0] == 2.0
+    assert primary.calls == 1  # 서킷이 열려 두 번째는 주 백엔드를 호출하지 않음
+    assert backend.fallbacks == 2
+    assert backend.stats()["breaker"]["state"] == CircuitBreaker.OPEN
+
+
+def test_open_breaker_without_fallback_raises_unavailable():
+    backend = make_backend(FakeBackend("lambda", [None]), hedge_enabled=False)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(backend.aembed(b"image"))
+    with pytest.raises(EmbeddingBackendUnavailable) as error:
+        asyncio.run(backend.aembed(b"image"))
+
+    assert error.value.retry_after == 60
+
+
+def test_batch_failure_uses_fallback():
+    primary = FakeBackend("lambda", [None])
+    fallback = FakeBackend("onnx", [0.0], value=2.0)
+    backend = make_backend(primary, fallback)
+
+    embeddings = asyncio.run(backend.aembed_batch([b"a", b"b"]))
+
+    assert [e[0] for e in embeddings] == [2.0, 2.0]
+    assert asyncio.run(backend.aembed_batch([])) == []
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_cancelled_half_open_probe_does_not_block_breaker(clock, batch):
+    # /match/batch: 바깥 wait_for가 시험 호출을 취소해도 이후 호출이 막히지 않아야 함
+    primary = FakeBackend("lambda", [None, 1.0, 0.0])
+    backend = make_backend(primary, hedge_enabled=False)
+    with pytest.raises(RuntimeError):
+        asyncio.run(backend.aembed(b"image"))
+    clock.now += 61
+
+    def call():
+        if batch:
+            return backend.aembed_batch([b"image"])
+        return backend.aembed(b"image")
+
+    async def cancelled_probe():
+        await asyncio.wait_for(call(), timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(cancelled_probe())
+
+    assert backend.breaker.state == CircuitBreaker.HALF_OPEN
+    asyncio.run(call())
+    assert backend.breaker.state == CircuitBreaker.CLOSED
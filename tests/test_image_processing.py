@@ -0,0 +1,47 @@
+"""이미지 전처리 / dHash 테스트"""
+
+import asyncio
+import io
+
+from PIL import Image, UnidentifiedImageError
+import pytest
+
+from app.utils.image_processing import (
+    ImagePreprocessor,
+    ImageTooLargeError,
+    compute_dhash,
+)
+
+
+def jpeg_bytes(width: int = 320, height: int = 240, quality: int = 90) -> bytes:
+    """가로 그라디언트 + 사각형 (dHash가 0이 아닌 이미지)"""
+    image = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    image.paste((255, 0, 0), (width // 4, height // 4, width // 2, height // 2))
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+def test_dhash_stable_under_recompression():
+    original = compute_dhash(jpeg_bytes(quality=95))
+    recompressed = compute_dhash(jpeg_bytes(quality=60))
+
+    assert bin(original ^ recompressed).count("1") <= 3
+
+
+def test_dhash_rejects_too_many_pixels():
+    with pytest.raises(ImageTooLargeError):
+        compute_dhash(jpeg_bytes(), max_pixels=1000)
+
+
+def test_preprocessor_dhash_runs_in_process_pool():
+    preprocessor = ImagePreprocessor(max_workers=1, max_pending=2)
+    image_bytes = jpeg_bytes()
+    try:
+        assert asyncio.run(preprocessor.dhash(image_bytes)) == compute_dhash(
+            image_bytes
+        )
+        with pytest.raises(UnidentifiedImageError):
+            asyncio.run(preprocessor.dhash(b"not an image"))
+    finally:
+        preprocessor.shutdown()
@@ -0,0 +1,132 @@
+"""전시 매칭 번들 (ETag / 직렬화 / 캐시) 테스트 (DB는 가짜 세션)"""
+
+import base64
+from datetime import datetime
+import json
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.utils.match_bundle import (
+    FINGERPRINT_QUERY,
+    MatchBundleCache,
+    build_match_bundle,
+    bundle_version,
+    etag_matches,
+)
+
+FINGERPRINT = (2, 2, 3, datetime(2024, 5, 1), datetime(2024, 4, 1), None, "v1")
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, False),
+        ("", False),
+        ('"abc"', True),
+        ('W/"abc"', True),
+        ('"other", "abc"', True),
+        ('"other"', False),
+        ("*", True),
+        ("abc", False),
+    ],
+)
+def test_etag_matches(header, expected):
+    assert etag_matches(header, '"abc"') is expected
+
+
+def test_bundle_version_is_stable_and_sensitive():
+    assert bundle_version(FINGERPRINT) == bundle_version(tuple(FINGERPRINT))
+    assert bundle_version(FINGERPRINT) != bundle_version(FINGERPRINT[:-1] + ("v2",))
+    assert len(bundle_version(FINGERPRINT)) == 32
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchone(self):
+        return self.rows[0]
+
+    def fetchall(self):
+        return self.rows
+
+
+class FakeSession:
+    def __init__(self, rows, fingerprint=FINGERPRINT):
+        self.rows = rows
+        self.fingerprint = fingerprint
+        self.bundle_queries = 0
+
+    def execute(self, query, params=None):
+        if query is FINGERPRINT_QUERY:
+            return FakeResult([self.fingerprint])
+        self.bundle_queries += 1
+        return FakeResult(self.rows)
+
+
+def row(artwork_id, embedding):
+    return SimpleNamespace(
+        id=artwork_id,
+        title=f"작품 {artwork_id}",
+        artist_name="작가",
+        thumbnail_url=f"https://example.com/{artwork_id}.jpg",
+        embedding=embedding,
+    )
+
+
+def test_build_bundle_serializes_normalized_float16():
+    rows = [
+        row(1, np.full(384, 2.0, dtype=np.float32)),
+        row(2, np.ones(10, dtype=np.float32)),  # 차원이 다른 임베딩은 제외
+        row(3, np.arange(384, dtype=np.float32)),
+    ]
+
+    bundle = build_match_bundle(FakeSession(rows), 5, "v1", "ver")
+    payload = json.loads(bundle.body)
+    matrix = np.frombuffer(
+        base64.b64decode(payload["embeddings"]), dtype="<f2"
+    ).reshape(payload["count"], payload["dimension"])
+
+    assert bundle.etag == '"ver"'
+    assert payload["count"] == bundle.count == 2
+    assert [a["artwork_id"] for a in payload["artworks"]] == [1, 3]
+    assert payload["embedding_model_version"] == "v1"
+    np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, atol=1e-3)
+
+
+def test_build_empty_bundle():
+    payload = json.loads(build_match_bundle(FakeSession([]), 5, None, "ver").body)
+
+    assert payload["count"] == 0
+    assert payload["embeddings"] == ""
+
+
+def test_cache_rebuilds_only_when_fingerprint_changes():
+    cache = MatchBundleCache(max_entries=2)
+    db = FakeSession([row(1, np.ones(384, dtype=np.float32))])
+
+    first = cache.get(db, 5)
+    assert cache.get(db, 5) is first
+
+    db.fingerprint = FINGERPRINT[:-1] + ("v2",)
+    rebuilt = cache.get(db, 5)
+
+    assert rebuilt is not first and rebuilt.version != first.version
+    assert (cache.hits, cache.builds, db.bundle_queries) == (1, 2, 2)
+
+
+def test_cache_evicts_least_recently_used_exhibition():
+    cache = MatchBundleCache(max_entries=2)
+    db = FakeSession([])
+
+    for exhibition_id in (1, 2, 1, 3):
+        cache.get(db, exhibition_id)
+    cache.get(db, 1)
+    cache.get(db, 2)
+
+    assert cache.builds == 4
+    cache.invalidate(1)
+    cache.get(db, 1)
+    assert cache.builds == 5
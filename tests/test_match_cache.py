@@ -0,0 +1,111 @@
+"""MatchCache 로컬 LRU / TTL / 해밍 거리 조회 테스트 (공유 캐시는 가짜 저장소)"""
+
+import numpy as np
+
+from app.utils.match_cache import MatchCache, _to_signed
+
+MODEL = "dinov2-small"
+
+
+def vector(value: float) -> np.ndarray:
+    return np.full(384, value, dtype=np.float32)
+
+
+def test_exact_and_near_hits():
+    cache = MatchCache(max_entries=8, ttl_seconds=60, max_distance=3)
+    cache.put(0b1111_0000, vector(1.0), MODEL)
+
+    assert cache.get(0b1111_0000, MODEL)[0] == 1.0
+    assert cache.get(0b1111_0111, MODEL)[0] == 1.0  # 거리 3
+    assert cache.get(0b1111_1111, MODEL) is None  # 거리 4
+
+    stats = cache.stats()
+    assert (stats["exact_hits"], stats["near_hits"], stats["misses"]) == (1, 1, 1)
+
+
+def test_nearest_entry_wins():
+    cache = MatchCache(max_distance=3)
+    cache.put(0b0000, vector(1.0), MODEL)
+    cache.put(0b0111, vector(2.0), MODEL)
+
+    assert cache.get(0b0011, MODEL)[0] == 2.0  # 거리 1 (0b0000과는 2)
+
+
+def test_exact_only_when_max_distance_zero():
+    cache = MatchCache(max_distance=0)
+    cache.put(0b1000, vector(1.0), MODEL)
+
+    assert cache.get(0b1001, MODEL) is None
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = MatchCache(max_entries=2, max_distance=0)
+    cache.put(1, vector(1.0), MODEL)
+    cache.put(2, vector(2.0), MODEL)
+    cache.get(1, MODEL)
+    cache.put(3, vector(3.0), MODEL)
+
+    assert cache.get(2, MODEL) is None
+    assert cache.get(1, MODEL) is not None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_expired_entries_are_dropped():
+    cache = MatchCache(ttl_seconds=0, max_distance=3)
+    cache.put(0b0001, vector(1.0), MODEL)
+    cache.put(0b0011, vector(2.0), MODEL)
+
+    assert cache.get(0b0001, MODEL) is None
+    assert len(cache) == 0
+    assert cache.stats()["expirations"] == 2
+
+
+def test_model_change_clears_local_entries():
+    cache = MatchCache(max_distance=0)
+    cache.put(1, vector(1.0), MODEL)
+
+    assert cache.get(1, "other-model") is None
+    assert cache.get(1, MODEL) is None
+
+
+class FakeSharedStore:
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.rows = {}
+
+    def get(self, image_hash, max_distance, model_version):
+        if self.fail:
+            raise RuntimeError("db down")
+        embedding = self.rows.get((image_hash, model_version))
+        return None if embedding is None else (embedding, 0)
+
+    def put(self, image_hash, embedding, ttl_seconds, model_version):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.rows[(image_hash, model_version)] = embedding
+
+
+def test_shared_hit_fills_local_cache():
+    store = FakeSharedStore()
+    store.put(5, vector(5.0), 60, MODEL)
+    cache = MatchCache(max_distance=0, shared_store=store)
+
+    assert cache.get(5, MODEL)[0] == 5.0
+    store.rows.clear()
+    assert cache.get(5, MODEL)[0] == 5.0
+    assert cache.stats()["shared_hits"] == 1
+
+
+def test_shared_errors_fall_back_to_miss():
+    cache = MatchCache(max_distance=0, shared_store=FakeSharedStore(fail=True))
+    cache.put(1, vector(1.0), MODEL)
+
+    assert cache.get(2, MODEL) is None
+    assert cache.stats()["shared_errors"] == 2
+
+
+def test_to_signed_fits_bigint():
+    assert _to_signed(0) == 0
+    assert _to_signed((1 << 63) - 1) == (1 << 63) - 1
+    assert _to_signed(1 << 63) == -(1 << 63)
+    assert _to_signed((1 << 64) - 1) == -1
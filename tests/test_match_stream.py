@@ -0,0 +1,89 @@
+"""실시간 작품 인식 프레임 슬롯 / 연속 매칭 확정 테스트"""
+
+import asyncio
+
+from app.utils.match_stream import ConsecutiveMatchTracker, LatestFrameSlot
+
+
+def results(*artwork_ids):
+    return [{"artwork_id": artwork_id} for artwork_id in artwork_ids]
+
+
+def test_slot_keeps_only_latest_frame():
+    async def run():
+        slot = LatestFrameSlot()
+        slot.put(b"1")
+        slot.put(b"2")
+        latest = slot.put(b"3")
+        return slot, latest, await slot.get()
+
+    slot, latest, frame = asyncio.run(run())
+
+    assert frame == (3, b"3") and latest == 3
+    assert (slot.received, slot.dropped) == (3, 2)
+
+
+def test_slot_get_waits_for_next_frame():
+    async def run():
+        slot = LatestFrameSlot()
+        waiter = asyncio.ensure_future(slot.get())
+        await asyncio.sleep(0)
+        assert not waiter.done()
+        slot.put(b"frame")
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    assert asyncio.run(run()) == (1, b"frame")
+
+
+def test_slot_close_drains_pending_frame_then_ends():
+    async def run():
+        slot = LatestFrameSlot()
+        slot.put(b"last")
+        slot.close()
+        return await slot.get(), await slot.get()
+
+    assert asyncio.run(run()) == ((1, b"last"), None)
+
+
+def test_slot_close_wakes_waiting_reader():
+    async def run():
+        slot = LatestFrameSlot()
+        waiter = asyncio.ensure_future(slot.get())
+        await asyncio.sleep(0)
+        slot.close()
+        return await asyncio.wait_for(waiter, timeout=1)
+
+    assert asyncio.run(run()) is None
+
+
+def test_tracker_confirms_after_consecutive_frames():
+    tracker = ConsecutiveMatchTracker(required=3)
+
+    assert [tracker.update(results(7, 8)) for _ in range(3)] == [False, False, True]
+    assert tracker.confirmed == 7
+    # 같은 작품은 한 번만 확정
+    assert tracker.update(results(7)) is False
+
+
+def test_tracker_streak_breaks_on_other_artwork_or_empty_frame():
+    tracker = ConsecutiveMatchTracker(required=2)
+
+    assert tracker.update(results(1)) is False
+    assert tracker.update(results(2)) is False
+    assert tracker.update([]) is False
+    assert tracker.update(results(2)) is False
+    assert tracker.update(results(2)) is True
+
+
+def test_tracker_confirms_new_artwork_and_reset():
+    tracker = ConsecutiveMatchTracker(required=1)
+
+    assert tracker.update(results(1)) is True
+    assert tracker.update(results(2)) is True
+    tracker.reset()
+    assert tracker.confirmed is None
+    assert tracker.update(results(2)) is True
+
+
+def test_tracker_required_at_least_one():
+    assert ConsecutiveMatchTracker(required=0).required == 1
@@ -0,0 +1,203 @@
+"""Singleflight 작업 합치기 테스트 (임베딩 백그라운드 생성 포함, DB / 백엔드는 가짜 객체)"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.utils import embedding_utils
+from app.utils.singleflight import AsyncSingleFlight, SingleFlight, content_key
+
+
+def test_content_key_depends_on_bytes_only():
+    assert content_key(b"image") == content_key(b"image")
+    assert content_key(b"image") != content_key(b"image2")
+
+
+def test_async_singleflight_coalesces_concurrent_calls():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "embedding"
+
+    async def run():
+        return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["embedding"] * 5
+    assert len(calls) == 1
+    assert flight.stats()["executions"] == 1
+    assert flight.stats()["coalesced"] == 4
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_async_singleflight_propagates_errors_and_forgets_key():
+    flight = AsyncSingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("lambda down")
+
+    async def ok():
+        return "ok"
+
+    async def run():
+        results = await asyncio.gather(
+            flight.do("key", fail), flight.do("key", fail), return_exceptions=True
+        )
+        return results, await flight.do("key", ok)
+
+    results, retried = asyncio.run(run())
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert retried == "ok"
+
+
+def test_async_singleflight_survives_caller_cancellation():
+    flight = AsyncSingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.05)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+def run_concurrently(func, count=4):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def target(i):
+        barrier.wait()
+        results[i] = func(i)
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_singleflight_coalesces_threads():
+    flight = SingleFlight()
+    calls = []
+
+    def work():
+        calls.append(1)
+        time.sleep(0.1)
+        return 42
+
+    assert run_concurrently(lambda i: flight.do("key", work)) == [42] * 4
+    assert len(calls) == 1
+    assert flight.stats()["in_flight"] == 0
+
+
+def test_singleflight_propagates_errors():
+    flight = SingleFlight()
+
+    def fail():
+        time.sleep(0.05)
+        raise ValueError("bad image")
+
+    def call(i):
+        with pytest.raises(ValueError):
+            flight.do("key", fail)
+        return True
+
+    assert all(run_concurrently(call, count=3))
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+        self.closed = False
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class SlowBackend:
+    name = "fake"
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def embed(self, image_bytes):
+        with self._lock:
+            self.calls += 1
+        time.sleep(0.1)
+        return [0.0] * 384
+
+    def embed_url(self, url, max_size=800):
+        return self.embed(b"")
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = SlowBackend()
+    registry = type("Registry", (), {"active": lambda self: ("v1", backend)})()
+    monkeypatch.setattr(embedding_utils, "embedding_flight", SingleFlight())
+    monkeypatch.setattr(
+        embedding_utils, "get_embedding_model_registry", lambda: registry
+    )
+    monkeypatch.setattr(embedding_utils, "reuse_embedding_by_hash", lambda *a: None)
+    monkeypatch.setattr(embedding_utils, "save_artwork_embedding", lambda *a: None)
+    monkeypatch.setattr(embedding_utils, "update_embedding_index", lambda *a: None)
+    monkeypatch.setattr(
+        embedding_utils, "generate_shadow_embedding", lambda *a, **k: False
+    )
+    return backend
+
+
+def test_background_embedding_coalesces_double_submit(backend):
+    # 중복 제출마다 썸네일 S3 키(uuid)가 달라도 같은 작품 + 같은 이미지면 한 번만 생성
+    sessions = [FakeSession() for _ in range(2)]
+
+    run_concurrently(
+        lambda i: embedding_utils.generate_embedding_background(
+            7,
+            f"https://bucket.s3.amazonaws.com/thumbnails/{i}-uuid.jpg",
+            "작품",
+            sessions[i],
+            content_hash="sha256",
+            image_bytes=b"jpeg",
+        ),
+        count=2,
+    )
+
+    assert backend.calls == 1
+    assert all(session.closed for session in sessions)
+
+
+def test_background_embedding_runs_again_for_new_image(backend):
+    run_concurrently(
+        lambda i: embedding_utils.generate_embedding_background(
+            7,
+            f"https://bucket.s3.amazonaws.com/thumbnails/{i}.jpg",
+            "작품",
+            FakeSession(),
+            content_hash=f"sha256-{i}",
+            image_bytes=b"jpeg",
+        ),
+        count=2,
+    )
+
+    assert backend.calls == 2
@@ -0,0 +1,141 @@
+"""작품 수정 시 썸네일 재업로드 판별 테스트 (DB/S3는 가짜 객체)"""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.api.v1.endpoints import artworks
+from app.config import settings
+from app.utils.image_processing import compute_content_hash
+
+IMAGE_A = b"image-a"
+IMAGE_B = b"image-b"
+
+
+class FakeUpload:
+    def __init__(self, data):
+        self.data = data
+        self.filename = "thumbnail.jpg"
+        self.content_type = "image/jpeg"
+
+    async def read(self):
+        return self.data
+
+
+class FakeQuery:
+    def __init__(self, artwork):
+        self.artwork = artwork
+
+    def filter(self, *args):
+        return self
+
+    def first(self):
+        return self.artwork
+
+
+class FakeSession:
+    def __init__(self, artwork):
+        self.artwork = artwork
+
+    def query(self, model):
+        return FakeQuery(self.artwork)
+
+    def commit(self):
+        pass
+
+    def refresh(self, instance):
+        pass
+
+
+class FakeS3:
+    def __init__(self):
+        self.uploads = []
+
+    def delete_file(self, url):
+        pass
+
+    async def upload_bytes(self, data, folder, filename, content_type):
+        self.uploads.append(data)
+        return f"https://example.com/{folder}/{len(self.uploads)}.jpg"
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    s3 = FakeS3()
+
+    async def prepare_embedding_image(image_bytes):
+        return image_bytes
+
+    monkeypatch.setattr(settings, "EMBEDDING_JOBS_ENABLED", True)
+    monkeypatch.setattr(artworks, "s3_client", s3)
+    monkeypatch.setattr(artworks, "reuse_embedding_by_hash", lambda *args: None)
+    monkeypatch.setattr(artworks, "prepare_embedding_image", prepare_embedding_image)
+    monkeypatch.setattr(artworks, "get_artwork", lambda artwork_id, db: None)
+    monkeypatch.setattr(
+        artworks,
+        "get_artwork_embedding_index",
+        lambda: SimpleNamespace(refresh_metadata=lambda artwork_id, db: None),
+    )
+    return s3
+
+
+@pytest.fixture
+def jobs(monkeypatch):
+    jobs = []
+    monkeypatch.setattr(
+        artworks,
+        "enqueue_embedding_job",
+        lambda db, artwork_id, url, content_hash, image: jobs.append(content_hash),
+    )
+    return jobs
+
+
+def make_artwork():
+    """이미지 A로 임베딩까지 끝난 작품"""
+    return SimpleNamespace(
+        id=1,
+        title="작품",
+        thumbnail_url="https://example.com/artworks/a.jpg",
+        thumbnail_content_hash=compute_content_hash(IMAGE_A),
+        embedding_content_hash=compute_content_hash(IMAGE_A),
+        embedding=np.ones(384, dtype=np.float32),
+    )
+
+
+def update_thumbnail(artwork, data):
+    asyncio.run(
+        artworks.update_artwork(
+            artwork_id=artwork.id,
+            background_tasks=None,
+            title=None,
+            artist_id=None,
+            description=None,
+            year=None,
+            thumbnail=FakeUpload(data),
+            db=FakeSession(artwork),
+        )
+    )
+
+
+def test_same_thumbnail_is_not_replaced(s3, jobs):
+    artwork = make_artwork()
+
+    update_thumbnail(artwork, IMAGE_A)
+
+    assert s3.uploads == [] and jobs == []
+    assert artwork.thumbnail_url.endswith("a.jpg")
+
+
+def test_reverting_thumbnail_while_embedding_is_pending(s3, jobs):
+    # A 임베딩 완료 → B로 교체 (작업 대기 중) → A 재업로드는 교체되어야 함
+    artwork = make_artwork()
+
+    update_thumbnail(artwork, IMAGE_B)
+    update_thumbnail(artwork, IMAGE_A)
+
+    assert s3.uploads == [IMAGE_B, IMAGE_A]
+    assert jobs == [compute_content_hash(IMAGE_B), compute_content_hash(IMAGE_A)]
+    assert artwork.thumbnail_content_hash == compute_content_hash(IMAGE_A)
+    assert artwork.thumbnail_url.endswith("/2.jpg")
@@ -0,0 +1,100 @@
+"""pgvector 인덱스 / 후보 검색 SQL 문자열 테스트 (DB 없이)"""
+
+import pytest
+
+from app.config import settings
+from app.utils.vector_index import (
+    candidate_distance_sql,
+    create_index_sql,
+    ivfflat_lists,
+    quantized_expression,
+    rescore_candidates,
+)
+
+
+def test_quantized_expression():
+    assert quantized_expression("embedding", "none") == "embedding"
+    assert quantized_expression("embedding", "halfvec") == (
+        "CAST(embedding AS halfvec(384))"
+    )
+    assert quantized_expression("embedding", "binary") == (
+        "CAST(binary_quantize(embedding) AS bit(384))"
+    )
+    with pytest.raises(ValueError):
+        quantized_expression("embedding", "int8")
+
+
+@pytest.mark.parametrize(
+    "quantization, expected",
+    [
+        ("none", "a.embedding <=> CAST(:q AS vector(384))"),
+        (
+            "halfvec",
+            "CAST(a.embedding AS halfvec(384)) <=> "
+            "CAST(CAST(:q AS vector(384)) AS halfvec(384))",
+        ),
+        (
+            "binary",
+            "CAST(binary_quantize(a.embedding) AS bit(384)) <~> "
+            "CAST(binary_quantize(CAST(:q AS vector(384))) AS bit(384))",
+        ),
+    ],
+)
+def test_candidate_distance_sql_casts_query(quantization, expected):
+    # 타입 없는 바인드 파라미터는 binary_quantize 오버로드를 고를 수 없음 → 항상 vector(384)로 CAST
+    assert candidate_distance_sql("a.embedding", ":q", quantization) == expected
+
+
+def test_candidate_distance_matches_index_expression():
+    # ORDER BY 컬럼 쪽 표현식이 인덱스 정의와 같아야 플래너가 인덱스를 사용
+    for quantization in ("none", "halfvec", "binary"):
+        index_sql = create_index_sql("hnsw", quantization=quantization)
+        column_side = candidate_distance_sql("embedding", ":q", quantization).split(
+            " <"
+        )[0]
+        assert f"(({column_side}) " in index_sql
+
+
+def test_candidate_distance_uses_configured_quantization(monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_INDEX_QUANTIZATION", "binary")
+
+    assert "<~>" in candidate_distance_sql("embedding", ":q")
+
+
+def test_create_index_sql_options(monkeypatch):
+    monkeypatch.setattr(settings, "HNSW_M", 24)
+    monkeypatch.setattr(settings, "HNSW_EF_CONSTRUCTION", 100)
+
+    hnsw = create_index_sql("hnsw", quantization="binary", concurrently=True)
+    ivfflat = create_index_sql("ivfflat", rows=50_000, quantization="none")
+
+    assert "CREATE INDEX CONCURRENTLY artworks_embedding_idx" in hnsw
+    assert "bit_hamming_ops" in hnsw
+    assert "m = 24, ef_construction = 100" in hnsw
+    assert "vector_cosine_ops" in ivfflat
+    assert "lists = 50" in ivfflat
+    with pytest.raises(ValueError):
+        create_index_sql("diskann", quantization="none")
+
+
+def test_ivfflat_lists():
+    assert ivfflat_lists(0) == 1
+    assert ivfflat_lists(500_000) == 500
+    assert ivfflat_lists(4_000_000) == 2000
+
+
+def test_rescore_candidates(monkeypatch):
+    monkeypatch.setattr(settings, "VECTOR_RESCORE_FACTOR", 4)
+
+    assert rescore_candidates(10, "none") == 10
+    assert rescore_candidates(10, "halfvec") == 40
+    assert rescore_candidates(10, "binary") == 40
+
+
+def test_benchmark_uses_same_candidate_sql():
+    from app.utils.benchmark_vector_index import search_sql
+
+    sql = search_sql("binary")
+
+    assert candidate_distance_sql("embedding", ":query", "binary") in sql
+    assert "CAST(CAST(" not in sql